@@ -0,0 +1,116 @@
+"""
+Ingestion Execution Mode Benchmark
+==================================
+Compares thread-pool and process-pool ingestion on the NEST dataset
+(all 23 studies by default).
+
+Each mode is run with the parsed-workbook cache disabled so both pay the
+full openpyxl parse cost. Results are printed and optionally written as JSON.
+
+Usage:
+    python scripts/benchmark_ingestion.py
+    python scripts/benchmark_ingestion.py --workers 2 4 8 --repeat 3
+    python scripts/benchmark_ingestion.py --data-root path/to/studies --output bench.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.ingestion import DataIngestionEngine, StudyDiscovery
+
+
+def run_mode(engine: DataIngestionEngine, mode: str, workers: int, repeat: int) -> dict:
+    """Time ingest_all_studies for one execution mode and worker count."""
+    timings = []
+    studies = files = rows = 0
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        all_data = engine.ingest_all_studies(
+            parallel=True,
+            max_workers=workers,
+            execution_mode=mode,
+        )
+        timings.append(time.perf_counter() - start)
+
+        studies = len(all_data)
+        files = sum(len(study_data) for study_data in all_data.values())
+        rows = sum(len(df) for study_data in all_data.values() for df in study_data.values())
+
+    return {
+        "mode": mode,
+        "workers": workers,
+        "runs": timings,
+        "median_seconds": statistics.median(timings),
+        "best_seconds": min(timings),
+        "studies": studies,
+        "files": files,
+        "rows": rows,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark thread vs process ingestion")
+    parser.add_argument("--data-root", help="Study data root (defaults to DATA_ROOT_PATH)")
+    parser.add_argument(
+        "--workers", type=int, nargs="+",
+        default=[4, os.cpu_count() or 1],
+        help="Worker counts to test",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    engine = DataIngestionEngine(use_workbook_cache=False)
+    if args.data_root:
+        engine.discovery = StudyDiscovery(args.data_root)
+
+    study_count = len(engine.discovery.discover_all_studies())
+
+    print(f"\n{'='*80}")
+    print("INGESTION BENCHMARK: THREAD POOL vs PROCESS POOL")
+    print(f"{'='*80}")
+    print(f"Data root: {engine.discovery.data_root}")
+    print(f"Studies:   {study_count}")
+    print(f"CPUs:      {os.cpu_count()}\n")
+
+    results = []
+    for workers in sorted(set(args.workers)):
+        for mode in DataIngestionEngine.EXECUTION_MODES:
+            result = run_mode(engine, mode, workers, args.repeat)
+            results.append(result)
+            print(
+                f"  {mode:<8} workers={workers:<3} "
+                f"median={result['median_seconds']:.2f}s best={result['best_seconds']:.2f}s "
+                f"({result['studies']} studies, {result['files']} files, {result['rows']} rows)"
+            )
+
+    print(f"\n{'-'*80}")
+    for workers in sorted(set(args.workers)):
+        by_mode = {r["mode"]: r for r in results if r["workers"] == workers}
+        speedup = by_mode["thread"]["median_seconds"] / max(by_mode["process"]["median_seconds"], 1e-9)
+        print(f"  workers={workers:<3} process speedup over threads: {speedup:.2f}x")
+    print(f"{'='*80}\n")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"data_root": str(engine.discovery.data_root), "cpu_count": os.cpu_count(), "results": results},
+                f,
+                indent=2,
+            )
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,637 @@
+"""
+Scaling Benchmark
+=================
+Measures how ingestion, feature extraction, the agent pipeline, consensus
+and the API behave as the data grows.
+
+A synthetic dataset in the NEST 2.0 layout (study folders, file names and
+the column schema the ingestion validator and feature extractors expect) is
+generated at the requested scale (studies x sites x subjects per site x rows
+per SAE, coding and EDRR listing), then each stage is timed on it:
+
+- ingestion:  DataIngestionEngine.ingest_all_studies (workbook cache off)
+- features:   RealFeatureExtractor.extract_features, every study
+- pipeline:   AgentPipeline.run_full_analysis, every study
+- consensus:  ConsensusEngine.calculate_consensus on the pipeline's signals
+- api:        key endpoints through an in-process ASGI client (httpx)
+
+Each stage records its timings, its peak RSS and a per-stage breakdown
+from the tracer (src/core/tracing.py). Results are written as JSON and,
+when a baseline of the same scale exists, compared against it: a metric
+that is more than --tolerance worse than the baseline is reported as a
+regression and the script exits with status 1.
+
+The run also records how many features were extracted and how many agents
+produced a signal instead of abstaining. If either is zero, the timings
+measure nothing useful: the run is reported as invalid and exits with
+status 1.
+
+Usage:
+    python scripts/benchmark_scaling.py
+    python scripts/benchmark_scaling.py --studies 20 --sites 50 --subjects-per-site 40 --rows-per-workbook 20000
+    python scripts/benchmark_scaling.py --save-baseline          # record the reference run
+    python scripts/benchmark_scaling.py --output run.json --tolerance 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_BASELINE = Path(__file__).parent.parent / "benchmarks" / "scaling_baseline.json"
+
+# Differences below these are noise, whatever the ratio
+MIN_DELTA = {"seconds": 0.05, "ms": 2.0, "mb": 25.0}
+
+
+# ========================================
+# MEMORY
+# ========================================
+
+def reset_peak_rss() -> bool:
+    """Reset the process peak RSS (Linux only); False if unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process in MB (since the last reset where supported)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ========================================
+# DATA GENERATION
+# ========================================
+
+# EDC Metrics carry NEST's three-row header. The ID block and the counts the
+# derived features look up by exact name come first with blank group rows;
+# later columns sit under their (forward-filled) group and sub-group.
+EDC_HEADER = [
+    ["", "", "", "", "", "", "", "", "", "", "", "CPMD", "", "", "SDV", ""],
+    ["", "", "", "", "", "", "", "", "", "", "", "Page status (Source: (Rave EDC : BO4))", "", "Query status",
+     "Verification status", ""],
+    ["Study", "Region", "Country", "Site", "Subject", "Visit", "Latest Visit Date", "Subject Status",
+     "Expected Visits", "Completed Visits", "# SAE", "# Pages Entered", "# Pages with Non-Conformant data",
+     "# Open Queries", "Forms Verified", "CRFs Require Verification (SDV)"],
+]
+VISITS = ["Screening", "Baseline", "Week 4", "Week 8", "Week 12", "Week 16", "Week 24"]
+FORMS = ["Demographics", "Vital Signs", "Adverse Events", "Concomitant Medications", "Labs", "ECG"]
+
+
+def _day(days_ago: int) -> str:
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+def _write(path: Path, columns: List[str], rows: List[list]) -> None:
+    pd.DataFrame(rows, columns=columns).to_excel(path, index=False)
+
+
+def generate_study(folder: Path, number: int, args: argparse.Namespace, rng: random.Random) -> None:
+    """Write one study's NEST workbooks (the file types the feature extractors read)."""
+    study = f"Study {number}"
+    prefix = folder / study
+    subjects = [
+        (f"Site {site + 1:03d}", f"{number:03d}-{site + 1:03d}-{subject + 1:04d}")
+        for site in range(args.sites)
+        for subject in range(args.subjects_per_site)
+    ]
+    listing_rows = args.rows_per_workbook
+
+    def subject_row() -> tuple:
+        return subjects[rng.randrange(len(subjects))]
+
+    sae_rows = []
+    for i in range(listing_rows):
+        site, subject = subject_row()
+        outcome = rng.choices(["Recovered", "Recovering", "Not Recovered", "Fatal"], [60, 25, 13, 2])[0]
+        sae_rows.append([
+            study, site, subject, f"SAE-{i + 1:06d}", rng.choice(FORMS),
+            rng.choices(["Open", "Pending", "Closed", "Resolved"], [20, 10, 50, 20])[0],
+            _day(rng.randint(0, 180)), outcome, "Death" if outcome == "Fatal" else "Hospitalization",
+        ])
+    _write(Path(f"{prefix}_eSAE Dashboard_DM.xlsx"),
+           ["Study", "Site", "Subject", "SAE_ID", "Form Name", "Review Status",
+            "Discrepancy Created Timestamp in Dashboard", "SAE Outcome", "Seriousness Criteria"],
+           sae_rows)
+    sae_per_subject: Dict[str, int] = {}
+    for row in sae_rows:
+        sae_per_subject[row[2]] = sae_per_subject.get(row[2], 0) + 1
+
+    edc_rows = []
+    for site, subject in subjects:
+        expected_visits = rng.randint(3, len(VISITS))
+        completed_visits = expected_visits - (rng.random() < 0.2)
+        expected_pages = expected_visits * len(FORMS)
+        entered = expected_pages - rng.randint(0, 4)
+        verified = rng.randint(0, expected_pages)
+        edc_rows.append([
+            study, "EMEA", "DEU", site, subject, VISITS[completed_visits - 1], _day(rng.randint(0, 90)),
+            rng.choices(["On Treatment", "Follow-Up", "Completed", "Discontinued", "Screen Failure"],
+                        [55, 20, 15, 7, 3])[0],
+            expected_visits, completed_visits, sae_per_subject.get(subject, 0), entered, rng.randint(0, 3),
+            rng.randint(0, 5), verified, expected_pages - verified,
+        ])
+    pd.DataFrame(EDC_HEADER + edc_rows).to_excel(
+        Path(f"{prefix}_CPID_EDC_Metrics.xlsx"), header=False, index=False
+    )
+
+    visit_rows = []
+    for site, subject in rng.sample(subjects, max(1, len(subjects) // 4)):
+        days_outstanding = rng.randint(1, 90)
+        visit_rows.append([study, site, subject, rng.choice(VISITS), _day(days_outstanding), days_outstanding])
+    _write(Path(f"{prefix}_Visit Projection Tracker.xlsx"),
+           ["Study", "Site", "Subject", "Visit", "Projected Date", "# Days Outstanding"],
+           visit_rows)
+
+    missing = rng.sample(subjects, max(1, len(subjects) // 3))
+    _write(Path(f"{prefix}_Missing_Pages_Report.xlsx"),
+           ["Study", "Site", "Subject", "Form", "Visit Name", "Form Type (Summary or Visit)", "Visit date"],
+           [[study, site, subject, rng.choice(FORMS), rng.choice(VISITS),
+             rng.choice(["Visit", "Summary"]), _day(rng.randint(1, 120))]
+            for site, subject in missing])
+
+    for dictionary in ("MedDRA", "WHODD"):
+        coding_rows = []
+        for _ in range(listing_rows):
+            site, subject = subject_row()
+            coded = rng.random() < 0.9
+            coding_rows.append([
+                study, site, subject, dictionary, rng.choice(FORMS),
+                "Coded" if coded else "Uncoded", _day(rng.randint(1, 60)) if coded else None,
+            ])
+        _write(Path(f"{prefix}_GlobalCodingReport_{dictionary}.xlsx"),
+               ["Study", "Site", "Subject", "Dictionary", "Form", "Coding Status", "Coding Date"],
+               coding_rows)
+
+    query_rows = []
+    for _ in range(listing_rows):
+        site, subject = subject_row()
+        query_rows.append([
+            study, site, subject, rng.choice(VISITS), rng.choice(FORMS),
+            rng.choices(["Open", "Answered", "Closed"], [30, 20, 50])[0],
+            rng.choices(["Manual", "Auto"], [35, 65])[0], rng.randint(0, 120),
+            rng.choice(["Site Review", "Field Monitor Review", "Data Manager"]),
+        ])
+    _write(Path(f"{prefix}_Compiled_EDRR.xlsx"),
+           ["Study", "Site", "Subject", "Visit", "Form", "Query Status", "Query Type", "# Days Since Open",
+            "Action Owner"],
+           query_rows)
+
+
+def generate_dataset(data_root: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    """Write args.studies "Study N_CPID_Input Files" folders in the NEST 2.0 layout."""
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    for number in range(1, args.studies + 1):
+        folder = data_root / f"Study {number}_CPID_Input Files"
+        folder.mkdir(parents=True, exist_ok=True)
+        generate_study(folder, number, args, rng)
+
+    files = [p for p in data_root.rglob("*.xlsx")]
+    return {
+        "seconds": round(time.perf_counter() - start, 3),
+        "files": len(files),
+        "bytes": sum(p.stat().st_size for p in files),
+    }
+
+
+# ========================================
+# STAGES
+# ========================================
+
+def stage_breakdown() -> List[Dict[str, Any]]:
+    """Tracer stage totals merged across studies (label sets other than study_id kept apart)."""
+    from src.core.tracing import tracer
+
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for stat in tracer.get_stage_stats():
+        labels = {k: v for k, v in stat["labels"].items() if k != "study_id"}
+        key = (stat["stage"], tuple(sorted(labels.items())))
+        entry = merged.setdefault(key, {"stage": stat["stage"], "labels": labels, "count": 0, "total_seconds": 0.0})
+        entry["count"] += stat["count"]
+        entry["total_seconds"] += stat["total_seconds"]
+    return sorted(
+        ({**e, "total_seconds": round(e["total_seconds"], 4)} for e in merged.values()),
+        key=lambda e: -e["total_seconds"],
+    )
+
+
+def run_stage(name: str, fn: Callable[[], int], repeat: int) -> Dict[str, Any]:
+    """Time fn (which returns the number of items it processed) repeat times."""
+    from src.core.tracing import tracer
+
+    tracer.reset()
+    rss_reset = reset_peak_rss()
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    result = {
+        "runs": [round(t, 4) for t in timings],
+        "median_seconds": round(median, 4),
+        "best_seconds": round(min(timings), 4),
+        "items": items,
+        "per_item_ms": round(median / items * 1000, 3) if items else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_scope": "stage" if rss_reset else "process",
+        "breakdown": stage_breakdown(),
+    }
+    print(
+        f"  {name:<10} median={result['median_seconds']:.3f}s best={result['best_seconds']:.3f}s "
+        f"items={items} per_item={result['per_item_ms']}ms peak_rss={result['peak_rss_mb']}MB"
+    )
+    return result
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(len(ordered) * p / 100) - 1))]
+
+
+async def time_endpoints(app: Any, endpoints: List[tuple]) -> Dict[str, Dict[str, Any]]:
+    """Request each (label, path, requests) endpoint through httpx's ASGI transport."""
+    import httpx
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=300.0) as client:
+        for label, path, requests in endpoints:
+            await client.get(path)  # warm-up
+            latencies, errors, size = [], 0, 0
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+                size = len(response.content)
+            results[label] = {
+                "path": path,
+                "requests": requests,
+                "errors": errors,
+                "response_bytes": size,
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "max_ms": round(max(latencies), 3),
+            }
+            print(
+                f"  {label:<18} p50={results[label]['p50_ms']:.2f}ms p95={results[label]['p95_ms']:.2f}ms "
+                f"errors={errors} bytes={size}"
+            )
+    return results
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Time every stage on the dataset under DATA_ROOT_PATH."""
+    # Imported here so settings pick up DATA_ROOT_PATH for the generated data
+    from src.data.features_real_extraction import RealFeatureExtractor
+    from src.data.ingestion import DataIngestionEngine
+    from src.intelligence.agent_pipeline import AgentPipeline
+
+    stages: Dict[str, Any] = {}
+    engine = DataIngestionEngine(use_workbook_cache=False)
+    extractor = RealFeatureExtractor()
+    pipeline = AgentPipeline()
+    state: Dict[str, Any] = {}
+
+    print("\nStages:")
+
+    def ingest() -> int:
+        state["raw"] = engine.ingest_all_studies(
+            parallel=True,
+            max_workers=args.workers,
+            execution_mode=args.execution_mode,
+        )
+        return sum(len(df) for study_data in state["raw"].values() for df in study_data.values())
+
+    stages["ingestion"] = run_stage("ingestion", ingest, args.repeat)
+
+    def extract() -> int:
+        state["features"] = {
+            study_id: extractor.extract_features(raw_data, study_id)
+            for study_id, raw_data in state["raw"].items()
+        }
+        return len(state["features"])
+
+    stages["features"] = run_stage("features", extract, args.repeat)
+
+    def analyze() -> int:
+        state["results"] = {
+            study_id: pipeline.run_full_analysis(study_id, features)
+            for study_id, features in state["features"].items()
+        }
+        return len(state["results"])
+
+    stages["pipeline"] = run_stage("pipeline", analyze, args.repeat)
+    coverage = measure_coverage(state)
+
+    signals = {
+        study_id: [r.signal for r in result.agent_results if r.signal is not None]
+        for study_id, result in state["results"].items()
+    }
+
+    def consensus() -> int:
+        for study_id, study_signals in signals.items():
+            if study_signals:
+                pipeline.consensus_engine.calculate_consensus(signals=study_signals, study_id=study_id)
+        return sum(1 for s in signals.values() if s)
+
+    stages["consensus"] = run_stage("consensus", consensus, args.repeat)
+    pipeline.close()
+
+    if not args.skip_api:
+        stages["api"] = benchmark_api(args, engine, extractor, state)
+
+    return {
+        "stages": stages,
+        "coverage": coverage,
+        "ingested": {
+            "studies": len(state["raw"]),
+            "files": sum(len(study_data) for study_data in state["raw"].values()),
+            "rows": stages["ingestion"]["items"],
+        },
+    }
+
+
+def measure_coverage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Features extracted and agents that did not abstain, per study and in total."""
+    studies = {}
+    for study_id, result in state["results"].items():
+        active = [
+            r.agent_name for r in result.agent_results
+            if r.signal is not None and not r.abstained and r.error is None
+        ]
+        studies[study_id] = {
+            "features_extracted": sum(1 for v in state["features"][study_id].values() if v is not None),
+            "agents_active": len(active),
+            "agents_abstained": result.agents_abstained,
+        }
+    coverage = {
+        "features_extracted": sum(s["features_extracted"] for s in studies.values()),
+        "agents_active": sum(s["agents_active"] for s in studies.values()),
+        "studies": studies,
+    }
+    print(f"  coverage   features={coverage['features_extracted']} active_agents={coverage['agents_active']}")
+    return coverage
+
+
+def benchmark_api(args: argparse.Namespace, engine: Any, extractor: Any, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Publish the benchmark results to the study store and time the API against them."""
+    import src.api.main as api_main
+    from src.api.site_index import rebuild_site_index
+    from src.api.study_store import get_study_store
+    from src.intelligence.dqi import DQIEngine
+
+    # What the application lifespan would set up (without loading data_cache.json)
+    api_main.data_ingestion = engine
+    api_main.feature_extractor = extractor
+    api_main.dqi_engine = DQIEngine()
+
+    studies = {}
+    for study_id, result in state["results"].items():
+        dqi = result.dqi_score.to_dict() if result.dqi_score else {}
+        studies[study_id] = {
+            "overall_score": dqi.get("overall_score"),
+            "risk_level": dqi.get("risk_level"),
+            "dimension_scores": dqi.get("dimension_scores", {}),
+            "features": state["features"][study_id],
+            "timeline": {"phase": "Phase 2", "status": "Ongoing", "enrollment_pct": 0.0, "est_completion": None},
+            "sites": api_main.extract_real_sites_from_nest(study_id, state["raw"][study_id]),
+            "last_updated": result.timestamp.isoformat(),
+        }
+    store = get_study_store()
+    store.add_listener(rebuild_site_index)
+    store.publish(studies, persist=False)  # leave data_cache.json alone
+
+    study_id = sorted(studies)[0]
+    n, compute = args.api_requests, args.compute_requests
+    endpoints = [
+        ("health", "/api/v1/health", n),
+        ("studies", "/api/v1/studies", n),
+        ("study_detail", f"/api/v1/studies/{study_id}", n),
+        ("dashboard_summary", "/api/v1/dashboard/summary", n),
+        ("study_sites", f"/api/v1/studies/{study_id}/sites", n),
+        ("sites_page", "/api/v1/sites?limit=100&sort=dqi_score", n),
+        ("export_studies", "/api/v1/export/studies", n),
+        ("prometheus", "/api/v1/metrics/prometheus", n),
+        ("study_dqi", f"/api/v1/studies/{study_id}/dqi", compute),
+        ("study_agents", f"/api/v1/studies/{study_id}/agents", compute),
+    ]
+
+    print("\nAPI:")
+    reset_peak_rss()
+    try:
+        endpoints_result = asyncio.run(time_endpoints(api_main.app, endpoints))
+    finally:
+        store.remove_listener(rebuild_site_index)
+    return {"endpoints": endpoints_result, "peak_rss_mb": peak_rss_mb()}
+
+
+# ========================================
+# BASELINE COMPARISON
+# ========================================
+
+def flatten_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """Metrics compared against the baseline (lower is better for all of them)."""
+    metrics = {}
+    for name, stage in results["stages"].items():
+        if name == "api":
+            for label, endpoint in stage["endpoints"].items():
+                metrics[f"api.{label}.p50_ms"] = endpoint["p50_ms"]
+                metrics[f"api.{label}.p95_ms"] = endpoint["p95_ms"]
+            key = "api.peak_rss_mb"
+            value = stage["peak_rss_mb"]
+        else:
+            metrics[f"{name}.median_seconds"] = stage["median_seconds"]
+            key = f"{name}.peak_rss_mb"
+            value = stage["peak_rss_mb"]
+        if value is not None:
+            metrics[key] = value
+    return metrics
+
+
+def _unit(metric: str) -> str:
+    if metric.endswith("_seconds"):
+        return "seconds"
+    return "ms" if metric.endswith("_ms") else "mb"
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """
+    Compare flattened metrics of two runs.
+
+    A metric regresses when it is more than ``tolerance`` (a fraction)
+    above the baseline and the absolute difference exceeds MIN_DELTA.
+    """
+    if baseline.get("scale") != results["scale"]:
+        return {"comparable": False, "reason": "baseline was recorded at a different scale", "regressions": []}
+
+    current, reference = flatten_metrics(results), flatten_metrics(baseline)
+    rows, regressions = [], []
+    for metric in sorted(current.keys() & reference.keys()):
+        value, base = current[metric], reference[metric]
+        ratio = value / base if base else None
+        regressed = (
+            ratio is not None
+            and ratio > 1 + tolerance
+            and value - base > MIN_DELTA[_unit(metric)]
+        )
+        rows.append({"metric": metric, "baseline": base, "current": value, "ratio": round(ratio, 3) if ratio else None, "regressed": regressed})
+        if regressed:
+            regressions.append(metric)
+    return {
+        "comparable": True,
+        "baseline_created_at": baseline.get("created_at"),
+        "tolerance": tolerance,
+        "metrics": rows,
+        "regressions": regressions,
+    }
+
+
+# ========================================
+# MAIN
+# ========================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark C-TRUST stages on synthetic data of configurable scale")
+    parser.add_argument("--studies", type=int, default=8, help="Number of studies")
+    parser.add_argument("--sites", type=int, default=10, help="Sites per study")
+    parser.add_argument("--subjects-per-site", type=int, default=20, help="Subjects per site")
+    parser.add_argument("--rows-per-workbook", type=int, default=1000, help="Rows in each SAE, coding and EDRR workbook")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data generation")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage")
+    parser.add_argument("--workers", type=int, default=None, help="Ingestion workers")
+    parser.add_argument("--execution-mode", default="thread", help="Ingestion execution mode (thread or process)")
+    parser.add_argument("--api-requests", type=int, default=50, help="Requests per cached API endpoint")
+    parser.add_argument("--compute-requests", type=int, default=3, help="Requests per API endpoint that recomputes a study")
+    parser.add_argument("--skip-api", action="store_true", help="Do not benchmark the API")
+    parser.add_argument("--data-dir", help="Generate data here and keep it (default: a temporary directory)")
+    parser.add_argument("--output", default="scaling_benchmark.json", help="Results JSON path")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args()
+
+    scale = {
+        "studies": args.studies,
+        "sites": args.sites,
+        "subjects_per_site": args.subjects_per_site,
+        "rows_per_workbook": args.rows_per_workbook,
+        "seed": args.seed,
+        "execution_mode": args.execution_mode,
+        "workers": args.workers,
+    }
+
+    print(f"\n{'='*80}")
+    print("C-TRUST SCALING BENCHMARK")
+    print(f"{'='*80}")
+    print(f"Scale: {args.studies} studies x {args.sites} sites x {args.subjects_per_site} subjects, "
+          f"{args.rows_per_workbook} rows per listing workbook")
+
+    data_root = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="ctrust_bench_"))
+    try:
+        data_root.mkdir(parents=True, exist_ok=True)
+        generation = generate_dataset(data_root, args)
+        print(f"Generated {generation['files']} workbooks ({generation['bytes'] / 1e6:.1f} MB) "
+              f"in {generation['seconds']:.1f}s under {data_root}")
+
+        os.environ["DATA_ROOT_PATH"] = str(data_root)
+        run = run_benchmark(args)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": scale,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "generation": generation,
+        **run,
+    }
+
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path) as f:
+            results["comparison"] = compare_to_baseline(results, json.load(f), args.tolerance)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"\nResults written to {args.output}")
+
+    coverage = results["coverage"]
+    if not coverage["features_extracted"] or not coverage["agents_active"]:
+        print(f"\nInvalid run: {coverage['features_extracted']} features extracted, "
+              f"{coverage['agents_active']} agents did not abstain")
+        return 1
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    comparison = results.get("comparison")
+    print(f"\n{'-'*80}")
+    if comparison is None:
+        print(f"No baseline at {baseline_path} (record one with --save-baseline)")
+        return 0
+    if not comparison["comparable"]:
+        print(f"Baseline not compared: {comparison['reason']}")
+        return 0
+    for row in comparison["metrics"]:
+        marker = "REGRESSION" if row["regressed"] else ""
+        print(f"  {row['metric']:<32} baseline={row['baseline']:<10} current={row['current']:<10} "
+              f"x{row['ratio']} {marker}")
+    print(f"{'='*80}")
+    if comparison["regressions"]:
+        print(f"{len(comparison['regressions'])} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,12 +21,16 @@ Key Features:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -232,6 +236,60 @@ class CodingReadinessAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        abstained = self._should_abstain_batch(matrix, self.REQUIRED_FEATURES)
+        
+        coding_completion = matrix.get("coding_completion_rate", 0.0)
+        backlog_days = matrix.get("coding_backlog_days", 0.0)
+        uncoded_sae = matrix.get("uncoded_sae_count", 0)
+        coding_velocity = matrix.get("coding_velocity")
+        pending_queries = matrix.get("pending_queries_coding", 0)
+        
+        severities = {
+            "coding_completion_rate": self._batch_evidence(
+                coding_completion < 100,
+                self._batch_deficit_severity(
+                    coding_completion, self.THRESHOLDS["coding_completion_rate"]["medium"]
+                )
+            ),
+            "coding_backlog_days": self._batch_evidence(
+                backlog_days > 0,
+                self._batch_severity(
+                    backlog_days,
+                    self.THRESHOLDS["coding_backlog_days"]["medium"],
+                    max_value=60.0
+                )
+            ),
+            "uncoded_sae_count": self._batch_evidence(uncoded_sae > 0, 1.0),
+            "coding_velocity": self._batch_evidence(coding_velocity < 1.0, 1.0 - coding_velocity),
+            "pending_queries_coding": self._batch_evidence(
+                pending_queries > 0, np.minimum(pending_queries / 50.0, 1.0)
+            ),
+        }
+        
+        # Any uncoded SAE is CRITICAL regardless of the other metrics
+        risk_scores = np.where(
+            uncoded_sae > 0,
+            4,
+            np.maximum(
+                self._batch_risk_scores(
+                    coding_completion, self.THRESHOLDS["coding_completion_rate"], inverted=True
+                ),
+                self._batch_risk_scores(backlog_days, self.THRESHOLDS["coding_backlog_days"]),
+            ),
+        )
+        
+        base_confidence = matrix.count(self.REQUIRED_FEATURES) / len(self.REQUIRED_FEATURES)
+        optional_bonus = (matrix.count(self.OPTIONAL_FEATURES) / len(self.OPTIONAL_FEATURES)) * 0.2
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.minimum(base_confidence + optional_bonus, 1.0),
+            abstained=abstained,
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
@@ -20,12 +20,16 @@ Key Features:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -223,6 +227,76 @@ class DataCompletenessAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        abstained = self._should_abstain_batch(matrix, self.REQUIRED_FEATURES)
+        
+        missing_pct = matrix.get("missing_pages_pct", 0.0)
+        form_completion = matrix.get("form_completion_rate", 100.0)
+        visit_completion = matrix.get("visit_completion_rate")
+        data_entry_lag = matrix.get("data_entry_lag_days")
+        
+        severities = {
+            "missing_pages_pct": self._batch_evidence(
+                missing_pct > 0,
+                self._batch_severity(
+                    missing_pct,
+                    self.THRESHOLDS["missing_pages_pct"]["medium"],
+                    max_value=100.0
+                )
+            ),
+            "form_completion_rate": self._batch_evidence(
+                form_completion < 100,
+                self._batch_deficit_severity(
+                    form_completion, self.THRESHOLDS["form_completion_rate"]["medium"]
+                )
+            ),
+            "visit_completion_rate": self._batch_evidence(
+                visit_completion < 100,
+                self._batch_deficit_severity(
+                    visit_completion, self.THRESHOLDS["visit_completion_rate"]["medium"]
+                )
+            ),
+            "data_entry_lag_days": self._batch_evidence(
+                data_entry_lag > 0,
+                self._batch_severity(
+                    data_entry_lag,
+                    self.THRESHOLDS["data_entry_lag_days"]["medium"],
+                    max_value=30.0
+                )
+            ),
+        }
+        
+        # Optional metrics only score when present
+        risk_scores = np.maximum.reduce([
+            self._batch_risk_scores(missing_pct, self.THRESHOLDS["missing_pages_pct"]),
+            self._batch_risk_scores(
+                form_completion, self.THRESHOLDS["form_completion_rate"], inverted=True
+            ),
+            np.where(
+                matrix.has("visit_completion_rate"),
+                self._batch_risk_scores(
+                    visit_completion, self.THRESHOLDS["visit_completion_rate"], inverted=True
+                ),
+                0,
+            ),
+            np.where(
+                matrix.has("data_entry_lag_days"),
+                self._batch_risk_scores(data_entry_lag, self.THRESHOLDS["data_entry_lag_days"]),
+                0,
+            ),
+        ])
+        
+        base_confidence = matrix.count(self.REQUIRED_FEATURES) / len(self.REQUIRED_FEATURES)
+        optional_bonus = (matrix.count(self.OPTIONAL_FEATURES) / len(self.OPTIONAL_FEATURES)) * 0.2
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.minimum(base_confidence + optional_bonus, 1.0),
+            abstained=abstained,
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
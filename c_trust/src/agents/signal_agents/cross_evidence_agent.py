@@ -21,12 +21,16 @@ Key Features:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -237,6 +241,64 @@ class CrossEvidenceAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        abstained = self._should_abstain_batch(matrix, self.REQUIRED_FEATURES)
+        
+        consistency_score = matrix.get("edc_sae_consistency_score", 100.0)
+        visit_deviation = matrix.get("visit_projection_deviation", 0.0)
+        integrity_issues = matrix.get("data_integrity_issues_count", 0)
+        mismatch_rate = matrix.get("cross_source_mismatch_rate", 0.0)
+        duplicate_count = matrix.get("duplicate_records_count", 0)
+        
+        severities = {
+            "edc_sae_consistency_score": self._batch_evidence(
+                consistency_score < 100,
+                np.where(consistency_score >= 90, 0.0, (90 - consistency_score) / 90)
+            ),
+            "visit_projection_deviation": self._batch_evidence(
+                visit_deviation > 0,
+                self._batch_severity(
+                    visit_deviation,
+                    self.THRESHOLDS["visit_projection_deviation"]["medium"],
+                    max_value=50.0
+                )
+            ),
+            "data_integrity_issues_count": self._batch_evidence(
+                integrity_issues > 0, np.minimum(integrity_issues / 15, 1.0)
+            ),
+            "cross_source_mismatch_rate": self._batch_evidence(
+                mismatch_rate > 0,
+                self._batch_severity(
+                    mismatch_rate,
+                    self.THRESHOLDS["cross_source_mismatch_rate"]["medium"],
+                    max_value=25.0
+                )
+            ),
+            "duplicate_records_count": self._batch_evidence(
+                duplicate_count > 0, np.minimum(duplicate_count / 20, 1.0)
+            ),
+        }
+        
+        risk_scores = np.maximum.reduce([
+            self._batch_risk_scores(
+                consistency_score, self.THRESHOLDS["edc_sae_consistency_score"], inverted=True
+            ),
+            self._batch_risk_scores(visit_deviation, self.THRESHOLDS["visit_projection_deviation"]),
+            self._batch_risk_scores(integrity_issues, self.THRESHOLDS["data_integrity_issues_count"]),
+            self._batch_risk_scores(mismatch_rate, self.THRESHOLDS["cross_source_mismatch_rate"]),
+        ])
+        
+        base_confidence = matrix.count(self.REQUIRED_FEATURES) / len(self.REQUIRED_FEATURES)
+        optional_bonus = (matrix.count(self.OPTIONAL_FEATURES) / len(self.OPTIONAL_FEATURES)) * 0.2
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.minimum(base_confidence + optional_bonus, 1.0),
+            abstained=abstained,
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """Calculate confidence based on data availability."""
         required_available = sum(
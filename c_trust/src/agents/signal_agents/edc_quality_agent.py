@@ -21,12 +21,16 @@ Key Features:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -234,6 +238,69 @@ class EDCQualityAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        abstained = self._should_abstain_batch(matrix, self.REQUIRED_FEATURES)
+        
+        form_completion = matrix.get("form_completion_rate")
+        data_errors = matrix.get("data_entry_errors", 0)
+        missing_fields = matrix.get("missing_required_fields", 0)
+        system_uptime = matrix.get("edc_system_uptime")
+        validation_failures = matrix.get("data_validation_failures", 0)
+        
+        severities = {
+            "form_completion_rate": self._batch_evidence(
+                form_completion < 100,
+                self._batch_deficit_severity(
+                    form_completion, self.THRESHOLDS["form_completion_rate"]["medium"]
+                )
+            ),
+            "data_entry_errors": self._batch_evidence(
+                data_errors > 0,
+                self._batch_severity(
+                    data_errors,
+                    self.THRESHOLDS["data_entry_errors"]["medium"],
+                    max_value=50.0
+                )
+            ),
+            "missing_required_fields": self._batch_evidence(
+                missing_fields > 0,
+                self._batch_severity(
+                    missing_fields,
+                    self.THRESHOLDS["missing_required_fields"]["medium"],
+                    max_value=100.0
+                )
+            ),
+            "edc_system_uptime": self._batch_evidence(
+                system_uptime < 99.0, 1.0 - (system_uptime / 100.0)
+            ),
+            "data_validation_failures": self._batch_evidence(
+                validation_failures > 0, np.minimum(validation_failures / 50.0, 1.0)
+            ),
+        }
+        
+        risk_scores = np.maximum.reduce([
+            np.where(
+                matrix.has("form_completion_rate"),
+                self._batch_risk_scores(
+                    form_completion, self.THRESHOLDS["form_completion_rate"], inverted=True
+                ),
+                0,
+            ),
+            self._batch_risk_scores(data_errors, self.THRESHOLDS["data_entry_errors"]),
+            self._batch_risk_scores(missing_fields, self.THRESHOLDS["missing_required_fields"]),
+        ])
+        
+        base_confidence = matrix.count(self.REQUIRED_FEATURES) / len(self.REQUIRED_FEATURES)
+        optional_bonus = (matrix.count(self.OPTIONAL_FEATURES) / len(self.OPTIONAL_FEATURES)) * 0.2
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.minimum(base_confidence + optional_bonus, 1.0),
+            abstained=abstained,
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
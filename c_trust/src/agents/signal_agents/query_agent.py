@@ -21,12 +21,16 @@ Key Features:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -210,6 +214,59 @@ class QueryQualityAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        open_queries = matrix.get("open_query_count", 0)
+        query_aging = matrix.get("query_aging_days", 0.0)
+        data_entry_lag = matrix.get("data_entry_lag_days")
+        
+        severities = {
+            "open_query_count": self._batch_evidence(
+                open_queries > 0,
+                self._batch_severity(
+                    open_queries,
+                    self.THRESHOLDS["open_query_count"]["medium"],
+                    max_value=300
+                )
+            ),
+            "query_aging_days": self._batch_evidence(
+                query_aging > 0,
+                self._batch_severity(
+                    query_aging,
+                    self.THRESHOLDS["query_aging_days"]["medium"],
+                    max_value=60.0
+                )
+            ),
+            "data_entry_lag_days": self._batch_evidence(
+                data_entry_lag > 3, np.minimum(data_entry_lag / 14.0, 1.0)
+            ),
+        }
+        
+        risk_scores = np.maximum(
+            self._batch_risk_scores(open_queries, self.THRESHOLDS["open_query_count"]),
+            self._batch_risk_scores(query_aging, self.THRESHOLDS["query_aging_days"]),
+        )
+        
+        # Same availability rules as _calculate_confidence
+        open_query_available = matrix.has("open_query_count")
+        query_aging_available = matrix.has("query_aging_days")
+        available_count = matrix.count(
+            ["open_query_count", "query_aging_days", "data_entry_lag_days"]
+        )
+        base_confidence = available_count / 3
+        confidence = np.where(
+            open_query_available & query_aging_available,
+            np.minimum(base_confidence + 0.2, 1.0),
+            base_confidence,
+        )
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.where(available_count == 0, 0.0, confidence),
+            abstained=np.zeros(len(matrix), dtype=bool),
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
@@ -24,12 +24,16 @@ due to the critical nature of safety monitoring in clinical trials.
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -221,6 +225,49 @@ class SafetyComplianceAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        fatal_count = matrix.get("fatal_sae_count", 0)
+        sae_backlog = matrix.get("sae_backlog_days", 0.0)
+        overdue_count = matrix.get("sae_overdue_count", 0)
+        
+        severities = {
+            "fatal_sae_count": self._batch_evidence(fatal_count > 0, 1.0),
+            "sae_overdue_count": self._batch_evidence(
+                overdue_count > 0, np.minimum(overdue_count / 5, 1.0)
+            ),
+            "sae_backlog_days": self._batch_evidence(
+                sae_backlog > 0,
+                self._batch_severity(
+                    sae_backlog,
+                    self.THRESHOLDS["sae_backlog_days"]["medium"],
+                    max_value=30.0
+                )
+            ),
+        }
+        
+        # Any fatal or overdue SAE escalates straight to CRITICAL
+        risk_scores = np.where(
+            (fatal_count > 0) | (overdue_count > 0),
+            4,
+            self._batch_risk_scores(sae_backlog, self.THRESHOLDS["sae_backlog_days"]),
+        )
+        
+        available_count = matrix.count(["fatal_sae_count", "sae_backlog_days", "sae_overdue_count"])
+        base_confidence = available_count / 3
+        confidence = np.where(
+            matrix.has("fatal_sae_count"),
+            np.minimum(base_confidence + 0.2, 1.0),
+            base_confidence,
+        )
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.where(available_count == 0, 0.0, confidence),
+            abstained=np.zeros(len(matrix), dtype=bool),
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
@@ -26,12 +26,16 @@ IMPORTANT: This agent uses INVERTED risk logic:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -258,6 +262,96 @@ class StabilityAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        abstained = self._should_abstain_batch(matrix, self.REQUIRED_FEATURES)
+        
+        enrollment_velocity = matrix.get("enrollment_velocity", 0.0)
+        site_activation = matrix.get("site_activation_rate", 0.0)
+        dropout_rate = matrix.get("dropout_rate", 0.0)
+        enrollment_trend = matrix.get("enrollment_trend")
+        site_variance = matrix.get("site_performance_variance")
+        retention_rate = matrix.get("patient_retention_rate")
+        
+        severities = {
+            "enrollment_velocity": self._batch_evidence(
+                enrollment_velocity < 100,
+                self._batch_deficit_severity(
+                    enrollment_velocity, self.THRESHOLDS["enrollment_velocity"]["low"]
+                )
+            ),
+            "site_activation_rate": self._batch_evidence(
+                site_activation < 100,
+                self._batch_deficit_severity(
+                    site_activation, self.THRESHOLDS["site_activation_rate"]["low"]
+                )
+            ),
+            "dropout_rate": self._batch_evidence(
+                dropout_rate > 0,
+                self._batch_severity(
+                    dropout_rate,
+                    self.THRESHOLDS["dropout_rate"]["low"],
+                    max_value=50.0
+                )
+            ),
+            # Declining trend is scored, improving trend is recorded at 0
+            "enrollment_trend": np.select(
+                [enrollment_trend < 0, enrollment_trend > 0],
+                [np.minimum(np.abs(enrollment_trend) / 10.0, 1.0), 0.0],
+                np.nan,
+            ),
+            "site_performance_variance": self._batch_evidence(
+                site_variance > 20.0, np.minimum(site_variance / 50.0, 1.0)
+            ),
+            "patient_retention_rate": self._batch_evidence(
+                retention_rate < 90.0, self._batch_deficit_severity(retention_rate, 90.0)
+            ),
+        }
+        
+        # INVERTED: higher velocity/activation = lower risk
+        velocity_thresholds = self.THRESHOLDS["enrollment_velocity"]
+        activation_thresholds = self.THRESHOLDS["site_activation_rate"]
+        dropout_thresholds = self.THRESHOLDS["dropout_rate"]
+        risk_scores = np.maximum.reduce([
+            np.select(
+                [
+                    enrollment_velocity >= velocity_thresholds["low"],
+                    enrollment_velocity >= velocity_thresholds["medium"],
+                    enrollment_velocity >= velocity_thresholds["high"],
+                ],
+                [1, 2, 3],
+                4,
+            ),
+            np.select(
+                [
+                    site_activation >= activation_thresholds["low"],
+                    site_activation >= activation_thresholds["medium"],
+                    site_activation >= activation_thresholds["high"],
+                ],
+                [1, 2, 3],
+                4,
+            ),
+            np.select(
+                [
+                    dropout_rate <= dropout_thresholds["low"],
+                    dropout_rate <= dropout_thresholds["medium"],
+                    dropout_rate <= dropout_thresholds["high"],
+                ],
+                [1, 2, 3],
+                4,
+            ),
+        ])
+        
+        base_confidence = matrix.count(self.REQUIRED_FEATURES) / len(self.REQUIRED_FEATURES)
+        optional_bonus = (matrix.count(self.OPTIONAL_FEATURES) / len(self.OPTIONAL_FEATURES)) * 0.2
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.minimum(base_confidence + optional_bonus, 1.0),
+            abstained=abstained,
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
@@ -21,12 +21,16 @@ Key Features:
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.intelligence.base_agent import (
     BaseAgent,
     AgentType,
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
 )
 from src.core import get_logger
 
@@ -254,6 +258,82 @@ class TemporalDriftAgent(BaseAgent):
                                    if f in features and features[f] is not None])
         )
     
+    def _assess_batch(self, matrix: FeatureMatrix) -> BatchAssessment:
+        """Vectorized analyze() over a feature matrix (see BaseAgent.analyze_batch)."""
+        avg_lag = matrix.get("avg_data_entry_lag_days", 0.0)
+        overdue_visits = matrix.get("overdue_visits_count", 0)
+        lag_trend = matrix.get("lag_trend")
+        max_lag = matrix.get("max_data_entry_lag_days")
+        visit_completion = matrix.get("visit_completion_rate")
+        
+        max_lag_thresholds = self.THRESHOLDS["max_data_entry_lag_days"]
+        severities = {
+            "avg_data_entry_lag_days": self._batch_evidence(
+                avg_lag > 0,
+                self._batch_severity(
+                    avg_lag,
+                    self.THRESHOLDS["avg_data_entry_lag_days"]["medium"],
+                    max_value=60.0
+                )
+            ),
+            "overdue_visits_count": self._batch_evidence(
+                overdue_visits > 0,
+                self._batch_severity(
+                    overdue_visits,
+                    self.THRESHOLDS["overdue_visits_count"]["medium"],
+                    max_value=50.0
+                )
+            ),
+            # Increasing lag is scored, significant improvement is recorded at 0
+            "lag_trend": np.select(
+                [lag_trend > 0, lag_trend < -1.0],
+                [np.minimum(np.abs(lag_trend) / 10.0, 1.0), 0.0],
+                np.nan,
+            ),
+            "max_data_entry_lag_days": self._batch_evidence(
+                max_lag > max_lag_thresholds["medium"],
+                self._batch_severity(max_lag, max_lag_thresholds["medium"], max_value=90.0)
+            ),
+            "visit_completion_rate": self._batch_evidence(
+                visit_completion < 100,
+                self._batch_deficit_severity(visit_completion, 90.0)
+            ),
+        }
+        
+        # Trend and max lag only add a score when they exceed a threshold
+        risk_scores = np.maximum.reduce([
+            self._batch_risk_scores(avg_lag, self.THRESHOLDS["avg_data_entry_lag_days"]),
+            self._batch_risk_scores(overdue_visits, self.THRESHOLDS["overdue_visits_count"]),
+            np.select([lag_trend > 5.0, lag_trend > 2.0, lag_trend > 0.5], [4, 3, 2], 0),
+            np.select(
+                [
+                    max_lag >= max_lag_thresholds["critical"],
+                    max_lag >= max_lag_thresholds["high"],
+                    max_lag >= max_lag_thresholds["medium"],
+                ],
+                [4, 3, 2],
+                0,
+            ),
+        ])
+        
+        available_count = matrix.count([
+            "avg_data_entry_lag_days", "overdue_visits_count", "lag_trend",
+            "max_data_entry_lag_days", "visit_completion_rate",
+        ])
+        base_confidence = available_count / 5
+        confidence = np.where(
+            matrix.has("avg_data_entry_lag_days") & matrix.has("overdue_visits_count"),
+            np.minimum(base_confidence + 0.2, 1.0),
+            base_confidence,
+        )
+        
+        return BatchAssessment(
+            risk_scores=risk_scores,
+            confidence=np.where(available_count == 0, 0.0, confidence),
+            abstained=np.zeros(len(matrix), dtype=bool),
+            severities=severities,
+        )
+    
     def _calculate_confidence(self, features: Dict[str, Any]) -> float:
         """
         Calculate confidence based on data availability and quality.
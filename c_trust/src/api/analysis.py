@@ -4,25 +4,39 @@ Analysis API Endpoints
 Full analysis pipeline API with cache integration.
 
 Endpoints:
-- POST /api/v1/analysis/{study_id} - Run full analysis
+- POST /api/v1/analysis/{study_id} - Queue full analysis (202 + job)
 - GET /api/v1/analysis/{study_id} - Get cached analysis
+- GET /api/v1/analysis/jobs/{job_id} - Get job status
+- GET /api/v1/analysis/jobs/{job_id}/result - Get job result
 - POST /api/v1/analysis/refresh - Trigger full refresh
 - GET /api/v1/analysis/status - Get system status
+
+Analyses run on the bounded job executor (src/core/jobs.py), never on
+the event loop. Job completion is also pushed over /api/v1/ws.
 """
 
+import asyncio
 from datetime import datetime
+from functools import partial
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from src.core import get_logger
 from src.core.cache import get_cache
+from src.core.jobs import Job, JobQueueFullError, JobStatus, get_job_manager
 from src.intelligence.agent_pipeline import get_pipeline, PipelineResult
-from src.data import DataIngestionEngine, FeatureEngineeringEngine, StudyDiscovery
+from src.data import DataIngestionEngine, get_study_catalog
+from src.data.features_real_extraction import RealFeatureExtractor
 
 logger = get_logger(__name__)
 
+# Shared ingestion engine (reuses the parsed-workbook cache across requests)
+_ingestion_engine: Optional[DataIngestionEngine] = None
+
 # Create router
 router = APIRouter(prefix="/analysis", tags=["Analysis"])
 
@@ -74,6 +88,19 @@ class AnalysisResponse(BaseModel):
     agents_abstained: int
 
 
+class AnalysisJobResponse(BaseModel):
+    """Background analysis job response"""
+    job_id: str
+    study_id: str
+    status: str
+    submitted_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    status_url: str
+    result_url: str
+
+
 class RefreshResponse(BaseModel):
     """Refresh trigger response"""
     status: str
@@ -86,6 +113,7 @@ class SystemStatusResponse(BaseModel):
     status: str
     pipeline: Dict[str, Any]
     cache: Dict[str, Any]
+    jobs: Optional[Dict[str, Any]] = None
     scheduler: Optional[Dict[str, Any]] = None
     timestamp: datetime = Field(default_factory=datetime.now)
 
@@ -94,29 +122,127 @@ class SystemStatusResponse(BaseModel):
 # HELPER FUNCTIONS
 # ========================================
 
-def _run_analysis_for_study(study_id: str) -> PipelineResult:
-    """Run full analysis pipeline for a study."""
-    pipeline = get_pipeline()
-    
-    # Get features for study
+def _get_ingestion_engine() -> DataIngestionEngine:
+    """Get or create the shared ingestion engine."""
+    global _ingestion_engine
+    if _ingestion_engine is None:
+        _ingestion_engine = DataIngestionEngine()
+    return _ingestion_engine
+
+
+def _prepare_features(study_id: str) -> Dict[str, Any]:
+    """Ingest a study and extract its features (minimal features on failure)."""
     try:
-        ingestion = DataIngestionEngine()
-        feature_engine = FeatureEngineeringEngine()
+        ingestion = _get_ingestion_engine()
+        study = get_study_catalog().get_study(study_id)
+        if study is None:
+            raise ValueError(f"Study not found: {study_id}")
         
-        # Ingest data
-        ingestion.ingest_study(study_id)
-        tables = ingestion.get_study_data(study_id)
+        # Ingest data (unchanged workbooks are served from the workbook cache)
+        raw_data = ingestion.ingest_study(study)
         
-        # Engineer features
-        features = feature_engine.engineer_features(tables)
+        # Extract features
+        return RealFeatureExtractor().extract_features(raw_data, study_id)
         
     except Exception as e:
         logger.error(f"Data preparation failed: {e}")
         # Use minimal features
-        features = {"study_id": study_id}
+        return {"study_id": study_id}
+
+
+def _run_analysis_for_study(study_id: str) -> PipelineResult:
+    """Run full analysis pipeline for a study."""
+    return get_pipeline().run_full_analysis(study_id, _prepare_features(study_id))
+
+
+def _compute_analysis_payload(study_id: str) -> Dict[str, Any]:
+    """
+    Run the pipeline for a study and return the JSON-safe response payload.
     
-    # Run pipeline
-    return pipeline.run_full_analysis(study_id, features)
+    Module-level so it can run in a process-pool job worker.
+    """
+    result = _run_analysis_for_study(study_id)
+    return jsonable_encoder(_convert_result_to_response(result))
+
+
+def _cache_analysis_payload(study_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Store an analysis payload (JSON-safe: the cache persists to disk)."""
+    get_cache().set(f"analysis_{study_id}", payload, ttl=1800)  # 30 min TTL
+    return payload
+
+
+def refresh_study_analysis(study_id: str) -> "AnalysisResponse":
+    """
+    Recompute analysis for one study and replace its cache entry.
+    
+    Used by analysis jobs and by the scheduler's incremental refresh, so
+    both write the same cached payload.
+    """
+    payload = _cache_analysis_payload(study_id, _compute_analysis_payload(study_id))
+    return AnalysisResponse(**payload)
+
+
+def refresh_studies_analysis(study_ids: List[str]) -> List[str]:
+    """
+    Recompute analysis for several studies in one agent-pool batch.
+    
+    Agents for all studies share the pipeline's pool; each study's cache
+    entry is replaced as soon as its result streams back.
+    
+    Returns:
+        Study IDs in the order they completed
+    """
+    features = {study_id: _prepare_features(study_id) for study_id in study_ids}
+    
+    refreshed = []
+    for result in get_pipeline().run_batch(features):
+        _cache_analysis_payload(result.study_id, jsonable_encoder(_convert_result_to_response(result)))
+        refreshed.append(result.study_id)
+    
+    return refreshed
+
+
+def submit_analysis_job(study_id: str) -> Job:
+    """
+    Queue an analysis for a study on the job executor.
+    
+    Returns the already active job if one is queued or running for the
+    study. The result is cached when the job completes.
+    
+    Raises:
+        JobQueueFullError: If the job queue is full
+    """
+    return get_job_manager().submit(
+        "analysis",
+        study_id,
+        _compute_analysis_payload,
+        study_id,
+        on_success=partial(_cache_analysis_payload, study_id),
+    )
+
+
+def _job_to_response(job: Job) -> AnalysisJobResponse:
+    """Convert Job to API response."""
+    job_dict = job.to_dict()
+    return AnalysisJobResponse(
+        job_id=job.job_id,
+        study_id=job.key,
+        status=job_dict["status"],
+        submitted_at=job.submitted_at,
+        finished_at=job.finished_at,
+        duration_ms=job_dict["duration_ms"],
+        error=job.error,
+        status_url=f"/api/v1/analysis/jobs/{job.job_id}",
+        result_url=f"/api/v1/analysis/jobs/{job.job_id}/result",
+    )
+
+
+def _queue_full_error(e: JobQueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Analysis queue is full: {e}",
+        headers={"Retry-After": "30"},
+    )
 
 
 def _convert_result_to_response(
@@ -184,12 +310,88 @@ def _convert_result_to_response(
 # ENDPOINTS
 # ========================================
 
+@router.post("/refresh", response_model=RefreshResponse)
+async def trigger_refresh():
+    """
+    Trigger background refresh for all studies.
+    
+    This invalidates cache and queues a batch analysis job for all studies.
+    """
+    try:
+        # Full discovery walks the data root - keep it off the event loop
+        studies = list(await asyncio.to_thread(get_study_catalog().refresh))
+        
+        cache = get_cache()
+        
+        # Invalidate all study caches
+        for study_id in studies:
+            cache.invalidate(f"analysis_{study_id}")
+        
+        # Queue one batch job: all studies share the agent pool
+        get_job_manager().submit("analysis_batch", "all", refresh_studies_analysis, studies)
+        
+        return RefreshResponse(
+            status="queued",
+            message=f"Refresh queued for {len(studies)} studies",
+            studies_queued=len(studies),
+        )
+        
+    except Exception as e:
+        logger.error(f"Refresh failed: {e}")
+        return RefreshResponse(
+            status="error",
+            message=str(e),
+            studies_queued=0,
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(job_id: str):
+    """
+    Get the status of an analysis job.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.kind != "analysis":
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    return _job_to_response(job)
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=AnalysisResponse,
+    responses={202: {"model": AnalysisJobResponse}},
+)
+async def get_analysis_job_result(job_id: str):
+    """
+    Get the result of an analysis job.
+    
+    Returns 202 with the job status while the job is queued or running.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.kind != "analysis":
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {job.error}")
+    
+    if not job.done:
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(_job_to_response(job)),
+        )
+    
+    return AnalysisResponse(**job.result)
+
+
 @router.get("/{study_id}", response_model=AnalysisResponse)
 async def get_analysis(study_id: str):
     """
     Get analysis for a study (cache-first).
     
-    Returns cached analysis if available, otherwise runs full analysis.
+    Returns cached analysis if available. On a miss the analysis runs as a
+    job (shared with any job already running for the study) and is awaited
+    without blocking the event loop.
     """
     cache = get_cache()
     cache_key = f"analysis_{study_id}"
@@ -218,86 +420,54 @@ async def get_analysis(study_id: str):
             agents_abstained=cached_data.get("agents_abstained", 0),
         )
     
-    # Cache miss - run full analysis
+    # Cache miss - run full analysis as a job
     logger.info(f"Cache miss for {study_id}, running analysis...")
     
     try:
-        result = _run_analysis_for_study(study_id)
-        response = _convert_result_to_response(result)
-        
-        # Cache the result
-        cache.set(cache_key, response.dict(), ttl=1800)  # 30 min TTL
-        
-        return response
+        job = submit_analysis_job(study_id)
+    except JobQueueFullError as e:
+        raise _queue_full_error(e)
+    
+    try:
+        payload = await asyncio.wrap_future(job.completion)
+        return AnalysisResponse(**payload)
         
     except Exception as e:
         logger.error(f"Analysis failed for {study_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/{study_id}", response_model=AnalysisResponse)
-async def run_analysis(study_id: str, force_refresh: bool = False):
+@router.post(
+    "/{study_id}",
+    response_model=AnalysisJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def run_analysis(study_id: str, response: Response, force_refresh: bool = False):
     """
-    Run analysis for a study.
+    Queue analysis for a study.
+    
+    Returns 202 with a job ID immediately. Poll the job's status_url /
+    result_url, or listen for an "analysis_job" message on /api/v1/ws.
     
     Args:
         study_id: Study identifier
-        force_refresh: Force recompute even if cached
+        force_refresh: Drop the cached analysis now instead of when the job completes
     """
-    cache = get_cache()
-    cache_key = f"analysis_{study_id}"
+    # The first lookup builds the catalog (full discovery) - keep it off the event loop
+    if await asyncio.to_thread(get_study_catalog().get_study, study_id) is None:
+        raise HTTPException(status_code=404, detail=f"Study not found: {study_id}")
     
     if force_refresh:
-        cache.invalidate(cache_key)
+        get_cache().invalidate(f"analysis_{study_id}")
     
     try:
-        result = _run_analysis_for_study(study_id)
-        response = _convert_result_to_response(result)
-        
-        # Cache the result
-        cache.set(cache_key, response.dict(), ttl=1800)
-        
-        return response
-        
-    except Exception as e:
-        logger.error(f"Analysis failed for {study_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.post("/refresh", response_model=RefreshResponse)
-async def trigger_refresh(background_tasks: BackgroundTasks):
-    """
-    Trigger background refresh for all studies.
+        job = submit_analysis_job(study_id)
+    except JobQueueFullError as e:
+        raise _queue_full_error(e)
     
-    This invalidates cache and queues analysis for all studies.
-    """
-    try:
-        discovery = StudyDiscovery()
-        studies = discovery.discover_studies()
-        
-        cache = get_cache()
-        
-        # Invalidate all study caches
-        for study_id in studies:
-            cache.invalidate(f"analysis_{study_id}")
-        
-        # Queue background refresh
-        for study_id in studies:
-            background_tasks.add_task(_run_analysis_for_study, study_id)
-        
-        return RefreshResponse(
-            status="queued",
-            message=f"Refresh queued for {len(studies)} studies",
-            studies_queued=len(studies),
-        )
-        
-    except Exception as e:
-        logger.error(f"Refresh failed: {e}")
-        return RefreshResponse(
-            status="error",
-            message=str(e),
-            studies_queued=0,
-        )
+    job_response = _job_to_response(job)
+    response.headers["Location"] = job_response.status_url
+    return job_response
 
 
 @router.get("/status/system", response_model=SystemStatusResponse)
@@ -321,8 +491,9 @@ async def get_system_status():
         status="healthy",
         pipeline=pipeline.get_pipeline_stats(),
         cache=cache.get_stats(),
+        jobs=get_job_manager().get_stats(),
         scheduler=scheduler_status,
     )
 
 
-__all__ = ["router"]
+__all__ = ["router", "refresh_study_analysis", "refresh_studies_analysis", "submit_analysis_job"]
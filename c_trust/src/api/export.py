@@ -1,7 +1,7 @@
 """
 Export API Endpoint
 ===================
-Provides data export functionality in CSV and Excel formats.
+Provides data export functionality in CSV, Excel, Parquet and Arrow formats.
 
 Phase 4, Task 16: Implement Export API Endpoint
 
@@ -10,23 +10,38 @@ Features:
 - Excel export with formatted workbook (optional)
 - Includes DQI scores, agent signals, dimension scores
 - Automatic file cleanup (delete old exports)
+- Streaming exports (CSV, Parquet, Arrow IPC) at study, site or patient
+  granularity, generated row by row from the study result store
 - Error handling and logging
 """
 
 import csv
-import json
+import io
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 import pandas as pd
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.core import get_logger
+from src.core.settings import settings
+from src.api.study_store import get_study_store
 
 logger = get_logger(__name__)
 
+# Optional columnar formats
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow not installed. Parquet and Arrow exports are unavailable.")
+
 # Create router
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -68,7 +83,7 @@ class ExportResponse(BaseModel):
 
 def get_export_data(study_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
-    Get study data for export from data cache.
+    Get study data for export from the study result store.
     
     Args:
         study_ids: Optional list of study IDs to filter
@@ -76,22 +91,12 @@ def get_export_data(study_ids: Optional[List[str]] = None) -> List[Dict[str, Any
     Returns:
         List of study data dictionaries
     """
-    import json
-    from pathlib import Path
-    
     logger.info(f"Retrieving export data for studies: {study_ids or 'all'}")
     
-    # Load data from cache
-    cache_file = Path("c_trust/data_cache.json")
-    if not cache_file.exists():
-        logger.warning("Data cache not found, returning empty export data")
-        return []
-    
-    try:
-        with open(cache_file, "r") as f:
-            cache_data = json.load(f)
-    except Exception as e:
-        logger.error(f"Failed to load data cache: {e}", exc_info=True)
+    # Published results from the shared study store
+    cache_data = get_study_store().snapshot().studies
+    if not cache_data:
+        logger.warning("No published study results, returning empty export data")
         return []
     
     # Filter by study_ids if provided
@@ -99,64 +104,77 @@ def get_export_data(study_ids: Optional[List[str]] = None) -> List[Dict[str, Any
         cache_data = {k: v for k, v in cache_data.items() if k in study_ids}
     
     # Convert cache data to export format
-    export_data = []
-    
-    for study_id, study_data in cache_data.items():
-        # Extract dimension scores
-        dimension_scores = {}
-        for dim in study_data.get("dimension_scores", []):
-            dim_name = dim.get("dimension", "unknown")
-            dimension_scores[f"dimension_{dim_name}_score"] = dim.get("raw_score", 0)
+    export_data = [_build_study_row(study_id, study_data) for study_id, study_data in cache_data.items()]
+    
+    logger.info(f"Retrieved {len(export_data)} studies for export")
+    return export_data
+
+
+def _build_study_row(study_id: str, study_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one study result into an export row."""
+    # Extract dimension scores
+    dimension_scores = {
+        f"dimension_{dim_name}_score": score
+        for dim_name, score in _dimension_scores(study_data)
+    }
+    
+    # Extract features
+    features = study_data.get("features", {})
+    
+    # Build export row
+    row = {
+        'study_id': study_id,
+        'study_name': study_id,  # Use study_id as name for now
+        'dqi_score': study_data.get("overall_score"),
+        'dqi_band': _get_dqi_band(study_data.get("overall_score")),
+        'risk_level': study_data.get("risk_level"),
         
-        # Extract features
-        features = study_data.get("features", {})
+        # Enrollment data
+        'enrollment_actual': features.get("total_subjects"),
+        'enrollment_target': features.get("target_enrollment"),
+        'enrollment_rate': features.get("enrollment_rate"),
+        'enrollment_velocity': features.get("enrollment_velocity"),
         
-        # Build export row
-        row = {
-            'study_id': study_id,
-            'study_name': study_id,  # Use study_id as name for now
-            'dqi_score': study_data.get("overall_score"),
-            'dqi_band': _get_dqi_band(study_data.get("overall_score")),
-            'risk_level': study_data.get("risk_level"),
-            
-            # Enrollment data
-            'enrollment_actual': features.get("total_subjects"),
-            'enrollment_target': features.get("target_enrollment"),
-            'enrollment_rate': features.get("enrollment_rate"),
-            'enrollment_velocity': features.get("enrollment_velocity"),
-            
-            # Temporal metrics
-            'visit_schedule_adherence': features.get("visit_completion_rate"),
-            'data_entry_lag_days': features.get("avg_data_entry_lag_days"),
-            
-            # Safety metrics
-            'sae_backlog_days': features.get("sae_backlog_days"),
-            'fatal_sae_count': features.get("fatal_sae_count"),
-            'sae_overdue_count': features.get("sae_overdue_count"),
-            
-            # Completeness metrics
-            'missing_pages_pct': features.get("missing_pages_pct"),
-            'visit_completion_rate': features.get("visit_completion_rate"),
-            'form_completion_rate': features.get("form_completion_rate"),
-            
-            # Query metrics
-            'open_query_count': features.get("open_query_count"),
-            'query_aging_days': features.get("query_aging_days"),
-            'subjects_with_queries': features.get("subjects_with_queries"),
-            
-            # Coding metrics
-            'uncoded_terms_count': features.get("uncoded_terms_count"),
-            'coding_completion_rate': features.get("coding_completion_rate"),
-            'coding_backlog_days': features.get("coding_backlog_days"),
-        }
+        # Temporal metrics
+        'visit_schedule_adherence': features.get("visit_completion_rate"),
+        'data_entry_lag_days': features.get("avg_data_entry_lag_days"),
+        
+        # Safety metrics
+        'sae_backlog_days': features.get("sae_backlog_days"),
+        'fatal_sae_count': features.get("fatal_sae_count"),
+        'sae_overdue_count': features.get("sae_overdue_count"),
+        
+        # Completeness metrics
+        'missing_pages_pct': features.get("missing_pages_pct"),
+        'visit_completion_rate': features.get("visit_completion_rate"),
+        'form_completion_rate': features.get("form_completion_rate"),
         
-        # Add dimension scores
-        row.update(dimension_scores)
+        # Query metrics
+        'open_query_count': features.get("open_query_count"),
+        'query_aging_days': features.get("query_aging_days"),
+        'subjects_with_queries': features.get("subjects_with_queries"),
         
-        export_data.append(row)
+        # Coding metrics
+        'uncoded_terms_count': features.get("uncoded_terms_count"),
+        'coding_completion_rate': features.get("coding_completion_rate"),
+        'coding_backlog_days': features.get("coding_backlog_days"),
+    }
     
-    logger.info(f"Retrieved {len(export_data)} studies for export")
-    return export_data
+    # Add dimension scores
+    row.update(dimension_scores)
+    
+    return row
+
+
+def _dimension_scores(study_data: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """(dimension, score) pairs from list ({dimension, raw_score}) or dict ({name: {score}}) results."""
+    dimension_scores = study_data.get("dimension_scores") or []
+    if isinstance(dimension_scores, dict):
+        for dim_name, dim in dimension_scores.items():
+            yield dim_name, dim.get("score", 0) if isinstance(dim, dict) else dim
+    else:
+        for dim in dimension_scores:
+            yield dim.get("dimension", "unknown"), dim.get("raw_score", 0)
 
 
 def _get_dqi_band(dqi_score: Optional[float]) -> str:
@@ -382,6 +400,326 @@ def cleanup_old_exports():
         logger.error(f"Error cleaning up old exports: {e}", exc_info=True)
 
 
+# ========================================
+# STREAMING EXPORT
+# ========================================
+
+EXPORT_GRANULARITIES = ("study", "site", "patient")
+
+STREAM_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Study columns; dimension_<name>_score columns are appended per result set
+STUDY_EXPORT_COLUMNS = list(_build_study_row("", {}))
+
+SITE_EXPORT_COLUMNS = [
+    'study_id',
+    'site_id',
+    'site_name',
+    'risk_level',
+    'dqi_score',
+    'enrollment',
+    'target_enrollment',
+    'patient_count',
+    'saes',
+    'queries',
+    'open_queries',
+    'resolved_queries',
+    'last_data_entry',
+]
+
+PATIENT_EXPORT_COLUMNS = [
+    'study_id',
+    'site_id',
+    'patient_id',
+    'site_risk_level',
+]
+
+# Column types for columnar formats (anything else is float64)
+STRING_COLUMNS = {
+    'study_id', 'study_name', 'dqi_band', 'risk_level', 'site_id', 'site_name',
+    'patient_id', 'site_risk_level', 'last_data_entry',
+}
+INTEGER_COLUMNS = {
+    'enrollment', 'target_enrollment', 'patient_count', 'saes', 'queries',
+    'open_queries', 'resolved_queries',
+}
+
+
+def _site_rows(study_id: str, study_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for site in study_data.get("sites") or []:
+        yield {
+            'study_id': study_id,
+            'site_id': site.get("site_id"),
+            'site_name': site.get("site_name"),
+            'risk_level': site.get("risk_level"),
+            'dqi_score': site.get("dqi_score"),
+            'enrollment': site.get("enrollment"),
+            'target_enrollment': site.get("target_enrollment"),
+            'patient_count': len(site.get("patients") or []),
+            'saes': site.get("saes"),
+            'queries': site.get("queries"),
+            'open_queries': site.get("open_queries"),
+            'resolved_queries': site.get("resolved_queries"),
+            'last_data_entry': site.get("last_data_entry"),
+        }
+
+
+def _patient_rows(study_id: str, study_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for site in study_data.get("sites") or []:
+        for patient_id in site.get("patients") or []:
+            yield {
+                'study_id': study_id,
+                'site_id': site.get("site_id"),
+                'patient_id': patient_id,
+                'site_risk_level': site.get("risk_level"),
+            }
+
+
+_ROW_BUILDERS: Dict[str, Callable[[str, Dict[str, Any]], Iterable[Dict[str, Any]]]] = {
+    "study": lambda study_id, study_data: [_build_study_row(study_id, study_data)],
+    "site": _site_rows,
+    "patient": _patient_rows,
+}
+
+
+def get_stream_columns(
+    studies: Mapping[str, Dict[str, Any]],
+    granularity: str = "study",
+    study_ids: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    All columns available for a streaming export.
+    
+    Study exports add a column for every DQI dimension present in the
+    selected studies, so the schema is known before the first row.
+    """
+    if granularity == "site":
+        return list(SITE_EXPORT_COLUMNS)
+    if granularity == "patient":
+        return list(PATIENT_EXPORT_COLUMNS)
+    
+    columns = list(STUDY_EXPORT_COLUMNS)
+    for study_id, study_data in studies.items():
+        if study_ids and study_id not in study_ids:
+            continue
+        for dim_name, _ in _dimension_scores(study_data):
+            column = f"dimension_{dim_name}_score"
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def iter_export_rows(
+    studies: Mapping[str, Dict[str, Any]],
+    granularity: str = "study",
+    study_ids: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield export rows one at a time.
+    
+    Study filtering happens before any row is built and rows are projected
+    to columns as they are yielded, so memory stays bounded by one row.
+    
+    Args:
+        studies: Published study results (e.g. a store snapshot's studies)
+        granularity: "study", "site" or "patient"
+        study_ids: Only export these studies (None = all)
+        columns: Only include these columns (None = all)
+    """
+    if granularity not in _ROW_BUILDERS:
+        raise ValueError(f"Unknown export granularity '{granularity}', expected one of {EXPORT_GRANULARITIES}")
+    
+    build_rows = _ROW_BUILDERS[granularity]
+    wanted = set(study_ids) if study_ids else None
+    
+    for study_id, study_data in studies.items():
+        if wanted is not None and study_id not in wanted:
+            continue
+        for row in build_rows(study_id, study_data):
+            yield {column: row.get(column) for column in columns} if columns else row
+
+
+def _batches(rows: Iterable[Dict[str, Any]], batch_rows: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_rows))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_csv(
+    rows: Iterable[Dict[str, Any]],
+    columns: List[str],
+    batch_rows: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Encode rows as CSV, one chunk per batch of rows."""
+    batch_rows = batch_rows or getattr(settings, 'EXPORT_STREAM_BATCH_ROWS', 5000)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    
+    writer.writeheader()
+    for batch in _batches(rows, batch_rows):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back in chunks."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def writable(self) -> bool:
+        return True
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None and number == number else None
+
+
+def _arrow_schema(columns: List[str]) -> "pa.Schema":
+    def column_type(column: str):
+        if column in STRING_COLUMNS:
+            return pa.string()
+        if column in INTEGER_COLUMNS:
+            return pa.int64()
+        return pa.float64()
+    
+    return pa.schema([(column, column_type(column)) for column in columns])
+
+
+def _record_batch(batch: List[Dict[str, Any]], schema: "pa.Schema") -> "pa.RecordBatch":
+    arrays = []
+    for column in schema:
+        values = [row.get(column.name) for row in batch]
+        if pa.types.is_string(column.type):
+            values = [str(v) if v is not None else None for v in values]
+        elif pa.types.is_integer(column.type):
+            values = [_to_int(v) for v in values]
+        else:
+            values = [_to_float(v) for v in values]
+        arrays.append(pa.array(values, type=column.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def stream_columnar(
+    rows: Iterable[Dict[str, Any]],
+    columns: List[str],
+    format: str = "parquet",
+    batch_rows: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Encode rows as Parquet (one row group per batch) or an Arrow IPC stream.
+    
+    Only the current batch is held in memory; encoded bytes are yielded as
+    soon as each batch is written.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet and Arrow exports")
+    if format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown columnar format '{format}'")
+    
+    batch_rows = batch_rows or getattr(settings, 'EXPORT_STREAM_BATCH_ROWS', 5000)
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if format == "parquet" else pa.ipc.new_stream(sink, schema)
+    
+    try:
+        for batch in _batches(rows, batch_rows):
+            writer.write_batch(_record_batch(batch, schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    
+    yield sink.drain()
+
+
+def stream_export(
+    studies: Mapping[str, Dict[str, Any]],
+    format: str = "csv",
+    granularity: str = "study",
+    study_ids: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    batch_rows: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Stream an export of published study results.
+    
+    Args:
+        studies: Published study results (e.g. a store snapshot's studies)
+        format: "csv", "parquet" or "arrow" (IPC stream)
+        granularity: "study", "site" or "patient"
+        study_ids: Only export these studies (None = all)
+        columns: Column projection (None = all columns for the granularity)
+        batch_rows: Rows encoded per chunk (defaults to settings.EXPORT_STREAM_BATCH_ROWS)
+    
+    Raises:
+        ValueError: On an unknown format, granularity or column
+    """
+    if format not in STREAM_FORMATS:
+        raise ValueError(f"Unknown export format '{format}', expected one of {tuple(STREAM_FORMATS)}")
+    if granularity not in EXPORT_GRANULARITIES:
+        raise ValueError(f"Unknown export granularity '{granularity}', expected one of {EXPORT_GRANULARITIES}")
+    
+    available = get_stream_columns(studies, granularity, study_ids)
+    if columns:
+        unknown = [column for column in columns if column not in available]
+        if unknown:
+            raise ValueError(f"Unknown {granularity} export columns: {unknown}")
+    else:
+        columns = available
+    
+    if format != "csv" and not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet and Arrow exports")
+    
+    rows = iter_export_rows(studies, granularity, study_ids, columns)
+    if format == "csv":
+        return stream_csv(rows, columns, batch_rows)
+    return stream_columnar(rows, columns, format, batch_rows)
+
+
 # ========================================
 # API ENDPOINTS
 # ========================================
@@ -510,6 +848,54 @@ async def export_excel(
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 
+@router.get("/stream")
+async def export_stream(
+    format: str = Query("csv", description="Export format: 'csv', 'parquet' or 'arrow'"),
+    granularity: str = Query("study", description="Row granularity: 'study', 'site' or 'patient'"),
+    study_ids: Optional[str] = Query(None, description="Comma-separated study IDs (default: all)"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+) -> StreamingResponse:
+    """
+    Stream study data as it is generated (no export file is written).
+    
+    Rows are produced from the current study result snapshot and encoded
+    in batches, so memory use does not grow with the size of the export.
+    
+    Args:
+        format: csv, parquet or arrow (Arrow IPC stream)
+        granularity: study, site or patient rows
+        study_ids: Studies to include
+        columns: Columns to include, in order
+    
+    Returns:
+        Streaming response with the encoded export
+    """
+    snapshot = get_study_store().snapshot()
+    selected_studies = [s.strip() for s in study_ids.split(",") if s.strip()] if study_ids else None
+    selected_columns = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    
+    try:
+        chunks = stream_export(snapshot.studies, format, granularity, selected_studies, selected_columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    media_type, extension = STREAM_FORMATS[format]
+    filename = f"c_trust_{granularity}_export_v{snapshot.version}.{extension}"
+    logger.info(f"Streaming {format} export ({granularity} rows, studies: {selected_studies or 'all'})")
+    
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "ETag": snapshot.etag,
+            "X-Data-Version": str(snapshot.version),
+        },
+    )
+
+
 @router.get("/download/{filename}")
 async def download_export(filename: str):
     """
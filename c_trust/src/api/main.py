@@ -14,7 +14,8 @@ Endpoints:
 - GET /api/v1/notifications - Get notifications
 - GET /api/v1/guardian/status - Get Guardian Agent status
 - POST /api/v1/ingest - Trigger data ingestion
-- WebSocket /api/v1/ws - Real-time updates
+- WebSocket /api/v1/ws - Real-time updates (topic subscriptions)
+- GET /api/v1/ws/stats - WebSocket push statistics
 
 Production Features:
 - Async endpoints for performance
@@ -29,31 +30,46 @@ Production Features:
 
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Dict, List, Optional
 import asyncio
 import dataclasses
 import json
+import threading
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from src.core import get_logger, settings
+from src.core.jobs import get_job_manager, reset_job_manager
+from src.core.scheduler import reset_file_watcher, start_scheduler, stop_scheduler
 from src.data import (
     DataIngestionEngine,
     FeatureEngineeringEngine,
     FileType,
-    StudyDiscovery,
+    get_study_catalog,
 )
 from src.data.features_real_extraction import RealFeatureExtractor
 from src.intelligence.dqi import DQIEngine
+from src.guardian.guardian_agent import GuardianAgent
+from src.guardian.event_store import get_event_store
+from src.notifications.notification_engine import (
+    NotificationPriority,
+    UserRole,
+    get_notification_engine,
+)
+from src.notifications.system_based_notifications import get_system_notification_engine
 
 # Import API routers
-from src.api.analysis import router as analysis_router
+from src.api.analysis import refresh_studies_analysis, router as analysis_router
 from src.api.metrics import router as metrics_router
 from src.api.export import router as export_router
+from src.api.realtime import get_push_hub
+from src.api.site_index import SITE_FIELDS, SITE_SORT_FIELDS, Page, SiteIndex, get_site_index, rebuild_site_index
+from src.api.study_store import check_not_modified, get_study_store
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -90,9 +106,35 @@ async def lifespan(app: FastAPI):
         
         logger.info("All engines initialized successfully")
 
-        # Check for data cache or run initial analysis
-        cache_file = Path("data_cache.json")
-        if not cache_file.exists():
+        # Build the study catalog off the event loop, then keep it current
+        # from the shared data-root watcher
+        await asyncio.to_thread(get_study_catalog().refresh)
+        get_study_catalog().start_watching()
+
+        # Re-analyze only the studies whose files change (plus the periodic refresh)
+        start_scheduler(on_changed_studies=refresh_studies_analysis)
+
+        # The dashboard's default inbox receives every system notification
+        get_notification_engine().register_watcher(_notification_user(None))
+
+        # Index sites as soon as results are published
+        get_study_store().add_listener(rebuild_site_index)
+
+        # Raise and route DQI alerts for studies whose scores changed on each refresh
+        get_study_store().add_listener(get_system_notification_engine().route_snapshot_alerts)
+
+        # Push job completions, study result diffs, Guardian events and notification
+        # deliveries to WebSocket clients
+        get_job_manager().add_listener(partial(_push_job_update, asyncio.get_running_loop()))
+        get_study_store().add_listener(ws_manager.publish_snapshot)
+        GuardianAgent.add_event_listener(ws_manager.publish_guardian_event)
+        get_notification_engine().register_delivery_callback(ws_manager.publish_notification_delivery)
+        
+        # Collect events from every Guardian (pipeline runs included) for the Guardian endpoints
+        GuardianAgent.add_event_listener(get_event_store().add)
+
+        # Load persisted results into the study store or run initial analysis
+        if not get_study_store().load():
             logger.info("No data cache found. Running initial analysis...")
             # Run in background to not block startup
             asyncio.create_task(run_analysis_pipeline())
@@ -106,13 +148,42 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("C-TRUST API shutting down...")
+    stop_scheduler()
+    get_study_catalog().stop_watching()
+    reset_file_watcher()
+    reset_job_manager()
+    get_study_store().remove_listener(ws_manager.publish_snapshot)
+    get_study_store().remove_listener(rebuild_site_index)
+    get_study_store().remove_listener(get_system_notification_engine().route_snapshot_alerts)
+    GuardianAgent.remove_event_listener(ws_manager.publish_guardian_event)
+    get_notification_engine().unregister_delivery_callback(ws_manager.publish_notification_delivery)
+    GuardianAgent.remove_event_listener(get_event_store().add)
+    get_notification_engine().unregister_watcher(_notification_user(None))
+    await ws_manager.close()
+
+
+# Serializes full pipeline runs (startup and /ingest can overlap)
+_pipeline_lock = threading.Lock()
 
 
 async def run_analysis_pipeline():
     """
     Run the full analysis pipeline:
     Ingest -> Direct Feature Extract -> DQI -> Cache
+    
+    The work is blocking (file reads, pandas, scoring), so it runs in a
+    worker thread and the event loop keeps serving requests.
     """
+    await asyncio.to_thread(_run_analysis_pipeline_sync)
+
+
+def _run_analysis_pipeline_sync() -> None:
+    """Blocking body of run_analysis_pipeline (one run at a time)."""
+    with _pipeline_lock:
+        _run_analysis_pipeline_locked()
+
+
+def _run_analysis_pipeline_locked() -> None:
     logger.info("Starting full analysis pipeline...")
     
     try:
@@ -165,15 +236,8 @@ async def run_analysis_pipeline():
             except Exception as e:
                 logger.error(f"Error processing pipeline for {study_id}: {e}", exc_info=True)
         
-        # 3. Save to cache
-        with open("data_cache.json", "w") as f:
-            # Helper to serialize datetimes
-            def json_serial(obj):
-                if isinstance(obj, (datetime, datetime.date)):
-                    return obj.isoformat()
-                raise TypeError (f"Type {type(obj)} not serializable")
-                
-            json.dump(cache_data, f, default=json_serial, indent=2)
+        # 3. Publish to the study store (swapped in atomically, persisted to data_cache.json)
+        get_study_store().publish(cache_data)
             
         logger.info(f"Analysis pipeline complete. Cached {len(cache_data)} studies.")
         
@@ -610,30 +674,19 @@ async def health_check():
     
     # Check Data Cache status
     try:
-        import json
-        from pathlib import Path
-        cache_file = Path("data_cache.json")
+        snapshot = get_study_store().snapshot()
         
-        if cache_file.exists():
-            with open(cache_file, "r") as f:
-                cache_data = json.load(f)
-            
-            studies_count = len(cache_data.get("studies", {}))
-            
+        if snapshot.studies:
             components["data_cache"] = ComponentStatus(
                 available=True,
                 status="available",
-                details={
-                    "studies_count": studies_count,
-                    "file_exists": True,
-                    "last_modified": cache_file.stat().st_mtime
-                }
+                details=snapshot.to_dict()
             )
         else:
             components["data_cache"] = ComponentStatus(
                 available=False,
                 status="missing",
-                details={"file_exists": False}
+                details=snapshot.to_dict()
             )
             overall_status = "degraded"
             
@@ -673,32 +726,29 @@ async def health_check():
 
 
 @app.get("/api/v1/studies", response_model=List[StudyListItem], tags=["Studies"])
-async def list_studies():
+async def list_studies(request: Request, response: Response):
     """
     List all available studies.
     
     Returns basic information for each study including DQI score.
+    Supports conditional GET via ETag / If-None-Match.
     """
     logger.info("Listing all studies")
     
     try:
-        # Discover studies
-        discovery = StudyDiscovery()
-        studies = discovery.discover_all_studies()
+        # Studies from the catalog
+        catalog_fingerprint, studies_by_id = get_study_catalog().snapshot()
+        studies = list(studies_by_id.values())
+        
+        snapshot = get_study_store().snapshot()
+        not_modified = check_not_modified(request, response, snapshot, catalog_fingerprint=catalog_fingerprint)
+        if not_modified:
+            return not_modified
         
         study_list = []
         
-        # Load cached results if available
-        import json
-        from pathlib import Path
-        cache_file = Path("data_cache.json")
-        cached_scores = {}
-        if cache_file.exists():
-            try:
-                with open(cache_file, "r") as f:
-                    cached_scores = json.load(f)
-            except:
-                pass
+        # Published results
+        cached_scores = snapshot.studies
 
         for study in studies:
             # Get available file types (handle both enum and string types)
@@ -734,7 +784,7 @@ async def list_studies():
 
 
 @app.get("/api/v1/studies/{study_id}", response_model=StudyDetail, tags=["Studies"])
-async def get_study(study_id: str):
+async def get_study(study_id: str, request: Request, response: Response):
     """
     Get detailed information for a specific study.
     
@@ -747,11 +797,9 @@ async def get_study(study_id: str):
     logger.info(f"Getting details for study: {study_id}")
     
     try:
-        # Discover study
-        discovery = StudyDiscovery()
-        studies = discovery.discover_all_studies()
-        
-        study = next((s for s in studies if s.study_id == study_id), None)
+        # Look up study in the catalog
+        catalog_fingerprint, studies_by_id = get_study_catalog().snapshot()
+        study = studies_by_id.get(study_id)
         
         if not study:
             raise HTTPException(
@@ -759,24 +807,19 @@ async def get_study(study_id: str):
                 detail=f"Study not found: {study_id}"
             )
         
+        snapshot = get_study_store().snapshot()
+        not_modified = check_not_modified(request, response, snapshot, catalog_fingerprint=catalog_fingerprint)
+        if not_modified:
+            return not_modified
+        
         # Get file types (handle both enum and string types)
         file_types = [
             ft.value if hasattr(ft, 'value') else str(ft) 
             for ft in study.available_files.keys()
         ]
         
-        # Load enhanced data from cache
-        import json
-        from pathlib import Path
-        cache_file = Path("data_cache.json")
-        cached_data = {}
-        if cache_file.exists():
-            try:
-                with open(cache_file, "r") as f:
-                    full_cache = json.load(f)
-                    cached_data = full_cache.get(study_id, {})
-            except:
-                pass
+        # Published results for this study
+        cached_data = snapshot.studies.get(study_id, {})
 
         # Extract timeline
         timeline_data = cached_data.get("timeline", {})
@@ -806,20 +849,20 @@ async def get_study(study_id: str):
             rate = features.get("enrollment_rate")
             
             # Determine status
-            status = "unknown"
+            enrollment_status = "unknown"
             if actual is not None and target is not None and rate is not None:
                 if rate >= 100.0:
-                    status = "complete"
+                    enrollment_status = "complete"
                 elif rate >= 80.0:
-                    status = "on_track"
+                    enrollment_status = "on_track"
                 else:
-                    status = "behind"
+                    enrollment_status = "behind"
             
             enrollment_data = EnrollmentData(
                 actual=actual,
                 target=target,
                 rate_pct=rate,
-                status=status
+                status=enrollment_status
             )
 
         dqi_score = cached_data.get("overall_score")
@@ -851,24 +894,23 @@ async def get_study(study_id: str):
 
 
 @app.get("/api/v1/dashboard/summary", response_model=DashboardSummary, tags=["Dashboard"])
-async def get_dashboard_summary():
+async def get_dashboard_summary(request: Request, response: Response):
     """
     Get executive dashboard summary metrics.
     Aggregates data across all studies.
     """
-    import json
-    from pathlib import Path
-    
     try:
-        cache_file = Path("data_cache.json")
-        if not cache_file.exists():
+        snapshot = get_study_store().snapshot()
+        not_modified = check_not_modified(request, response, snapshot)
+        if not_modified:
+            return not_modified
+        
+        data = snapshot.studies
+        if not data:
             return DashboardSummary(
                 total_studies=0, avg_dqi=0, critical_risks=0, sites_at_risk=0, total_patients=0
             )
             
-        with open(cache_file, "r") as f:
-            data = json.load(f)
-            
         total_studies = len(data)
         scores = [d.get("overall_score", 0) for d in data.values() if d.get("overall_score")]
         avg_dqi = sum(scores) / len(scores) if scores else 0
@@ -902,6 +944,22 @@ async def get_dashboard_summary():
         )
 
 
+def _extract_study_features(study, study_id: str) -> Dict[str, Any]:
+    """Ingest a study and extract its features (blocking)."""
+    raw_data = data_ingestion.ingest_study(study)
+    return feature_extractor.extract_features(raw_data, study_id)
+
+
+def _calculate_study_dqi(study, study_id: str):
+    """Ingest, extract features and calculate DQI for a study (blocking)."""
+    return dqi_engine.calculate_dqi(_extract_study_features(study, study_id), study_id)
+
+
+def _run_study_agents(pipeline, study, study_id: str):
+    """Ingest, extract features and run the agent pipeline for a study (blocking)."""
+    return pipeline.run_full_analysis(study_id, _extract_study_features(study, study_id))
+
+
 @app.get("/api/v1/studies/{study_id}/dqi", response_model=DQIResponse, tags=["DQI"])
 async def get_study_dqi(study_id: str):
     """
@@ -922,11 +980,8 @@ async def get_study_dqi(study_id: str):
     logger.info(f"Calculating DQI for study: {study_id}")
     
     try:
-        # Discover study
-        discovery = StudyDiscovery()
-        studies = discovery.discover_all_studies()
-        
-        study = next((s for s in studies if s.study_id == study_id), None)
+        # Look up study in the catalog
+        study = get_study_catalog().get_study(study_id)
         
         if not study:
             raise HTTPException(
@@ -934,14 +989,8 @@ async def get_study_dqi(study_id: str):
                 detail=f"Study not found: {study_id}"
             )
         
-        # Ingest data
-        raw_data = data_ingestion.ingest_study(study)
-        
-        # Extract features directly (no semantic layer)
-        features = feature_extractor.extract_features(raw_data, study_id)
-        
-        # Calculate DQI
-        dqi_score = dqi_engine.calculate_dqi(features, study_id)
+        # Ingest, extract features (no semantic layer) and score off the event loop
+        dqi_score = await asyncio.to_thread(_calculate_study_dqi, study, study_id)
         
         # Convert to response format
         response = DQIResponse(
@@ -989,11 +1038,8 @@ async def get_study_features(study_id: str):
     logger.info(f"Getting features for study: {study_id}")
     
     try:
-        # Discover study
-        discovery = StudyDiscovery()
-        studies = discovery.discover_all_studies()
-        
-        study = next((s for s in studies if s.study_id == study_id), None)
+        # Look up study in the catalog
+        study = get_study_catalog().get_study(study_id)
         
         if not study:
             raise HTTPException(
@@ -1001,9 +1047,8 @@ async def get_study_features(study_id: str):
                 detail=f"Study not found: {study_id}"
             )
         
-        # Ingest and extract features directly
-        raw_data = data_ingestion.ingest_study(study)
-        features = feature_extractor.extract_features(raw_data, study_id)
+        # Ingest and extract features directly, off the event loop
+        features = await asyncio.to_thread(_extract_study_features, study, study_id)
         
         logger.info(f"Features retrieved for {study_id}: {len(features)} features")
         return features
@@ -1243,11 +1288,8 @@ async def get_agent_insights(study_id: str):
     try:
         from src.intelligence.agent_pipeline import get_pipeline
         
-        # Discover study
-        discovery = StudyDiscovery()
-        studies = discovery.discover_all_studies()
-        
-        study = next((s for s in studies if s.study_id == study_id), None)
+        # Look up study in the catalog
+        study = get_study_catalog().get_study(study_id)
         
         if not study:
             raise HTTPException(
@@ -1255,13 +1297,9 @@ async def get_agent_insights(study_id: str):
                 detail=f"Study not found: {study_id}"
             )
         
-        # Ingest and extract features directly
-        raw_data = data_ingestion.ingest_study(study)
-        features = feature_extractor.extract_features(raw_data, study_id)
-        
-        # Run agent pipeline
+        # Ingest, extract features and run the agent pipeline off the event loop
         pipeline = get_pipeline()
-        result = pipeline.run_full_analysis(study_id, features)
+        result = await asyncio.to_thread(_run_study_agents, pipeline, study, study_id)
         
         # Format agent insights
         agent_insights = []
@@ -1385,8 +1423,8 @@ async def get_guardian_status():
     try:
         from src.guardian.guardian_agent import GuardianAgent
         
-        # Initialize Guardian
-        guardian = GuardianAgent()
+        # Guardian backed by the shared event store
+        guardian = GuardianAgent(event_store=get_event_store())
         
         # Run self-diagnostic
         diagnostic = guardian.run_self_diagnostic()
@@ -1524,8 +1562,8 @@ async def get_guardian_events(
     try:
         from src.guardian.guardian_agent import GuardianAgent, GuardianEventType, GuardianSeverity
         
-        # Initialize Guardian
-        guardian = GuardianAgent()
+        # Guardian backed by the shared event store
+        guardian = GuardianAgent(event_store=get_event_store())
         
         # Convert string parameters to enums if provided
         event_type_enum = None
@@ -1610,80 +1648,134 @@ class NotificationResponse(BaseModel):
             self.id = self.notification_id
 
 
+# API role names <-> UserRole
+_NOTIFICATION_ROLES = {
+    "CRA": UserRole.CRA,
+    "DataManager": UserRole.DATA_MANAGER,
+    "StudyLead": UserRole.STUDY_LEAD,
+    "Admin": UserRole.ADMIN,
+}
+_NOTIFICATION_ROLE_NAMES = {role: name for name, role in _NOTIFICATION_ROLES.items()}
+
+_NOTIFICATION_TYPES = {
+    NotificationPriority.CRITICAL: "critical",
+    NotificationPriority.HIGH: "warning",
+    NotificationPriority.MEDIUM: "info",
+    NotificationPriority.LOW: "info",
+}
+
+
+def _notification_user(user_id: Optional[str]) -> str:
+    """Inbox to read; the dashboard's shared inbox when no user is given."""
+    return user_id or getattr(settings, 'NOTIFICATION_DEFAULT_USER_ID', 'dashboard')
+
+
+def _notification_response(item) -> NotificationResponse:
+    """NotificationResponse for an inbox item (delivery + notification)."""
+    notification, delivery = item.notification, item.delivery
+    study_id = (
+        notification.entity_id if notification.entity_type == "STUDY"
+        else notification.metadata.get("study_id")
+    )
+    return NotificationResponse(
+        notification_id=notification.notification_id,
+        type=_NOTIFICATION_TYPES.get(notification.priority, "info"),
+        title=notification.title,
+        message=notification.message,
+        study_id=study_id,
+        role=_NOTIFICATION_ROLE_NAMES.get(delivery.user_role, "All"),
+        timestamp=notification.created_at,
+        read=delivery.read_at is not None,
+        acknowledged=delivery.acknowledged_at is not None,
+    )
+
+
 @app.get("/api/v1/notifications", response_model=List[NotificationResponse], tags=["Notifications"])
 async def get_notifications(
+    response: Response,
     role: Optional[str] = None,
     unread_only: bool = False,
-    limit: int = 50
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    user_id: Optional[str] = Query(None, description="Inbox to read (default NOTIFICATION_DEFAULT_USER_ID)"),
+    include_acknowledged: bool = True,
 ):
     """
-    Get notifications for the current user.
+    Get notifications for the current user, most urgent first.
+    
+    Served from the user's indexed inbox in the notification engine. The
+    cursor for the next page is returned in the X-Next-Cursor header, the
+    unread count in X-Unread-Count.
     
     Args:
-        role: Filter by role (CRA, DataManager, StudyLead)
+        role: Filter by role (CRA, DataManager, StudyLead, Admin)
         unread_only: Only return unread notifications
         limit: Maximum number of notifications to return
+        cursor: Cursor from the previous page
+        user_id: Inbox to read
+        include_acknowledged: Include acknowledged notifications
     """
-    # Return mock notifications - will be connected to real notification system
-    notifications = [
-        NotificationResponse(
-            notification_id="notif_001",
-            type="critical",
-            title="SAE Review Overdue",
-            message="3 SAEs in Study 08 have exceeded the 48-hour review window",
-            study_id="STUDY_08",
-            role="StudyLead",
-            timestamp=datetime.now(),
-            read=False,
-            acknowledged=False
-        ),
-        NotificationResponse(
-            notification_id="notif_002",
-            type="warning",
-            title="Data Entry Lag Detected",
-            message="Site SITE-101 shows a 5-day lag in data entry",
-            study_id="STUDY_05",
-            role="CRA",
-            timestamp=datetime.now(),
-            read=False,
-            acknowledged=False
-        ),
-        NotificationResponse(
-            notification_id="notif_003",
-            type="info",
-            title="DQI Score Improved",
-            message="Study 11 DQI score improved from 72 to 81",
-            study_id="STUDY_11",
-            role="All",
-            timestamp=datetime.now(),
-            read=True,
-            acknowledged=True
-        ),
-    ]
+    roles = None
+    if role and role != "All":
+        if role not in _NOTIFICATION_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid role: {role}"
+            )
+        roles = [_NOTIFICATION_ROLES[role]]
     
-    if role:
-        notifications = [n for n in notifications if n.role == role or n.role == "All"]
+    engine = get_notification_engine()
+    user = _notification_user(user_id)
+    try:
+        page = engine.get_user_notifications_page(
+            user,
+            limit=limit,
+            cursor=cursor,
+            unread_only=unread_only,
+            include_acknowledged=include_acknowledged,
+            roles=roles,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    if unread_only:
-        notifications = [n for n in notifications if not n.read]
+    response.headers["X-Unread-Count"] = str(engine.get_unread_count(user))
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
     
-    return notifications[:limit]
+    return [_notification_response(item) for item in page.items]
+
+
+def _inbox_item_or_404(notification_id: str, user_id: Optional[str]):
+    inbox = get_notification_engine().get_inbox(_notification_user(user_id))
+    item = inbox.get_by_notification(notification_id) if inbox is not None else None
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Notification not found: {notification_id}"
+        )
+    return item
 
 
 @app.post("/api/v1/notifications/{notification_id}/acknowledge", tags=["Notifications"])
-async def acknowledge_notification(notification_id: str):
+async def acknowledge_notification(notification_id: str, user_id: Optional[str] = None):
     """
     Acknowledge a notification.
     """
+    item = _inbox_item_or_404(notification_id, user_id)
+    get_notification_engine().acknowledge_delivery(item.delivery.delivery_id, action_taken="ACKNOWLEDGED")
     logger.info(f"Notification acknowledged: {notification_id}")
     return {"status": "acknowledged", "notification_id": notification_id}
 
 
 @app.post("/api/v1/notifications/{notification_id}/read", tags=["Notifications"])
-async def mark_notification_read(notification_id: str):
+async def mark_notification_read(notification_id: str, user_id: Optional[str] = None):
     """
     Mark a notification as read.
     """
+    item = _inbox_item_or_404(notification_id, user_id)
+    get_notification_engine().mark_delivery_read(item.delivery.delivery_id)
     logger.info(f"Notification marked as read: {notification_id}")
     return {"status": "read", "notification_id": notification_id}
 
@@ -1692,58 +1784,58 @@ async def mark_notification_read(notification_id: str):
 # WEBSOCKET FOR REAL-TIME UPDATES
 # ========================================
 
-class ConnectionManager:
-    """Manages WebSocket connections"""
-    
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-    
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
-    
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
-    
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to WebSocket: {e}")
-
-
-ws_manager = ConnectionManager()
+ws_manager = get_push_hub()
+
+
+def _push_job_update(loop: asyncio.AbstractEventLoop, job) -> None:
+    """Publish a finished background job (called from job pool threads)."""
+    if loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(
+        ws_manager.broadcast({
+            "type": f"{job.kind}_job",
+            "topic": "jobs",
+            "job": job.to_dict(),
+            "timestamp": datetime.now().isoformat(),
+        }),
+        loop,
+    )
 
 
 @app.websocket("/api/v1/ws")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(websocket: WebSocket, topics: Optional[str] = None):
     """
     WebSocket endpoint for real-time updates.
     
-    Clients can subscribe to receive:
-    - DQI score updates
-    - New agent signals
-    - Guardian alerts
-    - Notification updates
+    Connect with ?topics=a,b or send {"action": "subscribe", "topics": [...]}.
+    Clients subscribed to no topics receive job completions only.
+    
+    Topics:
+    - study:<study_id> - Study snapshot, then diff-only updates ("study_update")
+    - dqi - Portfolio DQI score changes
+    - guardian - Guardian integrity events
+    - notifications[:<user_id>] - Notification deliveries
+    - jobs - Background job completion ("analysis_job")
     """
-    await ws_manager.connect(websocket)
+    connection = await ws_manager.connect(websocket, topics.split(",") if topics else None)
     try:
         while True:
-            # Keep connection alive and handle incoming messages
             data = await websocket.receive_text()
-            logger.debug(f"WebSocket received: {data}")
-            
-            # Echo back for now - can be extended for subscriptions
-            await websocket.send_json({
-                "type": "ack",
-                "message": f"Received: {data}",
-                "timestamp": datetime.now().isoformat()
-            })
-    except WebSocketDisconnect:
-        ws_manager.disconnect(websocket)
+            try:
+                message = json.loads(data)
+            except ValueError:
+                message = None
+            await ws_manager.handle_client_message(connection, message)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        await ws_manager.disconnect(connection)
+
+
+@app.get("/api/v1/ws/stats", tags=["System"])
+async def get_websocket_stats():
+    """WebSocket push statistics: per-connection queue depth, drops and lag."""
+    return ws_manager.get_stats()
 
 
 # ========================================
@@ -1780,12 +1872,62 @@ class PatientSummary(BaseModel):
     last_visit: Optional[datetime] = None
 
 
+def _page_limit(limit: Optional[int]) -> int:
+    """Requested page size, defaulting to and capped by the configured sizes."""
+    maximum = getattr(settings, 'SITE_PAGE_MAX', 1000)
+    return min(limit or getattr(settings, 'SITE_PAGE_SIZE', 100), maximum)
+
+
+def _split_param(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query parameter as a list (None when absent)."""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _site_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validated site field selection."""
+    selected = _split_param(fields)
+    if selected:
+        unknown = [name for name in selected if name not in SITE_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown site fields: {unknown}. Available: {list(SITE_FIELDS)}"
+            )
+    return selected
+
+
+def _query_site_page(index: SiteIndex, study_id: Optional[str], **query: Any) -> Page:
+    """Query the site index, mapping bad sort/cursor values to 400."""
+    try:
+        return index.query_sites(study_id=study_id, **query)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @app.get("/api/v1/studies/{study_id}/sites", tags=["Sites"])
-async def get_study_sites(study_id: str):
+async def get_study_sites(
+    study_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default SITE_PAGE_SIZE, capped at SITE_PAGE_MAX)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: str = Query("site_id", description=f"Sort field: {', '.join(SITE_SORT_FIELDS)}"),
+    order: str = Query("asc", description="Sort order: 'asc' or 'desc'"),
+    risk_level: Optional[str] = Query(None, description="Comma-separated risk levels to include"),
+    min_dqi: Optional[float] = Query(None, description="Minimum site DQI score"),
+    max_dqi: Optional[float] = Query(None, description="Maximum site DQI score"),
+    min_open_queries: Optional[int] = Query(None, description="Minimum open queries"),
+    max_open_queries: Optional[int] = Query(None, description="Maximum open queries"),
+    fields: Optional[str] = Query(None, description="Comma-separated site fields to return (default: all)"),
+):
     """
-    Get all sites for a study with enhanced error handling and data quality validation.
+    Get a page of a study's sites with data quality validation.
     
-    This endpoint implements the following improvements:
+    Sites come from the site index built when results are published, so
+    paging, sorting and filtering never rescan the study. Patient data
+    validation is done once per published version:
     - Patient data validation for each site
     - Clear error messages for data extraction failures
     - Data quality indicator in response
@@ -1795,154 +1937,72 @@ async def get_study_sites(study_id: str):
         study_id: Study identifier (e.g., "STUDY_01")
     
     Returns:
-        JSON response with sites list and data quality metadata
+        JSON response with one page of sites, study-wide totals, data
+        quality metadata and next_cursor (None on the last page)
     """
     logger.info(f"Getting sites for study: {study_id}")
     
     try:
-        import json
-        from pathlib import Path
-        
-        # Load cached data
-        cache_file = Path("data_cache.json")
-        if not cache_file.exists():
+        # Published results
+        snapshot = get_study_store().snapshot()
+        full_cache = snapshot.studies
+        if not full_cache:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No data cache available. Please run data ingestion first."
             )
         
-        with open(cache_file, "r") as f:
-            full_cache = json.load(f)
-            
-        study_data = full_cache.get(study_id)
-        if not study_data:
+        not_modified = check_not_modified(request, response, snapshot)
+        if not_modified:
+            return not_modified
+        
+        index = get_site_index(snapshot)
+        study = index.study_sites(study_id)
+        if study is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Study '{study_id}' not found in cache. Available studies: {list(full_cache.keys())}"
             )
         
-        # Get sites from cache
-        sites_data = study_data.get("sites", [])
-        
-        if not sites_data:
+        if not study.sites:
             logger.warning(f"No sites data found for study {study_id}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No sites data available for study '{study_id}'. Data extraction may have failed."
             )
         
-        # Track data quality metrics
-        sites_with_patients = 0
-        sites_missing_patients = 0
-        total_patients = 0
-        data_quality_warnings = []
-        
-        # Enhance site data with additional details and validate patient data
-        site_details = []
-        for site in sites_data:
-            site_id = site.get("site_id", "UNKNOWN")
-            
-            # Validate patient data presence
-            patients = site.get("patients")
-            if patients is None:
-                sites_missing_patients += 1
-                logger.warning(
-                    f"Study {study_id}, Site {site_id}: Missing patients array. "
-                    f"Patient data extraction may have failed."
-                )
-                # Fallback: provide empty array with warning
-                patients = []
-                data_quality_warnings.append(
-                    f"Site {site_id}: Patient data unavailable (extraction failed)"
-                )
-            elif not isinstance(patients, list):
-                sites_missing_patients += 1
-                logger.error(
-                    f"Study {study_id}, Site {site_id}: Invalid patients data type: {type(patients)}"
-                )
-                patients = []
-                data_quality_warnings.append(
-                    f"Site {site_id}: Invalid patient data format"
-                )
-            else:
-                sites_with_patients += 1
-                total_patients += len(patients)
-                
-                # Validate patient count matches enrollment
-                enrollment = site.get("enrollment", 0)
-                if len(patients) != enrollment:
-                    logger.warning(
-                        f"Study {study_id}, Site {site_id}: Patient count mismatch. "
-                        f"Enrollment: {enrollment}, Patients: {len(patients)}"
-                    )
-                    data_quality_warnings.append(
-                        f"Site {site_id}: Patient count mismatch (enrollment: {enrollment}, patients: {len(patients)})"
-                    )
-            
-            # Calculate enrollment rate if target is available
-            enrollment_rate = None
-            if site.get("target_enrollment"):
-                enrollment_rate = (site.get("enrollment", 0) / site["target_enrollment"]) * 100
-            
-            # Calculate completeness rate (mock for now - would come from real data)
-            completeness_rate = 0.85 + (hash(site_id) % 15) / 100  # Mock: 85-100%
-            
-            # Calculate DQI score for site (mock for now)
-            site_dqi = 70 + (hash(site_id) % 25)  # Mock: 70-95
-            
-            site_detail = {
-                "site_id": site_id,
-                "site_name": site.get("site_name", f"Site {site_id}"),
-                "enrollment": site.get("enrollment", 0),
-                "target_enrollment": site.get("target_enrollment"),
-                "enrollment_rate": enrollment_rate,
-                "saes": site.get("saes", 0),
-                "queries": site.get("queries", 0),
-                "open_queries": site.get("open_queries", site.get("queries", 0)),
-                "resolved_queries": site.get("resolved_queries", 0),
-                "risk_level": site.get("risk_level", "Low"),
-                "dqi_score": site_dqi,
-                "completeness_rate": completeness_rate,
-                "last_data_entry": site.get("last_data_entry"),
-                "patients": patients,
-                "data_quality_warning": None if patients else "Patient data unavailable"
-            }
-            site_details.append(site_detail)
-        
-        # Determine overall data quality status
-        if sites_missing_patients == 0:
-            data_quality = "complete"
-            data_quality_message = "All sites have complete patient data"
-        elif sites_with_patients == 0:
-            data_quality = "unavailable"
-            data_quality_message = "Patient data unavailable for all sites. Data extraction failed."
-        else:
-            data_quality = "partial"
-            data_quality_message = (
-                f"Patient data available for {sites_with_patients}/{len(sites_data)} sites. "
-                f"{sites_missing_patients} sites missing patient data."
-            )
+        selected_fields = _site_fields(fields)
+        page = _query_site_page(
+            index,
+            study_id,
+            sort=sort,
+            order=order,
+            limit=_page_limit(limit),
+            cursor=cursor,
+            risk_levels=_split_param(risk_level),
+            min_dqi=min_dqi,
+            max_dqi=max_dqi,
+            min_open_queries=min_open_queries,
+            max_open_queries=max_open_queries,
+        )
+        data_quality = study.data_quality()
         
         logger.info(
-            f"Study {study_id}: Found {len(site_details)} sites. "
-            f"Data quality: {data_quality}. "
-            f"Sites with patients: {sites_with_patients}/{len(sites_data)}. "
-            f"Total patients: {total_patients}"
+            f"Study {study_id}: Returning {len(page.items)}/{page.total} sites. "
+            f"Data quality: {data_quality['status']}. "
+            f"Sites with patients: {study.sites_with_patients}/{len(study.sites)}. "
+            f"Total patients: {study.total_patients}"
         )
         
         # Return enhanced response with data quality metadata
         return {
             "study_id": study_id,
-            "sites": site_details,
-            "total_sites": len(site_details),
-            "total_patients": total_patients,
-            "data_quality": {
-                "status": data_quality,
-                "message": data_quality_message,
-                "sites_with_patient_data": sites_with_patients,
-                "sites_missing_patient_data": sites_missing_patients,
-                "warnings": data_quality_warnings if data_quality_warnings else None
-            }
+            "sites": [entry.to_dict(selected_fields) for entry in page.items],
+            "total_sites": len(study.sites),
+            "matched_sites": page.total,
+            "total_patients": study.total_patients,
+            "next_cursor": page.next_cursor,
+            "data_quality": data_quality,
         }
     
     except HTTPException:
@@ -1955,14 +2015,71 @@ async def get_study_sites(study_id: str):
         )
 
 
+@app.get("/api/v1/sites", tags=["Sites"])
+async def list_sites(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default SITE_PAGE_SIZE, capped at SITE_PAGE_MAX)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: str = Query("site_id", description=f"Sort field: {', '.join(SITE_SORT_FIELDS)}"),
+    order: str = Query("asc", description="Sort order: 'asc' or 'desc'"),
+    risk_level: Optional[str] = Query(None, description="Comma-separated risk levels to include"),
+    min_dqi: Optional[float] = Query(None, description="Minimum site DQI score"),
+    max_dqi: Optional[float] = Query(None, description="Maximum site DQI score"),
+    min_open_queries: Optional[int] = Query(None, description="Minimum open queries"),
+    max_open_queries: Optional[int] = Query(None, description="Maximum open queries"),
+    fields: Optional[str] = Query(None, description="Comma-separated site fields to return (default: all)"),
+):
+    """
+    Get a page of sites across all studies.
+    
+    Supports the same sorting, filtering and field selection as the study
+    sites endpoint (e.g. every High/Critical risk site, worst DQI first).
+    Each site carries its study_id.
+    """
+    snapshot = get_study_store().snapshot()
+    not_modified = check_not_modified(request, response, snapshot)
+    if not_modified:
+        return not_modified
+    
+    selected_fields = _site_fields(fields)
+    page = _query_site_page(
+        get_site_index(snapshot),
+        None,
+        sort=sort,
+        order=order,
+        limit=_page_limit(limit),
+        cursor=cursor,
+        risk_levels=_split_param(risk_level),
+        min_dqi=min_dqi,
+        max_dqi=max_dqi,
+        min_open_queries=min_open_queries,
+        max_open_queries=max_open_queries,
+    )
+    return {
+        "sites": [{"study_id": entry.study_id, **entry.to_dict(selected_fields)} for entry in page.items],
+        "matched_sites": page.total,
+        "next_cursor": page.next_cursor,
+    }
+
+
 @app.get("/api/v1/sites/{site_id}", response_model=SiteDetail, tags=["Sites"])
-async def get_site_details(site_id: str, study_id: Optional[str] = None):
+async def get_site_details(
+    site_id: str,
+    request: Request,
+    response: Response,
+    study_id: Optional[str] = None,
+):
     """
     Get detailed information for a specific site.
     
+    Looked up in the site index, so latency does not grow with the number
+    of studies and sites.
+    
     Args:
         site_id: Site identifier (e.g., "SITE_001")
-        study_id: Optional study identifier to narrow search
+        study_id: Optional study identifier (site IDs are unique per study;
+            without it the first study with the site is used)
     
     Returns:
         Detailed site information including patient list
@@ -1970,73 +2087,41 @@ async def get_site_details(site_id: str, study_id: Optional[str] = None):
     logger.info(f"Getting details for site: {site_id}")
     
     try:
-        import json
-        from pathlib import Path
-        
-        # Load cached data
-        cache_file = Path("data_cache.json")
-        if not cache_file.exists():
+        # Published results
+        snapshot = get_study_store().snapshot()
+        if not snapshot.studies:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No data available"
             )
         
-        with open(cache_file, "r") as f:
-            full_cache = json.load(f)
+        not_modified = check_not_modified(request, response, snapshot)
+        if not_modified:
+            return not_modified
         
-        # Search for site across all studies (or specific study if provided)
-        site_found = None
-        found_study_id = None
-        
-        studies_to_search = [study_id] if study_id else full_cache.keys()
-        
-        for sid in studies_to_search:
-            study_data = full_cache.get(sid, {})
-            sites = study_data.get("sites", [])
-            
-            for site in sites:
-                if site.get("site_id") == site_id:
-                    site_found = site
-                    found_study_id = sid
-                    break
-            
-            if site_found:
-                break
-        
-        if not site_found:
+        entry = get_site_index(snapshot).get_site(site_id, study_id)
+        if entry is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Site not found: {site_id}"
             )
         
-        # Get patient list for this site (mock for now - would come from real data)
-        # In production, this would query the database for patients at this site
-        num_patients = site_found.get("enrollment", 0)
-        patients = [f"PAT_{site_id}_{i:03d}" for i in range(1, num_patients + 1)]
-        
-        # Calculate metrics
-        enrollment_rate = None
-        if site_found.get("target_enrollment"):
-            enrollment_rate = (site_found.get("enrollment", 0) / site_found["target_enrollment"]) * 100
-        
-        completeness_rate = 0.85 + (hash(site_id) % 15) / 100
-        site_dqi = 70 + (hash(site_id) % 25)
-        
+        site = entry.record
         site_detail = SiteDetail(
-            site_id=site_found.get("site_id", site_id),
-            site_name=site_found.get("site_name", f"Site {site_id}"),
-            enrollment=site_found.get("enrollment", 0),
-            target_enrollment=site_found.get("target_enrollment"),
-            enrollment_rate=enrollment_rate,
-            saes=site_found.get("saes", 0),
-            queries=site_found.get("queries", 0),
-            open_queries=site_found.get("open_queries", site_found.get("queries", 0)),
-            resolved_queries=site_found.get("resolved_queries", 0),
-            risk_level=site_found.get("risk_level", "Low"),
-            dqi_score=site_dqi,
-            completeness_rate=completeness_rate,
-            last_data_entry=site_found.get("last_data_entry"),
-            patients=patients
+            site_id=entry.site_id,
+            site_name=site.get("site_name", f"Site {site_id}"),
+            enrollment=site.get("enrollment", 0),
+            target_enrollment=site.get("target_enrollment"),
+            enrollment_rate=entry.enrollment_rate,
+            saes=site.get("saes", 0),
+            queries=site.get("queries", 0),
+            open_queries=entry.open_queries,
+            resolved_queries=site.get("resolved_queries", 0),
+            risk_level=entry.risk_level,
+            dqi_score=entry.dqi_score,
+            completeness_rate=entry.completeness_rate,
+            last_data_entry=site.get("last_data_entry"),
+            patients=list(entry.roster)
         )
         
         logger.info(f"Site details retrieved for {site_id}")
@@ -2053,12 +2138,25 @@ async def get_site_details(site_id: str, study_id: Optional[str] = None):
 
 
 @app.get("/api/v1/sites/{site_id}/patients", response_model=List[PatientSummary], tags=["Sites"])
-async def get_site_patients(site_id: str):
+async def get_site_patients(
+    site_id: str,
+    request: Request,
+    response: Response,
+    study_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default SITE_PAGE_SIZE, capped at SITE_PAGE_MAX)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    order: str = Query("asc", description="Patient ID order: 'asc' or 'desc'"),
+):
     """
-    Get all patients for a specific site.
+    Get a page of patients for a specific site, ordered by patient ID.
+    
+    The body stays a plain list; the cursor for the next page is returned
+    in the X-Next-Cursor header (absent on the last page) and the site's
+    patient count in X-Total-Count.
     
     Args:
         site_id: Site identifier
+        study_id: Optional study identifier
     
     Returns:
         List of patients with summary metrics
@@ -2066,12 +2164,28 @@ async def get_site_patients(site_id: str):
     logger.info(f"Getting patients for site: {site_id}")
     
     try:
-        # First get the site details to know how many patients
-        site_detail = await get_site_details(site_id)
+        snapshot = get_study_store().snapshot()
+        not_modified = check_not_modified(request, response, snapshot)
+        if not_modified:
+            return not_modified
+        
+        index = get_site_index(snapshot)
+        entry = index.get_site(site_id, study_id)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Site not found: {site_id}"
+            )
+        
+        try:
+            page = index.query_patients(entry, order=order, limit=_page_limit(limit), cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         
         # Generate patient summaries (mock for now - would come from real data)
         patients = []
-        for i, patient_id in enumerate(site_detail.patients, 1):
+        for patient_id, position in page.items:
+            i = position + 1
             # Mock patient data - in production this would come from database
             patients.append(PatientSummary(
                 patient_id=patient_id,
@@ -2084,7 +2198,11 @@ async def get_site_patients(site_id: str):
                 last_visit=datetime.now() - timedelta(days=i*7)
             ))
         
-        logger.info(f"Found {len(patients)} patients for site {site_id}")
+        response.headers["X-Total-Count"] = str(page.total)
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        
+        logger.info(f"Found {len(patients)}/{page.total} patients for site {site_id}")
         return patients
     
     except HTTPException:
@@ -2105,75 +2223,84 @@ async def get_site_patients(site_id: str):
 async def export_studies_csv():
     """
     Export all studies data as CSV.
+    
+    Rows are streamed as they are written; see /api/v1/export/stream for
+    Parquet/Arrow output, site and patient rows and column selection.
     """
-    import json
-    from pathlib import Path
     import csv
     from io import StringIO
     from fastapi.responses import StreamingResponse
     
     try:
-        cache_file = Path("data_cache.json")
-        if not cache_file.exists():
+        snapshot = get_study_store().snapshot()
+        data = snapshot.studies
+        if not data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No data available for export"
             )
         
-        with open(cache_file, "r") as f:
-            data = json.load(f)
-        
-        # Create CSV
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow(["Study ID", "DQI Score", "Risk Level", "Safety", "Completeness", "Accuracy", "Timeliness", "Conformance", "Consistency"])
-        
-        # Data rows
-        for study_id, study_data in data.items():
-            dimension_scores = study_data.get("dimension_scores", {})
+        def generate_rows():
+            output = StringIO()
+            writer = csv.writer(output)
             
-            # Handle both old (list) and new (dict) structures
-            if isinstance(dimension_scores, list):
-                # Old structure: list of {dimension, raw_score, ...}
-                dim_map = {d.get("dimension"): d.get("raw_score", "N/A") for d in dimension_scores}
-                safety_score = dim_map.get("safety", "N/A")
-                completeness_score = dim_map.get("completeness", "N/A")
-                accuracy_score = dim_map.get("accuracy", "N/A")
-                timeliness_score = dim_map.get("timeliness", "N/A")
-                conformance_score = dim_map.get("conformance", "N/A")
-                consistency_score = dim_map.get("consistency", "N/A")
-            elif isinstance(dimension_scores, dict):
-                # New structure: dict with dimension names as keys
-                safety_score = dimension_scores.get("safety", {}).get("score", "N/A") if isinstance(dimension_scores.get("safety"), dict) else "N/A"
-                completeness_score = dimension_scores.get("completeness", {}).get("score", "N/A") if isinstance(dimension_scores.get("completeness"), dict) else "N/A"
-                accuracy_score = dimension_scores.get("accuracy", {}).get("score", "N/A") if isinstance(dimension_scores.get("accuracy"), dict) else "N/A"
-                timeliness_score = dimension_scores.get("timeliness", {}).get("score", "N/A") if isinstance(dimension_scores.get("timeliness"), dict) else "N/A"
-                conformance_score = dimension_scores.get("conformance", {}).get("score", "N/A") if isinstance(dimension_scores.get("conformance"), dict) else "N/A"
-                consistency_score = dimension_scores.get("consistency", {}).get("score", "N/A") if isinstance(dimension_scores.get("consistency"), dict) else "N/A"
-            else:
-                # Fallback
-                safety_score = completeness_score = accuracy_score = timeliness_score = conformance_score = consistency_score = "N/A"
+            def flush() -> str:
+                chunk = output.getvalue()
+                output.seek(0)
+                output.truncate()
+                return chunk
+            
+            # Header
+            writer.writerow(["Study ID", "DQI Score", "Risk Level", "Safety", "Completeness", "Accuracy", "Timeliness", "Conformance", "Consistency"])
+            yield flush()
             
-            writer.writerow([
-                study_id,
-                study_data.get("overall_score", "N/A"),
-                study_data.get("risk_level", "Unknown"),
-                safety_score,
-                completeness_score,
-                accuracy_score,
-                timeliness_score,
-                conformance_score,
-                consistency_score,
-            ])
-        
-        output.seek(0)
+            # Data rows
+            for study_id, study_data in data.items():
+                dimension_scores = study_data.get("dimension_scores", {})
+                
+                # Handle both old (list) and new (dict) structures
+                if isinstance(dimension_scores, list):
+                    # Old structure: list of {dimension, raw_score, ...}
+                    dim_map = {d.get("dimension"): d.get("raw_score", "N/A") for d in dimension_scores}
+                    safety_score = dim_map.get("safety", "N/A")
+                    completeness_score = dim_map.get("completeness", "N/A")
+                    accuracy_score = dim_map.get("accuracy", "N/A")
+                    timeliness_score = dim_map.get("timeliness", "N/A")
+                    conformance_score = dim_map.get("conformance", "N/A")
+                    consistency_score = dim_map.get("consistency", "N/A")
+                elif isinstance(dimension_scores, dict):
+                    # New structure: dict with dimension names as keys
+                    safety_score = dimension_scores.get("safety", {}).get("score", "N/A") if isinstance(dimension_scores.get("safety"), dict) else "N/A"
+                    completeness_score = dimension_scores.get("completeness", {}).get("score", "N/A") if isinstance(dimension_scores.get("completeness"), dict) else "N/A"
+                    accuracy_score = dimension_scores.get("accuracy", {}).get("score", "N/A") if isinstance(dimension_scores.get("accuracy"), dict) else "N/A"
+                    timeliness_score = dimension_scores.get("timeliness", {}).get("score", "N/A") if isinstance(dimension_scores.get("timeliness"), dict) else "N/A"
+                    conformance_score = dimension_scores.get("conformance", {}).get("score", "N/A") if isinstance(dimension_scores.get("conformance"), dict) else "N/A"
+                    consistency_score = dimension_scores.get("consistency", {}).get("score", "N/A") if isinstance(dimension_scores.get("consistency"), dict) else "N/A"
+                else:
+                    # Fallback
+                    safety_score = completeness_score = accuracy_score = timeliness_score = conformance_score = consistency_score = "N/A"
+                
+                writer.writerow([
+                    study_id,
+                    study_data.get("overall_score", "N/A"),
+                    study_data.get("risk_level", "Unknown"),
+                    safety_score,
+                    completeness_score,
+                    accuracy_score,
+                    timeliness_score,
+                    conformance_score,
+                    consistency_score,
+                ])
+                yield flush()
         
         return StreamingResponse(
-            iter([output.getvalue()]),
+            generate_rows(),
             media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=ctrust_studies_export.csv"}
+            headers={
+                "Content-Disposition": "attachment; filename=ctrust_studies_export.csv",
+                "ETag": snapshot.etag,
+                "X-Data-Version": str(snapshot.version),
+            }
         )
         
     except HTTPException:
@@ -8,16 +8,21 @@ Endpoints:
 - GET /api/v1/metrics/health - System health summary
 - GET /api/v1/metrics/agents - Agent performance metrics
 - GET /api/v1/metrics/guardian - Guardian-specific metrics
+- GET /api/v1/metrics/prometheus - Pipeline stage metrics (Prometheus text format)
+- GET /api/v1/metrics/traces - Recent pipeline traces (JSON span trees)
 """
 
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 
 from src.core import get_logger
+from src.core.tracing import tracer
 from src.guardian.guardian_agent import GuardianAgent
+from src.guardian.event_store import get_event_store
 from src.guardian.guardian_dashboard import GuardianDashboardData, HealthStatus
 
 logger = get_logger(__name__)
@@ -85,7 +90,7 @@ def get_guardian() -> GuardianAgent:
     """Get or create Guardian instance"""
     global _guardian
     if _guardian is None:
-        _guardian = GuardianAgent()
+        _guardian = GuardianAgent(event_store=get_event_store())
     return _guardian
 
 
@@ -272,4 +277,37 @@ async def get_guardian_dashboard():
     return dashboard.get_full_dashboard_data()
 
 
+@router.get("/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """
+    Pipeline stage durations and error counts for Prometheus scraping.
+    
+    Histograms are labelled by stage and, where known, study_id,
+    file_type, agent and method.
+    """
+    return PlainTextResponse(
+        tracer.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@router.get("/traces")
+async def get_pipeline_traces(
+    limit: int = Query(20, ge=1, le=200),
+    study_id: Optional[str] = Query(None, description="Only traces of this study"),
+):
+    """
+    Get recent pipeline traces, newest first.
+    
+    Each trace is a root span (ingestion run, feature extraction or
+    analysis) with its nested stage spans, plus per-stage totals.
+    """
+    return {
+        "enabled": tracer.enabled,
+        "traces": tracer.get_traces(limit=limit, study_id=study_id),
+        "stages": tracer.get_stage_stats(),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 __all__ = ["router"]
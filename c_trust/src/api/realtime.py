@@ -0,0 +1,657 @@
+"""
+Real-Time Push Hub
+==================
+Topic-based WebSocket fan-out for dashboard clients.
+
+Publishing never awaits a socket: each connection has a bounded send
+queue drained by its own sender task, so one slow client cannot stall the
+others. Study and DQI updates are queued as per-topic markers and rendered
+at send time as a diff against what that client last received, so any
+number of publishes while a client is busy collapse into one diff-only
+message. Discrete events (jobs, Guardian, notifications) are queued as-is;
+when a queue is full the oldest event is dropped and the client is sent a
+"resync" message. Sockets that fail or exceed the send timeout are closed
+and removed.
+
+Topics:
+    study:<study_id>            - study result snapshot on subscribe, then diffs
+    dqi                         - portfolio DQI score / risk level diffs
+    guardian                    - Guardian integrity events
+    notifications[:<user_id>]   - notification deliveries (all or one user)
+    jobs                        - background job completions
+
+Client messages:
+    {"action": "subscribe", "topics": ["study:STUDY_01", "dqi"]}
+    {"action": "unsubscribe", "topics": ["dqi"]}
+    {"action": "ping"}
+    {"action": "stats"}
+
+Usage:
+    hub = get_push_hub()
+    connection = await hub.connect(websocket, ["jobs"])
+    hub.publish("guardian", {"type": "guardian_event", ...})   # any thread
+    get_study_store().add_listener(hub.publish_snapshot)
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+from src.api.study_store import StudyResultSnapshot, StudyResultStore, get_study_store
+from src.core import get_logger
+from src.core.settings import settings
+
+logger = get_logger(__name__)
+
+
+# Topic families; "study" and "notifications" take a ":<id>" suffix
+TOPIC_FAMILIES = ("study", "dqi", "guardian", "notifications", "jobs")
+
+# Marks a study the client has not been sent yet
+_UNSENT = object()
+
+# Renders a queued marker into a message for one connection (None: nothing to send)
+Renderer = Callable[["PushConnection"], Optional[Dict[str, Any]]]
+
+
+def topic_family(topic: str) -> str:
+    """Family of a topic ("study:STUDY_01" -> "study")."""
+    return topic.split(":", 1)[0]
+
+
+def is_valid_topic(topic: str) -> bool:
+    """Whether a client may subscribe to topic."""
+    if not isinstance(topic, str):
+        return False
+    family, _, suffix = topic.partition(":")
+    if family not in TOPIC_FAMILIES:
+        return False
+    if family == "study":
+        return bool(suffix)
+    return family == "notifications" or not suffix
+
+
+def diff_values(previous: Any, current: Any, path: Tuple[str, ...] = ()) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+    """
+    Changes that turn previous into current.
+
+    Nested dicts are compared key by key; any other changed value (including
+    lists) is replaced whole.
+
+    Returns:
+        (changes, removed): [{"path": [...], "value": v}] and [[...]] key paths
+    """
+    if isinstance(previous, dict) and isinstance(current, dict):
+        changes, removed = [], []
+        for key, value in current.items():
+            if key not in previous:
+                changes.append({"path": [*path, key], "value": value})
+            elif previous[key] != value:
+                sub_changes, sub_removed = diff_values(previous[key], value, (*path, key))
+                changes.extend(sub_changes)
+                removed.extend(sub_removed)
+        removed.extend([*path, key] for key in previous if key not in current)
+        return changes, removed
+
+    if previous == current:
+        return [], []
+    return [{"path": list(path), "value": current}], []
+
+
+# ========================================
+# CONNECTION
+# ========================================
+
+@dataclass
+class _QueuedEvent:
+    """Queued discrete message or per-topic render marker."""
+    enqueued_at: float
+    message: Optional[Dict[str, Any]] = None
+    render: Optional[Renderer] = None
+
+
+@dataclass
+class ConnectionStats:
+    """Delivery and lag counters for one connection."""
+    enqueued: int = 0
+    sent: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    resyncs: int = 0
+    last_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    total_lag_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "resyncs": self.resyncs,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "avg_lag_ms": round(self.total_lag_ms / self.sent, 2) if self.sent else 0.0,
+        }
+
+
+class PushConnection:
+    """
+    One WebSocket client: subscriptions, bounded send queue and sender task.
+
+    All queue operations run on the event loop thread. Only the sender task
+    writes to the socket, so replies to client messages are queued too.
+    """
+
+    def __init__(
+        self,
+        hub: "PushHub",
+        websocket: WebSocket,
+        connection_id: str,
+        queue_size: int,
+        send_timeout: float,
+    ):
+        self.hub = hub
+        self.websocket = websocket
+        self.connection_id = connection_id
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.topics: set = set()
+        self.connected_at = datetime.now()
+        self.stats = ConnectionStats()
+        self.closed = False
+
+        # Last state sent to this client, diffed against at send time
+        self.sent_studies: Dict[str, Any] = {}
+        self.sent_dqi: Optional[Dict[str, Dict[str, Any]]] = None
+
+        self._queue: "OrderedDict[Hashable, _QueuedEvent]" = OrderedDict()
+        self._discrete = 0  # queued discrete messages (render markers don't count)
+        self._dropped_since_resync = 0
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def matches(self, topic: Optional[str]) -> bool:
+        """Whether a message on topic goes to this client (None: every client)."""
+        return topic is None or topic in self.topics or topic_family(topic) in self.topics
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    # ----------------------------------------
+    # Queue
+    # ----------------------------------------
+
+    def enqueue(self, message: Dict[str, Any]) -> None:
+        """Queue a discrete message, dropping the oldest one if the queue is full."""
+        if self.closed:
+            return
+        if self._discrete >= self.queue_size:
+            self._drop_oldest()
+        self._queue[("event", next(self._sequence))] = _QueuedEvent(time.monotonic(), message=message)
+        self._discrete += 1
+        self.stats.enqueued += 1
+        self._wakeup.set()
+
+    def enqueue_render(self, key: Hashable, render: Renderer) -> None:
+        """Queue a render marker; a marker already queued for key absorbs it."""
+        if self.closed:
+            return
+        self.stats.enqueued += 1
+        if key in self._queue:
+            self.stats.coalesced += 1
+            return
+        self._queue[key] = _QueuedEvent(time.monotonic(), render=render)
+        self._wakeup.set()
+
+    def _drop_oldest(self) -> None:
+        for key, queued in self._queue.items():
+            if queued.render is None:
+                del self._queue[key]
+                self._discrete -= 1
+                self.stats.dropped += 1
+                self._dropped_since_resync += 1
+                return
+
+    # ----------------------------------------
+    # Sender
+    # ----------------------------------------
+
+    async def _run(self) -> None:
+        """Drain the queue to the socket until the connection closes."""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._queue:
+                    if self._dropped_since_resync:
+                        await self._send(self._resync_message(), time.monotonic())
+                        self.stats.resyncs += 1
+                        self._dropped_since_resync = 0
+                        continue
+
+                    _, queued = self._queue.popitem(last=False)
+                    if queued.render is None:
+                        self._discrete -= 1
+                        message = queued.message
+                    else:
+                        message = queued.render(self)
+                    if message is not None:
+                        await self._send(message, queued.enqueued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            reason = "send timed out" if isinstance(e, asyncio.TimeoutError) else f"send failed: {e}"
+            logger.warning(f"WebSocket {self.connection_id} dropped ({reason})")
+            await self.hub.disconnect(self, close=True)
+
+    async def _send(self, message: Dict[str, Any], enqueued_at: float) -> None:
+        await asyncio.wait_for(self.websocket.send_json(message), timeout=self.send_timeout)
+        lag_ms = (time.monotonic() - enqueued_at) * 1000
+        self.stats.sent += 1
+        self.stats.last_lag_ms = lag_ms
+        self.stats.max_lag_ms = max(self.stats.max_lag_ms, lag_ms)
+        self.stats.total_lag_ms += lag_ms
+
+    def _resync_message(self) -> Dict[str, Any]:
+        return {
+            "type": "resync",
+            "reason": "send queue overflow",
+            "dropped": self._dropped_since_resync,
+            "topics": sorted(self.topics),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    async def close(self, close_socket: bool) -> None:
+        """Stop the sender task and optionally close the socket."""
+        self.closed = True
+        self._queue.clear()
+        self._discrete = 0
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if close_socket:
+            try:
+                await asyncio.wait_for(self.websocket.close(), timeout=self.send_timeout)
+            except Exception:
+                pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        oldest = next(iter(self._queue.values()), None)
+        return {
+            "connection_id": self.connection_id,
+            "connected_at": self.connected_at.isoformat(),
+            "topics": sorted(self.topics),
+            "queue_depth": self.queue_depth,
+            "oldest_pending_ms": round((time.monotonic() - oldest.enqueued_at) * 1000, 2) if oldest else 0.0,
+            **self.stats.to_dict(),
+        }
+
+
+# ========================================
+# PUSH HUB
+# ========================================
+
+class PushHub:
+    """
+    Topic-subscribed WebSocket fan-out.
+
+    Features:
+    - Thread-safe publish (marshalled onto the event loop)
+    - Concurrent delivery: one bounded queue and sender task per client
+    - Diff-only study and DQI updates, coalesced per client
+    - Dead and timed-out sockets removed
+    - Per-connection lag metrics
+    """
+
+    DEFAULT_TOPICS = ("jobs",)
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        store: Optional[StudyResultStore] = None,
+    ):
+        """
+        Initialize push hub.
+
+        Args:
+            queue_size: Discrete messages queued per client (defaults to settings.PUSH_QUEUE_SIZE)
+            send_timeout: Seconds before a blocked send disconnects the client
+                          (defaults to settings.PUSH_SEND_TIMEOUT_SECONDS)
+            store: Study store rendered for study/DQI topics (defaults to the shared store)
+        """
+        self.queue_size = queue_size or getattr(settings, 'PUSH_QUEUE_SIZE', 256)
+        self.send_timeout = send_timeout or getattr(settings, 'PUSH_SEND_TIMEOUT_SECONDS', 5.0)
+        self._store = store
+
+        self._connections: Dict[str, PushConnection] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+        self._dqi_cache: Tuple[Optional[StudyResultSnapshot], Dict[str, Dict[str, Any]]] = (None, {})
+
+        self._stats = {
+            "connected": 0,
+            "disconnected": 0,
+            "published": 0,
+            "fanned_out": 0,
+        }
+
+    @property
+    def store(self) -> StudyResultStore:
+        return self._store or get_study_store()
+
+    @property
+    def active_connections(self) -> List[PushConnection]:
+        return list(self._connections.values())
+
+    # ----------------------------------------
+    # Connections
+    # ----------------------------------------
+
+    async def connect(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None) -> PushConnection:
+        """Accept a socket and start its sender task."""
+        await websocket.accept()
+        self._loop = asyncio.get_running_loop()
+
+        connection = PushConnection(
+            self,
+            websocket,
+            connection_id=f"ws_{next(self._ids)}",
+            queue_size=self.queue_size,
+            send_timeout=self.send_timeout,
+        )
+        self._connections[connection.connection_id] = connection
+        self._stats["connected"] += 1
+        connection.start()
+        self.subscribe(connection, self.DEFAULT_TOPICS if topics is None else topics)
+
+        logger.info(f"WebSocket {connection.connection_id} connected. Total connections: {len(self._connections)}")
+        return connection
+
+    async def disconnect(self, connection: PushConnection, close: bool = False) -> None:
+        """Remove a connection (idempotent)."""
+        if self._connections.pop(connection.connection_id, None) is None:
+            return
+        self._stats["disconnected"] += 1
+        await connection.close(close_socket=close)
+        logger.info(f"WebSocket {connection.connection_id} disconnected. Total connections: {len(self._connections)}")
+
+    async def close(self) -> None:
+        """Disconnect every client."""
+        for connection in self.active_connections:
+            await self.disconnect(connection, close=True)
+
+    # ----------------------------------------
+    # Subscriptions
+    # ----------------------------------------
+
+    def subscribe(self, connection: PushConnection, topics: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Add topics to a connection; study and DQI topics get their current state.
+
+        Returns:
+            (accepted, rejected) topics
+        """
+        accepted, rejected = [], []
+        for topic in topics:
+            if not is_valid_topic(topic):
+                rejected.append(topic)
+                continue
+            accepted.append(topic)
+            if topic in connection.topics:
+                continue
+            connection.topics.add(topic)
+            if topic_family(topic) == "study":
+                study_id = topic.split(":", 1)[1]
+                connection.enqueue_render(("study", study_id), self._study_renderer(study_id))
+            elif topic == "dqi":
+                connection.enqueue_render(("dqi",), self._render_dqi)
+        return accepted, rejected
+
+    def unsubscribe(self, connection: PushConnection, topics: Iterable[str]) -> List[str]:
+        """Remove topics from a connection; returns those it was subscribed to."""
+        removed = []
+        for topic in topics:
+            if topic not in connection.topics:
+                continue
+            connection.topics.discard(topic)
+            removed.append(topic)
+            if topic_family(topic) == "study":
+                connection.sent_studies.pop(topic.split(":", 1)[1], None)
+            elif topic == "dqi":
+                connection.sent_dqi = None
+        return removed
+
+    async def handle_client_message(self, connection: PushConnection, message: Any) -> None:
+        """Apply a client message and queue the reply."""
+        if not isinstance(message, dict):
+            connection.enqueue(self._error("Expected a JSON object"))
+            return
+
+        action = message.get("action")
+        topics = message.get("topics") or []
+        if isinstance(topics, str):
+            topics = [topics]
+
+        if action == "subscribe":
+            accepted, rejected = self.subscribe(connection, topics)
+            reply = {"type": "subscribed", "topics": accepted, "rejected": rejected}
+        elif action == "unsubscribe":
+            reply = {"type": "unsubscribed", "topics": self.unsubscribe(connection, topics)}
+        elif action == "ping":
+            reply = {"type": "pong"}
+        elif action == "stats":
+            reply = {"type": "stats", "connection": connection.to_dict()}
+        else:
+            connection.enqueue(self._error(f"Unknown action: {action}"))
+            return
+
+        connection.enqueue({**reply, "timestamp": datetime.now().isoformat()})
+
+    @staticmethod
+    def _error(detail: str) -> Dict[str, Any]:
+        return {"type": "error", "detail": detail, "timestamp": datetime.now().isoformat()}
+
+    # ----------------------------------------
+    # Publishing
+    # ----------------------------------------
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        """
+        Queue a message for every client subscribed to topic (or its family).
+
+        Safe to call from any thread; never blocks on a socket.
+        """
+        self._stats["published"] += 1
+        self._dispatch(self._fan_out, topic, {"topic": topic, "timestamp": datetime.now().isoformat(), **message})
+
+    async def broadcast(self, message: Dict[str, Any]) -> None:
+        """Queue a message for subscribers of message["topic"], or every client if it has none."""
+        self._stats["published"] += 1
+        self._fan_out(message.get("topic"), message)
+
+    def publish_snapshot(self, previous: StudyResultSnapshot, snapshot: StudyResultSnapshot) -> None:
+        """Study store listener: queue diffs for changed studies and DQI scores."""
+        changed = [
+            study_id
+            for study_id in set(previous.studies) | set(snapshot.studies)
+            if previous.studies.get(study_id) != snapshot.studies.get(study_id)
+        ]
+        if not changed:
+            return
+
+        dqi_changed = any(
+            self._dqi_entry(previous.studies.get(study_id)) != self._dqi_entry(snapshot.studies.get(study_id))
+            for study_id in changed
+        )
+        self._stats["published"] += 1
+        self._dispatch(self._mark_studies_changed, changed, dqi_changed)
+
+    def publish_guardian_event(self, event: Any) -> None:
+        """Guardian event listener (GuardianAgent.add_event_listener)."""
+        self.publish("guardian", {"type": "guardian_event", "event": event.to_dict()})
+
+    def publish_notification_delivery(self, delivery: Any) -> None:
+        """Notification delivery callback (NotificationRoutingEngine.register_delivery_callback)."""
+        self.publish(f"notifications:{delivery.user_id}", {"type": "notification", "delivery": delivery.to_dict()})
+
+    def _dispatch(self, fn: Callable[..., None], *args: Any) -> None:
+        """Run fn on the event loop, from whichever thread published."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._connections:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            fn(*args)
+        else:
+            try:
+                loop.call_soon_threadsafe(fn, *args)
+            except RuntimeError:
+                pass  # loop closed between the check and the call
+
+    def _fan_out(self, topic: Optional[str], message: Dict[str, Any]) -> None:
+        for connection in list(self._connections.values()):
+            if connection.matches(topic):
+                connection.enqueue(message)
+                self._stats["fanned_out"] += 1
+
+    def _mark_studies_changed(self, study_ids: List[str], dqi_changed: bool) -> None:
+        for connection in list(self._connections.values()):
+            for study_id in study_ids:
+                if f"study:{study_id}" in connection.topics:
+                    connection.enqueue_render(("study", study_id), self._study_renderer(study_id))
+                    self._stats["fanned_out"] += 1
+            if dqi_changed and "dqi" in connection.topics:
+                connection.enqueue_render(("dqi",), self._render_dqi)
+                self._stats["fanned_out"] += 1
+
+    # ----------------------------------------
+    # Rendering (at send time, per connection)
+    # ----------------------------------------
+
+    def _study_renderer(self, study_id: str) -> Renderer:
+        return lambda connection: self._render_study(connection, study_id)
+
+    def _render_study(self, connection: PushConnection, study_id: str) -> Optional[Dict[str, Any]]:
+        """Full snapshot the first time, then only what changed since the last send."""
+        snapshot = self.store.snapshot()
+        current = snapshot.studies.get(study_id)
+        previous = connection.sent_studies.get(study_id, _UNSENT)
+        if previous is current:
+            return None
+        connection.sent_studies[study_id] = current
+
+        message = {
+            "topic": f"study:{study_id}",
+            "study_id": study_id,
+            "version": snapshot.version,
+            "timestamp": datetime.now().isoformat(),
+        }
+        if previous is _UNSENT or previous is None or current is None:
+            return {**message, "type": "study_snapshot", "data": current}
+
+        changes, removed = diff_values(previous, current)
+        if not changes and not removed:
+            return None
+        return {**message, "type": "study_update", "changes": changes, "removed": removed}
+
+    @staticmethod
+    def _dqi_entry(study: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not study:
+            return None
+        return {"overall_score": study.get("overall_score"), "risk_level": study.get("risk_level")}
+
+    def _dqi_scores(self, snapshot: StudyResultSnapshot) -> Dict[str, Dict[str, Any]]:
+        """DQI summary of a snapshot (shared by all connections)."""
+        cached_snapshot, scores = self._dqi_cache
+        if cached_snapshot is not snapshot:
+            scores = {
+                study_id: self._dqi_entry(study)
+                for study_id, study in snapshot.studies.items()
+                if study
+            }
+            self._dqi_cache = (snapshot, scores)
+        return scores
+
+    def _render_dqi(self, connection: PushConnection) -> Optional[Dict[str, Any]]:
+        snapshot = self.store.snapshot()
+        scores = self._dqi_scores(snapshot)
+        previous = connection.sent_dqi
+        connection.sent_dqi = scores
+
+        message = {"topic": "dqi", "version": snapshot.version, "timestamp": datetime.now().isoformat()}
+        if previous is None:
+            return {**message, "type": "dqi_snapshot", "scores": scores}
+
+        changed = {study_id: entry for study_id, entry in scores.items() if previous.get(study_id) != entry}
+        removed = [study_id for study_id in previous if study_id not in scores]
+        if not changed and not removed:
+            return None
+        return {**message, "type": "dqi_update", "scores": changed, "removed": removed}
+
+    # ----------------------------------------
+    # Statistics
+    # ----------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hub counters and per-connection queue depth and lag."""
+        connections = [connection.to_dict() for connection in self.active_connections]
+        return {
+            **self._stats,
+            "active_connections": len(connections),
+            "queue_size": self.queue_size,
+            "send_timeout_seconds": self.send_timeout,
+            "max_lag_ms": max((c["max_lag_ms"] for c in connections), default=0.0),
+            "connections": connections,
+        }
+
+
+# ========================================
+# SINGLETON INSTANCE
+# ========================================
+
+_hub_instance: Optional[PushHub] = None
+
+
+def get_push_hub() -> PushHub:
+    """Get or create singleton push hub."""
+    global _hub_instance
+    if _hub_instance is None:
+        _hub_instance = PushHub()
+    return _hub_instance
+
+
+def reset_push_hub() -> None:
+    """Reset push hub instance (for testing)."""
+    global _hub_instance
+    _hub_instance = None
+
+
+# ========================================
+# EXPORTS
+# ========================================
+
+__all__ = [
+    "TOPIC_FAMILIES",
+    "PushHub",
+    "PushConnection",
+    "ConnectionStats",
+    "diff_values",
+    "is_valid_topic",
+    "get_push_hub",
+    "reset_push_hub",
+]
@@ -0,0 +1,606 @@
+"""
+Site Index
+==========
+In-memory index over the sites and patients of a published study result
+snapshot, so site drill-down and site lists never scan every study.
+
+One immutable index is built per snapshot version, eagerly from the study
+store listener or lazily on first use:
+- site_id -> study / site entries (constant-time drill-down)
+- study_id -> sites sorted by site_id, plus patient data quality summary
+- sorted orderings per sort field, built on first use
+
+Lists are paginated with opaque keyset cursors: a cursor holds the sort key
+of the last item returned, so pages stay consistent as results are
+republished and a page costs O(log n + page size). Filtered totals are
+counted once per snapshot and filter.
+
+Usage:
+    index = get_site_index()
+    entry = index.get_site("SITE_001", study_id="STUDY_01")
+    page = index.query_sites(study_id="STUDY_01", sort="dqi_score", order="desc", limit=50)
+    page.items, page.next_cursor
+"""
+
+import base64
+import json
+import math
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.api.study_store import StudyResultSnapshot, get_study_store
+from src.core import get_logger
+
+logger = get_logger(__name__)
+
+
+# Sort order of site risk levels (unknown levels sort after these)
+RISK_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+SITE_FIELDS = (
+    "site_id",
+    "site_name",
+    "enrollment",
+    "target_enrollment",
+    "enrollment_rate",
+    "saes",
+    "queries",
+    "open_queries",
+    "resolved_queries",
+    "risk_level",
+    "dqi_score",
+    "completeness_rate",
+    "last_data_entry",
+    "patients",
+    "data_quality_warning",
+)
+
+SITE_SORT_FIELDS = (
+    "site_id",
+    "site_name",
+    "study_id",
+    "enrollment",
+    "enrollment_rate",
+    "saes",
+    "queries",
+    "open_queries",
+    "risk_level",
+    "dqi_score",
+    "completeness_rate",
+)
+
+SORT_ORDERS = ("asc", "desc")
+
+# Filtered-list totals remembered per index (one index per snapshot)
+FILTER_COUNT_CACHE_SIZE = 256
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or from another query."""
+
+
+# ========================================
+# INDEX ENTRIES
+# ========================================
+
+@dataclass(frozen=True)
+class SiteEntry:
+    """One indexed site with its derived metrics."""
+    study_id: str
+    site_id: str
+    record: Mapping[str, Any]
+    patients: Tuple[str, ...]
+    patients_valid: bool
+    enrollment_rate: Optional[float]
+    dqi_score: float
+    completeness_rate: float
+
+    @classmethod
+    def from_record(cls, study_id: str, site: Mapping[str, Any]) -> "SiteEntry":
+        site_id = site.get("site_id", "UNKNOWN")
+        patients = site.get("patients")
+        patients_valid = isinstance(patients, list)
+
+        enrollment_rate = None
+        if site.get("target_enrollment"):
+            enrollment_rate = (site.get("enrollment", 0) / site["target_enrollment"]) * 100
+
+        return cls(
+            study_id=study_id,
+            site_id=site_id,
+            record=site,
+            patients=tuple(patients) if patients_valid else (),
+            patients_valid=patients_valid,
+            enrollment_rate=enrollment_rate,
+            # Mock metrics until site-level DQI is computed by the pipeline
+            dqi_score=site.get("dqi_score", 70 + (hash(site_id) % 25)),
+            completeness_rate=site.get("completeness_rate", 0.85 + (hash(site_id) % 15) / 100),
+        )
+
+    @property
+    def roster(self) -> Tuple[str, ...]:
+        """Patient IDs served by site drill-down (mock until patient records are published)."""
+        return tuple(f"PAT_{self.site_id}_{i:03d}" for i in range(1, self.record.get("enrollment", 0) + 1))
+
+    @property
+    def open_queries(self) -> Any:
+        return self.record.get("open_queries", self.record.get("queries", 0))
+
+    @property
+    def risk_level(self) -> str:
+        return self.record.get("risk_level", "Low")
+
+    def value(self, name: str) -> Any:
+        """Field value used for sorting and filtering."""
+        if name in ("study_id", "site_id", "enrollment_rate", "dqi_score", "completeness_rate",
+                    "open_queries", "risk_level"):
+            return getattr(self, name)
+        return self.record.get(name)
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Site detail as served by the site list endpoints."""
+        patients = list(self.patients)
+        detail = {
+            "site_id": self.site_id,
+            "site_name": self.record.get("site_name", f"Site {self.site_id}"),
+            "enrollment": self.record.get("enrollment", 0),
+            "target_enrollment": self.record.get("target_enrollment"),
+            "enrollment_rate": self.enrollment_rate,
+            "saes": self.record.get("saes", 0),
+            "queries": self.record.get("queries", 0),
+            "open_queries": self.open_queries,
+            "resolved_queries": self.record.get("resolved_queries", 0),
+            "risk_level": self.risk_level,
+            "dqi_score": self.dqi_score,
+            "completeness_rate": self.completeness_rate,
+            "last_data_entry": self.record.get("last_data_entry"),
+            "patients": patients,
+            "data_quality_warning": None if patients else "Patient data unavailable",
+        }
+        if fields:
+            return {name: detail[name] for name in fields}
+        return detail
+
+
+@dataclass
+class StudySites:
+    """A study's sites (sorted by site_id) and patient data quality."""
+    study_id: str
+    sites: List[SiteEntry] = field(default_factory=list)
+    total_patients: int = 0
+    sites_with_patients: int = 0
+    sites_missing_patients: int = 0
+    warnings: List[str] = field(default_factory=list)
+
+    def data_quality(self) -> Dict[str, Any]:
+        if self.sites_missing_patients == 0:
+            status, message = "complete", "All sites have complete patient data"
+        elif self.sites_with_patients == 0:
+            status, message = "unavailable", "Patient data unavailable for all sites. Data extraction failed."
+        else:
+            status = "partial"
+            message = (
+                f"Patient data available for {self.sites_with_patients}/{len(self.sites)} sites. "
+                f"{self.sites_missing_patients} sites missing patient data."
+            )
+        return {
+            "status": status,
+            "message": message,
+            "sites_with_patient_data": self.sites_with_patients,
+            "sites_missing_patient_data": self.sites_missing_patients,
+            "warnings": self.warnings or None,
+        }
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated list."""
+    items: List[Any]
+    next_cursor: Optional[str]
+    total: int
+
+
+# ========================================
+# CURSORS
+# ========================================
+
+def _number(value: Any) -> Optional[float]:
+    """Numeric value for range filters; None for missing or non-numeric values."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+        return None
+    return value
+
+
+def _sort_key(entry: SiteEntry, sort: str) -> Tuple:
+    """
+    Total order for a sort field: (missing, type rank, value, study_id, site_id).
+
+    Numbers sort before strings and other JSON values compare by their JSON
+    text, so mixed-type fields never raise; missing values (and NaN) sort
+    last (ascending).
+    """
+    value = entry.value(sort)
+    if sort == "risk_level":
+        value = RISK_RANK.get(str(value).lower(), len(RISK_RANK)) if value is not None else None
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return (1, 0, 0, entry.study_id, entry.site_id)
+    if _number(value) is not None:
+        return (0, 0, value, entry.study_id, entry.site_id)
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True)
+    return (0, 1, value, entry.study_id, entry.site_id)
+
+
+def _valid_site_key(key: Tuple) -> bool:
+    """Whether a decoded cursor key has the shape _sort_key produces."""
+    if len(key) != 5 or key[0] not in (0, 1) or key[1] not in (0, 1):
+        return False
+    if not all(type(part) is int for part in key[:2]) or not all(isinstance(part, str) for part in key[3:]):
+        return False
+    if key[1] == 0:
+        return _number(key[2]) is not None
+    return isinstance(key[2], str)
+
+
+def _valid_patient_key(key: Tuple) -> bool:
+    """Whether a decoded cursor key is a (patient_id, position) pair."""
+    return len(key) == 2 and isinstance(key[0], str) and type(key[1]) is int
+
+
+def encode_cursor(scope: str, key: Sequence[Any]) -> str:
+    """Opaque cursor for the item with the given sort key."""
+    payload = json.dumps([scope, list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    scope: str,
+    key_check: Optional[Callable[[Tuple], bool]] = None,
+) -> Tuple:
+    """
+    Sort key from a cursor, checking it belongs to the same list and ordering.
+
+    Args:
+        cursor: Cursor from encode_cursor
+        scope: Scope the cursor must have been issued for
+        key_check: Validates the key's length and element types against the sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_scope, key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = tuple(key)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+    if cursor_scope != scope:
+        raise InvalidCursorError("Cursor does not belong to this query (sort order changed?)")
+    if key_check is not None and not key_check(key):
+        raise InvalidCursorError("Malformed cursor: sort key does not match the sort field")
+    return key
+
+
+def paginate(
+    items: Sequence[Any],
+    keys: Sequence[Tuple],
+    scope: str,
+    order: str = "asc",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    predicate: Optional[Callable[[Any], bool]] = None,
+    key_check: Optional[Callable[[Tuple], bool]] = None,
+    total: Optional[int] = None,
+) -> Page:
+    """
+    Keyset-paginate items sorted ascending by keys.
+
+    Args:
+        items: Items in ascending key order
+        keys: Sort key of each item
+        scope: Identifies the list and ordering (cursors are only valid within it)
+        order: "asc" or "desc"
+        limit: Page size
+        cursor: Cursor from the previous page
+        predicate: Filter applied while walking the ordering
+        key_check: Validates decoded cursor keys (see decode_cursor)
+        total: Number of items matching predicate, if already known
+            (otherwise counted with a scan of items)
+    """
+    if order not in SORT_ORDERS:
+        raise ValueError(f"Unknown sort order '{order}', expected one of {SORT_ORDERS}")
+
+    scope = f"{scope}:{order}"
+    after = decode_cursor(cursor, scope, key_check) if cursor else None
+    if order == "asc":
+        start = bisect_right(keys, after) if cursor else 0
+        positions = range(start, len(items))
+    else:
+        start = bisect_left(keys, after) - 1 if cursor else len(items) - 1
+        positions = range(start, -1, -1)
+
+    page, last, more = [], None, False
+    for position in positions:
+        item = items[position]
+        if predicate is not None and not predicate(item):
+            continue
+        if len(page) == limit:
+            more = True
+            break
+        page.append(item)
+        last = position
+
+    if predicate is None:
+        total = len(items)
+    elif total is None:
+        total = sum(1 for item in items if predicate(item))
+
+    next_cursor = encode_cursor(scope, keys[last]) if more and last is not None else None
+    return Page(items=page, next_cursor=next_cursor, total=total)
+
+
+# ========================================
+# SITE INDEX
+# ========================================
+
+class SiteIndex:
+    """Immutable site/patient index over one study result snapshot."""
+
+    def __init__(self, snapshot: StudyResultSnapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        self._by_site: Dict[str, List[SiteEntry]] = {}
+        self._by_study_site: Dict[Tuple[str, str], SiteEntry] = {}
+        self._studies: Dict[str, StudySites] = {}
+        self._orderings: Dict[Tuple[Optional[str], str], Tuple[List[SiteEntry], List[Tuple]]] = {}
+        self._patient_orderings: Dict[Tuple[str, str], List[Tuple[str, int]]] = {}
+        self._filter_counts: "OrderedDict[Tuple, int]" = OrderedDict()
+        self._lock = Lock()
+
+        for study_id, study_data in snapshot.studies.items():
+            self._index_study(study_id, study_data or {})
+
+        logger.info(
+            f"Site index v{self.version} built: {len(self._by_study_site)} sites "
+            f"across {len(self._studies)} studies"
+        )
+
+    def _index_study(self, study_id: str, study_data: Mapping[str, Any]) -> None:
+        study = StudySites(study_id=study_id)
+        for site in study_data.get("sites") or []:
+            entry = SiteEntry.from_record(study_id, site)
+            study.sites.append(entry)
+            self._by_study_site.setdefault((study_id, entry.site_id), entry)
+            self._by_site.setdefault(entry.site_id, []).append(entry)
+
+            if entry.patients_valid:
+                study.sites_with_patients += 1
+                study.total_patients += len(entry.patients)
+                enrollment = site.get("enrollment", 0)
+                if len(entry.patients) != enrollment:
+                    study.warnings.append(
+                        f"Site {entry.site_id}: Patient count mismatch "
+                        f"(enrollment: {enrollment}, patients: {len(entry.patients)})"
+                    )
+            else:
+                study.sites_missing_patients += 1
+                study.warnings.append(
+                    f"Site {entry.site_id}: Patient data unavailable (extraction failed)"
+                    if site.get("patients") is None
+                    else f"Site {entry.site_id}: Invalid patient data format"
+                )
+
+        study.sites.sort(key=lambda entry: entry.site_id)
+        self._studies[study_id] = study
+
+    # ----------------------------------------
+    # Lookups
+    # ----------------------------------------
+
+    def has_study(self, study_id: str) -> bool:
+        return study_id in self._studies
+
+    def study_sites(self, study_id: str) -> Optional[StudySites]:
+        """A study's sites sorted by site_id, or None for an unknown study."""
+        return self._studies.get(study_id)
+
+    def get_site(self, site_id: str, study_id: Optional[str] = None) -> Optional[SiteEntry]:
+        """
+        Site by ID in constant time.
+
+        Site IDs are only unique within a study; without study_id the site
+        from the first study (in published order) that has it is returned.
+        """
+        if study_id is not None:
+            return self._by_study_site.get((study_id, site_id))
+        entries = self._by_site.get(site_id)
+        return entries[0] if entries else None
+
+    def studies_for_site(self, site_id: str) -> List[str]:
+        return [entry.study_id for entry in self._by_site.get(site_id, [])]
+
+    @property
+    def site_count(self) -> int:
+        return len(self._by_study_site)
+
+    # ----------------------------------------
+    # Paginated queries
+    # ----------------------------------------
+
+    def _ordering(self, study_id: Optional[str], sort: str) -> Tuple[List[SiteEntry], List[Tuple]]:
+        """Sites of a study (or all studies) sorted by a field, built once."""
+        cache_key = (study_id, sort)
+        ordering = self._orderings.get(cache_key)
+        if ordering is None:
+            if study_id is None:
+                entries: Iterable[SiteEntry] = (e for s in self._studies.values() for e in s.sites)
+            else:
+                entries = self._studies[study_id].sites
+            keyed = sorted(((_sort_key(entry, sort), entry) for entry in entries), key=lambda pair: pair[0])
+            ordering = ([entry for _, entry in keyed], [key for key, _ in keyed])
+            with self._lock:
+                self._orderings[cache_key] = ordering
+        return ordering
+
+    def query_sites(
+        self,
+        study_id: Optional[str] = None,
+        sort: str = "site_id",
+        order: str = "asc",
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        risk_levels: Optional[Sequence[str]] = None,
+        min_dqi: Optional[float] = None,
+        max_dqi: Optional[float] = None,
+        min_open_queries: Optional[int] = None,
+        max_open_queries: Optional[int] = None,
+    ) -> Page:
+        """
+        One page of sites for a study (or the whole portfolio).
+
+        Raises:
+            KeyError: Unknown study
+            ValueError: Unknown sort field/order or an invalid cursor
+        """
+        if sort not in SITE_SORT_FIELDS:
+            raise ValueError(f"Unknown sort field '{sort}', expected one of {SITE_SORT_FIELDS}")
+        if study_id is not None and study_id not in self._studies:
+            raise KeyError(study_id)
+
+        wanted_risk = {level.lower() for level in risk_levels} if risk_levels else None
+
+        # Sites with a missing or non-numeric value never match a range on it
+        def in_range(value: Any, low: Optional[float], high: Optional[float]) -> bool:
+            if low is None and high is None:
+                return True
+            value = _number(value)
+            if value is None:
+                return False
+            return (low is None or value >= low) and (high is None or value <= high)
+
+        def matches(entry: SiteEntry) -> bool:
+            if wanted_risk is not None and str(entry.risk_level).lower() not in wanted_risk:
+                return False
+            if not in_range(entry.dqi_score, min_dqi, max_dqi):
+                return False
+            return in_range(entry.open_queries or 0, min_open_queries, max_open_queries)
+
+        filters = (
+            tuple(sorted(wanted_risk)) if wanted_risk is not None else None,
+            min_dqi, max_dqi, min_open_queries, max_open_queries,
+        )
+        filtered = any(v is not None for v in filters)
+        entries, keys = self._ordering(study_id, sort)
+        return paginate(
+            entries, keys, f"sites:{study_id or '*'}:{sort}", order, limit, cursor,
+            predicate=matches if filtered else None,
+            key_check=_valid_site_key,
+            total=self._filtered_count(study_id, filters, entries, matches) if filtered else None,
+        )
+
+    def _filtered_count(
+        self,
+        study_id: Optional[str],
+        filters: Tuple,
+        entries: Sequence[SiteEntry],
+        matches: Callable[[SiteEntry], bool],
+    ) -> int:
+        """Sites matching a filter, counted once per index (i.e. per snapshot)."""
+        cache_key = (study_id, filters)
+        with self._lock:
+            count = self._filter_counts.get(cache_key)
+            if count is not None:
+                self._filter_counts.move_to_end(cache_key)
+                return count
+
+        count = sum(1 for entry in entries if matches(entry))
+        with self._lock:
+            self._filter_counts[cache_key] = count
+            if len(self._filter_counts) > FILTER_COUNT_CACHE_SIZE:
+                self._filter_counts.popitem(last=False)
+        return count
+
+    def query_patients(
+        self,
+        entry: SiteEntry,
+        order: str = "asc",
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """
+        One page of a site's roster sorted by patient_id.
+
+        Items are (patient_id, position) pairs; position is the patient's
+        index in the site's roster.
+        """
+        cache_key = (entry.study_id, entry.site_id)
+        ordering = self._patient_orderings.get(cache_key)
+        if ordering is None:
+            ordering = sorted((str(patient_id), position) for position, patient_id in enumerate(entry.roster))
+            with self._lock:
+                self._patient_orderings[cache_key] = ordering
+        return paginate(
+            ordering, ordering, f"patients:{entry.study_id}:{entry.site_id}", order, limit, cursor,
+            key_check=_valid_patient_key,
+        )
+
+
+# ========================================
+# SINGLETON INSTANCE
+# ========================================
+
+_index_instance: Optional[SiteIndex] = None
+_index_lock = Lock()
+
+
+def get_site_index(snapshot: Optional[StudyResultSnapshot] = None) -> SiteIndex:
+    """
+    Index for a snapshot (default: the study store's current snapshot).
+
+    Built once per snapshot; later calls for the same snapshot reuse it.
+    """
+    global _index_instance
+    snapshot = snapshot or get_study_store().snapshot()
+    index = _index_instance
+    if index is not None and index.snapshot is snapshot:
+        return index
+
+    with _index_lock:
+        index = _index_instance
+        if index is None or index.snapshot is not snapshot:
+            index = SiteIndex(snapshot)
+            # Never replace a newer index with one for an older snapshot
+            if _index_instance is None or _index_instance.version <= index.version:
+                _index_instance = index
+    return index
+
+
+def rebuild_site_index(previous: StudyResultSnapshot, snapshot: StudyResultSnapshot) -> None:
+    """Study store listener: index results as soon as they are published."""
+    get_site_index(snapshot)
+
+
+def reset_site_index() -> None:
+    """Reset index instance (for testing)."""
+    global _index_instance
+    _index_instance = None
+
+
+# ========================================
+# EXPORTS
+# ========================================
+
+__all__ = [
+    "SITE_FIELDS",
+    "SITE_SORT_FIELDS",
+    "InvalidCursorError",
+    "Page",
+    "SiteEntry",
+    "SiteIndex",
+    "StudySites",
+    "paginate",
+    "get_site_index",
+    "rebuild_site_index",
+    "reset_site_index",
+]
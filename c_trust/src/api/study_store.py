@@ -0,0 +1,300 @@
+"""
+Study Result Store
+==================
+Shared in-memory store for per-study pipeline results (DQI, features,
+timeline, sites) served by the dashboard endpoints.
+
+The analysis pipeline publishes a complete result set; the store swaps it
+in atomically as a new immutable snapshot with a version number and ETag.
+Reads never touch disk. data_cache.json is still written on publish so
+results survive restarts and remain available to offline scripts.
+
+Snapshot data contract:
+- publish() copies its input (through a JSON round-trip), so a publisher
+  may keep mutating its own dicts after publishing.
+- Only the top-level mapping is read-only (MappingProxyType). The nested
+  study dicts and lists are plain objects shared by every reader of the
+  snapshot, its ETag and the derived indexes (site index, push diffs).
+  They are not deep-frozen: endpoints and exports rely on dict/list
+  isinstance checks and JSON encoding.
+- Readers must therefore treat nested values as read-only. To change a
+  study, build a new dict, e.g. {**store.get_study(sid), "risk_level": ...},
+  or take copy.deepcopy() of it, and hand it to publish_study(). Never
+  edit the dict returned by get_study() in place.
+
+Usage:
+    store = get_study_store()
+    store.publish({"STUDY_01": {...}})      # pipeline
+    snapshot = store.snapshot()             # endpoints
+    snapshot.studies.get("STUDY_01")
+    store.add_listener(on_publish)          # on_publish(previous, snapshot)
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock, RLock
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from fastapi import Request, Response
+
+from src.core import get_logger
+
+logger = get_logger(__name__)
+
+
+# Default location shared with scripts/update_dashboard_cache.py and src/predictions
+DEFAULT_RESULTS_FILE = Path(__file__).parents[2] / "data_cache.json"
+
+
+# ========================================
+# SNAPSHOT
+# ========================================
+
+@dataclass(frozen=True)
+class StudyResultSnapshot:
+    """
+    Immutable view of one published result set.
+
+    studies is a read-only mapping; the per-study dicts inside it are shared
+    and must not be mutated (see the module docstring).
+    """
+    version: int
+    etag: str
+    studies: Mapping[str, Dict[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    published_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "etag": self.etag,
+            "studies_count": len(self.studies),
+            "published_at": self.published_at.isoformat() if self.published_at else None,
+        }
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize datetimes and numpy scalars; fall back to str."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+# ========================================
+# STUDY RESULT STORE
+# ========================================
+
+class StudyResultStore:
+    """
+    Version-stamped, in-memory study result store.
+
+    Readers take a reference to the current snapshot; publishers build a new
+    snapshot and swap the reference, so readers never see a partial update.
+    """
+
+    def __init__(self, results_file: Optional[str] = None):
+        """
+        Initialize store.
+
+        Args:
+            results_file: JSON file used for persistence (defaults to c_trust/data_cache.json)
+        """
+        self.results_file = Path(results_file) if results_file else DEFAULT_RESULTS_FILE
+        self._lock = Lock()
+        self._publish_lock = RLock()  # serializes publishers (read-modify-write in publish_study)
+        self._snapshot = StudyResultSnapshot(version=0, etag=self._make_etag(0, "empty"))
+        self._listeners: List[Callable[[StudyResultSnapshot, StudyResultSnapshot], None]] = []
+
+    def snapshot(self) -> StudyResultSnapshot:
+        """Current snapshot (no locking or disk access)."""
+        return self._snapshot
+
+    def get_study(self, study_id: str) -> Optional[Dict[str, Any]]:
+        """Result for one study from the current snapshot (shared: do not mutate)."""
+        return self._snapshot.studies.get(study_id)
+
+    def publish(self, studies: Dict[str, Dict[str, Any]], persist: bool = True) -> StudyResultSnapshot:
+        """
+        Publish a complete result set as a new version.
+
+        Args:
+            studies: Mapping of study_id -> result dict
+            persist: Also write the results file (atomic replace)
+
+        Returns:
+            The new snapshot
+        """
+        # Normalize through JSON once so memory matches what is persisted
+        serialized = json.dumps(studies, default=_json_default, sort_keys=True)
+
+        with self._publish_lock:
+            snapshot = self._swap(json.loads(serialized), serialized)
+
+            if persist:
+                self._write_file(serialized)
+
+        logger.info(f"Published study results v{snapshot.version} ({len(snapshot.studies)} studies)")
+        return snapshot
+
+    def publish_study(self, study_id: str, result: Dict[str, Any], persist: bool = True) -> StudyResultSnapshot:
+        """
+        Publish a new version with one study's result replaced.
+
+        result must be a new dict, not the current one edited in place:
+        that would also change the snapshot that is being replaced.
+        """
+        with self._publish_lock:
+            studies = dict(self._snapshot.studies)
+            studies[study_id] = result
+            return self.publish(studies, persist=persist)
+
+    def load(self) -> bool:
+        """
+        Load the results file into memory as a new version.
+
+        Returns:
+            True if results were loaded
+        """
+        if not self.results_file.exists():
+            return False
+
+        try:
+            serialized = self.results_file.read_text()
+            studies = json.loads(serialized)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load study results from {self.results_file}: {e}")
+            return False
+
+        if not isinstance(studies, dict):
+            logger.error(f"Unexpected study results format in {self.results_file}")
+            return False
+
+        snapshot = self._swap(studies, json.dumps(studies, sort_keys=True))
+        logger.info(f"Loaded study results v{snapshot.version} ({len(snapshot.studies)} studies) from disk")
+        return True
+
+    def add_listener(self, callback: Callable[[StudyResultSnapshot, StudyResultSnapshot], None]) -> None:
+        """Call callback(previous, snapshot) after each new version is installed."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[StudyResultSnapshot, StudyResultSnapshot], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _swap(self, studies: Dict[str, Dict[str, Any]], serialized: str) -> StudyResultSnapshot:
+        """Install a new snapshot and notify listeners."""
+        content_hash = hashlib.blake2b(serialized.encode(), digest_size=8).hexdigest()
+
+        with self._lock:
+            previous = self._snapshot
+            version = previous.version + 1
+            snapshot = StudyResultSnapshot(
+                version=version,
+                etag=self._make_etag(version, content_hash),
+                studies=MappingProxyType(studies),
+                published_at=datetime.now(),
+            )
+            self._snapshot = snapshot
+
+        for listener in list(self._listeners):
+            try:
+                listener(previous, snapshot)
+            except Exception as e:
+                logger.error(f"Study store listener error: {e}")
+
+        return snapshot
+
+    def _write_file(self, serialized: str) -> None:
+        """Write results file via temp file + rename."""
+        try:
+            temp_file = self.results_file.with_suffix(".tmp")
+            temp_file.write_text(serialized)
+            os.replace(temp_file, self.results_file)
+        except OSError as e:
+            logger.error(f"Failed to persist study results: {e}")
+
+    @staticmethod
+    def _make_etag(version: int, content_hash: str) -> str:
+        return f'"v{version}-{content_hash}"'
+
+
+# ========================================
+# CONDITIONAL REQUESTS
+# ========================================
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    snapshot: StudyResultSnapshot,
+    catalog_fingerprint: Optional[str] = None,
+) -> Optional[Response]:
+    """
+    Stamp version headers and handle conditional GETs.
+
+    Sets ETag and X-Data-Version on the response. If the request's
+    If-None-Match matches the snapshot, returns a 304 response that the
+    endpoint should return as-is. Endpoints that also read the study
+    catalog pass its content fingerprint so catalog changes invalidate the
+    ETag (and an unchanged catalog keeps it across restarts).
+    """
+    etag = snapshot.etag
+    if catalog_fingerprint is not None:
+        etag = f'{etag[:-1]}-c{catalog_fingerprint}"'
+
+    headers = {"ETag": etag, "X-Data-Version": str(snapshot.version)}
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return None
+
+
+# ========================================
+# SINGLETON INSTANCE
+# ========================================
+
+_store_instance: Optional[StudyResultStore] = None
+
+
+def get_study_store() -> StudyResultStore:
+    """Get or create singleton store instance."""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = StudyResultStore()
+    return _store_instance
+
+
+def reset_study_store() -> None:
+    """Reset store instance (for testing)."""
+    global _store_instance
+    _store_instance = None
+
+
+# ========================================
+# EXPORTS
+# ========================================
+
+__all__ = [
+    "StudyResultStore",
+    "StudyResultSnapshot",
+    "check_not_modified",
+    "get_study_store",
+    "reset_study_store",
+]
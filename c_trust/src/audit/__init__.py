@@ -8,6 +8,7 @@ Key Components:
 - AuditTrailManager: Central audit trail management
 - AuditEvent: Immutable audit event records
 - AuditQuery: Query and reporting interface
+- AuditIndexStore: Daily JSONL segments with a SQLite query index
 
 **Validates: Requirements 7.3, 10.3**
 """
@@ -19,6 +20,7 @@ from .audit_trail import (
     AuditQuery,
     AuditReport,
 )
+from .audit_store import AuditIndexStore
 
 __all__ = [
     "AuditTrailManager",
@@ -26,4 +28,5 @@ __all__ = [
     "AuditEventType",
     "AuditQuery",
     "AuditReport",
+    "AuditIndexStore",
 ]
@@ -0,0 +1,351 @@
+"""
+C-TRUST Audit Index Store
+=========================
+Indexed persistence for the audit trail.
+
+Events are still written as one JSON line to daily ``audit_YYYYMMDD.jsonl``
+segment files, which remain the immutable regulatory record. Alongside
+them a SQLite index (``audit_index.db``, WAL mode) holds one row per event
+with the queryable columns and the byte offset of its line in the segment:
+
+    events(ts, event_type, component_name, entity_id, user_id, session_id,
+           event_id, segment, byte_offset, length)
+
+Queries seek through the index instead of parsing every segment in the
+date range, summaries are answered with GROUP BY over the index, and only
+the page that is actually returned is read back from the segments.
+
+The segment being written is kept open between appends; durability is
+left to the caller (``sync()`` or ``append(..., sync_each=True)``, see
+AuditWriter for the fsync policies).
+
+Segments that are not (fully) indexed - logs written before the index
+existed, or a line written just before a crash - are indexed on open.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core import get_logger
+
+logger = get_logger(__name__)
+
+
+SEGMENT_GLOB = "audit_*.jsonl"
+
+_INDEXED_COLUMNS = {
+    "event_types": "event_type",
+    "component_names": "component_name",
+    "entity_ids": "entity_id",
+    "user_ids": "user_id",
+    "session_ids": "session_id",
+}
+
+
+def segment_name(timestamp: datetime) -> str:
+    """Daily segment file name for an event timestamp."""
+    return f"audit_{timestamp.strftime('%Y%m%d')}.jsonl"
+
+
+class AuditIndexStore:
+    """
+    Daily JSONL segments plus a SQLite index over them.
+
+    Thread-safe: all access goes through a single connection guarded by a
+    lock, as in SQLiteCacheStore.
+    """
+
+    def __init__(self, storage_path: Path, db_name: str = "audit_index.db"):
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.storage_path / db_name
+        self._lock = Lock()
+        self._open_segments: Dict[str, BinaryIO] = {}
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " ts REAL NOT NULL,"
+            " event_type TEXT NOT NULL,"
+            " component_name TEXT NOT NULL,"
+            " entity_id TEXT,"
+            " user_id TEXT,"
+            " session_id TEXT,"
+            " event_id TEXT NOT NULL,"
+            " segment TEXT NOT NULL,"
+            " byte_offset INTEGER NOT NULL,"
+            " length INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " name TEXT PRIMARY KEY,"
+            " indexed_bytes INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts)")
+        for column in _INDEXED_COLUMNS.values():
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_events_{column} ON events ({column}, ts)"
+            )
+
+        indexed = self.reindex()
+        if indexed:
+            logger.info(f"Indexed {indexed} audit events from existing segments")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, records: Sequence[Dict[str, Any]], sync_each: bool = False) -> None:
+        """
+        Append serialized events (AuditEvent.to_dict()) to their daily
+        segments and index them in one transaction.
+
+        Args:
+            records: Serialized events, in commit order
+            sync_each: fsync the segment after every line instead of
+                leaving durability to sync()
+        """
+        by_segment: Dict[str, List[Tuple[datetime, Dict[str, Any], bytes]]] = {}
+        for record in records:
+            timestamp = datetime.fromisoformat(record["timestamp"])
+            line = (json.dumps(record) + "\n").encode("utf-8")
+            by_segment.setdefault(segment_name(timestamp), []).append((timestamp, record, line))
+
+        with self._lock:
+            rows = []
+            ends: Dict[str, int] = {}
+            for name, items in by_segment.items():
+                f = self._segment(name)
+                offset = f.tell()
+                for timestamp, record, line in items:
+                    rows.append(self._row(timestamp, record, name, offset, len(line)))
+                    offset += len(line)
+                if sync_each:
+                    for _, _, line in items:
+                        f.write(line)
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    f.write(b"".join(line for _, _, line in items))
+                    # Lines must reach the OS before the index points at them
+                    f.flush()
+                ends[name] = offset
+            self._insert(rows, ends)
+
+    def sync(self) -> None:
+        """fsync every open segment."""
+        with self._lock:
+            for f in self._open_segments.values():
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _segment(self, name: str) -> BinaryIO:
+        """Open segment for appending (caller holds the lock)."""
+        f = self._open_segments.get(name)
+        if f is None:
+            # Segments are daily: once a newer day starts, older ones are done
+            for old in [n for n in self._open_segments if n < name]:
+                self._close_segment(old)
+            f = open(self.storage_path / name, "ab")
+            self._open_segments[name] = f
+        return f
+
+    def _close_segment(self, name: str) -> None:
+        f = self._open_segments.pop(name)
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+
+    def reindex(self) -> int:
+        """
+        Index any segment bytes not yet covered by the index.
+
+        Returns:
+            Number of events indexed
+        """
+        total = 0
+        with self._lock:
+            known = dict(self._conn.execute("SELECT name, indexed_bytes FROM segments"))
+            for path in sorted(self.storage_path.glob(SEGMENT_GLOB)):
+                start = known.get(path.name, 0)
+                if path.stat().st_size <= start:
+                    continue
+                rows, end = self._scan_segment(path, start)
+                if end > start:
+                    self._insert(rows, {path.name: end})
+                    total += len(rows)
+        return total
+
+    def _scan_segment(self, path: Path, start: int) -> Tuple[List[tuple], int]:
+        """Parse complete lines of a segment from byte offset ``start``."""
+        rows = []
+        offset = start
+        with open(path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial trailing line, picked up by a later reindex
+                try:
+                    record = json.loads(line)
+                    timestamp = datetime.fromisoformat(record["timestamp"])
+                    rows.append(self._row(timestamp, record, path.name, offset, len(line)))
+                except Exception as e:
+                    logger.warning(f"Failed to index audit line in {path.name} at {offset}: {e}")
+                offset += len(line)
+        return rows, offset
+
+    @staticmethod
+    def _row(timestamp: datetime, record: Dict[str, Any], segment: str, offset: int, length: int) -> tuple:
+        return (
+            timestamp.timestamp(),
+            record["event_type"],
+            record["component_name"],
+            record.get("entity_id"),
+            record.get("user_id"),
+            record.get("session_id"),
+            record["event_id"],
+            segment,
+            offset,
+            length,
+        )
+
+    def _insert(self, rows: List[tuple], ends: Dict[str, int]) -> None:
+        """Insert index rows and advance segment watermarks (caller holds the lock)."""
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT INTO events (ts, event_type, component_name, entity_id, user_id,"
+                " session_id, event_id, segment, byte_offset, length)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments (name, indexed_bytes) VALUES (?, ?)",
+                list(ends.items()),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _where(
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        **filters: Optional[Iterable[Any]],
+    ) -> Tuple[str, List[Any]]:
+        """Build a WHERE clause from AuditQuery-style filters."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if start_time:
+            clauses.append("ts >= ?")
+            params.append(start_time.timestamp())
+        if end_time:
+            clauses.append("ts <= ?")
+            params.append(end_time.timestamp())
+        for name, values in filters.items():
+            if not values:
+                continue
+            values = [getattr(v, "value", v) for v in values]
+            clauses.append(f"{_INDEXED_COLUMNS[name]} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def search(self, limit: int = 1000, offset: int = 0, **filters: Any) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find events newest first.
+
+        Args:
+            limit: Maximum events to return
+            offset: Number of matching events to skip
+            **filters: start_time, end_time and the AuditQuery list filters
+
+        Returns:
+            Tuple of (total matching count, serialized events for the page)
+        """
+        where, params = self._where(**filters)
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+            refs = self._conn.execute(
+                f"SELECT segment, byte_offset, length FROM events{where}"
+                " ORDER BY ts DESC, rowid DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return total, self._read(refs)
+
+    def count(self, **filters: Any) -> int:
+        """Count matching events without reading any segment."""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    def summarize(self, **filters: Any) -> Dict[str, Any]:
+        """
+        Summary statistics over all matching events, computed from the
+        index alone (same shape as AuditTrailManager._generate_summary).
+        """
+        where, params = self._where(**filters)
+        with self._lock:
+            total, earliest, latest = self._conn.execute(
+                f"SELECT COUNT(*), MIN(ts), MAX(ts) FROM events{where}", params
+            ).fetchone()
+            if not total:
+                return {"total": 0}
+            by_type = dict(self._conn.execute(
+                f"SELECT event_type, COUNT(*) FROM events{where} GROUP BY event_type", params
+            ))
+            by_component = dict(self._conn.execute(
+                f"SELECT component_name, COUNT(*) FROM events{where} GROUP BY component_name", params
+            ))
+            user_where = f"{where} AND user_id IS NOT NULL" if where else " WHERE user_id IS NOT NULL"
+            by_user = dict(self._conn.execute(
+                f"SELECT user_id, COUNT(*) FROM events{user_where} GROUP BY user_id", params
+            ))
+        return {
+            "total": total,
+            "by_type": by_type,
+            "by_component": by_component,
+            "by_user": by_user,
+            "time_range": {
+                "earliest": datetime.fromtimestamp(earliest).isoformat(),
+                "latest": datetime.fromtimestamp(latest).isoformat(),
+            },
+        }
+
+    def _read(self, refs: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+        """Read events back from their segments, preserving order of ``refs``."""
+        records: List[Optional[Dict[str, Any]]] = [None] * len(refs)
+        by_segment: Dict[str, List[Tuple[int, int, int]]] = {}
+        for position, (segment, offset, length) in enumerate(refs):
+            by_segment.setdefault(segment, []).append((offset, length, position))
+
+        for segment, items in by_segment.items():
+            try:
+                with open(self.storage_path / segment, "rb") as f:
+                    for offset, length, position in sorted(items):
+                        f.seek(offset)
+                        records[position] = json.loads(f.read(length))
+            except Exception as e:
+                logger.error(f"Failed to read audit segment {segment}: {e}")
+
+        return [r for r in records if r is not None]
+
+    def close(self) -> None:
+        with self._lock:
+            for name in list(self._open_segments):
+                self._close_segment(name)
+            self._conn.close()
+
+
+__all__ = ["AuditIndexStore", "segment_name"]
@@ -10,6 +10,8 @@ Key Features:
 - System operation logging
 - Agent decision logging
 - Query and reporting interface
+- Indexed storage: daily JSONL segments plus a SQLite index (audit_store.py)
+- Group-commit background writer with off-thread callbacks (audit_writer.py)
 
 **Validates: Requirements 7.3, 10.3**
 """
@@ -17,14 +19,17 @@ Key Features:
 import hashlib
 import json
 import threading
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 from pathlib import Path
 
 from src.core import get_logger
+from src.audit.audit_store import AuditIndexStore
+from src.audit.audit_writer import AuditWriter
 
 logger = get_logger(__name__)
 
@@ -225,10 +230,10 @@ class AuditTrailManager:
     user actions, and agent decisions.
     
     Features:
-    - Thread-safe event logging
+    - Thread-safe event logging, persisted by a background group-commit writer
     - Immutable event records
     - Integrity verification
-    - Query and reporting
+    - Indexed query and reporting (time, event type, component, entity, user)
     - File-based persistence
     
     **Validates: Requirements 7.3, 10.3**
@@ -249,6 +254,9 @@ class AuditTrailManager:
         self,
         storage_path: str = "logs/audit",
         max_memory_events: int = 10000,
+        fsync_mode: Optional[str] = None,
+        writer_queue_size: Optional[int] = None,
+        writer_batch_size: Optional[int] = None,
     ):
         """
         Initialize audit trail manager.
@@ -256,6 +264,9 @@ class AuditTrailManager:
         Args:
             storage_path: Path for audit log files
             max_memory_events: Maximum events to keep in memory
+            fsync_mode: "event", "batch" or "interval" (see AuditWriter)
+            writer_queue_size: Maximum events waiting to be written
+            writer_batch_size: Maximum events per group commit
         """
         if hasattr(self, '_initialized') and self._initialized:
             return
@@ -264,10 +275,18 @@ class AuditTrailManager:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
         self.max_memory_events = max_memory_events
-        self._events: List[AuditEvent] = []
+        self._events: "deque[AuditEvent]" = deque(maxlen=max_memory_events)
         self._event_counter = 0
         self._write_lock = threading.Lock()
         self._callbacks: List[Callable[[AuditEvent], None]] = []
+        self._store = AuditIndexStore(self.storage_path)
+        self._writer = AuditWriter(
+            self._store,
+            on_commit=self._dispatch_callbacks,
+            queue_size=writer_queue_size,
+            batch_size=writer_batch_size,
+            fsync_mode=fsync_mode,
+        )
         
         self._initialized = True
         logger.info(f"AuditTrailManager initialized with storage at {storage_path}")
@@ -287,6 +306,9 @@ class AuditTrailManager:
         """
         Log an audit event.
         
+        The event is persisted and callbacks run on the background writer;
+        use flush() to wait for them.
+        
         Args:
             event_type: Type of event
             component_name: Component generating the event
@@ -319,62 +341,81 @@ class AuditTrailManager:
                 new_state=new_state,
             )
             
-            # Store in memory
+            # Store in memory (bounded deque drops the oldest)
             self._events.append(event)
             
-            # Trim if exceeds max
-            if len(self._events) > self.max_memory_events:
-                self._events = self._events[-self.max_memory_events:]
-            
-            # Persist to file
+            # Queue for the next group commit; submitted under the lock so
+            # segment order matches event_id order
             self._persist_event(event)
             
-            # Notify callbacks
-            for callback in self._callbacks:
-                try:
-                    callback(event)
-                except Exception as e:
-                    logger.error(f"Audit callback error: {e}")
-            
             logger.debug(f"Audit event logged: {event_id} - {event_type.value}")
             return event
     
     def _persist_event(self, event: AuditEvent) -> None:
-        """Persist event to file"""
+        """Queue event for its daily segment and the index"""
         try:
-            # Daily log files
-            date_str = event.timestamp.strftime("%Y%m%d")
-            log_file = self.storage_path / f"audit_{date_str}.jsonl"
-            
-            with open(log_file, "a") as f:
-                f.write(json.dumps(event.to_dict()) + "\n")
+            self._writer.submit(event.to_dict(), event)
         except Exception as e:
             logger.error(f"Failed to persist audit event: {e}")
     
+    def _dispatch_callbacks(self, events: List[AuditEvent]) -> None:
+        """Run registered callbacks for a committed batch (writer callback thread)"""
+        callbacks = list(self._callbacks)
+        for event in events:
+            for callback in callbacks:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Audit callback error: {e}")
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event logged so far is persisted and its
+        callbacks have run.
+        
+        Returns:
+            False if the timeout expired first
+        """
+        return self._writer.flush(timeout=timeout)
+    
+    @staticmethod
+    def _query_filters(query: AuditQuery) -> Dict[str, Any]:
+        """AuditQuery filters as keyword arguments for AuditIndexStore"""
+        return {
+            "start_time": query.start_time,
+            "end_time": query.end_time,
+            "event_types": query.event_types,
+            "component_names": query.component_names,
+            "entity_ids": query.entity_ids,
+            "user_ids": query.user_ids,
+            "session_ids": query.session_ids,
+        }
+    
     def query_events(self, query: AuditQuery) -> AuditReport:
         """
         Query audit events.
         
+        Matching is done on the index; only the requested page is read
+        back from the segment files.
+        
         Args:
             query: Query parameters
         
         Returns:
-            AuditReport with matching events
+            AuditReport with matching events, newest first
         """
-        # First check memory
-        matching = [e for e in self._events if query.matches(e)]
-        
-        # If we need more events, check files
-        if len(matching) < query.limit and query.start_time:
-            file_events = self._load_events_from_files(query)
-            matching.extend(file_events)
-        
-        # Sort by timestamp descending
-        matching.sort(key=lambda e: e.timestamp, reverse=True)
-        
-        # Apply pagination
-        total_count = len(matching)
-        matching = matching[query.offset:query.offset + query.limit]
+        self._writer.flush(callbacks=False)
+        try:
+            total_count, records = self._store.search(
+                limit=query.limit, offset=query.offset, **self._query_filters(query)
+            )
+            matching = [AuditEvent.from_dict(r) for r in records]
+        except Exception as e:
+            logger.error(f"Audit index query failed, using in-memory events: {e}")
+            matching = [e for e in self._events if query.matches(e)]
+            matching.sort(key=lambda e: e.timestamp, reverse=True)
+            total_count = len(matching)
+            matching = matching[query.offset:query.offset + query.limit]
         
         # Generate summary
         summary = self._generate_summary(matching)
@@ -386,36 +427,21 @@ class AuditTrailManager:
             summary=summary,
         )
     
-    def _load_events_from_files(self, query: AuditQuery) -> List[AuditEvent]:
-        """Load events from log files based on query"""
-        events = []
-        
-        # Determine date range
-        start_date = query.start_time.date() if query.start_time else datetime.now().date() - timedelta(days=30)
-        end_date = query.end_time.date() if query.end_time else datetime.now().date()
-        
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y%m%d")
-            log_file = self.storage_path / f"audit_{date_str}.jsonl"
-            
-            if log_file.exists():
-                try:
-                    with open(log_file, "r") as f:
-                        for line in f:
-                            try:
-                                data = json.loads(line.strip())
-                                event = AuditEvent.from_dict(data)
-                                if query.matches(event):
-                                    events.append(event)
-                            except Exception as e:
-                                logger.warning(f"Failed to parse audit line: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to read audit file {log_file}: {e}")
-            
-            current_date += timedelta(days=1)
+    def count_events(self, query: AuditQuery) -> int:
+        """Count events matching a query without loading them"""
+        self._writer.flush(callbacks=False)
+        return self._store.count(**self._query_filters(query))
+    
+    def summarize_events(self, query: AuditQuery) -> Dict[str, Any]:
+        """
+        Summary statistics over all events matching a query.
         
-        return events
+        Unlike AuditReport.summary, which covers the returned page, this
+        covers every match and is computed from the index without loading
+        any event.
+        """
+        self._writer.flush(callbacks=False)
+        return self._store.summarize(**self._query_filters(query))
     
     def _generate_summary(self, events: List[AuditEvent]) -> Dict[str, Any]:
         """Generate summary statistics for events"""
@@ -639,6 +665,11 @@ class AuditTrailManager:
         with self._write_lock:
             self._events.clear()
             logger.info("Audit trail memory cache cleared")
+    
+    def close(self) -> None:
+        """Drain pending writes and callbacks, then close the audit index"""
+        self._writer.close()
+        self._store.close()
 
 
 # Global audit trail instance
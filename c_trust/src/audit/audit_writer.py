@@ -0,0 +1,240 @@
+"""
+C-TRUST Audit Writer
+====================
+Background group-commit writer for the audit trail.
+
+AuditTrailManager.log_event only builds the event and puts it on a
+bounded queue. A writer thread drains the queue in batches, appends each
+batch to the open daily segment and the index in one transaction, and
+hands the committed batch to a second thread that runs the registered
+callbacks. Agent decisions and user actions no longer pay for file I/O
+or callbacks on the caller's thread.
+
+fsync policies:
+- "event":    fsync after every line (slowest, nothing buffered)
+- "batch":    fsync once per group commit (default)
+- "interval": fsync at most every ``fsync_interval`` seconds
+
+When the queue is full, log_event blocks until the writer catches up:
+audit events are never dropped.
+
+Usage:
+    writer = AuditWriter(store, on_commit=dispatch_callbacks)
+    writer.submit(event.to_dict(), event)
+    writer.flush()   # wait until everything submitted so far is committed
+    writer.close()   # drain and stop
+"""
+
+import atexit
+import queue
+import time
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core import get_logger
+from src.core.settings import settings
+from src.audit.audit_store import AuditIndexStore
+
+logger = get_logger(__name__)
+
+
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Bounded-queue, group-commit writer over an AuditIndexStore.
+
+    Items are (record, payload) pairs: ``record`` is the serialized event
+    that is persisted, ``payload`` is passed back to ``on_commit`` once the
+    batch containing it is committed.
+    """
+
+    FSYNC_MODES = ("event", "batch", "interval")
+
+    def __init__(
+        self,
+        store: AuditIndexStore,
+        on_commit: Optional[Callable[[List[Any]], None]] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        fsync_mode: Optional[str] = None,
+        fsync_interval: Optional[float] = None,
+    ):
+        """
+        Initialize and start the writer.
+
+        Args:
+            store: Segment + index store to append to
+            on_commit: Called off-thread with the payloads of each committed batch
+            queue_size: Maximum queued events (defaults to settings.AUDIT_WRITER_QUEUE_SIZE)
+            batch_size: Maximum events per group commit (defaults to settings.AUDIT_WRITER_BATCH_SIZE)
+            fsync_mode: "event", "batch" or "interval" (defaults to settings.AUDIT_FSYNC_MODE)
+            fsync_interval: Seconds between fsyncs in "interval" mode
+                (defaults to settings.AUDIT_FSYNC_INTERVAL_SECONDS)
+        """
+        self.store = store
+        self.on_commit = on_commit
+        self.queue_size = queue_size or getattr(settings, 'AUDIT_WRITER_QUEUE_SIZE', 10000)
+        self.batch_size = batch_size or getattr(settings, 'AUDIT_WRITER_BATCH_SIZE', 500)
+        self.fsync_mode = fsync_mode or getattr(settings, 'AUDIT_FSYNC_MODE', 'batch')
+        self.fsync_interval = (
+            fsync_interval if fsync_interval is not None
+            else getattr(settings, 'AUDIT_FSYNC_INTERVAL_SECONDS', 1.0)
+        )
+
+        if self.fsync_mode not in self.FSYNC_MODES:
+            raise ValueError(
+                f"Unknown audit fsync mode '{self.fsync_mode}', expected one of {self.FSYNC_MODES}"
+            )
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._callback_queue: "queue.Queue" = queue.Queue()
+        self._progress = Condition()
+        self._submitted = 0
+        self._committed = 0
+        self._dispatched = 0
+        self._last_sync = time.monotonic()
+        self._closed = False
+
+        self.stats: Dict[str, int] = {"events": 0, "batches": 0, "errors": 0}
+
+        self._writer = Thread(target=self._write_loop, name="audit-writer", daemon=True)
+        self._dispatcher = Thread(target=self._dispatch_loop, name="audit-callbacks", daemon=True)
+        self._writer.start()
+        self._dispatcher.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, record: Dict[str, Any], payload: Any = None) -> None:
+        """Queue an event for the next group commit (blocks while the queue is full)."""
+        if self._closed:
+            raise RuntimeError("AuditWriter is closed")
+        with self._progress:
+            self._submitted += 1
+        self._queue.put((record, payload))
+
+    def flush(self, timeout: Optional[float] = None, callbacks: bool = True) -> bool:
+        """
+        Wait until every event submitted before the call is committed
+        (and, if ``callbacks``, its callbacks have run).
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._progress:
+            target = self._submitted
+            done = (lambda: self._dispatched >= target) if callbacks else (lambda: self._committed >= target)
+            return self._progress.wait_for(done, timeout=timeout)
+
+    @property
+    def pending(self) -> int:
+        """Events submitted but not yet committed."""
+        with self._progress:
+            return self._submitted - self._committed
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Drain the queue, fsync and stop both threads. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+        self._callback_queue.put(_STOP)
+        self._dispatcher.join(timeout)
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _next_batch(self) -> Tuple[List[Tuple[Dict[str, Any], Any]], bool]:
+        """Block for one item, then take whatever else is queued up to batch_size."""
+        timeout = self.fsync_interval if self.fsync_mode == "interval" else None
+        try:
+            first = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return [], False
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        stop = False
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _write_loop(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._commit(batch)
+            elif self.fsync_mode == "interval":
+                self._maybe_sync(force=False)
+            if stop:
+                self._maybe_sync(force=True)
+                return
+
+    def _commit(self, batch: List[Tuple[Dict[str, Any], Any]]) -> None:
+        try:
+            self.store.append([record for record, _ in batch], sync_each=self.fsync_mode == "event")
+            if self.fsync_mode == "batch":
+                self.store.sync()
+            else:
+                self._maybe_sync(force=False)
+            self.stats["events"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            # Segments/index are re-read on the next open; keep the writer alive
+            self.stats["errors"] += 1
+            logger.error(f"Audit group commit of {len(batch)} events failed: {e}")
+
+        with self._progress:
+            self._committed += len(batch)
+            self._progress.notify_all()
+        self._callback_queue.put([payload for _, payload in batch])
+
+    def _maybe_sync(self, force: bool) -> None:
+        if self.fsync_mode != "interval" and not force:
+            return
+        now = time.monotonic()
+        if force or now - self._last_sync >= self.fsync_interval:
+            try:
+                self.store.sync()
+            except Exception as e:
+                logger.error(f"Audit segment fsync failed: {e}")
+            self._last_sync = now
+
+    # ------------------------------------------------------------------
+    # Callback thread
+    # ------------------------------------------------------------------
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            payloads = self._callback_queue.get()
+            if payloads is _STOP:
+                return
+            if self.on_commit is not None:
+                try:
+                    self.on_commit(payloads)
+                except Exception as e:
+                    logger.error(f"Audit callback dispatch error: {e}")
+            with self._progress:
+                self._dispatched += len(payloads)
+                self._progress.notify_all()
+
+
+__all__ = ["AuditWriter"]
@@ -69,6 +69,7 @@ from .performance import (
     PerformanceMonitor,
     performance_monitor,
 )
+from .tracing import Span, Tracer, tracer, traced
 
 __version__ = "1.0.0"
 __author__ = "C-TRUST Development Team"
@@ -179,6 +180,12 @@ __all__ = [
     'PerformanceMonitor',
     'performance_monitor',
     
+    # Stage tracing
+    'Span',
+    'Tracer',
+    'tracer',
+    'traced',
+    
     # System initialization
     'initialize_core_system'
 ]
\ No newline at end of file
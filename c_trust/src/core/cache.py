@@ -6,8 +6,13 @@ caching with cache-first pattern.
 Design Principles:
 1. Cache-first: Always return cached data immediately
 2. Background refresh: Compute new data async
-3. File persistence: Survive restarts
+3. File persistence: Survive restarts (per-key writes to SQLite in WAL mode)
 4. Hash-based invalidation: Detect data changes
+5. Lazy loading: Entries are read from disk on first access
+6. Bounded memory: LRU/LFU eviction by entry count and approximate bytes,
+   plus a background sweeper for entries expired past the stale grace window
+7. Single-flight: concurrent misses on a key share one computation;
+   stale entries are revalidated on a bounded refresh pool
 
 Architecture:
     Request → Check Cache
@@ -24,15 +29,19 @@ Usage:
 import hashlib
 import json
 import os
+import sqlite3
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from threading import Lock, Thread
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock, Thread
 from typing import Any, Callable, Dict, List, Optional
 import shutil
 
 from src.core import get_logger
+from src.core.settings import settings
 
 logger = get_logger(__name__)
 
@@ -50,11 +59,16 @@ class CacheEntry:
     expires_at: datetime
     data_hash: str
     hit_count: int = 0
+    size_bytes: int = 0  # Approximate size (serialized length), not persisted
     
     def is_expired(self) -> bool:
         """Check if entry has expired."""
         return datetime.now() > self.expires_at
     
+    def is_past_grace(self, grace_seconds: float) -> bool:
+        """Check if entry expired more than grace_seconds ago (no longer served stale)."""
+        return datetime.now() > self.expires_at + timedelta(seconds=grace_seconds)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Serialize for file storage."""
         return {
@@ -79,6 +93,103 @@ class CacheEntry:
         )
 
 
+# ========================================
+# PERSISTENCE
+# ========================================
+
+class SQLiteCacheStore:
+    """
+    Per-key persistence for cache entries.
+    
+    Each set/invalidate is a single-row statement in a SQLite database in
+    WAL mode, so write cost does not grow with the number of cached keys.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = Lock()
+        
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY,"
+            " expires_at REAL NOT NULL,"
+            " entry TEXT NOT NULL)"
+        )
+    
+    def load(self, key: str) -> Optional[CacheEntry]:
+        """Load a single entry, or None if not stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        entry = CacheEntry.from_dict(json.loads(row[0]))
+        entry.size_bytes = len(row[0])
+        return entry
+    
+    def save(self, entry: CacheEntry) -> None:
+        """Insert or replace a single entry (raises TypeError if not JSON serializable)."""
+        payload = json.dumps(entry.to_dict())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, expires_at, entry) VALUES (?, ?, ?)",
+                (entry.key, entry.expires_at.timestamp(), payload),
+            )
+    
+    def save_many(self, entries: List[CacheEntry]) -> None:
+        """Insert or replace several entries in one transaction."""
+        rows = [(e.key, e.expires_at.timestamp(), json.dumps(e.to_dict())) for e in entries]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (key, expires_at, entry) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def delete(self, key: str) -> bool:
+        """Delete a single entry. Returns True if it existed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+    
+    def clear(self) -> int:
+        """Delete all entries. Returns number deleted."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries")
+        return cursor.rowcount
+    
+    def purge_expired(self, grace_seconds: float = 0) -> int:
+        """Delete entries expired more than grace_seconds ago. Returns number deleted."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time() - grace_seconds,)
+            )
+        return cursor.rowcount
+    
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM cache_entries")]
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 # ========================================
 # CACHE STATISTICS
 # ========================================
@@ -90,6 +201,12 @@ class CacheStats:
     cache_hits: int = 0
     cache_misses: int = 0
     entries_count: int = 0
+    memory_entries: int = 0
+    bytes_held: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+    expired_removed: int = 0
+    coalesced_requests: int = 0
     background_refreshes: int = 0
     last_refresh: Optional[datetime] = None
     
@@ -107,6 +224,12 @@ class CacheStats:
             "cache_misses": self.cache_misses,
             "hit_rate": f"{self.hit_rate:.1%}",
             "entries_count": self.entries_count,
+            "memory_entries": self.memory_entries,
+            "bytes_held": self.bytes_held,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+            "expired_removed": self.expired_removed,
+            "coalesced_requests": self.coalesced_requests,
             "background_refreshes": self.background_refreshes,
             "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
         }
@@ -122,20 +245,35 @@ class CacheManager:
     
     Features:
     - In-memory cache with TTL
-    - File-based persistence
+    - Per-key SQLite persistence, read through lazily on first access
     - Hash-based change detection
     - Background refresh
     - Thread-safe operations
+    - In-memory capacity bounds (entries and approximate bytes) with LRU
+      or LFU eviction; evicted entries stay on disk and are read back on demand
+    - Background sweeper for entries expired past the stale grace window
+      (inside it they are kept, in memory and on disk, for stale reads)
+    - Single-flight computation per key and stale-while-revalidate
+      refreshes on a bounded worker pool
     """
     
+    EVICTION_POLICIES = ("lru", "lfu")
+    
     DEFAULT_TTL = 1800  # 30 minutes
-    CACHE_FILE = "analysis_cache.json"
+    CACHE_DB = "analysis_cache.db"
+    CACHE_FILE = "analysis_cache.json"  # Legacy whole-file store, migrated on startup
     
     def __init__(
         self,
         cache_dir: Optional[str] = None,
         default_ttl: int = DEFAULT_TTL,
-        enable_persistence: bool = True
+        enable_persistence: bool = True,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: Optional[str] = None,
+        sweep_interval: Optional[float] = None,
+        refresh_workers: Optional[int] = None,
+        stale_grace: Optional[float] = None
     ):
         """
         Initialize cache manager.
@@ -144,10 +282,30 @@ class CacheManager:
             cache_dir: Directory for cache files
             default_ttl: Default TTL in seconds
             enable_persistence: Enable file persistence
+            max_entries: Max entries held in memory (defaults to settings.CACHE_MAX_ENTRIES)
+            max_bytes: Max approximate bytes held in memory (defaults to settings.CACHE_MAX_MB)
+            eviction_policy: "lru" or "lfu" (defaults to settings.CACHE_EVICTION_POLICY)
+            sweep_interval: Seconds between expired-entry sweeps, 0 to disable
+                           (defaults to settings.CACHE_SWEEP_INTERVAL)
+            refresh_workers: Max concurrent background refreshes
+                           (defaults to settings.CACHE_REFRESH_WORKERS)
+            stale_grace: Seconds an expired entry is kept for stale-while-revalidate
+                           before the sweeper removes it
+                           (defaults to settings.CACHE_STALE_GRACE_SECONDS)
         """
         self.default_ttl = default_ttl
         self.enable_persistence = enable_persistence
         
+        # Capacity policy
+        self.max_entries = max_entries if max_entries is not None else getattr(settings, 'CACHE_MAX_ENTRIES', 1000)
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(settings, 'CACHE_MAX_MB', 256) * 1024 * 1024
+        self.eviction_policy = (eviction_policy or getattr(settings, 'CACHE_EVICTION_POLICY', 'lru')).lower()
+        if self.eviction_policy not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {self.eviction_policy} (expected one of {self.EVICTION_POLICIES})")
+        self.sweep_interval = sweep_interval if sweep_interval is not None else getattr(settings, 'CACHE_SWEEP_INTERVAL', 60)
+        self.refresh_workers = refresh_workers or getattr(settings, 'CACHE_REFRESH_WORKERS', 4)
+        self.stale_grace = stale_grace if stale_grace is not None else getattr(settings, 'CACHE_STALE_GRACE_SECONDS', 3600)
+        
         # Set cache directory
         if cache_dir:
             self.cache_dir = Path(cache_dir)
@@ -157,18 +315,33 @@ class CacheManager:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / self.CACHE_FILE
         
-        # In-memory cache
-        self._cache: Dict[str, CacheEntry] = {}
+        # In-memory cache (front of the persistent store), least recently used first
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = Lock()
         
+        # In-flight computations (single-flight) and the refresh pool
+        self._inflight: Dict[str, Future] = {}
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        
         # Statistics
         self.stats = CacheStats()
         
-        # Load from file on init
+        # Persistent store - entries are loaded lazily on first access
+        self._store: Optional[SQLiteCacheStore] = None
         if enable_persistence:
-            self._load_from_file()
-        
-        logger.info(f"CacheManager initialized: {len(self._cache)} entries loaded")
+            self._open_store()
+        
+        # Expired-entry sweeper
+        self._sweeper_stop = Event()
+        self._sweeper_thread: Optional[Thread] = None
+        if self.sweep_interval > 0:
+            self._sweeper_thread = Thread(target=self._sweep_loop, daemon=True)
+            self._sweeper_thread.start()
+        
+        logger.info(
+            f"CacheManager initialized: {self.stats.entries_count} entries persisted "
+            f"(memory bound: {self.max_entries} entries / {self.max_bytes // (1024 * 1024)} MB, {self.eviction_policy})"
+        )
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -179,11 +352,14 @@ class CacheManager:
         
         Returns:
             Cached data or None if not found/expired
+        
+        Expired entries still inside the stale grace window are kept for
+        get_or_compute_background; only entries past it are removed here.
         """
         with self._lock:
             self.stats.total_requests += 1
             
-            entry = self._cache.get(key)
+            entry = self._get_entry(key)
             
             if entry is None:
                 self.stats.cache_misses += 1
@@ -191,12 +367,16 @@ class CacheManager:
             
             if entry.is_expired():
                 self.stats.cache_misses += 1
-                del self._cache[key]
+                if entry.is_past_grace(self.stale_grace):
+                    self._drop(key)
+                    self._delete_persisted(key)
+                    self.stats.expired_removed += 1
                 return None
             
             # Cache hit!
             self.stats.cache_hits += 1
             entry.hit_count += 1
+            self._cache.move_to_end(key)
             return entry.data
     
     def set(
@@ -215,21 +395,22 @@ class CacheManager:
         """
         ttl = ttl or self.default_ttl
         
+        serialized = self._serialize(data)
+        
         with self._lock:
             entry = CacheEntry(
                 key=key,
                 data=data,
                 created_at=datetime.now(),
                 expires_at=datetime.now() + timedelta(seconds=ttl),
-                data_hash=self._compute_hash(data),
+                data_hash=hashlib.md5(serialized.encode()).hexdigest(),
+                size_bytes=len(serialized),
             )
             
-            self._cache[key] = entry
-            self.stats.entries_count = len(self._cache)
+            self._admit(entry)
         
-        # Persist to file
-        if self.enable_persistence:
-            self._save_to_file()
+        # Persist this key only
+        self._persist(entry)
     
     def get_or_compute(
         self,
@@ -246,6 +427,9 @@ class CacheManager:
         2. If hit and not expired, return cached
         3. If miss, compute, cache, and return
         
+        Concurrent misses on the same key are coalesced: one caller runs
+        compute_fn and the others wait for its result (or its exception).
+        
         Args:
             key: Cache key
             compute_fn: Function to compute value if cache miss
@@ -261,8 +445,38 @@ class CacheManager:
                 logger.debug(f"Cache hit for {key}")
                 return cached
         
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            
+            if is_leader:
+                # Re-check under the lock: a computation may have just finished
+                if not force_refresh:
+                    entry = self._get_entry(key)
+                    if entry is not None and not entry.is_expired():
+                        return entry.data
+                
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats.coalesced_requests += 1
+        
+        if not is_leader:
+            logger.debug(f"Waiting on in-flight computation for {key}")
+            return future.result()
+        
         # Cache miss - compute
         logger.info(f"Cache miss for {key}, computing...")
+        return self._run_compute(key, compute_fn, ttl, future)
+    
+    def _run_compute(
+        self,
+        key: str,
+        compute_fn: Callable[[], Any],
+        ttl: Optional[int],
+        future: Future
+    ) -> Any:
+        """Compute, cache and publish a value to waiters of the in-flight future."""
         start_time = time.time()
         
         try:
@@ -272,11 +486,18 @@ class CacheManager:
             self.set(key, data, ttl)
             logger.info(f"Computed and cached {key} in {compute_time:.2f}s")
             
+            future.set_result(data)
             return data
             
         except Exception as e:
             logger.error(f"Compute failed for {key}: {e}")
+            future.set_exception(e)
             raise
+        
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
     
     def get_or_compute_background(
         self,
@@ -288,8 +509,12 @@ class CacheManager:
         Get from cache, and refresh in background if stale.
         
         Always returns immediately:
-        - If cached (even stale): return cached + trigger background refresh
-        - If not cached: compute synchronously
+        - If cached (even stale, within the stale grace window): return
+          cached + trigger background refresh
+        - If not cached (or expired past the grace window): compute synchronously
+        
+        At most one refresh per key is queued at a time, and refreshes run
+        on a bounded worker pool.
         
         Args:
             key: Cache key
@@ -300,9 +525,9 @@ class CacheManager:
             Cached data (potentially stale) or freshly computed
         """
         with self._lock:
-            entry = self._cache.get(key)
+            entry = self._get_entry(key)
         
-        if entry is not None:
+        if entry is not None and not entry.is_past_grace(self.stale_grace):
             # Return cached data immediately
             if entry.is_expired():
                 # Trigger background refresh
@@ -318,20 +543,51 @@ class CacheManager:
         key: str,
         compute_fn: Callable[[], Any],
         ttl: Optional[int]
-    ) -> None:
-        """Start background refresh thread."""
+    ) -> bool:
+        """
+        Queue a refresh on the refresh pool unless one is already in flight.
+        
+        Returns:
+            True if a refresh was queued
+        """
+        with self._lock:
+            if key in self._inflight:
+                self.stats.coalesced_requests += 1
+                return False
+            
+            future = Future()
+            self._inflight[key] = future
+            
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix="cache-refresh",
+                )
+            pool = self._refresh_pool
+        
         def refresh():
+            logger.info(f"Background refresh for {key}")
             try:
-                logger.info(f"Background refresh for {key}")
-                data = compute_fn()
-                self.set(key, data, ttl)
-                self.stats.background_refreshes += 1
-                self.stats.last_refresh = datetime.now()
+                self._run_compute(key, compute_fn, ttl, future)
             except Exception as e:
                 logger.error(f"Background refresh failed for {key}: {e}")
+                return
+            
+            with self._lock:
+                self.stats.background_refreshes += 1
+                self.stats.last_refresh = datetime.now()
         
-        thread = Thread(target=refresh, daemon=True)
-        thread.start()
+        try:
+            pool.submit(refresh)
+        except RuntimeError as e:
+            # Pool shut down (cache closed)
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            logger.warning(f"Background refresh for {key} not queued: {e}")
+            return False
+        
+        return True
     
     def invalidate(self, key: str) -> bool:
         """
@@ -344,15 +600,15 @@ class CacheManager:
             True if entry existed and was removed
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                self.stats.entries_count = len(self._cache)
-                
-                if self.enable_persistence:
-                    self._save_to_file()
-                
-                return True
-            return False
+            existed = self._drop(key) is not None
+            
+            if self._store is not None:
+                try:
+                    existed = self._store.delete(key) or existed
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to delete cache entry {key}: {e}")
+            
+            return existed
     
     def invalidate_all(self) -> int:
         """
@@ -365,9 +621,13 @@ class CacheManager:
             count = len(self._cache)
             self._cache.clear()
             self.stats.entries_count = 0
-        
-        if self.enable_persistence:
-            self._save_to_file()
+            self.stats.bytes_held = 0
+            
+            if self._store is not None:
+                try:
+                    count = max(count, self._store.clear())
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to clear cache store: {e}")
         
         logger.info(f"Invalidated {count} cache entries")
         return count
@@ -386,7 +646,7 @@ class CacheManager:
             True if data is different or not cached
         """
         with self._lock:
-            entry = self._cache.get(key)
+            entry = self._get_entry(key)
             
             if entry is None:
                 return True
@@ -396,33 +656,175 @@ class CacheManager:
     
     def _compute_hash(self, data: Any) -> str:
         """Compute hash of data for change detection."""
+        return hashlib.md5(self._serialize(data).encode()).hexdigest()
+    
+    def _serialize(self, data: Any) -> str:
+        """Stable serialization used for change hashes and size accounting."""
         try:
-            serialized = json.dumps(data, sort_keys=True, default=str)
-            return hashlib.md5(serialized.encode()).hexdigest()
+            return json.dumps(data, sort_keys=True, default=str)
         except Exception:
-            return hashlib.md5(str(data).encode()).hexdigest()
+            return str(data)
     
-    def _save_to_file(self) -> None:
-        """Persist cache to file."""
-        try:
-            with self._lock:
-                cache_data = {
-                    key: entry.to_dict()
-                    for key, entry in self._cache.items()
-                }
+    # ----------------------------------------
+    # Capacity policy (caller holds lock)
+    # ----------------------------------------
+    
+    def _admit(self, entry: CacheEntry) -> None:
+        """Insert entry as most recently used and evict down to capacity."""
+        self._drop(entry.key)
+        self._cache[entry.key] = entry
+        self.stats.bytes_held += entry.size_bytes
+        self._enforce_capacity(protect=entry.key)
+    
+    def _drop(self, key: str) -> Optional[CacheEntry]:
+        """Remove entry from memory and release its bytes."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self.stats.bytes_held -= entry.size_bytes
+        return entry
+    
+    def _enforce_capacity(self, protect: Optional[str] = None) -> None:
+        """Evict entries until within max_entries and max_bytes."""
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_entries or self.stats.bytes_held > self.max_bytes
+        ):
+            victim = self._select_victim(protect)
+            if victim is None:
+                break
+            
+            entry = self._drop(victim)
+            self.stats.evictions += 1
+            self.stats.evicted_bytes += entry.size_bytes
+            logger.debug(f"Evicted {victim} ({entry.size_bytes} bytes, {self.eviction_policy})")
+    
+    def _select_victim(self, protect: Optional[str]) -> Optional[str]:
+        """Pick the entry to evict: least recently used, or least frequently used (ties → LRU)."""
+        candidates = (key for key in self._cache if key != protect)
+        
+        if self.eviction_policy == "lfu":
+            return min(candidates, key=lambda key: self._cache[key].hit_count, default=None)
+        
+        return next(candidates, None)
+    
+    # ----------------------------------------
+    # Expired-entry sweeper
+    # ----------------------------------------
+    
+    def _sweep_loop(self) -> None:
+        """Periodically remove entries expired past the stale grace window."""
+        while not self._sweeper_stop.wait(self.sweep_interval):
+            try:
+                self.sweep_expired()
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+    
+    def sweep_expired(self) -> int:
+        """
+        Remove entries expired past the stale grace window from memory and
+        the persistent store. Entries inside the window stay available for
+        stale-while-revalidate reads.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            expired_keys = [key for key, entry in self._cache.items() if entry.is_past_grace(self.stale_grace)]
+            for key in expired_keys:
+                self._drop(key)
             
-            # Write to temp file first, then rename (atomic)
-            temp_file = self.cache_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            removed = len(expired_keys)
+            if self._store is not None:
+                try:
+                    removed = max(removed, self._store.purge_expired(self.stale_grace))
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to purge expired cache entries: {e}")
             
-            shutil.move(str(temp_file), str(self.cache_file))
+            self.stats.expired_removed += removed
+        
+        if removed:
+            logger.debug(f"Swept {removed} expired cache entries")
+        return removed
+    
+    def close(self) -> None:
+        """Stop the sweeper and refresh pool and close the persistent store."""
+        self._sweeper_stop.set()
+        if self._sweeper_thread is not None:
+            self._sweeper_thread.join(timeout=5)
+            self._sweeper_thread = None
+        
+        with self._lock:
+            pool, self._refresh_pool = self._refresh_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        
+        # Release waiters on refreshes that were cancelled before they ran
+        with self._lock:
+            pending, self._inflight = self._inflight, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Cache closed"))
+        
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+    
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get entry from memory, reading through to the store on first access (caller holds lock)."""
+        entry = self._cache.get(key)
+        
+        if entry is None and self._store is not None:
+            try:
+                entry = self._store.load(key)
+            except (sqlite3.Error, ValueError, KeyError) as e:
+                logger.error(f"Failed to load cache entry {key}: {e}")
+                entry = None
             
-        except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
+            if entry is not None:
+                self._admit(entry)
+        
+        return entry
     
-    def _load_from_file(self) -> None:
-        """Load cache from file."""
+    def _persist(self, entry: CacheEntry) -> None:
+        """Write a single entry to the store."""
+        if self._store is None:
+            return
+        
+        try:
+            self._store.save(entry)
+        except (TypeError, ValueError) as e:
+            # Not JSON serializable - keep in memory only
+            logger.warning(f"Cache entry {entry.key} not persisted: {e}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save cache entry {entry.key}: {e}")
+    
+    def _delete_persisted(self, key: str) -> None:
+        """Remove a single entry from the store."""
+        if self._store is None:
+            return
+        
+        try:
+            self._store.delete(key)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to delete cache entry {key}: {e}")
+    
+    def _open_store(self) -> None:
+        """Open the SQLite store, drop expired rows and migrate the legacy JSON file."""
+        try:
+            self._store = SQLiteCacheStore(self.cache_dir / self.CACHE_DB)
+            expired = self._store.purge_expired(self.stale_grace)
+            self._migrate_legacy_file()
+            self.stats.entries_count = self._store.count()
+            
+            if expired:
+                logger.info(f"Discarded {expired} expired cache entries")
+            
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open cache store, persistence disabled: {e}")
+            self._store = None
+    
+    def _migrate_legacy_file(self) -> None:
+        """Import entries from the old whole-file JSON cache, then retire the file."""
         if not self.cache_file.exists():
             return
         
@@ -430,32 +832,37 @@ class CacheManager:
             with open(self.cache_file, 'r') as f:
                 cache_data = json.load(f)
             
-            loaded = 0
-            expired = 0
-            
-            for key, entry_data in cache_data.items():
-                entry = CacheEntry.from_dict(entry_data)
-                
-                if not entry.is_expired():
-                    self._cache[key] = entry
-                    loaded += 1
-                else:
-                    expired += 1
+            entries = [CacheEntry.from_dict(entry_data) for entry_data in cache_data.values()]
+            live = [entry for entry in entries if not entry.is_past_grace(self.stale_grace)]
+            self._store.save_many(live)
             
-            self.stats.entries_count = len(self._cache)
-            logger.info(f"Loaded {loaded} entries, discarded {expired} expired")
+            shutil.move(str(self.cache_file), str(self.cache_file.with_suffix('.json.migrated')))
+            logger.info(f"Migrated {len(live)} entries from {self.CACHE_FILE}, discarded {len(entries) - len(live)} expired")
             
         except Exception as e:
-            logger.error(f"Failed to load cache: {e}")
+            logger.error(f"Failed to migrate legacy cache file: {e}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        with self._lock:
+            if self._store is not None:
+                try:
+                    self.stats.entries_count = self._store.count()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to count cache entries: {e}")
+            else:
+                self.stats.entries_count = len(self._cache)
+            self.stats.memory_entries = len(self._cache)
+        
         return self.stats.to_dict()
     
     def get_all_keys(self) -> List[str]:
-        """Get all cache keys."""
+        """Get all cache keys (including persisted entries not yet loaded)."""
         with self._lock:
-            return list(self._cache.keys())
+            keys = set(self._cache.keys())
+            if self._store is not None:
+                keys.update(self._store.keys())
+            return list(keys)
 
 
 # ========================================
@@ -478,6 +885,7 @@ def reset_cache() -> None:
     global _cache_instance
     if _cache_instance:
         _cache_instance.invalidate_all()
+        _cache_instance.close()
     _cache_instance = None
 
 
@@ -489,6 +897,7 @@ __all__ = [
     "CacheManager",
     "CacheEntry", 
     "CacheStats",
+    "SQLiteCacheStore",
     "get_cache",
     "reset_cache",
 ]
@@ -0,0 +1,357 @@
+"""
+C-TRUST Background Jobs
+=======================
+Bounded executor for long-running work (full study analyses) submitted
+from async API handlers.
+
+Handlers submit a job and return immediately; the work runs on a thread
+or process pool so the event loop keeps serving other requests. Jobs for
+the same key are coalesced, the number of queued + running jobs is
+capped, and finished jobs are kept for a bounded time-ordered history.
+
+Usage:
+    jobs = get_job_manager()
+    job = jobs.submit("analysis", "STUDY_01", compute_fn, "STUDY_01")
+    jobs.get(job.job_id).to_dict()
+    result = await asyncio.wrap_future(job.completion)
+"""
+
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core import get_logger
+from src.core.settings import settings
+from src.core.utils import generate_id
+
+logger = get_logger(__name__)
+
+
+# ========================================
+# JOB MODEL
+# ========================================
+
+class JobStatus(str, Enum):
+    """Lifecycle state of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """Single background job."""
+    job_id: str
+    kind: str
+    key: str
+    submitted_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    status: JobStatus = JobStatus.QUEUED
+    result: Any = None
+    error: Optional[str] = None
+    # Resolved with the final result (after on_success) or the job's exception
+    completion: Future = field(default_factory=Future, repr=False, compare=False)
+    _future: Optional[Future] = field(default=None, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def refresh_status(self) -> JobStatus:
+        """Promote QUEUED to RUNNING once a worker has picked the job up."""
+        if self.status == JobStatus.QUEUED and self._future is not None and self._future.running():
+            self.status = JobStatus.RUNNING
+        return self.status
+
+    def to_dict(self) -> Dict[str, Any]:
+        self.refresh_status()
+        duration = (
+            (self.finished_at - self.submitted_at).total_seconds() * 1000
+            if self.finished_at else None
+        )
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "key": self.key,
+            "status": self.status.value,
+            "submitted_at": self.submitted_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": duration,
+            "error": self.error,
+        }
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the number of active jobs has reached max_pending."""
+
+
+# ========================================
+# JOB MANAGER
+# ========================================
+
+class JobManager:
+    """
+    Bounded background job executor.
+
+    Features:
+    - Thread or process pool (process jobs must be picklable top-level functions)
+    - One active job per (kind, key); duplicate submissions return it
+    - Admission control via max_pending
+    - Completion listeners (e.g. WebSocket push)
+    """
+
+    EXECUTORS = ("thread", "process")
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        executor: Optional[str] = None,
+        retention: Optional[int] = None,
+    ):
+        """
+        Initialize job manager.
+
+        Args:
+            max_workers: Pool size (defaults to settings.ANALYSIS_JOB_WORKERS)
+            max_pending: Maximum queued + running jobs (defaults to settings.ANALYSIS_JOB_MAX_PENDING)
+            executor: "thread" or "process" (defaults to settings.ANALYSIS_JOB_EXECUTOR)
+            retention: Finished jobs kept for status lookups (defaults to settings.ANALYSIS_JOB_RETENTION)
+        """
+        self.max_workers = max_workers or getattr(settings, 'ANALYSIS_JOB_WORKERS', 2)
+        self.max_pending = max_pending or getattr(settings, 'ANALYSIS_JOB_MAX_PENDING', 100)
+        self.executor_kind = executor or getattr(settings, 'ANALYSIS_JOB_EXECUTOR', 'thread')
+        self.retention = retention or getattr(settings, 'ANALYSIS_JOB_RETENTION', 500)
+
+        if self.executor_kind not in self.EXECUTORS:
+            raise ValueError(
+                f"Unknown job executor '{self.executor_kind}', expected one of {self.EXECUTORS}"
+            )
+
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[Tuple[str, str], Job] = {}
+        self._listeners: List[Callable[[Job], None]] = []
+        self._lock = Lock()
+        self._executor = None
+        self._closed = False
+
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+
+        logger.info(
+            f"JobManager initialized: {self.executor_kind} pool, "
+            f"{self.max_workers} workers, max_pending={self.max_pending}"
+        )
+
+    # ----------------------------------------
+    # Submission
+    # ----------------------------------------
+
+    def submit(
+        self,
+        kind: str,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_success: Optional[Callable[[Any], Any]] = None,
+    ) -> Job:
+        """
+        Submit a job, or return the active job for the same kind and key.
+
+        Args:
+            kind: Job category (e.g. "analysis")
+            key: Coalescing key within the kind (e.g. study_id)
+            fn: Callable run on the pool
+            *args: Arguments for fn
+            on_success: Runs in this process with fn's result; its return
+                        value becomes the job result
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already active
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobManager is closed")
+
+            active = self._active.get((kind, key))
+            if active is not None:
+                self._stats["coalesced"] += 1
+                return active
+
+            if len(self._active) >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise JobQueueFullError(
+                    f"{len(self._active)} jobs already pending (max {self.max_pending})"
+                )
+
+            job = Job(job_id=generate_id(kind), kind=kind, key=key)
+            job.completion.set_running_or_notify_cancel()  # a waiter going away can't cancel it
+            self._jobs[job.job_id] = job
+            self._active[(kind, key)] = job
+            self._stats["submitted"] += 1
+            self._prune()
+
+            job._future = self._get_executor().submit(fn, *args)
+
+        job._future.add_done_callback(lambda future: self._finish(job, future, on_success))
+        logger.info(f"Job {job.job_id} queued ({kind} {key})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job by ID (active or retained)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.refresh_status()
+        return job
+
+    def list_jobs(self, kind: Optional[str] = None, active_only: bool = False) -> List[Job]:
+        """Jobs, oldest first."""
+        with self._lock:
+            jobs = list(self._active.values()) if active_only else list(self._jobs.values())
+        return [job for job in jobs if kind is None or job.kind == kind]
+
+    # ----------------------------------------
+    # Listeners
+    # ----------------------------------------
+
+    def add_listener(self, callback: Callable[[Job], None]) -> None:
+        """Call callback(job) when a job completes or fails (from a pool thread)."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Job], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+
+    def _get_executor(self):
+        """Get or create the pool (called with the lock held)."""
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ctrust-job",
+                )
+        return self._executor
+
+    def _finish(self, job: Job, future: Future, on_success: Optional[Callable[[Any], Any]]) -> None:
+        """Record the outcome of a job and notify listeners."""
+        try:
+            result = future.result()
+            if on_success is not None:
+                result = on_success(result)
+            job.result = result
+            job.status = JobStatus.COMPLETED
+            job.completion.set_result(result)
+        except BaseException as e:
+            if isinstance(e, CancelledError):
+                e = RuntimeError("Job cancelled")
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor()
+            job.error = str(e) or type(e).__name__
+            job.status = JobStatus.FAILED
+            job.completion.set_exception(e)
+            logger.error(f"Job {job.job_id} ({job.kind} {job.key}) failed: {job.error}")
+        finally:
+            job.finished_at = datetime.now()
+            with self._lock:
+                self._stats[job.status.value] += 1
+                if self._active.get((job.kind, job.key)) is job:
+                    del self._active[(job.kind, job.key)]
+
+        for listener in list(self._listeners):
+            try:
+                listener(job)
+            except Exception as e:
+                logger.error(f"Job listener error: {e}")
+
+    def _discard_executor(self) -> None:
+        """Drop a broken process pool; the next submit creates a new one."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond retention (lock held)."""
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done][:excess]:
+            del self._jobs[job_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job statistics."""
+        with self._lock:
+            active = list(self._active.values())
+            retained = len(self._jobs)
+        return {
+            **self._stats,
+            "executor": self.executor_kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "active": len(active),
+            "running": sum(1 for job in active if job.refresh_status() == JobStatus.RUNNING),
+            "retained": retained,
+        }
+
+    def close(self) -> None:
+        """Stop accepting jobs and cancel those not yet started."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ========================================
+# SINGLETON INSTANCE
+# ========================================
+
+_job_manager_instance: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create singleton job manager instance."""
+    global _job_manager_instance
+    if _job_manager_instance is None:
+        _job_manager_instance = JobManager()
+    return _job_manager_instance
+
+
+def reset_job_manager() -> None:
+    """Reset job manager instance (for testing)."""
+    global _job_manager_instance
+    if _job_manager_instance is not None:
+        _job_manager_instance.close()
+    _job_manager_instance = None
+
+
+# ========================================
+# EXPORTS
+# ========================================
+
+__all__ = [
+    "Job",
+    "JobStatus",
+    "JobManager",
+    "JobQueueFullError",
+    "get_job_manager",
+    "reset_job_manager",
+]
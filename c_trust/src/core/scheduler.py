@@ -5,14 +5,15 @@ Scheduled refresh and file change detection for automatic updates.
 
 Features:
 1. 30-minute scheduled refresh cycle
-2. File watcher for dataset changes
-3. Hash-based change detection
+2. File watcher for dataset changes (inotify events or scandir polling)
+3. Stat-first change detection, content hashes to filter touch-only updates
 4. Background async processing
 5. Cache invalidation triggers
+6. Incremental refresh of only the studies whose files changed
 
 Architecture:
     Scheduler (30 min) → Check Dataset → Changed? → Run Pipeline
-    File Watcher       → File Changed → Invalidate Cache → Run Pipeline
+    File Watcher       → File Changed → Map to Studies → Re-run Affected Studies
 
 Usage:
     scheduler = RefreshScheduler()
@@ -23,19 +24,193 @@ Usage:
 
 import hashlib
 import os
+import stat
 import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from threading import Thread, Event
-from typing import Any, Callable, Dict, List, Optional, Set
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 import json
 
 from src.core import get_logger
-from src.core.config import settings
+from src.core.settings import settings
 
 logger = get_logger(__name__)
 
 
+# ========================================
+# FILE HASHING
+# ========================================
+
+# Optional fast hashing
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Optional event-driven watching (inotify on Linux, FSEvents/ReadDirectoryChangesW elsewhere)
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+    logger.warning("watchdog not installed - FileWatcher will use polling")
+
+HASH_BUFFER_SIZE = 1024 * 1024  # 1 MB reads
+
+
+def hash_file(file_path: Path | str) -> str:
+    """
+    Compute a content hash of a file.
+    
+    Uses xxh3-128 when xxhash is installed, otherwise BLAKE2b (both are
+    several times faster than MD5 on large workbooks).
+    """
+    hasher = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+    
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b''):
+            hasher.update(chunk)
+    
+    return hasher.hexdigest()
+
+
+@dataclass
+class FileState:
+    """
+    Stat signature of a watched file, plus its content hash once known.
+    
+    The digest is computed lazily: only when a same-size change has to be
+    told apart from a touch (mtime/inode change with identical contents).
+    """
+    size: int
+    mtime_ns: int
+    inode: int
+    digest: Optional[str] = None
+    
+    @classmethod
+    def from_stat(cls, stat_result: os.stat_result) -> "FileState":
+        return cls(
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            inode=stat_result.st_ino,
+        )
+    
+    def same_stat(self, other: "FileState") -> bool:
+        return (self.size, self.mtime_ns, self.inode) == (other.size, other.mtime_ns, other.inode)
+
+
+# ========================================
+# WATCHER BACKENDS
+# ========================================
+
+class PollingBackend:
+    """
+    Interval polling backend.
+    
+    Reports no candidates, so FileWatcher stat-scans every watched path
+    each interval.
+    """
+    
+    name = "polling"
+    
+    def start(self) -> None:
+        pass
+    
+    def stop(self) -> None:
+        pass
+    
+    def collect_candidates(self) -> Optional[Set[str]]:
+        """None means a full scan is required."""
+        return None
+    
+    def wait_interval(self, check_interval: float) -> float:
+        return check_interval
+
+
+class _DebouncedEventHandler(FileSystemEventHandler):
+    """Records the last event time for each watched file path."""
+    
+    def __init__(self, extensions: Set[str]):
+        super().__init__()
+        self.extensions = extensions
+        self._last_event: Dict[str, float] = {}
+        self._lock = Lock()
+    
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        
+        now = time.monotonic()
+        with self._lock:
+            for path in (event.src_path, getattr(event, "dest_path", None)):
+                if path and Path(path).suffix.lower() in self.extensions:
+                    self._last_event[os.fsdecode(path)] = now
+    
+    def pop_settled(self, debounce_seconds: float) -> Set[str]:
+        """Remove and return paths with no events for debounce_seconds."""
+        cutoff = time.monotonic() - debounce_seconds
+        with self._lock:
+            settled = {path for path, last in self._last_event.items() if last <= cutoff}
+            for path in settled:
+                del self._last_event[path]
+        return settled
+    
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._last_event)
+
+
+class EventBackend:
+    """
+    Event-driven backend using watchdog (inotify on Linux).
+    
+    Filesystem events are debounced: a path is only reported once it has
+    been quiet for debounce_seconds, so a workbook being written in many
+    chunks produces a single change.
+    """
+    
+    name = "events"
+    
+    def __init__(self, watch_paths: List[Path], extensions: Set[str], debounce_seconds: float = 2.0):
+        if not WATCHDOG_AVAILABLE:
+            raise RuntimeError("watchdog is not installed")
+        
+        self.watch_paths = watch_paths
+        self.debounce_seconds = debounce_seconds
+        self._handler = _DebouncedEventHandler(extensions)
+        self._observer = None
+    
+    def start(self) -> None:
+        if self._observer is not None:
+            return
+        
+        observer = Observer()
+        for watch_path in self.watch_paths:
+            if watch_path.exists():
+                observer.schedule(self._handler, str(watch_path), recursive=True)
+        observer.start()
+        self._observer = observer
+    
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+    
+    def collect_candidates(self) -> Optional[Set[str]]:
+        """Paths whose event bursts have settled."""
+        return self._handler.pop_settled(self.debounce_seconds)
+    
+    def wait_interval(self, check_interval: float) -> float:
+        return min(check_interval, max(self.debounce_seconds / 2, 0.1))
+
+
 # ========================================
 # FILE WATCHER
 # ========================================
@@ -44,29 +219,50 @@ class FileWatcher:
     """
     Watches directories for file changes.
     
-    Uses hash-based detection to identify actual content changes.
+    Detection is stat-first: (size, mtime_ns, inode) is compared on every
+    check and file contents are only read when the stat signature changed.
+    Every recorded state carries a content hash, so a touch-only update
+    (new mtime, same contents) is never reported, even for a file's first
+    touch. Deleted files are reported once and then dropped.
+    
+    Backends:
+    - "events": watchdog/inotify events, debounced (no directory walks)
+    - "polling": os.scandir walk every check_interval
+    - "auto": events when watchdog is installed, otherwise polling
     """
     
     WATCH_EXTENSIONS = {'.xlsx', '.xls', '.csv'}
+    BACKENDS = ("auto", "events", "polling")
     
     def __init__(
         self,
         watch_paths: List[str],
         check_interval: int = 60,  # seconds
+        backend: str = "auto",
+        debounce_seconds: float = 2.0,
     ):
         """
         Initialize file watcher.
         
         Args:
             watch_paths: List of directories to watch
-            check_interval: Seconds between checks
+            check_interval: Seconds between checks (polling backend)
+            backend: "auto", "events" or "polling"
+            debounce_seconds: Quiet period before an event is reported (events backend)
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown FileWatcher backend: {backend} (expected one of {self.BACKENDS})")
+        
         self.watch_paths = [Path(p) for p in watch_paths]
         self.check_interval = check_interval
         
         # File state tracking
-        self._file_hashes: Dict[str, str] = {}
-        self._file_mtimes: Dict[str, float] = {}
+        self._file_states: Dict[str, FileState] = {}
+        self._files_hashed = 0
+        self._check_lock = Lock()
+        
+        # Backend
+        self._backend = self._create_backend(backend, debounce_seconds)
         
         # Threading
         self._stop_event = Event()
@@ -78,17 +274,43 @@ class FileWatcher:
         # Initialize baseline
         self._scan_all_files()
         
-        logger.info(f"FileWatcher initialized: watching {len(self.watch_paths)} paths")
+        logger.info(
+            f"FileWatcher initialized: watching {len(self.watch_paths)} paths "
+            f"({self._backend.name} backend)"
+        )
+    
+    def _create_backend(self, backend: str, debounce_seconds: float):
+        """Create the requested backend, falling back to polling."""
+        if backend == "polling" or (backend == "auto" and not WATCHDOG_AVAILABLE):
+            return PollingBackend()
+        
+        try:
+            return EventBackend(self.watch_paths, self.WATCH_EXTENSIONS, debounce_seconds)
+        except RuntimeError as e:
+            logger.warning(f"Event backend unavailable ({e}), using polling")
+            return PollingBackend()
     
     def add_change_callback(self, callback: Callable[[List[str]], None]) -> None:
         """Add callback to be called when files change."""
         self._on_change_callbacks.append(callback)
     
+    def remove_change_callback(self, callback: Callable[[List[str]], None]) -> None:
+        """Stop calling a callback added with add_change_callback."""
+        if callback in self._on_change_callbacks:
+            self._on_change_callbacks.remove(callback)
+    
     def start(self) -> None:
         """Start watching in background thread."""
         if self._watch_thread is not None:
             return
         
+        try:
+            self._backend.start()
+        except OSError as e:
+            # e.g. inotify watch limit reached
+            logger.warning(f"{self._backend.name} backend failed to start ({e}), using polling")
+            self._backend = PollingBackend()
+        
         self._stop_event.clear()
         self._watch_thread = Thread(target=self._watch_loop, daemon=True)
         self._watch_thread.start()
@@ -100,11 +322,13 @@ class FileWatcher:
         if self._watch_thread:
             self._watch_thread.join(timeout=5)
             self._watch_thread = None
+        self._backend.stop()
         logger.info("FileWatcher stopped")
     
     def check_now(self) -> List[str]:
-        """Check for changes immediately."""
-        return self._check_for_changes()
+        """Check all watched paths for changes immediately."""
+        with self._check_lock:
+            return self._check_paths(self._walk_files(), full_scan=True)
     
     def _watch_loop(self) -> None:
         """Main watch loop."""
@@ -114,7 +338,7 @@ class FileWatcher:
                 
                 if changed:
                     logger.info(f"Detected {len(changed)} file changes")
-                    for callback in self._on_change_callbacks:
+                    for callback in list(self._on_change_callbacks):
                         try:
                             callback(changed)
                         except Exception as e:
@@ -124,98 +348,183 @@ class FileWatcher:
                 logger.error(f"FileWatcher error: {e}")
             
             # Wait for interval or stop signal
-            self._stop_event.wait(self.check_interval)
+            self._stop_event.wait(self._backend.wait_interval(self.check_interval))
     
     def _check_for_changes(self) -> List[str]:
-        """Check all watched paths for changes."""
+        """Check backend candidates (or every watched file when polling) for changes."""
+        with self._check_lock:
+            candidates = self._backend.collect_candidates()
+            if candidates is None:
+                return self._check_paths(self._walk_files(), full_scan=True)
+            
+            return self._check_paths(self._stat_paths(candidates), full_scan=False)
+    
+    def _check_paths(
+        self,
+        entries: Iterator[Tuple[str, Optional[os.stat_result]]],
+        full_scan: bool,
+    ) -> List[str]:
+        """
+        Compare stat results against tracked state.
+        
+        Args:
+            entries: (path, stat) pairs; stat is None for files that no longer exist
+            full_scan: Entries cover every watched file, so untracked leftovers are dropped
+        
+        Returns:
+            Paths of new, modified or deleted files
+        """
         changed_files = []
+        seen: Set[str] = set()
         
-        for watch_path in self.watch_paths:
-            if not watch_path.exists():
+        for file_key, stat_result in entries:
+            seen.add(file_key)
+            
+            if stat_result is None:
+                if self._file_states.pop(file_key, None) is not None:
+                    changed_files.append(file_key)
                 continue
             
-            for file_path in watch_path.rglob("*"):
-                if file_path.suffix.lower() not in self.WATCH_EXTENSIONS:
-                    continue
-                
-                if not file_path.is_file():
-                    continue
-                
-                file_key = str(file_path)
-                
-                try:
-                    # Quick check - modification time
-                    mtime = file_path.stat().st_mtime
-                    old_mtime = self._file_mtimes.get(file_key)
-                    
-                    if old_mtime is None:
-                        # New file
-                        self._file_mtimes[file_key] = mtime
-                        self._file_hashes[file_key] = self._hash_file(file_path)
-                        changed_files.append(file_key)
-                        
-                    elif mtime != old_mtime:
-                        # Mtime changed - verify with hash
-                        new_hash = self._hash_file(file_path)
-                        old_hash = self._file_hashes.get(file_key)
-                        
-                        if new_hash != old_hash:
-                            changed_files.append(file_key)
-                            self._file_hashes[file_key] = new_hash
-                        
-                        self._file_mtimes[file_key] = mtime
-                        
-                except Exception as e:
-                    logger.warning(f"Error checking {file_path}: {e}")
+            try:
+                if self._update_state(file_key, FileState.from_stat(stat_result)):
+                    changed_files.append(file_key)
+            except Exception as e:
+                logger.warning(f"Error checking {file_key}: {e}")
+        
+        if full_scan:
+            for file_key in sorted(set(self._file_states) - seen):
+                del self._file_states[file_key]
+                changed_files.append(file_key)
         
         return changed_files
     
-    def _scan_all_files(self) -> None:
-        """Scan all files and store baseline hashes."""
-        for watch_path in self.watch_paths:
-            if not watch_path.exists():
+    def _update_state(self, file_key: str, new_state: FileState) -> bool:
+        """Record the new state and return True if contents changed."""
+        old_state = self._file_states.get(file_key)
+        
+        if old_state is not None and old_state.same_stat(new_state):
+            return False
+        
+        self._file_states[file_key] = new_state
+        
+        # New file or different size - changed, no need to read it
+        if old_state is None or new_state.size != old_state.size:
+            return True
+        
+        # Same size, different mtime/inode - hash so this and later touches can be compared
+        new_state.digest = self._hash_file(Path(file_key))
+        if old_state.digest is None:
+            return True  # nothing to compare against yet
+        return new_state.digest != old_state.digest
+    
+    def _walk_files(self) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """Walk watched paths with os.scandir, yielding (path, stat) for watched files."""
+        stack = [str(p) for p in self.watch_paths if p.exists()]
+        
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif (
+                                os.path.splitext(entry.name)[1].lower() in self.WATCH_EXTENSIONS
+                                and entry.is_file()
+                            ):
+                                yield entry.path, entry.stat()
+                        except OSError as e:
+                            logger.warning(f"Error checking {entry.path}: {e}")
+            except OSError as e:
+                logger.warning(f"Error scanning {directory}: {e}")
+    
+    def _stat_paths(self, paths: Set[str]) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """Stat specific paths, yielding None for files that disappeared."""
+        for path in sorted(paths):
+            try:
+                stat_result = os.stat(path)
+            except FileNotFoundError:
+                yield path, None
+                continue
+            except OSError as e:
+                logger.warning(f"Error checking {path}: {e}")
                 continue
             
-            for file_path in watch_path.rglob("*"):
-                if file_path.suffix.lower() not in self.WATCH_EXTENSIONS:
-                    continue
-                
-                if not file_path.is_file():
-                    continue
-                
-                try:
-                    file_key = str(file_path)
-                    self._file_mtimes[file_key] = file_path.stat().st_mtime
-                    self._file_hashes[file_key] = self._hash_file(file_path)
-                except Exception as e:
-                    logger.warning(f"Error scanning {file_path}: {e}")
+            if stat.S_ISREG(stat_result.st_mode):
+                yield path, stat_result
+    
+    def _scan_all_files(self) -> None:
+        """Record baseline stat signatures (files are hashed lazily, see _update_state)."""
+        for file_key, stat_result in self._walk_files():
+            self._file_states[file_key] = FileState.from_stat(stat_result)
         
-        logger.info(f"Baseline: {len(self._file_hashes)} files indexed")
+        logger.info(f"Baseline: {len(self._file_states)} files indexed")
     
     def _hash_file(self, file_path: Path) -> str:
         """Compute hash of file contents."""
-        hasher = hashlib.md5()
-        
         try:
-            with open(file_path, 'rb') as f:
-                # Read in chunks for large files
-                for chunk in iter(lambda: f.read(65536), b''):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            digest = hash_file(file_path)
+            self._files_hashed += 1
+            return digest
         except Exception:
             # Fallback to mtime-based hash
-            return str(file_path.stat().st_mtime)
+            return str(file_path.stat().st_mtime_ns)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get watcher statistics."""
         return {
             "watching_paths": [str(p) for p in self.watch_paths],
-            "files_tracked": len(self._file_hashes),
+            "files_tracked": len(self._file_states),
+            "files_hashed": self._files_hashed,
+            "hash_algorithm": "xxh3_128" if XXHASH_AVAILABLE else "blake2b",
+            "backend": self._backend.name,
             "check_interval": self.check_interval,
             "is_running": self._watch_thread is not None and self._watch_thread.is_alive(),
         }
 
 
+# ========================================
+# SHARED DATA-ROOT WATCHER
+# ========================================
+
+_file_watcher_instance: Optional[FileWatcher] = None
+_file_watcher_lock = Lock()
+
+
+def _create_file_watcher(data_path: Path | str) -> FileWatcher:
+    return FileWatcher(
+        watch_paths=[str(data_path)],
+        check_interval=60,
+        backend=getattr(settings, 'FILE_WATCHER_BACKEND', 'auto'),
+        debounce_seconds=getattr(settings, 'FILE_WATCHER_DEBOUNCE_SECONDS', 2.0),
+    )
+
+
+def get_file_watcher() -> FileWatcher:
+    """
+    Get or create the single FileWatcher on DATA_ROOT_PATH.
+    
+    The study catalog and the refresh scheduler both subscribe to it, so
+    the data root is scanned and hashed once.
+    """
+    global _file_watcher_instance
+    if _file_watcher_instance is None:
+        with _file_watcher_lock:
+            if _file_watcher_instance is None:
+                _file_watcher_instance = _create_file_watcher(getattr(settings, 'DATA_ROOT_PATH', '.'))
+    return _file_watcher_instance
+
+
+def reset_file_watcher() -> None:
+    """Stop and drop the shared watcher."""
+    global _file_watcher_instance
+    with _file_watcher_lock:
+        watcher, _file_watcher_instance = _file_watcher_instance, None
+    if watcher is not None:
+        watcher.stop()
+
+
 # ========================================
 # REFRESH SCHEDULER
 # ========================================
@@ -228,6 +537,9 @@ class RefreshScheduler:
     1. Check if dataset has changed
     2. If changed, run full pipeline
     3. Update cache with new results
+    
+    File changes reported by the watcher are accumulated and handed to the
+    change callback (if set) so only the affected data is refreshed.
     """
     
     DEFAULT_INTERVAL = 1800  # 30 minutes in seconds
@@ -242,7 +554,8 @@ class RefreshScheduler:
         Initialize scheduler.
         
         Args:
-            data_path: Path to dataset directory
+            data_path: Path to dataset directory (defaults to DATA_ROOT_PATH,
+                watched through the shared get_file_watcher())
             refresh_interval: Seconds between scheduled refreshes
             enable_file_watcher: Enable file change detection
         """
@@ -254,28 +567,37 @@ class RefreshScheduler:
             self.data_path = Path(data_path)
         else:
             # Default from settings
-            self.data_path = Path(settings.data_root) if hasattr(settings, 'data_root') else None
+            data_root = getattr(settings, 'DATA_ROOT_PATH', None)
+            self.data_path = Path(data_root) if data_root else None
         
         # Threading
         self._stop_event = Event()
         self._scheduler_thread: Optional[Thread] = None
         
-        # File watcher
+        # File watcher (the shared data-root watcher unless a data_path was given)
         self._file_watcher: Optional[FileWatcher] = None
+        self._owns_file_watcher = data_path is not None
         if enable_file_watcher and self.data_path:
-            self._file_watcher = FileWatcher(
-                watch_paths=[str(self.data_path)],
-                check_interval=60,
-            )
+            if self._owns_file_watcher:
+                self._file_watcher = _create_file_watcher(self.data_path)
+            else:
+                self._file_watcher = get_file_watcher()
             self._file_watcher.add_change_callback(self._on_file_change)
         
-        # Refresh callback
+        # Refresh callbacks
         self._refresh_callback: Optional[Callable[[], None]] = None
+        self._change_callback: Optional[Callable[[List[str]], None]] = None
         
         # State tracking
         self._last_refresh: Optional[datetime] = None
         self._refresh_count = 0
+        self._incremental_refresh_count = 0
         self._pending_refresh = False
+        self._full_refresh_requested = False
+        
+        # Changed files accumulated between refreshes (watcher thread → scheduler thread)
+        self._pending_changes: Set[str] = set()
+        self._changes_lock = Lock()
         
         logger.info(f"RefreshScheduler initialized: {refresh_interval}s interval")
     
@@ -283,6 +605,10 @@ class RefreshScheduler:
         """Set callback to run on refresh."""
         self._refresh_callback = callback
     
+    def set_change_callback(self, callback: Callable[[List[str]], None]) -> None:
+        """Set callback to run with the changed file paths on file-driven refresh."""
+        self._change_callback = callback
+    
     def start(self) -> None:
         """Start scheduler and file watcher."""
         if self._scheduler_thread is not None:
@@ -304,7 +630,9 @@ class RefreshScheduler:
         self._stop_event.set()
         
         if self._file_watcher:
-            self._file_watcher.stop()
+            self._file_watcher.remove_change_callback(self._on_file_change)
+            if self._owns_file_watcher:
+                self._file_watcher.stop()
         
         if self._scheduler_thread:
             self._scheduler_thread.join(timeout=5)
@@ -313,7 +641,8 @@ class RefreshScheduler:
         logger.info("RefreshScheduler stopped")
     
     def trigger_refresh(self) -> None:
-        """Manually trigger a refresh."""
+        """Manually trigger a full refresh."""
+        self._full_refresh_requested = True
         self._pending_refresh = True
         logger.info("Manual refresh triggered")
     
@@ -345,13 +674,31 @@ class RefreshScheduler:
         return elapsed >= self.refresh_interval
     
     def _do_refresh(self) -> None:
-        """Execute refresh."""
-        logger.info("Starting scheduled refresh...")
-        self._pending_refresh = False
+        """
+        Execute refresh.
+        
+        Pending file changes are refreshed incrementally through the change
+        callback. A manual trigger, an elapsed interval with no changes, or a
+        missing change callback runs the full refresh callback instead.
+        """
+        with self._changes_lock:
+            changed_files = sorted(self._pending_changes)
+            self._pending_changes.clear()
+            full_refresh = self._full_refresh_requested
+            self._full_refresh_requested = False
+            self._pending_refresh = False
+        
+        incremental = bool(changed_files) and self._change_callback is not None and not full_refresh
         
         try:
-            if self._refresh_callback:
-                self._refresh_callback()
+            if incremental:
+                logger.info(f"Starting incremental refresh for {len(changed_files)} changed files...")
+                self._change_callback(changed_files)
+                self._incremental_refresh_count += 1
+            else:
+                logger.info("Starting scheduled refresh...")
+                if self._refresh_callback:
+                    self._refresh_callback()
             
             self._last_refresh = datetime.now()
             self._refresh_count += 1
@@ -362,9 +709,11 @@ class RefreshScheduler:
             logger.error(f"Refresh failed: {e}")
     
     def _on_file_change(self, changed_files: List[str]) -> None:
-        """Handle file change from watcher."""
+        """Handle file change from watcher by queuing the changed paths."""
         logger.info(f"File change detected: {len(changed_files)} files")
-        self.trigger_refresh()
+        with self._changes_lock:
+            self._pending_changes.update(changed_files)
+            self._pending_refresh = True
     
     def get_status(self) -> Dict[str, Any]:
         """Get scheduler status."""
@@ -373,7 +722,9 @@ class RefreshScheduler:
             "refresh_interval": self.refresh_interval,
             "last_refresh": self._last_refresh.isoformat() if self._last_refresh else None,
             "refresh_count": self._refresh_count,
+            "incremental_refresh_count": self._incremental_refresh_count,
             "pending_refresh": self._pending_refresh,
+            "pending_changes": len(self._pending_changes),
             "file_watcher": self._file_watcher.get_stats() if self._file_watcher else None,
         }
 
@@ -393,8 +744,16 @@ class AnalysisScheduler:
     - Scheduled refresh
     """
     
-    def __init__(self):
-        """Initialize integrated scheduler."""
+    def __init__(self, on_changed_studies: Optional[Callable[[List[str]], Any]] = None):
+        """
+        Initialize integrated scheduler.
+        
+        Args:
+            on_changed_studies: Re-runs analysis for a batch of study IDs
+                affected by file changes (the API passes its cache-writing
+                refresh). Without it, affected studies are only invalidated
+                and recomputed on next request.
+        """
         from src.core.cache import get_cache
         from src.intelligence.agent_pipeline import get_pipeline
         
@@ -407,7 +766,10 @@ class AnalysisScheduler:
             enable_file_watcher=True,
         )
         self.scheduler.set_refresh_callback(self._refresh_all_studies)
+        self.scheduler.set_change_callback(self._refresh_changed_files)
         
+        self.on_changed_studies = on_changed_studies
+        self._catalog = None
         self._is_running = False
         logger.info("AnalysisScheduler initialized")
     
@@ -423,14 +785,18 @@ class AnalysisScheduler:
         self._is_running = False
         logger.info("AnalysisScheduler stopped")
     
+    def _get_catalog(self):
+        """Get the study catalog used to map file changes."""
+        if self._catalog is None:
+            from src.data import get_study_catalog
+            self._catalog = get_study_catalog()
+        return self._catalog
+    
     def _refresh_all_studies(self) -> None:
         """Refresh analysis for all studies."""
-        from src.data import StudyDiscovery
-        
         try:
-            # Discover all studies
-            discovery = StudyDiscovery()
-            studies = discovery.discover_studies()
+            # Rebuild the study catalog (also rebuilds the file -> study index)
+            studies = list(self._get_catalog().refresh())
             
             logger.info(f"Refreshing {len(studies)} studies...")
             
@@ -450,6 +816,37 @@ class AnalysisScheduler:
         except Exception as e:
             logger.error(f"Refresh all studies failed: {e}")
     
+    def _refresh_changed_files(self, changed_files: List[str]) -> None:
+        """
+        Re-run analysis only for the studies the changed files belong to.
+        
+        Each affected study is re-ingested, re-featurized and re-run through
+        agents, consensus and DQI; other studies keep their cached results.
+        """
+        # Updates the catalog entries of affected studies before re-analysis
+        affected = self._get_catalog().apply_changes(changed_files)
+        if not affected:
+            logger.info("No studies affected by file changes")
+            return
+        
+        logger.info(f"Refreshing {len(affected)} affected studies: {sorted(affected)}")
+        
+        for study_id, file_types in sorted(affected.items()):
+            logger.info(
+                f"{study_id}: re-running analysis for "
+                f"{', '.join(sorted(ft.value for ft in file_types))}"
+            )
+            self.cache.invalidate(f"analysis_{study_id}")
+        
+        if self.on_changed_studies is None:
+            return
+        
+        # Affected studies share the agent pool in a single batch
+        try:
+            self.on_changed_studies(sorted(affected))
+        except Exception as e:
+            logger.error(f"Error refreshing {sorted(affected)}: {e}")
+    
     def get_status(self) -> Dict[str, Any]:
         """Get scheduler status."""
         return {
@@ -467,26 +864,33 @@ class AnalysisScheduler:
 _scheduler_instance: Optional[AnalysisScheduler] = None
 
 
-def get_scheduler() -> AnalysisScheduler:
-    """Get or create singleton scheduler instance."""
+def get_scheduler(
+    on_changed_studies: Optional[Callable[[List[str]], Any]] = None,
+) -> AnalysisScheduler:
+    """Get or create singleton scheduler instance (on_changed_studies applies on creation)."""
     global _scheduler_instance
     if _scheduler_instance is None:
-        _scheduler_instance = AnalysisScheduler()
+        _scheduler_instance = AnalysisScheduler(on_changed_studies=on_changed_studies)
     return _scheduler_instance
 
 
-def start_scheduler() -> AnalysisScheduler:
+def start_scheduler(
+    on_changed_studies: Optional[Callable[[List[str]], Any]] = None,
+) -> AnalysisScheduler:
     """Start the scheduler and return instance."""
-    scheduler = get_scheduler()
+    scheduler = get_scheduler(on_changed_studies)
+    if on_changed_studies is not None:
+        scheduler.on_changed_studies = on_changed_studies
     scheduler.start()
     return scheduler
 
 
 def stop_scheduler() -> None:
-    """Stop the scheduler."""
+    """Stop the scheduler (the next get_scheduler() creates a fresh one)."""
     global _scheduler_instance
     if _scheduler_instance:
         _scheduler_instance.stop()
+        _scheduler_instance = None
 
 
 # ========================================
@@ -495,6 +899,14 @@ def stop_scheduler() -> None:
 
 __all__ = [
     "FileWatcher",
+    "FileState",
+    "get_file_watcher",
+    "reset_file_watcher",
+    "PollingBackend",
+    "EventBackend",
+    "hash_file",
+    "WATCHDOG_AVAILABLE",
+    "XXHASH_AVAILABLE",
     "RefreshScheduler",
     "AnalysisScheduler",
     "get_scheduler",
@@ -113,8 +113,65 @@ class Settings(BaseSettings):
     )
     BATCH_SIZE: int = 10
     MAX_WORKERS: int = 4
+    # "thread" or "process" (per-file process pool, see DataIngestionEngine)
+    INGESTION_EXECUTION_MODE: str = "thread"
+    INGESTION_PROCESS_WORKERS: Optional[int] = None
     SNAPSHOT_RETENTION_DAYS: int = 90
     
+    # Parsed workbook cache (see src/data/workbook_cache.py)
+    WORKBOOK_CACHE_ENABLED: bool = True
+    WORKBOOK_CACHE_DIR: Optional[str] = None
+    WORKBOOK_CACHE_MAX_MB: int = 512
+    WORKBOOK_CACHE_MAX_ENTRIES: int = 500
+    
+    # Analysis cache memory bounds (see src/core/cache.py)
+    CACHE_MAX_ENTRIES: int = 1000
+    CACHE_MAX_MB: int = 256
+    CACHE_EVICTION_POLICY: str = "lru"  # "lru" or "lfu"
+    CACHE_SWEEP_INTERVAL: float = 60.0  # seconds, 0 disables
+    CACHE_REFRESH_WORKERS: int = 4  # background (stale-while-revalidate) refreshes
+    CACHE_STALE_GRACE_SECONDS: float = 3600.0  # expired entries kept this long for stale-while-revalidate
+    
+    # Data root file watcher (see src/core/scheduler.py): "auto", "events" or "polling"
+    FILE_WATCHER_BACKEND: str = "auto"
+    FILE_WATCHER_DEBOUNCE_SECONDS: float = 2.0
+    
+    # Background analysis jobs (see src/core/jobs.py): "thread" or "process" executor
+    ANALYSIS_JOB_EXECUTOR: str = "thread"
+    ANALYSIS_JOB_WORKERS: int = 2
+    ANALYSIS_JOB_MAX_PENDING: int = 100  # queued + running; further submissions get 503
+    ANALYSIS_JOB_RETENTION: int = 500  # finished jobs kept for status lookups
+    
+    # WebSocket push (see src/api/realtime.py)
+    PUSH_QUEUE_SIZE: int = 256  # undelivered events per connection before the oldest is dropped
+    PUSH_SEND_TIMEOUT_SECONDS: float = 5.0  # a send slower than this disconnects the client
+    
+    # Streaming exports (see src/api/export.py)
+    EXPORT_STREAM_BATCH_ROWS: int = 5000  # rows encoded per chunk / Parquet row group
+    
+    # Site and patient list pagination (see src/api/site_index.py)
+    SITE_PAGE_SIZE: int = 100  # default page size
+    SITE_PAGE_MAX: int = 1000  # largest page a client may request
+    
+    # Audit trail writer (see src/audit/audit_writer.py)
+    AUDIT_WRITER_QUEUE_SIZE: int = 10000  # log_event blocks when this many events are pending
+    AUDIT_WRITER_BATCH_SIZE: int = 500  # events per group commit
+    AUDIT_FSYNC_MODE: str = "batch"  # "event", "batch" or "interval"
+    AUDIT_FSYNC_INTERVAL_SECONDS: float = 1.0  # used by "interval"
+    
+    # Guardian event retention (see src/guardian/event_store.py)
+    GUARDIAN_EVENT_MAX_EVENTS: int = 10000  # events kept in memory per store
+    GUARDIAN_EVENT_MAX_AGE_HOURS: float = 0.0  # 0 keeps events until MAX_EVENTS is reached
+    GUARDIAN_EVENT_SPILL_DIR: Optional[str] = None  # evicted events are appended here as JSONL
+    
+    # Notification inbox served by GET /api/v1/notifications when no user_id is given
+    NOTIFICATION_DEFAULT_USER_ID: str = "dashboard"
+    NOTIFICATION_CALLBACK_BATCH_SIZE: int = 1000  # deliveries per dispatched callback batch
+    
+    # Pipeline stage tracing (see src/core/tracing.py)
+    TRACING_ENABLED: bool = True
+    TRACING_MAX_TRACES: int = 200  # finished root spans kept for /api/v1/metrics/traces
+    
     @field_validator("DATA_ROOT_PATH")
     @classmethod
     def validate_data_path(cls, v: str) -> str:
@@ -168,6 +225,11 @@ class Settings(BaseSettings):
     AGENT_MIN_CONFIDENCE: float = 0.6
     AGENT_ABSTENTION_THRESHOLD: float = 0.5
     
+    # Agent execution (see src/intelligence/agent_pipeline.py)
+    AGENT_POOL_WORKERS: int = 4  # persistent pool shared by all studies
+    AGENT_TIMEOUT_SECONDS: float = 30.0  # per-agent deadline from agent start
+    AGENT_QUEUE_TIMEOUT_SECONDS: float = 30.0  # longest an agent waits for a worker before abstaining
+    
     # ========================================
     # GUARDIAN ENGINE SETTINGS
     # ========================================
@@ -0,0 +1,318 @@
+"""
+C-TRUST Stage Tracing
+=====================
+Lightweight spans for timing the analysis pipeline end to end.
+
+A span times one stage (Excel read, header detection, feature extraction
+per FileType, each agent, consensus, DQI, Guardian validation). Spans
+nest through a context variable, so a stage started inside another stage
+becomes its child; ``bind`` carries the current span into worker threads.
+Child spans inherit the ``study_id`` tag of their parent.
+
+Every finished span is aggregated into a per-stage latency histogram
+(exported in the Prometheus text format), and every finished root span is
+kept, with its children, in a bounded buffer of JSON traces.
+
+Usage:
+    from src.core.tracing import tracer
+
+    with tracer.span("features.extract", study_id=study_id):
+        for file_type, df in raw_data.items():
+            with tracer.span("features.file_type", file_type=file_type.value):
+                ...
+
+    executor.submit(tracer.bind(work), item)     # child of the current span
+    tracer.render_prometheus()                   # text exposition format
+    tracer.get_traces(limit=20, study_id="STUDY_01")
+"""
+
+import contextvars
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.core import get_logger
+from src.core.settings import settings
+
+logger = get_logger(__name__)
+
+
+# Tags exported as Prometheus labels (others only appear in JSON traces)
+METRIC_LABELS = ("study_id", "file_type", "agent", "method")
+
+# Histogram bucket upper bounds, in seconds
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_span_ids = itertools.count(1)
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("ctrust_span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed stage; children are the stages started inside it."""
+    name: str
+    span_id: int
+    trace_id: int
+    parent_id: Optional[int] = None
+    tags: Dict[str, Any] = field(default_factory=dict)
+    started_at: datetime = field(default_factory=datetime.now)
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    children: List["Span"] = field(default_factory=list)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_tag(self, key: str, value: Any) -> None:
+        self.tags[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "trace_id": self.trace_id,
+            "parent_id": self.parent_id,
+            "tags": dict(self.tags),
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "error": self.error,
+            "children": [child.to_dict() for child in list(self.children)],
+        }
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "total", "errors")
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool) -> None:
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Tracer:
+    """
+    Span factory, stage histograms and recent-trace buffer.
+
+    Thread-safe. When disabled, ``span`` still yields a Span (so callers
+    can set tags) but nothing is recorded.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, max_traces: Optional[int] = None):
+        """
+        Initialize tracer.
+
+        Args:
+            enabled: Record spans (defaults to settings.TRACING_ENABLED)
+            max_traces: Finished root spans kept for get_traces
+                (defaults to settings.TRACING_MAX_TRACES)
+        """
+        self.enabled = enabled if enabled is not None else getattr(settings, 'TRACING_ENABLED', True)
+        self.max_traces = max_traces or getattr(settings, 'TRACING_MAX_TRACES', 200)
+        self._traces: Deque[Span] = deque(maxlen=self.max_traces)
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        """Span active in this context, if any."""
+        return _current_span.get()
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **tags: Any) -> Span:
+        """
+        Create a span without making it current; end it with ``finish``.
+
+        Args:
+            name: Stage name, e.g. "ingestion.excel_read"
+            parent: Parent span (defaults to the current span)
+            **tags: Span tags; study_id is inherited from the parent
+        """
+        parent = parent if parent is not None else _current_span.get()
+        span_id = next(_span_ids)
+        if parent is not None:
+            if "study_id" in parent.tags:
+                tags.setdefault("study_id", parent.tags["study_id"])
+            span = Span(name=name, span_id=span_id, trace_id=parent.trace_id, parent_id=parent.span_id, tags=tags)
+            with self._lock:
+                parent.children.append(span)
+        else:
+            span = Span(name=name, span_id=span_id, trace_id=span_id, tags=tags)
+        return span
+
+    def finish(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """Record a span's duration in the stage histogram (and the trace buffer for roots)."""
+        if span.duration_ms is not None:
+            return
+        span.duration_ms = (time.perf_counter() - span._start) * 1000
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        if not self.enabled:
+            return
+        labels = tuple((key, str(span.tags[key])) for key in METRIC_LABELS if span.tags.get(key) is not None)
+        with self._lock:
+            histogram = self._histograms.get((span.name, labels))
+            if histogram is None:
+                histogram = self._histograms[(span.name, labels)] = _Histogram()
+            histogram.observe(span.duration_ms / 1000, span.error is not None)
+            if span.parent_id is None:
+                self._traces.append(span)
+
+    @contextmanager
+    def span(self, name: str, **tags: Any) -> Iterator[Span]:
+        """Time the enclosed block as a child of the current span."""
+        span = self.start_span(name, **tags)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish(span, error=e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+    @contextmanager
+    def activate(self, span: Span) -> Iterator[Span]:
+        """Make an existing span current for the enclosed block without finishing it."""
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    def bind(self, fn: Callable[..., Any], parent: Optional[Span] = None) -> Callable[..., Any]:
+        """
+        Wrap ``fn`` so spans it starts are children of ``parent`` (defaults
+        to the current span), in whichever thread it runs.
+        """
+        parent = parent if parent is not None else _current_span.get()
+        if parent is None:
+            return fn
+
+        @wraps(fn)
+        def bound(*args: Any, **kwargs: Any) -> Any:
+            token = _current_span.set(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _current_span.reset(token)
+
+        return bound
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def get_traces(self, limit: int = 20, study_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent finished root spans with their children, newest first."""
+        with self._lock:
+            traces = list(self._traces)
+        result = []
+        for span in reversed(traces):
+            if study_id is not None and span.tags.get("study_id") != study_id:
+                continue
+            result.append(span.to_dict())
+            if len(result) >= limit:
+                break
+        return result
+
+    def get_stage_stats(self) -> List[Dict[str, Any]]:
+        """Count, total and mean duration per (stage, labels)."""
+        with self._lock:
+            items = [(key, h.count, h.total, h.errors) for key, h in self._histograms.items()]
+        return [
+            {
+                "stage": name,
+                "labels": dict(labels),
+                "count": count,
+                "total_seconds": round(total, 6),
+                "mean_ms": round(total / count * 1000, 3) if count else 0.0,
+                "errors": errors,
+            }
+            for (name, labels), count, total, errors in sorted(items, key=lambda item: -item[2])
+        ]
+
+    def render_prometheus(self) -> str:
+        """Stage histograms and error counters in the Prometheus text format (0.0.4)."""
+        with self._lock:
+            items = sorted(
+                ((name, labels, list(h.buckets), h.count, h.total, h.errors)
+                 for (name, labels), h in self._histograms.items()),
+                key=lambda item: (item[0], item[1]),
+            )
+
+        lines = [
+            "# HELP ctrust_stage_duration_seconds Time spent in analysis pipeline stages.",
+            "# TYPE ctrust_stage_duration_seconds histogram",
+        ]
+        for name, labels, buckets, count, total, _ in items:
+            base = ",".join([f'stage="{_escape(name)}"'] + [f'{k}="{_escape(v)}"' for k, v in labels])
+            cumulative = 0
+            for bound, n in zip(DURATION_BUCKETS, buckets):
+                cumulative += n
+                lines.append(f'ctrust_stage_duration_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'ctrust_stage_duration_seconds_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f"ctrust_stage_duration_seconds_sum{{{base}}} {total:.6f}")
+            lines.append(f"ctrust_stage_duration_seconds_count{{{base}}} {count}")
+
+        lines += [
+            "# HELP ctrust_stage_errors_total Stage executions that raised.",
+            "# TYPE ctrust_stage_errors_total counter",
+        ]
+        for name, labels, _, _, _, errors in items:
+            base = ",".join([f'stage="{_escape(name)}"'] + [f'{k}="{_escape(v)}"' for k, v in labels])
+            lines.append(f"ctrust_stage_errors_total{{{base}}} {errors}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop recorded histograms and traces."""
+        with self._lock:
+            self._histograms.clear()
+            self._traces.clear()
+
+
+def traced(name: str, **tags: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: run the function inside ``tracer.span(name, **tags)``."""
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(name, **tags):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Process-wide tracer used by the pipeline and the metrics endpoints
+tracer = Tracer()
+
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "tracer",
+    "traced",
+    "METRIC_LABELS",
+    "DURATION_BUCKETS",
+]
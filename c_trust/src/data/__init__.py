@@ -24,6 +24,8 @@ from src.data.ingestion import (
     DataValidator,
     BatchProcessor,
 )
+from src.data.workbook_cache import WorkbookCache
+from src.data.study_catalog import StudyCatalog, get_study_catalog, reset_study_catalog
 from src.data.models import (
     CodingReport,
     DataSnapshot,
@@ -64,6 +66,10 @@ __all__ = [
     "FileTypeDetector",
     "DataValidator",
     "BatchProcessor",
+    "WorkbookCache",
+    "StudyCatalog",
+    "get_study_catalog",
+    "reset_study_catalog",
     # Features
     "FeatureEngineeringEngine",
     "FeatureCalculator",
@@ -122,10 +122,11 @@ class FeatureMapper:
             logger.debug("Cannot calculate missing_pages_pct: missing required features (missing_pages_count or total_forms)")
         
         # Map SAE backlog days - ONLY if we have REAL data from SAE Dashboard
-        if "sae_dm_avg_age_days" in features:
+        # (the extractor sets the age to None when no timestamps were usable)
+        if features.get("sae_dm_avg_age_days") is not None:
             calculated["sae_backlog_days"] = features["sae_dm_avg_age_days"]
             logger.debug(f"Mapped sae_dm_avg_age_days → sae_backlog_days: {calculated['sae_backlog_days']:.1f} days")
-        elif "sae_safety_avg_age_days" in features:
+        elif features.get("sae_safety_avg_age_days") is not None:
             calculated["sae_backlog_days"] = features["sae_safety_avg_age_days"]
             logger.debug(f"Mapped sae_safety_avg_age_days → sae_backlog_days: {calculated['sae_backlog_days']:.1f} days")
         else:
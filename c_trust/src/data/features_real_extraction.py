@@ -21,6 +21,7 @@ from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from src.core import get_logger, safe_divide, calculate_percentage
+from src.core.tracing import tracer
 from src.data.models import FileType
 from src.data.feature_mapper import FeatureMapper
 from src.data.column_mapper import FlexibleColumnMapper
@@ -64,51 +65,54 @@ class RealFeatureExtractor:
         Returns:
             Dict with all feature categories (mapped to agent-expected names)
         """
-        features = {}
-        
-        try:
-            # Extract from each file type
-            for file_type, df in raw_data.items():
-                if df is None or (isinstance(df, pd.DataFrame) and df.empty):
-                    logger.debug(f"{study_id}: Skipping empty {file_type}")
-                    continue
+        with tracer.span("features.extract", study_id=study_id):
+            features = {}
+            
+            try:
+                # Extract from each file type
+                for file_type, df in raw_data.items():
+                    if df is None or (isinstance(df, pd.DataFrame) and df.empty):
+                        logger.debug(f"{study_id}: Skipping empty {file_type}")
+                        continue
+                    
+                    with tracer.span("features.file_type", file_type=getattr(file_type, "value", file_type)):
+                        try:
+                            if file_type == FileType.EDC_METRICS:
+                                features.update(self.extract_from_edc_metrics(df, study_id))
+                            elif file_type == FileType.EDRR:
+                                # EDRR can contain query data
+                                features.update(self.extract_from_query_report(df, study_id))
+                            elif file_type == FileType.MEDDRA:
+                                features.update(self.extract_from_coding_report(df, study_id, "MedDRA"))
+                            elif file_type == FileType.WHODD:
+                                features.update(self.extract_from_coding_report(df, study_id, "WHODD"))
+                            elif file_type == FileType.SAE_DM:
+                                features.update(self.extract_from_sae_dashboard(df, study_id, "DM"))
+                            elif file_type == FileType.SAE_SAFETY:
+                                features.update(self.extract_from_sae_dashboard(df, study_id, "Safety"))
+                            elif file_type == FileType.VISIT_PROJECTION:
+                                features.update(self.extract_from_visit_projection(df, study_id))
+                            elif file_type == FileType.MISSING_PAGES:
+                                features.update(self.extract_from_missing_pages(df, study_id))
+                            else:
+                                logger.debug(f"{study_id}: No extraction method for {file_type}")
+                        except Exception as e:
+                            logger.warning(f"{study_id}: Failed to extract from {file_type}: {e}")
+                            continue
                 
-                try:
-                    if file_type == FileType.EDC_METRICS:
-                        features.update(self.extract_from_edc_metrics(df, study_id))
-                    elif file_type == FileType.EDRR:
-                        # EDRR can contain query data
-                        features.update(self.extract_from_query_report(df, study_id))
-                    elif file_type == FileType.MEDDRA:
-                        features.update(self.extract_from_coding_report(df, study_id, "MedDRA"))
-                    elif file_type == FileType.WHODD:
-                        features.update(self.extract_from_coding_report(df, study_id, "WHODD"))
-                    elif file_type == FileType.SAE_DM:
-                        features.update(self.extract_from_sae_dashboard(df, study_id, "DM"))
-                    elif file_type == FileType.SAE_SAFETY:
-                        features.update(self.extract_from_sae_dashboard(df, study_id, "Safety"))
-                    elif file_type == FileType.VISIT_PROJECTION:
-                        features.update(self.extract_from_visit_projection(df, study_id))
-                    elif file_type == FileType.MISSING_PAGES:
-                        features.update(self.extract_from_missing_pages(df, study_id))
-                    else:
-                        logger.debug(f"{study_id}: No extraction method for {file_type}")
-                except Exception as e:
-                    logger.warning(f"{study_id}: Failed to extract from {file_type}: {e}")
-                    continue
-            
-            # Map extracted features to agent-expected names
-            mapped_features = self.mapper.map_features(features)
-            
-            # Calculate derived features (using math/logic on available data)
-            self._add_derived_features(mapped_features, raw_data, study_id)
-            
-            logger.info(f"{study_id}: Extracted {len(features)} raw features, mapped to {len(mapped_features)} total features")
-            
-        except Exception as e:
-            logger.error(f"{study_id}: Error in direct feature extraction: {e}", exc_info=True)
-            # Return empty dict - no fallback data
-            mapped_features = {}
+                # Map extracted features to agent-expected names
+                mapped_features = self.mapper.map_features(features)
+                
+                # Calculate derived features (using math/logic on available data)
+                with tracer.span("features.derived"):
+                    self._add_derived_features(mapped_features, raw_data, study_id)
+                
+                logger.info(f"{study_id}: Extracted {len(features)} raw features, mapped to {len(mapped_features)} total features")
+                
+            except Exception as e:
+                logger.error(f"{study_id}: Error in direct feature extraction: {e}", exc_info=True)
+                # Return empty dict - no fallback data
+                mapped_features = {}
         
         return mapped_features
     
@@ -9,14 +9,15 @@ Capabilities:
 - File type detection based on filename patterns
 - Schema validation and data cleaning
 - Snapshot creation for temporal analysis
-- Parallel processing for performance
+- Parallel processing for performance (threads or a per-file process pool)
 
 Key Components:
-1. ExcelFileReader - Handles binary Excel files (openpyxl + xlrd fallback)
+1. ExcelFileReader - Handles binary Excel files (single-pass openpyxl, xlrd fallback)
 2. FileTypeDetector - Pattern matching for 9 file types
 3. StudyDiscovery - Scans data directory for all studies
 4. DataValidator - Schema validation and data quality checks
 5. SnapshotManager -Versioned data snapshots
+6. WorkbookCache - On-disk cache of parsed workbooks (src/data/workbook_cache.py)
 
 Production features:
 - Comprehensive error handling
@@ -26,19 +27,26 @@ Production features:
 - Automatic retry logic
 """
 
+import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
 
 from src.core import get_logger
 from src.core.settings import settings
 from src.core.config import config_manager
+from src.core.tracing import tracer
 from src.data.models import FileType, Study
+from src.data.workbook_cache import WorkbookCache, frame_from_bytes, frame_to_bytes
 
 logger = get_logger(__name__)
 
@@ -57,12 +65,28 @@ class ExcelFileReader:
     - Multiple engine support (openpyxl, xlrd)
     - Error recovery and retry logic
     - Data type inference
+    - Optional parsed-workbook cache (skips re-parsing unchanged files)
     """
     
-    def __init__(self):
-        """Initialize Excel file reader"""
+    # Formats openpyxl can stream; .xls always goes through the fallback strategies
+    SINGLE_PASS_EXTENSIONS = {".xlsx", ".xlsm"}
+    
+    def __init__(self, cache: Optional[WorkbookCache] = None, single_pass: bool = True):
+        """
+        Initialize Excel file reader.
+        
+        Args:
+            cache: Parsed-workbook cache. If None, every read parses the file.
+            single_pass: Open each workbook once and build frames from the loaded
+                        rows. If False (or the single-pass read fails), use the
+                        openpyxl -> pandas -> xlrd strategy chain.
+        """
         self.supported_extensions = [".xlsx", ".xls", ".xlsm"]
-        logger.debug("ExcelFileReader initialized")
+        self.cache = cache
+        self.single_pass = single_pass
+        logger.debug(
+            f"ExcelFileReader initialized (cache={'on' if cache else 'off'}, single_pass={single_pass})"
+        )
     
     def _detect_header_row(self, file_path: Path, sheet_name: str | int = 0) -> int:
         """
@@ -86,16 +110,37 @@ class ExcelFileReader:
         Returns:
             Row index (0-based) containing headers
         """
-        try:
-            # Read first 5 rows without headers to analyze structure
-            df_preview = pd.read_excel(
-                file_path,
-                sheet_name=sheet_name,
-                header=None,
-                nrows=5,
-                engine="openpyxl"
-            )
+        with tracer.span("ingestion.header_detection"):
+            try:
+                # Read first 5 rows without headers to analyze structure
+                df_preview = pd.read_excel(
+                    file_path,
+                    sheet_name=sheet_name,
+                    header=None,
+                    nrows=5,
+                    engine="openpyxl"
+                )
+            except Exception as e:
+                logger.warning(f"Header detection failed for {file_path.name}: {e}, using row 0")
+                return 0
             
+            return self._detect_header_row_from_preview(df_preview, file_path.name)
+    
+    def _detect_header_row_from_preview(self, df_preview: pd.DataFrame, file_name: str) -> int:
+        """
+        Score the first rows of a sheet (read with header=None) and pick the header row.
+        
+        Shared by the per-read path (_detect_header_row) and the single-pass
+        path, which builds the preview from rows it has already loaded.
+        
+        Args:
+            df_preview: First rows of the sheet, read without headers
+            file_name: File name for logging
+        
+        Returns:
+            Row index (0-based) containing headers
+        """
+        try:
             # Find row with best header characteristics
             best_row = 0
             best_score = 0
@@ -112,7 +157,7 @@ class ExcelFileReader:
             row_0_cols = [str(val).strip() for val in row_0 if pd.notna(val)]
             if any('SITE' in col.upper() and 'ID' in col.upper() for col in row_0_cols) and \
                any('SUBJECT' in col.upper() and 'ID' in col.upper() for col in row_0_cols):
-                logger.info(f"Found 'Site ID' and 'Subject ID' in row 0 for {file_path.name}, using row 0")
+                logger.info(f"Found 'Site ID' and 'Subject ID' in row 0 for {file_name}, using row 0")
                 return 0
             
             for i in range(min(5, len(df_preview))):
@@ -176,11 +221,11 @@ class ExcelFileReader:
                     best_score = score
                     best_row = i
             
-            logger.info(f"Detected header row {best_row} for {file_path.name} (score={best_score:.1f})")
+            logger.info(f"Detected header row {best_row} for {file_name} (score={best_score:.1f})")
             return best_row
             
         except Exception as e:
-            logger.warning(f"Header detection failed for {file_path.name}: {e}, using row 0")
+            logger.warning(f"Header detection failed for {file_name}: {e}, using row 0")
             return 0
     
     def read_file(
@@ -221,8 +266,42 @@ class ExcelFileReader:
             logger.error(f"Unsupported file extension: {file_path.suffix}")
             return None
         
+        if self.cache is not None:
+            cached_header = header_row if header_row is not None or auto_detect_header else 0
+            df = self.cache.get(file_path, sheet_name, cached_header)
+            if df is not None:
+                logger.info(
+                    f"Loaded {file_path.name} from workbook cache: "
+                    f"{len(df)} rows, {len(df.columns)} columns"
+                )
+                return df
+        
+        with tracer.span("ingestion.excel_read"):
+            df = self._parse_file(file_path, sheet_name, header_row, auto_detect_header)
+        
+        if df is not None and self.cache is not None:
+            self.cache.put(file_path, df, sheet_name, cached_header)
+        
+        return df
+    
+    def _parse_file(
+        self,
+        file_path: Path,
+        sheet_name: str | int,
+        header_row: Optional[int],
+        auto_detect_header: bool
+    ) -> Optional[pd.DataFrame]:
+        """Parse Excel file from disk (no cache)."""
         logger.info(f"Reading Excel file: {file_path.name}")
         
+        if self.single_pass and file_path.suffix in self.SINGLE_PASS_EXTENSIONS:
+            try:
+                df = self._read_single_pass(file_path, sheet_name, header_row, auto_detect_header)
+                if df is not None and not df.empty:
+                    return df
+            except Exception as e:
+                logger.warning(f"Single-pass read failed for {file_path.name}: {e}, trying fallback strategies")
+        
         # CRITICAL FIX: Detect EDC Metrics files and use multi-row header
         is_edc_metrics = "EDC_Metrics" in file_path.name or "CPID_EDC" in file_path.name
         
@@ -304,42 +383,238 @@ class ExcelFileReader:
             
             logger.debug(f"Read EDC Metrics with multi-row header: {len(df)} rows, {len(df.columns)} columns")
             
-            # Flatten tuple column names
-            # Strategy: Join non-empty, non-"Unnamed" parts with " - "
-            new_columns = []
-            for col in df.columns:
-                if isinstance(col, tuple):
-                    # Filter out empty strings, "nan", and "Unnamed" parts
-                    parts = [
-                        str(part).strip() 
-                        for part in col 
-                        if str(part) != 'nan' 
-                        and 'Unnamed' not in str(part)
-                        and str(part).strip() != ''
-                    ]
-                    # Join remaining parts
-                    if parts:
-                        flattened = ' - '.join(parts)
-                    else:
-                        # If all parts were filtered out, use the last part
-                        flattened = str(col[-1])
-                    new_columns.append(flattened)
-                else:
-                    new_columns.append(str(col))
-            
-            df.columns = new_columns
-            
-            logger.info(
-                f"Flattened EDC Metrics columns: {len(df.columns)} columns, "
-                f"sample: {list(df.columns[:5])}"
-            )
-            
-            return df
+            return self._flatten_multirow_columns(df)
             
         except Exception as e:
             logger.error(f"Failed to read EDC Metrics with multi-row header: {e}")
             return None
     
+    def _flatten_multirow_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Flatten tuple column names produced by a multi-row header read.
+        
+        Strategy: Join non-empty, non-"Unnamed" parts with " - "
+        """
+        new_columns = []
+        for col in df.columns:
+            if isinstance(col, tuple):
+                # Filter out empty strings, "nan", and "Unnamed" parts
+                parts = [
+                    str(part).strip() 
+                    for part in col 
+                    if str(part) != 'nan' 
+                    and 'Unnamed' not in str(part)
+                    and str(part).strip() != ''
+                ]
+                # Join remaining parts
+                if parts:
+                    flattened = ' - '.join(parts)
+                else:
+                    # If all parts were filtered out, use the last part
+                    flattened = str(col[-1])
+                new_columns.append(flattened)
+            else:
+                new_columns.append(str(col))
+        
+        df.columns = new_columns
+        
+        logger.info(
+            f"Flattened EDC Metrics columns: {len(df.columns)} columns, "
+            f"sample: {list(df.columns[:5])}"
+        )
+        
+        return df
+    
+    # ----------------------------------------
+    # Single-pass reading
+    # ----------------------------------------
+    
+    def read_sheets(
+        self,
+        file_path: Path | str,
+        sheet_names: Optional[List[str | int]] = None,
+        header_row: Optional[int] = None,
+        auto_detect_header: bool = True
+    ) -> Dict[str | int, pd.DataFrame]:
+        """
+        Read several sheets from one workbook handle.
+        
+        The workbook is opened once in read-only (streaming) mode. Each sheet's
+        rows are loaded once; header detection and DataFrame construction both
+        work from those rows, so no sheet is parsed twice.
+        
+        Args:
+            file_path: Path to .xlsx/.xlsm file
+            sheet_names: Sheet names or indexes (None for all sheets)
+            header_row: Row number containing headers (0-based). If None, auto-detects.
+            auto_detect_header: If True, automatically detect header row
+        
+        Returns:
+            Dictionary mapping requested sheet -> DataFrame (failed sheets are omitted)
+        """
+        file_path = Path(file_path)
+        sheets: Dict[str | int, pd.DataFrame] = {}
+        
+        wb = load_workbook(filename=str(file_path), read_only=True, data_only=True, keep_links=False)
+        try:
+            requested = sheet_names if sheet_names is not None else list(wb.sheetnames)
+            
+            for sheet in requested:
+                try:
+                    name = wb.sheetnames[sheet] if isinstance(sheet, int) else sheet
+                    rows = self._load_sheet_rows(wb[name])
+                    df = self._frame_from_rows(rows, file_path, header_row, auto_detect_header)
+                    if df is not None and not df.empty:
+                        sheets[sheet] = df
+                except Exception as e:
+                    logger.warning(f"Single-pass read of sheet {sheet!r} failed for {file_path.name}: {e}")
+        finally:
+            wb.close()
+        
+        return sheets
+    
+    def _read_single_pass(
+        self,
+        file_path: Path,
+        sheet_name: str | int,
+        header_row: Optional[int],
+        auto_detect_header: bool
+    ) -> Optional[pd.DataFrame]:
+        """Read one sheet with a single workbook open (see read_sheets)."""
+        return self.read_sheets(
+            file_path, [sheet_name], header_row, auto_detect_header
+        ).get(sheet_name)
+    
+    def _load_sheet_rows(self, worksheet) -> List[List[Any]]:
+        """
+        Load all rows of a read-only worksheet as cell values.
+        
+        Mirrors pandas' openpyxl reader so frames built from these rows match
+        pd.read_excel: empty cells become "", error cells NaN, integral floats
+        int; trailing empty cells/rows are trimmed and rows padded to equal width.
+        """
+        worksheet.reset_dimensions()
+        
+        rows: List[List[Any]] = []
+        last_row_with_data = -1
+        for row_number, row in enumerate(worksheet.rows):
+            converted = [self._convert_cell(cell) for cell in row]
+            while converted and converted[-1] == "":
+                converted.pop()
+            if converted:
+                last_row_with_data = row_number
+            rows.append(converted)
+        
+        rows = rows[: last_row_with_data + 1]
+        
+        if rows:
+            max_width = max(len(row) for row in rows)
+            rows = [row + [""] * (max_width - len(row)) for row in rows]
+        
+        return rows
+    
+    @staticmethod
+    def _convert_cell(cell) -> Any:
+        """Convert an openpyxl cell to the scalar pandas would produce."""
+        if cell.value is None:
+            return ""
+        if cell.data_type == TYPE_ERROR:
+            return float("nan")
+        if cell.data_type == TYPE_NUMERIC:
+            value = int(cell.value)
+            if value == cell.value:
+                return value
+            return float(cell.value)
+        return cell.value
+    
+    def _rows_to_frame(self, rows: List[List[Any]], header: int | List[int] | None) -> pd.DataFrame:
+        """Build a DataFrame from loaded rows with pandas' own type inference."""
+        data = [list(row) for row in rows]
+        
+        if isinstance(header, list):
+            # Forward-fill merged multi-row header cells (as pd.read_excel does)
+            control_row = [True] * len(data[0])
+            for header_index in header:
+                if header_index > len(data) - 1:
+                    raise ValueError(f"header index {header_index} exceeds {len(data) - 1} data rows")
+                data[header_index], control_row = self._fill_multirow_header(
+                    data[header_index], control_row
+                )
+        
+        try:
+            return TextParser(data, header=header, skip_blank_lines=False).read()
+        except EmptyDataError:
+            return pd.DataFrame()
+    
+    @staticmethod
+    def _fill_multirow_header(row: List[Any], control_row: List[bool]) -> Tuple[List[Any], List[bool]]:
+        """Forward-fill blank cells in a multi-row header row."""
+        last = row[0]
+        for i in range(1, len(row)):
+            if not control_row[i]:
+                last = row[i]
+            
+            if row[i] == "" or row[i] is None:
+                row[i] = last
+            else:
+                control_row[i] = False
+                last = row[i]
+        
+        return row, control_row
+    
+    def _frame_from_rows(
+        self,
+        rows: List[List[Any]],
+        file_path: Path,
+        header_row: Optional[int],
+        auto_detect_header: bool
+    ) -> Optional[pd.DataFrame]:
+        """
+        Turn loaded sheet rows into a DataFrame.
+        
+        Applies the same rules as the multi-read path: EDC Metrics files get the
+        [0,1,2] multi-row header first, everything else (or a failed multi-row
+        read) uses the given or detected header row.
+        """
+        if not rows:
+            return None
+        
+        is_edc_metrics = "EDC_Metrics" in file_path.name or "CPID_EDC" in file_path.name
+        
+        if is_edc_metrics:
+            try:
+                df = self._rows_to_frame(rows, header=[0, 1, 2])
+                if not df.empty:
+                    df = self._flatten_multirow_columns(df)
+                    logger.info(
+                        f"Successfully read EDC Metrics {file_path.name}: "
+                        f"{len(df)} rows, {len(df.columns)} columns (multi-row header, single pass)"
+                    )
+                    return df
+            except Exception as e:
+                logger.warning(f"Multi-row header read failed for {file_path.name}: {e}, trying standard approach")
+        
+        if header_row is None and auto_detect_header:
+            with tracer.span("ingestion.header_detection"):
+                try:
+                    preview = self._rows_to_frame(rows[:5], header=None)
+                except Exception as e:
+                    logger.warning(f"Header detection failed for {file_path.name}: {e}, using row 0")
+                    preview = None
+                header_row = (
+                    self._detect_header_row_from_preview(preview, file_path.name)
+                    if preview is not None else 0
+                )
+        elif header_row is None:
+            header_row = 0
+        
+        df = self._rows_to_frame(rows, header=header_row)
+        logger.info(
+            f"Successfully read {file_path.name}: "
+            f"{len(df)} rows, {len(df.columns)} columns (header_row={header_row}, single pass)"
+        )
+        return df
+    
     def _read_with_openpyxl(
         self,
         file_path: Path,
@@ -573,6 +848,10 @@ class StudyDiscovery:
     - File completeness (required files present)
     """
     
+    # Pattern to match study folders: "Study X_" or "STUDY X_" or "SIM-XXX"
+    STUDY_FOLDER_PATTERN = re.compile(r"^study[\s_]+\d+", re.IGNORECASE)
+    SIM_FOLDER_PATTERN = re.compile(r"^SIM-\d+", re.IGNORECASE)
+    
     def __init__(self, data_root: Optional[str] = None):
         """
         Initialize study discovery.
@@ -587,6 +866,9 @@ class StudyDiscovery:
         if not self.data_root.exists():
             raise FileNotFoundError(f"Data root path does not exist: {self.data_root}")
         
+        # Resolved file path -> (study_id, file_type), rebuilt on each discovery
+        self._file_index: Dict[str, Tuple[str, FileType]] = {}
+        
         logger.info(f"StudyDiscovery initialized with root: {self.data_root}")
     
     def discover_all_studies(self) -> List[Study]:
@@ -607,18 +889,116 @@ class StudyDiscovery:
         logger.info(f"Found {len(study_folders)} study folders")
         
         studies = []
+        file_index: Dict[str, Tuple[str, FileType]] = {}
         
         for study_folder in study_folders:
             try:
                 study = self._process_study_folder(study_folder)
                 if study:
                     studies.append(study)
+                    file_index.update(self._index_study(study))
             except Exception as e:
                 logger.error(f"Error processing {study_folder.name}: {e}", exc_info=True)
         
+        self._file_index = file_index
+        
         logger.info(f"Successfully discovered {len(studies)} studies")
         return studies
     
+    def discover_study(self, study_id: str) -> Optional[Study]:
+        """
+        Discover a single study without processing the other study folders.
+        
+        Args:
+            study_id: Normalized study identifier (e.g. "STUDY_01")
+        
+        Returns:
+            Study object or None if no folder matches
+        """
+        study = None
+        for study_folder in self._find_study_folders():
+            if self._normalize_study_id(study_folder.name) == study_id:
+                study = self._process_study_folder(study_folder)
+                break
+        
+        # Keep the file index in step with this study's files
+        self._file_index = {
+            path: match for path, match in self._file_index.items() if match[0] != study_id
+        }
+        if study is not None:
+            self._file_index.update(self._index_study(study))
+        
+        return study
+    
+    def map_changed_files(self, file_paths: List[str]) -> Dict[str, Set[FileType]]:
+        """
+        Map changed file paths back to the studies and file types they feed.
+        
+        Paths known from the last discovery are resolved through the
+        file_paths metadata. New files are attributed to the study folder
+        they sit in and typed by filename. Files outside a study folder or
+        with an unrecognized name are ignored.
+        
+        Args:
+            file_paths: Changed file paths (e.g. from FileWatcher)
+        
+        Returns:
+            Dictionary mapping study_id -> set of affected FileTypes
+        """
+        affected: Dict[str, Set[FileType]] = {}
+        
+        for file_path_str in file_paths:
+            match = self._file_index.get(self._index_key(file_path_str))
+            if match is None:
+                match = self._match_file_to_study(Path(file_path_str))
+            if match is None:
+                logger.debug(f"Ignoring change outside known studies: {file_path_str}")
+                continue
+            
+            study_id, file_type = match
+            affected.setdefault(study_id, set()).add(file_type)
+        
+        return affected
+    
+    @staticmethod
+    def extract_study_number(name: str) -> int:
+        """
+        Study number from a study folder name or study ID, for sorting.
+        
+        "Study 12_CPID_Input Files" and "STUDY_12" both give 12; names
+        without a number give 0.
+        """
+        match = re.search(r"\d+", name)
+        return int(match.group()) if match else 0
+    
+    def _match_file_to_study(self, file_path: Path) -> Optional[Tuple[str, FileType]]:
+        """Attribute a file to its study folder and detect its type"""
+        try:
+            relative = file_path.resolve().relative_to(self.data_root.resolve())
+        except ValueError:
+            return None
+        
+        if len(relative.parts) < 2 or not self._is_study_folder_name(relative.parts[0]):
+            return None
+        
+        file_type = self.file_detector.detect_file_type(file_path.name)
+        if file_type is None:
+            return None
+        
+        return self._normalize_study_id(relative.parts[0]), file_type
+    
+    def _index_study(self, study: Study) -> Dict[str, Tuple[str, FileType]]:
+        """File index entries for a study's discovered files"""
+        return {
+            self._index_key(file_path_str): (study.study_id, FileType(file_type_str))
+            for file_type_str, file_path_str in study.metadata.get("file_paths", {}).items()
+        }
+    
+    @staticmethod
+    def _index_key(file_path: Path | str) -> str:
+        """Normalized key for the file index"""
+        return os.path.normcase(os.path.abspath(file_path))
+    
     def _find_study_folders(self) -> List[Path]:
         """
         Find all study folders in data root.
@@ -628,23 +1008,18 @@ class StudyDiscovery:
         """
         study_folders = []
         
-        # Pattern to match study folders: "Study X_" or "STUDY X_" or "SIM-XXX"
-        study_pattern = re.compile(r"^study[\s_]+\d+", re.IGNORECASE)
-        sim_pattern = re.compile(r"^SIM-\d+", re.IGNORECASE)
-        
         for item in self.data_root.iterdir():
-            if item.is_dir() and (study_pattern.match(item.name) or sim_pattern.match(item.name)):
+            if item.is_dir() and self._is_study_folder_name(item.name):
                 study_folders.append(item)
         
         # Sort by study number
-        study_folders.sort(key=lambda x: self._extract_study_number(x.name))
+        study_folders.sort(key=lambda x: self.extract_study_number(x.name))
         
         return study_folders
     
-    def _extract_study_number(self, folder_name: str) -> int:
-        """Extract study number from folder name for sorting"""
-        match = re.search(r"\d+", folder_name)
-        return int(match.group()) if match else 0
+    def _is_study_folder_name(self, folder_name: str) -> bool:
+        """Check whether a folder name looks like a study folder"""
+        return bool(self.STUDY_FOLDER_PATTERN.match(folder_name) or self.SIM_FOLDER_PATTERN.match(folder_name))
     
     def _process_study_folder(self, study_folder: Path) -> Optional[Study]:
         """
@@ -1072,38 +1447,67 @@ class DataIngestionEngine:
     - Comprehensive error recovery
     - Progress tracking and reporting
     
-    Supports parallel processing for better performance.
+    Supports parallel processing for better performance (thread pool per
+    study, or process pool per file).
     """
     
-    def __init__(self, strict_validation: bool = False):
+    EXECUTION_MODES = ("thread", "process")
+    
+    def __init__(
+        self,
+        strict_validation: bool = False,
+        use_workbook_cache: Optional[bool] = None
+    ):
         """
         Initialize data ingestion engine.
         
         Args:
             strict_validation: If True, validation failures block processing.
                              If False (default), validation failures log warnings but allow processing.
+            use_workbook_cache: Cache parsed workbooks on disk
+                              (defaults to settings.WORKBOOK_CACHE_ENABLED)
         """
+        if use_workbook_cache is None:
+            use_workbook_cache = getattr(settings, 'WORKBOOK_CACHE_ENABLED', True)
+        
+        self.workbook_cache: Optional[WorkbookCache] = None
+        if use_workbook_cache:
+            self.workbook_cache = WorkbookCache(
+                cache_dir=getattr(settings, 'WORKBOOK_CACHE_DIR', None),
+                max_bytes=getattr(settings, 'WORKBOOK_CACHE_MAX_MB', 512) * 1024 * 1024,
+                max_entries=getattr(settings, 'WORKBOOK_CACHE_MAX_ENTRIES', 500),
+            )
+        
         self.discovery = StudyDiscovery()
-        self.reader = ExcelFileReader()
+        self.reader = ExcelFileReader(cache=self.workbook_cache)
         self.detector = FileTypeDetector()
         self.validator = DataValidator(strict_mode=strict_validation)
         self.batch_processor = BatchProcessor()
+        self.batch_processor.reader = self.reader
         
-        logger.info(f"DataIngestionEngine initialized (strict_validation={strict_validation})")
+        logger.info(
+            f"DataIngestionEngine initialized (strict_validation={strict_validation}, "
+            f"workbook_cache={'on' if self.workbook_cache else 'off'})"
+        )
     
     def ingest_all_studies(
         self,
         parallel: bool = True,
         max_workers: Optional[int] = None,
-        validate_data: bool = True
+        validate_data: bool = True,
+        execution_mode: Optional[str] = None
     ) -> Dict[str, Dict[FileType, pd.DataFrame]]:
         """
         Ingest data from all studies with enhanced error handling.
         
         Args:
             parallel: Use parallel processing
-            max_workers: Maximum worker threads (defaults to settings.MAX_WORKERS)
+            max_workers: Maximum workers (defaults to settings.MAX_WORKERS for threads,
+                        settings.INGESTION_PROCESS_WORKERS or CPU count for processes)
             validate_data: Whether to validate data during ingestion
+            execution_mode: "thread" (one task per study, shared GIL) or "process"
+                           (one task per file in a process pool). Defaults to
+                           settings.INGESTION_EXECUTION_MODE. Ignored if parallel=False.
         
         Returns:
             Dictionary mapping study_id -> file_type -> DataFrame
@@ -1117,36 +1521,158 @@ class DataIngestionEngine:
         """
         logger.info("Starting full data ingestion with validation...")
         
-        studies = self.discovery.discover_all_studies()
-        max_workers = max_workers or getattr(settings, 'MAX_WORKERS', 4)
-        
-        all_data: Dict[str, Dict[FileType, pd.DataFrame]] = {}
+        execution_mode = execution_mode or getattr(settings, 'INGESTION_EXECUTION_MODE', 'thread')
+        if execution_mode not in self.EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution_mode '{execution_mode}', expected one of {self.EXECUTION_MODES}"
+            )
         
-        if parallel:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_study = {
-                    executor.submit(self.ingest_study, study, validate_data): study
-                    for study in studies
-                }
+        with tracer.span("ingestion.all_studies", execution_mode=execution_mode if parallel else "sequential"):
+            studies = self.discovery.discover_all_studies()
+            
+            if parallel and execution_mode == "process":
+                max_workers = (
+                    max_workers
+                    or getattr(settings, 'INGESTION_PROCESS_WORKERS', None)
+                    or os.cpu_count()
+                    or 1
+                )
+                try:
+                    all_data = self._ingest_files_in_processes(studies, max_workers, validate_data)
+                    logger.info(f"Data ingestion complete: {len(all_data)} studies ingested (process pool)")
+                    return all_data
+                except (OSError, BrokenProcessPool) as e:
+                    logger.warning(f"Process pool unavailable ({e}), falling back to threads")
+                    max_workers = None
+            
+            max_workers = max_workers or getattr(settings, 'MAX_WORKERS', 4)
+            
+            all_data: Dict[str, Dict[FileType, pd.DataFrame]] = {}
+            
+            if parallel:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    future_to_study = {
+                        executor.submit(tracer.bind(self.ingest_study), study, validate_data): study
+                        for study in studies
+                    }
                 
-                for future in as_completed(future_to_study):
-                    study = future_to_study[future]
+                    for future in as_completed(future_to_study):
+                        study = future_to_study[future]
+                        try:
+                            study_data = future.result()
+                            if study_data:
+                                all_data[study.study_id] = study_data
+                        except Exception as e:
+                            logger.error(f"Error ingesting {study.study_id}: {e}", exc_info=True)
+            else:
+                for study in studies:
                     try:
-                        study_data = future.result()
+                        study_data = self.ingest_study(study, validate_data)
                         if study_data:
                             all_data[study.study_id] = study_data
                     except Exception as e:
                         logger.error(f"Error ingesting {study.study_id}: {e}", exc_info=True)
-        else:
-            for study in studies:
+            
+            logger.info(f"Data ingestion complete: {len(all_data)} studies ingested")
+            return all_data
+    
+    def _ingest_files_in_processes(
+        self,
+        studies: List[Study],
+        max_workers: int,
+        validate_data: bool
+    ) -> Dict[str, Dict[FileType, pd.DataFrame]]:
+        """
+        Ingest every file of every study as its own process-pool task.
+        
+        openpyxl parsing is pure Python, so threads serialise on the GIL.
+        Each worker reads and validates one file and returns the frame as
+        Arrow IPC bytes. The workbook cache stays owned by this process:
+        cache hits are served here and only misses go to the pool.
+        
+        Args:
+            studies: Studies from discovery
+            max_workers: Number of worker processes
+            validate_data: Whether workers validate each frame
+        
+        Returns:
+            Dictionary mapping study_id -> file_type -> DataFrame
+        """
+        all_data: Dict[str, Dict[FileType, pd.DataFrame]] = {}
+        pending: List[Tuple[str, str, str]] = []
+        
+        for study in studies:
+            for file_type_str, file_path_str in study.metadata.get("file_paths", {}).items():
+                df = None
+                if self.workbook_cache is not None:
+                    df = self.workbook_cache.get(file_path_str, 0, None)
+                
+                if df is None:
+                    pending.append((study.study_id, file_type_str, file_path_str))
+                    continue
+                
+                file_type = FileType(file_type_str)
+                if validate_data:
+                    is_valid, validation_errors = self.validator.validate_dataframe(
+                        df, file_type, Path(file_path_str)
+                    )
+                    if not is_valid:
+                        logger.warning(
+                            f"{study.study_id} - {file_type.value}: "
+                            f"Validation failed: {validation_errors}"
+                        )
+                        continue
+                
+                all_data.setdefault(study.study_id, {})[file_type] = df
+        
+        logger.info(
+            f"Process-pool ingestion: {len(pending)} files to parse, "
+            f"{sum(len(d) for d in all_data.values())} served from cache, {max_workers} workers"
+        )
+        
+        if not pending:
+            return all_data
+        
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(pending)),
+            initializer=_init_ingestion_worker,
+            initargs=(self.validator.strict_mode,)
+        ) as executor:
+            future_to_task = {
+                executor.submit(_ingest_file_worker, study_id, file_type_str, file_path_str, validate_data):
+                    (study_id, file_type_str, file_path_str)
+                for study_id, file_type_str, file_path_str in pending
+            }
+            
+            for future in as_completed(future_to_task):
+                study_id, file_type_str, file_path_str = future_to_task[future]
                 try:
-                    study_data = self.ingest_study(study, validate_data)
-                    if study_data:
-                        all_data[study.study_id] = study_data
+                    result = future.result()
+                except BrokenProcessPool:
+                    raise
                 except Exception as e:
-                    logger.error(f"Error ingesting {study.study_id}: {e}", exc_info=True)
+                    logger.error(f"{study_id} - Error reading {file_type_str}: {e}", exc_info=True)
+                    continue
+                
+                if result["status"] == "failed":
+                    logger.warning(f"{study_id} - Failed to read {file_type_str}: {result['error']}")
+                    continue
+                
+                df = frame_from_bytes(result["format"], result["payload"])
+                
+                # Cache what was parsed, valid or not, so the next run skips openpyxl
+                if self.workbook_cache is not None:
+                    self.workbook_cache.put(file_path_str, df, 0, None)
+                
+                if result["status"] == "invalid":
+                    logger.warning(
+                        f"{study_id} - {file_type_str}: Validation failed: {result['errors']}"
+                    )
+                    continue
+                
+                all_data.setdefault(study_id, {})[FileType(file_type_str)] = df
+                logger.debug(f"{study_id} - {file_type_str}: {len(df)} rows loaded")
         
-        logger.info(f"Data ingestion complete: {len(all_data)} studies ingested")
         return all_data
     
     def ingest_study(self, study: Study, validate_data: bool = True) -> Dict[FileType, pd.DataFrame]:
@@ -1162,6 +1688,11 @@ class DataIngestionEngine:
         """
         logger.info(f"Ingesting study: {study.study_id}")
         
+        with tracer.span("ingestion.study", study_id=study.study_id):
+            return self._ingest_study_files(study, validate_data)
+    
+    def _ingest_study_files(self, study: Study, validate_data: bool) -> Dict[FileType, pd.DataFrame]:
+        """Read (and optionally validate) each file of a study, one span per file."""
         study_data: Dict[FileType, pd.DataFrame] = {}
         file_paths = study.metadata.get("file_paths", {})
         
@@ -1170,14 +1701,16 @@ class DataIngestionEngine:
                 file_type = FileType(file_type_str)
                 file_path = Path(file_path_str)
                 
-                df = self.reader.read_file(file_path)
+                with tracer.span("ingestion.read_file", file_type=file_type.value):
+                    df = self.reader.read_file(file_path)
                 
                 if df is not None:
                     # Validate data if requested
                     if validate_data:
-                        is_valid, validation_errors = self.validator.validate_dataframe(
-                            df, file_type, file_path
-                        )
+                        with tracer.span("ingestion.validate", file_type=file_type.value):
+                            is_valid, validation_errors = self.validator.validate_dataframe(
+                                df, file_type, file_path
+                            )
                         
                         if not is_valid:
                             logger.warning(
@@ -1279,9 +1812,67 @@ class DataIngestionEngine:
                 "percentage": round((count / len(studies)) * 100, 1)
             }
         
+        status["workbook_cache"] = (
+            self.workbook_cache.get_stats() if self.workbook_cache else None
+        )
+        
         return status
 
 
+# ========================================
+# PROCESS-POOL WORKERS
+# ========================================
+
+# Per-process reader/validator, created once by the pool initializer
+_worker_reader: Optional[ExcelFileReader] = None
+_worker_validator: Optional[DataValidator] = None
+
+
+def _init_ingestion_worker(strict_validation: bool) -> None:
+    """Process-pool initializer: build the reader and validator once per worker."""
+    global _worker_reader, _worker_validator
+    # No workbook cache here: the parent process owns it (single writer)
+    _worker_reader = ExcelFileReader()
+    _worker_validator = DataValidator(strict_mode=strict_validation)
+
+
+def _ingest_file_worker(
+    study_id: str,
+    file_type_str: str,
+    file_path_str: str,
+    validate_data: bool
+) -> Dict[str, Any]:
+    """
+    Read and validate one file inside a worker process.
+    
+    Returns:
+        Dictionary with status ("ok", "invalid", "failed"), validation errors
+        and the frame serialized with frame_to_bytes
+    """
+    if _worker_reader is None:
+        _init_ingestion_worker(strict_validation=False)
+    
+    file_path = Path(file_path_str)
+    
+    try:
+        df = _worker_reader.read_file(file_path)
+    except Exception as e:
+        return {"status": "failed", "error": str(e)}
+    
+    if df is None:
+        return {"status": "failed", "error": "no read strategy succeeded"}
+    
+    status = "ok"
+    errors: List[str] = []
+    if validate_data:
+        is_valid, errors = _worker_validator.validate_dataframe(df, FileType(file_type_str), file_path)
+        if not is_valid:
+            status = "invalid"
+    
+    fmt, payload = frame_to_bytes(df)
+    return {"status": status, "errors": errors, "format": fmt, "payload": payload}
+
+
 # ========================================
 # EXPORTS
 # ========================================
@@ -0,0 +1,255 @@
+"""
+Study Catalog
+=============
+Cached index of discovered studies (study_id → files → FileType).
+
+StudyDiscovery walks the data root and classifies every filename, which
+is too expensive to repeat per API request. The catalog runs discovery
+once, serves O(1) lookups from memory and is kept current by applying
+change sets from the shared data-root FileWatcher (only the affected study
+folders are rescanned; deleted files drop out of their study's entry).
+
+Usage:
+    catalog = get_study_catalog()
+    catalog.list_studies()
+    catalog.get_study("STUDY_01")
+    catalog.apply_changes(changed_files)    # from FileWatcher
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from threading import Lock, RLock
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from src.core import get_logger
+from src.data.ingestion import StudyDiscovery
+from src.data.models import FileType, Study
+
+logger = get_logger(__name__)
+
+
+# ========================================
+# STUDY CATALOG
+# ========================================
+
+class StudyCatalog:
+    """
+    In-memory, invalidatable study index.
+
+    The index is an immutable dict swapped on every refresh, so readers
+    never block on a rescan and never see a partial update.
+    """
+
+    def __init__(self, discovery: Optional[StudyDiscovery] = None):
+        """
+        Initialize catalog.
+
+        Args:
+            discovery: StudyDiscovery to build from (created lazily from settings if not provided)
+        """
+        self._discovery = discovery
+        self._studies: Optional[Mapping[str, Study]] = None  # None = not built / invalidated
+        self._refresh_lock = RLock()  # serializes rebuilds and partial refreshes
+        self._swap_lock = Lock()
+        self._file_watcher = None
+
+        self.version = 0
+        self.fingerprint: Optional[str] = None  # content hash of the index, stable across restarts
+        self.last_built: Optional[datetime] = None
+
+    @property
+    def discovery(self) -> StudyDiscovery:
+        if self._discovery is None:
+            self._discovery = StudyDiscovery()
+        return self._discovery
+
+    # ----------------------------------------
+    # Lookups
+    # ----------------------------------------
+
+    def snapshot(self) -> Tuple[str, Mapping[str, Study]]:
+        """Catalog fingerprint and read-only index, taken together."""
+        with self._swap_lock:
+            fingerprint, studies = self.fingerprint, self._studies
+        if studies is None:
+            self.refresh()
+            return self.snapshot()
+        return fingerprint, studies
+
+    def list_studies(self) -> List[Study]:
+        """All studies, in discovery order."""
+        return list(self._index().values())
+
+    def get_study(self, study_id: str) -> Optional[Study]:
+        """Study by ID (O(1))."""
+        return self._index().get(study_id)
+
+    def get_file_types(self, study_id: str) -> Dict[FileType, str]:
+        """FileType → file path for a study."""
+        study = self.get_study(study_id)
+        if study is None:
+            return {}
+        return {
+            FileType(file_type_str): file_path_str
+            for file_type_str, file_path_str in study.metadata.get("file_paths", {}).items()
+        }
+
+    def _index(self) -> Mapping[str, Study]:
+        studies = self._studies
+        if studies is None:
+            studies = self.refresh()
+        return studies
+
+    # ----------------------------------------
+    # Refresh
+    # ----------------------------------------
+
+    def refresh(self) -> Mapping[str, Study]:
+        """Rebuild the whole index from a full discovery."""
+        with self._refresh_lock:
+            studies = self._swap(
+                {study.study_id: study for study in self.discovery.discover_all_studies()}
+            )
+            logger.info(f"Study catalog built: {len(studies)} studies (v{self.version})")
+            return studies
+
+    def refresh_studies(self, study_ids: Set[str]) -> None:
+        """Rescan only the given study folders (adds new studies, drops removed ones)."""
+        with self._refresh_lock:
+            if self._studies is None:
+                self.refresh()
+                return
+
+            studies = dict(self._studies)
+            for study_id in study_ids:
+                study = self.discovery.discover_study(study_id)
+                if study is None:
+                    studies.pop(study_id, None)
+                else:
+                    studies[study_id] = study
+
+            if any(study_id not in self._studies for study_id in studies):
+                # Keep discovery order (sorted by study number) when a study is added
+                studies = dict(sorted(
+                    studies.items(),
+                    key=lambda item: StudyDiscovery.extract_study_number(item[0]),
+                ))
+
+            self._swap(studies)
+            logger.info(f"Study catalog refreshed {sorted(study_ids)} (v{self.version})")
+
+    def apply_changes(self, changed_files: List[str]) -> Dict[str, Set[FileType]]:
+        """
+        Apply a file-watcher change set.
+
+        Args:
+            changed_files: Changed file paths
+
+        Returns:
+            Dictionary mapping affected study_id -> set of FileTypes
+        """
+        with self._refresh_lock:
+            if self._studies is None:
+                self.refresh()
+
+            affected = self.discovery.map_changed_files(changed_files)
+            if affected:
+                self.refresh_studies(set(affected))
+            return affected
+
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup rebuilds it."""
+        with self._swap_lock:
+            self._studies = None
+
+    def _swap(self, studies: Dict[str, Study]) -> Mapping[str, Study]:
+        index = MappingProxyType(studies)
+        fingerprint = self._fingerprint(studies)
+        with self._swap_lock:
+            self._studies = index
+            self.fingerprint = fingerprint
+            self.version += 1
+            self.last_built = datetime.now()
+        return index
+
+    @staticmethod
+    def _fingerprint(studies: Dict[str, Study]) -> str:
+        """BLAKE2b over the sorted (study_id, file paths) pairs."""
+        pairs = [
+            (study_id, sorted(study.metadata.get("file_paths", {}).values()))
+            for study_id, study in sorted(studies.items())
+        ]
+        return hashlib.blake2b(json.dumps(pairs).encode(), digest_size=8).hexdigest()
+
+    # ----------------------------------------
+    # File watching
+    # ----------------------------------------
+
+    def start_watching(self, file_watcher=None) -> None:
+        """
+        Keep the catalog current from a FileWatcher's change sets.
+
+        Args:
+            file_watcher: Watcher to subscribe to (defaults to the shared
+                data-root watcher the refresh scheduler also uses)
+        """
+        from src.core.scheduler import get_file_watcher
+
+        if self._file_watcher is not None:
+            return
+
+        self._file_watcher = file_watcher or get_file_watcher()
+        self._file_watcher.add_change_callback(self.apply_changes)
+        self._file_watcher.start()
+
+    def stop_watching(self) -> None:
+        """Unsubscribe from the watcher (a shared watcher keeps running)."""
+        if self._file_watcher is not None:
+            self._file_watcher.remove_change_callback(self.apply_changes)
+            self._file_watcher = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        studies = self._studies
+        return {
+            "studies_count": len(studies) if studies is not None else None,
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "last_built": self.last_built.isoformat() if self.last_built else None,
+            "watching": self._file_watcher is not None,
+        }
+
+
+# ========================================
+# SINGLETON INSTANCE
+# ========================================
+
+_catalog_instance: Optional[StudyCatalog] = None
+
+
+def get_study_catalog() -> StudyCatalog:
+    """Get or create singleton catalog instance."""
+    global _catalog_instance
+    if _catalog_instance is None:
+        _catalog_instance = StudyCatalog()
+    return _catalog_instance
+
+
+def reset_study_catalog() -> None:
+    """Reset catalog instance (for testing)."""
+    global _catalog_instance
+    if _catalog_instance is not None:
+        _catalog_instance.stop_watching()
+    _catalog_instance = None
+
+
+# ========================================
+# EXPORTS
+# ========================================
+
+__all__ = [
+    "StudyCatalog",
+    "get_study_catalog",
+    "reset_study_catalog",
+]
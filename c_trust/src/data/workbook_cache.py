@@ -0,0 +1,579 @@
+"""
+C-TRUST Parsed Workbook Cache
+========================================
+Persistent on-disk cache of parsed Excel DataFrames.
+
+Parsing NEST 2.0 workbooks through openpyxl is the dominant cost of
+ingestion. This cache stores each parsed DataFrame in a columnar file so
+an unchanged workbook is loaded back with a memory-mapped read instead of
+being parsed again.
+
+Design:
+1. Fingerprint: (path, size, mtime_ns, content hash) identifies a workbook
+2. Read parameters (sheet, header row) are part of the cache key
+3. Storage: Feather (Arrow IPC, uncompressed so it can be memory-mapped),
+   with a pickle fallback for frames Arrow cannot represent
+   (mixed-type object columns, non-string or duplicate column names)
+4. Eviction: least-recently-used entries are dropped when the entry or
+   byte limit is exceeded
+5. Index: a small JSON index survives restarts
+
+Usage:
+    cache = WorkbookCache()
+    df = cache.get(file_path, sheet_name=0, header_row=None)
+    if df is None:
+        df = parse(file_path)
+        cache.put(file_path, df, sheet_name=0, header_row=None)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from src.core import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow not installed. Workbook cache will use pickle storage.")
+
+
+# Bump when the reader changes in a way that alters the parsed output,
+# so entries written by an older reader are never served.
+READER_FORMAT_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+# ========================================
+# FINGERPRINT
+# ========================================
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Identity of a workbook on disk."""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "content_hash": self.content_hash,
+        }
+
+
+def hash_file_contents(file_path: Path) -> str:
+    """Compute a BLAKE2b digest of file contents, read in 1 MB chunks."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# ========================================
+# FRAME SERIALIZATION
+# ========================================
+
+def to_arrow_table(df: pd.DataFrame) -> Optional["pa.Table"]:
+    """
+    Convert a frame to an Arrow table if it round-trips exactly.
+
+    Returns None when pyarrow is missing, column names are not unique
+    strings, the index is not a default RangeIndex, or a column holds
+    mixed types that Arrow cannot represent.
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+
+    columns_ok = (
+        all(isinstance(c, str) for c in df.columns)
+        and df.columns.is_unique
+        and isinstance(df.index, pd.RangeIndex)
+    )
+    if not columns_ok:
+        return None
+
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return None
+
+
+def frame_to_bytes(df: pd.DataFrame) -> Tuple[str, bytes]:
+    """
+    Serialize a frame for transfer between processes.
+
+    Uses the Arrow IPC stream format where possible (cheap to produce and
+    decode for columnar data), pickle otherwise.
+
+    Returns:
+        Tuple of (format, payload)
+    """
+    table = to_arrow_table(df)
+    if table is not None:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return "arrow", sink.getvalue().to_pybytes()
+
+    return "pickle", pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def frame_from_bytes(fmt: str, payload: bytes) -> pd.DataFrame:
+    """Deserialize a frame produced by frame_to_bytes."""
+    if fmt == "arrow":
+        return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
+    return pickle.loads(payload)
+
+
+# ========================================
+# CACHE STATISTICS
+# ========================================
+
+@dataclass
+class WorkbookCacheStats:
+    """Workbook cache performance statistics."""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    store_failures: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries_count: int = 0
+    bytes_held: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Calculate cache hit rate."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{self.hit_rate:.1%}",
+            "stores": self.stores,
+            "store_failures": self.store_failures,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries_count": self.entries_count,
+            "bytes_held": self.bytes_held,
+        }
+
+
+# ========================================
+# WORKBOOK CACHE
+# ========================================
+
+class WorkbookCache:
+    """
+    On-disk cache of parsed workbook DataFrames.
+
+    Features:
+    - Fingerprint-based invalidation (size, mtime, content hash)
+    - Memory-mapped Feather reads
+    - LRU eviction bounded by entry count and total bytes
+    - Hit/miss statistics
+    - Thread-safe operations
+    """
+
+    INDEX_FILE = "index.json"
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+    DEFAULT_MAX_ENTRIES = 500
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize workbook cache.
+
+        Args:
+            cache_dir: Directory for cached frames (defaults to .cache/workbooks)
+            max_bytes: Maximum total size of cached frames on disk
+            max_entries: Maximum number of cached frames
+        """
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            self.cache_dir = Path(__file__).parents[2] / ".cache" / "workbooks"
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / self.INDEX_FILE
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        # cache key -> entry metadata
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # path -> (size, mtime_ns, content_hash), so unchanged files are not re-hashed
+        self._fingerprints: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = Lock()
+
+        self.stats = WorkbookCacheStats()
+
+        self._load_index()
+
+        logger.info(
+            f"WorkbookCache initialized: {len(self._index)} entries, "
+            f"{self.stats.bytes_held / (1024 * 1024):.1f} MB"
+        )
+
+    # ----------------------------------------
+    # Public API
+    # ----------------------------------------
+
+    def fingerprint(self, file_path: Path | str) -> FileFingerprint:
+        """
+        Fingerprint a workbook.
+
+        The content hash is only recomputed when size or mtime change.
+        """
+        file_path = Path(file_path)
+        path_key = str(file_path.resolve())
+        stat = file_path.stat()
+
+        with self._lock:
+            known = self._fingerprints.get(path_key)
+
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            content_hash = known[2]
+        else:
+            content_hash = hash_file_contents(file_path)
+            with self._lock:
+                self._fingerprints[path_key] = (stat.st_size, stat.st_mtime_ns, content_hash)
+
+        return FileFingerprint(
+            path=path_key,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=content_hash,
+        )
+
+    def get(
+        self,
+        file_path: Path | str,
+        sheet_name: str | int = 0,
+        header_row: Optional[int] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get cached DataFrame for a workbook.
+
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Sheet name or index used for the read
+            header_row: Header row used for the read (None = auto-detected)
+
+        Returns:
+            Cached DataFrame, or None on miss
+        """
+        try:
+            fp = self.fingerprint(file_path)
+        except OSError as e:
+            logger.debug(f"Cannot fingerprint {file_path}: {e}")
+            return None
+
+        key = self._make_key(fp, sheet_name, header_row)
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                self._drop_stale_locked(fp)
+                return None
+
+        try:
+            df = self._read_frame(self.cache_dir / entry["file"], entry["format"])
+        except Exception as e:
+            logger.warning(f"Corrupt workbook cache entry for {Path(file_path).name}: {e}")
+            with self._lock:
+                self.stats.misses += 1
+                self._remove_entry_locked(key)
+                self._save_index_locked()
+            return None
+
+        with self._lock:
+            self.stats.hits += 1
+            entry["last_access"] = datetime.now().timestamp()
+            entry["hit_count"] = entry.get("hit_count", 0) + 1
+
+        logger.debug(f"Workbook cache hit for {Path(file_path).name}")
+        return df
+
+    def put(
+        self,
+        file_path: Path | str,
+        df: pd.DataFrame,
+        sheet_name: str | int = 0,
+        header_row: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a parsed DataFrame for a workbook.
+
+        Args:
+            file_path: Path to Excel file the frame was parsed from
+            df: Parsed DataFrame
+            sheet_name: Sheet name or index used for the read
+            header_row: Header row used for the read (None = auto-detected)
+
+        Returns:
+            True if the frame was stored
+        """
+        try:
+            fp = self.fingerprint(file_path)
+        except OSError as e:
+            logger.debug(f"Cannot fingerprint {file_path}: {e}")
+            return False
+
+        key = self._make_key(fp, sheet_name, header_row)
+        target = self.cache_dir / key
+
+        try:
+            fmt, size = self._write_frame(df, target)
+        except Exception as e:
+            logger.warning(f"Could not cache parsed frame for {Path(file_path).name}: {e}")
+            with self._lock:
+                self.stats.store_failures += 1
+            return False
+
+        now = datetime.now().timestamp()
+        with self._lock:
+            self._drop_stale_locked(fp)
+            previous = self._index.get(key)
+            if previous is not None:
+                self._remove_entry_locked(key, delete_file=previous["file"] != f"{key}.{fmt}")
+
+            self._index[key] = {
+                "file": f"{key}.{fmt}",
+                "format": fmt,
+                "bytes": size,
+                "fingerprint": fp.to_dict(),
+                "sheet_name": sheet_name,
+                "header_row": header_row,
+                "rows": len(df),
+                "created_at": now,
+                "last_access": now,
+                "hit_count": 0,
+            }
+            self.stats.stores += 1
+            self.stats.bytes_held += size
+            self._evict_locked()
+            self.stats.entries_count = len(self._index)
+            self._save_index_locked()
+
+        return True
+
+    def invalidate(self, file_path: Path | str) -> int:
+        """
+        Drop every cached frame for a workbook path.
+
+        Returns:
+            Number of entries removed
+        """
+        path_key = str(Path(file_path).resolve())
+
+        with self._lock:
+            keys = [
+                k for k, e in self._index.items()
+                if e["fingerprint"]["path"] == path_key
+            ]
+            for key in keys:
+                self._remove_entry_locked(key)
+            self._fingerprints.pop(path_key, None)
+            self.stats.invalidations += len(keys)
+            self.stats.entries_count = len(self._index)
+            if keys:
+                self._save_index_locked()
+
+        return len(keys)
+
+    def clear(self) -> int:
+        """
+        Remove all cached frames.
+
+        Returns:
+            Number of entries cleared
+        """
+        with self._lock:
+            count = len(self._index)
+            for key in list(self._index.keys()):
+                self._remove_entry_locked(key)
+            self._fingerprints.clear()
+            self.stats.entries_count = 0
+            self._save_index_locked()
+
+        logger.info(f"Cleared {count} workbook cache entries")
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            stats = self.stats.to_dict()
+        stats["max_bytes"] = self.max_bytes
+        stats["max_entries"] = self.max_entries
+        stats["cache_dir"] = str(self.cache_dir)
+        stats["columnar_storage"] = PYARROW_AVAILABLE
+        return stats
+
+    # ----------------------------------------
+    # Storage
+    # ----------------------------------------
+
+    def _make_key(
+        self,
+        fp: FileFingerprint,
+        sheet_name: str | int,
+        header_row: Optional[int],
+    ) -> str:
+        """Build cache key from fingerprint and read parameters."""
+        raw = json.dumps(
+            [READER_FORMAT_VERSION, fp.path, fp.size, fp.mtime_ns,
+             fp.content_hash, sheet_name, header_row],
+            default=str,
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _write_frame(self, df: pd.DataFrame, target: Path) -> Tuple[str, int]:
+        """
+        Write frame to disk atomically.
+
+        Returns:
+            Tuple of (format, size in bytes)
+        """
+        table = to_arrow_table(df)
+        fmt = "feather" if table is not None else "pickle"
+
+        final_path = target.with_suffix(f".{fmt}")
+        temp_path = target.with_suffix(f".{fmt}.tmp")
+
+        if table is not None:
+            # Uncompressed so reads can be memory-mapped
+            feather.write_feather(table, str(temp_path), compression="uncompressed")
+        else:
+            with open(temp_path, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_path, final_path)
+        return fmt, final_path.stat().st_size
+
+    def _read_frame(self, path: Path, fmt: str) -> pd.DataFrame:
+        """Read a cached frame from disk."""
+        if fmt == "feather":
+            table = feather.read_table(str(path), memory_map=True)
+            return table.to_pandas()
+
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    # ----------------------------------------
+    # Index maintenance (caller holds lock)
+    # ----------------------------------------
+
+    def _drop_stale_locked(self, fp: FileFingerprint) -> None:
+        """Remove entries for this path written for an older version of the file."""
+        stale = [
+            k for k, e in self._index.items()
+            if e["fingerprint"]["path"] == fp.path
+            and (
+                e["fingerprint"]["size"] != fp.size
+                or e["fingerprint"]["mtime_ns"] != fp.mtime_ns
+                or e["fingerprint"]["content_hash"] != fp.content_hash
+            )
+        ]
+        for key in stale:
+            self._remove_entry_locked(key)
+        if stale:
+            self.stats.invalidations += len(stale)
+            self.stats.entries_count = len(self._index)
+            self._save_index_locked()
+
+    def _remove_entry_locked(self, key: str, delete_file: bool = True) -> None:
+        """Remove a single entry and its file."""
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self.stats.bytes_held = max(0, self.stats.bytes_held - entry.get("bytes", 0))
+        if delete_file:
+            try:
+                (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"Failed to delete cache file {entry['file']}: {e}")
+
+    def _evict_locked(self) -> None:
+        """Evict least-recently-used entries until within limits."""
+        if len(self._index) <= self.max_entries and self.stats.bytes_held <= self.max_bytes:
+            return
+
+        by_age = sorted(self._index.items(), key=lambda item: item[1]["last_access"])
+        for key, _ in by_age:
+            if len(self._index) <= self.max_entries and self.stats.bytes_held <= self.max_bytes:
+                break
+            self._remove_entry_locked(key)
+            self.stats.evictions += 1
+
+    def _save_index_locked(self) -> None:
+        """Persist index to file (atomic rename)."""
+        try:
+            temp_file = self.index_file.with_suffix(".tmp")
+            with open(temp_file, "w") as f:
+                json.dump(self._index, f)
+            os.replace(temp_file, self.index_file)
+        except Exception as e:
+            logger.error(f"Failed to save workbook cache index: {e}")
+
+    def _load_index(self) -> None:
+        """Load index from file, dropping entries whose files are gone."""
+        if not self.index_file.exists():
+            return
+
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load workbook cache index: {e}")
+            return
+
+        for key, entry in index.items():
+            if (self.cache_dir / entry["file"]).exists():
+                self._index[key] = entry
+                self.stats.bytes_held += entry.get("bytes", 0)
+
+        self.stats.entries_count = len(self._index)
+
+
+# ========================================
+# EXPORTS
+# ========================================
+
+__all__ = [
+    "WorkbookCache",
+    "WorkbookCacheStats",
+    "FileFingerprint",
+    "hash_file_contents",
+    "to_arrow_table",
+    "frame_to_bytes",
+    "frame_from_bytes",
+    "PYARROW_AVAILABLE",
+]
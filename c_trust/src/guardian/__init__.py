@@ -10,6 +10,8 @@ integrity issues.
 Key Components:
 - GuardianAgent: Main agent for system integrity monitoring
 - GuardianEvent: Event structure for integrity findings
+- GuardianEventStore: Bounded, indexed event storage
+- AgentPerformanceRollup: Time-bucketed agent metrics with latency percentiles
 - DataDelta: Data change analysis between snapshots
 - OutputDelta: Output change analysis between snapshots
 - StalenessIndicator: Tracking for system staleness detection
@@ -27,6 +29,8 @@ from .guardian_agent import (
     OutputDelta,
     StalenessIndicator,
 )
+from .event_store import GuardianEventStore, get_event_store
+from .performance_rollup import AgentPerformanceRollup
 
 from .notification_system import (
     GuardianNotificationSystem,
@@ -45,6 +49,9 @@ __all__ = [
     "DataDelta",
     "OutputDelta",
     "StalenessIndicator",
+    "GuardianEventStore",
+    "get_event_store",
+    "AgentPerformanceRollup",
     # Notification System
     "GuardianNotificationSystem",
     "GuardianNotification",
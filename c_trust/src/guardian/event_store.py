@@ -0,0 +1,331 @@
+"""
+C-TRUST Guardian Event Store
+============================
+Bounded, indexed storage for Guardian integrity events.
+
+Events are kept in timestamp order in a primary deque plus one deque per
+entity_id, event_type and severity. Because every index is time-ordered:
+- a limited query walks the most selective index from the newest end and
+  stops after ``limit`` matches (O(k) for single-filter queries);
+- time windows stop as soon as they pass ``since``;
+- retention evicts from the oldest end of every index in O(1).
+
+Retention is by count (ring buffer) and optionally by age. Evicted events
+can be spilled to daily ``guardian_events_YYYYMMDD.jsonl`` files so the
+history survives for governance review without growing memory.
+
+Usage:
+    store = GuardianEventStore(max_events=10000, max_age_hours=24 * 30)
+    store.add(event)
+    store.query(severity=GuardianSeverity.CRITICAL, limit=10)
+"""
+
+import json
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.core import get_logger
+from src.core.settings import settings
+
+logger = get_logger(__name__)
+
+
+class GuardianEventStore:
+    """
+    Time-ordered Guardian event store with secondary indexes.
+
+    Holds GuardianEvent objects (duck-typed: event_id, entity_id,
+    event_type, severity, timestamp, to_dict()).
+    """
+
+    def __init__(
+        self,
+        max_events: Optional[int] = None,
+        max_age_hours: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initialize event store.
+
+        Args:
+            max_events: Events kept in memory (defaults to settings.GUARDIAN_EVENT_MAX_EVENTS)
+            max_age_hours: Evict events older than this; 0 keeps them until
+                max_events is reached (defaults to settings.GUARDIAN_EVENT_MAX_AGE_HOURS)
+            spill_dir: Directory evicted events are appended to; None drops
+                them (defaults to settings.GUARDIAN_EVENT_SPILL_DIR)
+        """
+        self.max_events = max_events or getattr(settings, 'GUARDIAN_EVENT_MAX_EVENTS', 10000)
+        self.max_age_hours = (
+            max_age_hours if max_age_hours is not None
+            else getattr(settings, 'GUARDIAN_EVENT_MAX_AGE_HOURS', 0.0)
+        )
+        spill_dir = spill_dir if spill_dir is not None else getattr(settings, 'GUARDIAN_EVENT_SPILL_DIR', None)
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+        self._events: Deque[Any] = deque()
+        self._by_id: Dict[str, Any] = {}
+        self._by_entity: Dict[str, Deque[Any]] = {}
+        self._by_type: Dict[Any, Deque[Any]] = {}
+        self._by_severity: Dict[Any, Deque[Any]] = {}
+        self._lock = Lock()
+
+        self.evicted_count = 0
+        self.spilled_count = 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, event: Any) -> bool:
+        """
+        Store an event. Events already stored (same event_id) are ignored.
+
+        Returns:
+            True if the event was added
+        """
+        with self._lock:
+            if event.event_id in self._by_id:
+                return False
+            self._by_id[event.event_id] = event
+            for dq in self._indexes_of(event, create=True):
+                self._insert_ordered(dq, event)
+
+            evicted = []
+            while len(self._events) > self.max_events:
+                evicted.append(self._evict_oldest())
+            evicted.extend(self._evict_expired())
+
+        if evicted:
+            self._spill(evicted)
+        return True
+
+    def remove_entity(self, entity_id: str) -> int:
+        """Drop every event of an entity. Returns number removed."""
+        with self._lock:
+            removed = self._by_entity.pop(entity_id, None)
+            if not removed:
+                return 0
+            removed_ids = {e.event_id for e in removed}
+            for event_id in removed_ids:
+                del self._by_id[event_id]
+            self._events = deque(e for e in self._events if e.event_id not in removed_ids)
+            for index in (self._by_type, self._by_severity):
+                for key in list(index):
+                    index[key] = deque(e for e in index[key] if e.event_id not in removed_ids)
+                    if not index[key]:
+                        del index[key]
+            return len(removed_ids)
+
+    def clear(self) -> int:
+        """Drop every event. Returns number removed."""
+        with self._lock:
+            count = len(self._events)
+            self._events.clear()
+            self._by_id.clear()
+            self._by_entity.clear()
+            self._by_type.clear()
+            self._by_severity.clear()
+            return count
+
+    def _indexes_of(self, event: Any, create: bool = False) -> List[Deque[Any]]:
+        """Primary deque plus the index deques an event belongs to."""
+        indexes = [self._events]
+        for index, key in (
+            (self._by_entity, event.entity_id),
+            (self._by_type, event.event_type),
+            (self._by_severity, event.severity),
+        ):
+            dq = index.get(key)
+            if dq is None and create:
+                dq = index[key] = deque()
+            if dq is not None:
+                indexes.append(dq)
+        return indexes
+
+    @staticmethod
+    def _insert_ordered(dq: Deque[Any], event: Any) -> None:
+        """Append, walking back only past newer events (out-of-order arrivals are rare)."""
+        if not dq or dq[-1].timestamp <= event.timestamp:
+            dq.append(event)
+            return
+        newer = 0
+        for existing in reversed(dq):
+            if existing.timestamp <= event.timestamp:
+                break
+            newer += 1
+        dq.insert(len(dq) - newer, event)
+
+    def _evict_oldest(self) -> Any:
+        """Remove the oldest event from every index (caller holds the lock)."""
+        event = self._events.popleft()
+        del self._by_id[event.event_id]
+        for index, key in (
+            (self._by_entity, event.entity_id),
+            (self._by_type, event.event_type),
+            (self._by_severity, event.severity),
+        ):
+            dq = index[key]
+            # Oldest overall is also oldest in its own index
+            if dq and dq[0] is event:
+                dq.popleft()
+            else:
+                dq.remove(event)
+            if not dq:
+                del index[key]
+        self.evicted_count += 1
+        return event
+
+    def _evict_expired(self) -> List[Any]:
+        """Evict events older than max_age_hours (caller holds the lock)."""
+        if not self.max_age_hours:
+            return []
+        cutoff = datetime.now() - timedelta(hours=self.max_age_hours)
+        evicted = []
+        while self._events and self._events[0].timestamp < cutoff:
+            evicted.append(self._evict_oldest())
+        return evicted
+
+    def _spill(self, events: List[Any]) -> None:
+        """Append evicted events to their daily spill files."""
+        if not self.spill_dir:
+            return
+        by_day: Dict[str, List[str]] = {}
+        for event in events:
+            name = f"guardian_events_{event.timestamp.strftime('%Y%m%d')}.jsonl"
+            by_day.setdefault(name, []).append(json.dumps(event.to_dict()) + "\n")
+        try:
+            for name, lines in by_day.items():
+                with open(self.spill_dir / name, "a") as f:
+                    f.writelines(lines)
+            self.spilled_count += len(events)
+        except Exception as e:
+            logger.error(f"Failed to spill Guardian events: {e}")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        entity_id: Optional[str] = None,
+        event_type: Any = None,
+        severity: Any = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Matching events, most recent first.
+
+        Walks the smallest applicable index from its newest end and stops
+        after ``limit`` matches or once events are older than ``since``.
+        """
+        with self._lock:
+            expired = self._evict_expired()
+            source, filters = self._plan(entity_id, event_type, severity)
+            result = []
+            if source:
+                for event in reversed(source):
+                    if until is not None and event.timestamp > until:
+                        continue
+                    if since is not None and event.timestamp < since:
+                        break
+                    if all(getattr(event, attr) == value for attr, value in filters):
+                        result.append(event)
+                        if limit and len(result) >= limit:
+                            break
+        if expired:
+            self._spill(expired)
+        return result
+
+    def count(self, entity_id: Optional[str] = None, event_type: Any = None, severity: Any = None) -> int:
+        """Number of stored events matching the filters (O(1) for a single filter)."""
+        with self._lock:
+            source, filters = self._plan(entity_id, event_type, severity)
+            if not filters:
+                return len(source) if source else 0
+            return sum(1 for e in source if all(getattr(e, a) == v for a, v in filters))
+
+    def counts_by(self, field_name: str) -> Dict[str, int]:
+        """Event counts per severity, event_type or entity_id value."""
+        index = {
+            "severity": self._by_severity,
+            "event_type": self._by_type,
+            "entity_id": self._by_entity,
+        }[field_name]
+        with self._lock:
+            return {getattr(key, "value", key): len(dq) for key, dq in index.items()}
+
+    def _plan(self, entity_id: Any, event_type: Any, severity: Any) -> Tuple[Optional[Deque[Any]], List[Tuple[str, Any]]]:
+        """Pick the smallest index for the filters; the rest are checked per event."""
+        candidates = []
+        for attr, value, index in (
+            ("entity_id", entity_id, self._by_entity),
+            ("event_type", event_type, self._by_type),
+            ("severity", severity, self._by_severity),
+        ):
+            if value:
+                candidates.append((len(index.get(value, ())), attr, value, index.get(value)))
+        if not candidates:
+            return self._events, []
+        candidates.sort(key=lambda c: c[0])
+        _, _, _, source = candidates[0]
+        return source, [(attr, value) for _, attr, value, _ in candidates[1:]]
+
+    def get(self, event_id: str) -> Optional[Any]:
+        return self._by_id.get(event_id)
+
+    def spilled_events(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Serialized events from the spill files in [since, until], oldest first."""
+        if not self.spill_dir:
+            return
+        for path in sorted(self.spill_dir.glob("guardian_events_*.jsonl")):
+            day = datetime.strptime(path.stem.rsplit("_", 1)[1], "%Y%m%d")
+            if since is not None and day + timedelta(days=1) <= since:
+                continue
+            if until is not None and day > until:
+                continue
+            with open(path) as f:
+                for line in f:
+                    data = json.loads(line)
+                    timestamp = datetime.fromisoformat(data["timestamp"])
+                    if (since is None or timestamp >= since) and (until is None or timestamp <= until):
+                        yield data
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "events": len(self._events),
+                "max_events": self.max_events,
+                "max_age_hours": self.max_age_hours,
+                "entities": len(self._by_entity),
+                "evicted": self.evicted_count,
+                "spilled": self.spilled_count,
+                "oldest": self._events[0].timestamp.isoformat() if self._events else None,
+            }
+
+
+# Process-wide store that API endpoints read; fed by GuardianAgent.add_event_listener
+_shared_store: Optional[GuardianEventStore] = None
+_shared_lock = Lock()
+
+
+def get_event_store() -> GuardianEventStore:
+    """Get or create the shared Guardian event store"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_lock:
+            if _shared_store is None:
+                _shared_store = GuardianEventStore()
+    return _shared_store
+
+
+__all__ = ["GuardianEventStore", "get_event_store"]
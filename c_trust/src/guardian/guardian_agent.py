@@ -22,11 +22,13 @@ Design Principles:
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import uuid
 import math
 
 from src.core import get_logger
+from src.core.tracing import traced
+from src.guardian.event_store import GuardianEventStore
 
 logger = get_logger(__name__)
 
@@ -234,11 +236,15 @@ class GuardianAgent:
     DEFAULT_STALENESS_THRESHOLD = 3  # 3 unchanged snapshots = stale
     DEFAULT_PROPORTIONALITY_TOLERANCE = 0.2  # 20% tolerance for proportionality
     
+    # Notified of every new event from any instance (e.g. WebSocket push)
+    _event_listeners: List[Callable[[GuardianEvent], None]] = []
+    
     def __init__(
         self,
         significance_threshold: float = None,
         staleness_threshold: int = None,
-        proportionality_tolerance: float = None
+        proportionality_tolerance: float = None,
+        event_store: GuardianEventStore = None
     ):
         """
         Initialize Guardian Agent.
@@ -247,13 +253,14 @@ class GuardianAgent:
             significance_threshold: Threshold for significant data changes (0-1)
             staleness_threshold: Number of unchanged snapshots before staleness
             proportionality_tolerance: Tolerance for output proportionality check
+            event_store: Event storage (default: a new bounded GuardianEventStore)
         """
         self.significance_threshold = significance_threshold or self.DEFAULT_SIGNIFICANCE_THRESHOLD
         self.staleness_threshold = staleness_threshold or self.DEFAULT_STALENESS_THRESHOLD
         self.proportionality_tolerance = proportionality_tolerance or self.DEFAULT_PROPORTIONALITY_TOLERANCE
         
-        # Event storage (in production, this would be database-backed)
-        self._events: List[GuardianEvent] = []
+        # Bounded, time-ordered event storage indexed by entity, type and severity
+        self._events = event_store if event_store is not None else GuardianEventStore()
         self._staleness_tracking: Dict[str, StalenessIndicator] = {}
         
         logger.info(
@@ -489,6 +496,7 @@ class GuardianAgent:
             proportional=True,  # Will be set by verify_consistency
         )
     
+    @traced("guardian.verify_consistency")
     def verify_consistency(
         self,
         data_delta: DataDelta,
@@ -578,6 +586,7 @@ class GuardianAgent:
     # STALENESS DETECTION
     # ========================================
     
+    @traced("guardian.check_staleness")
     def check_staleness(
         self,
         entity_id: str,
@@ -705,15 +714,32 @@ class GuardianAgent:
             recommendation=recommendation,
         )
         
-        self._events.append(event)
+        self._events.add(event)
         
         logger.warning(
             f"Guardian Event [{severity.value}]: {event_type.value} for {entity_id} - "
             f"{actual_behavior}"
         )
         
+        for listener in list(self._event_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Guardian event listener error: {e}")
+        
         return event
     
+    @classmethod
+    def add_event_listener(cls, callback: Callable[[GuardianEvent], None]) -> None:
+        """Call callback(event) whenever any Guardian instance creates an event"""
+        cls._event_listeners.append(callback)
+    
+    @classmethod
+    def remove_event_listener(cls, callback: Callable[[GuardianEvent], None]) -> None:
+        """Stop notifying callback of new events"""
+        if callback in cls._event_listeners:
+            cls._event_listeners.remove(callback)
+    
     def raise_integrity_warning(
         self,
         entity_id: str,
@@ -753,7 +779,9 @@ class GuardianAgent:
         entity_id: str = None,
         event_type: GuardianEventType = None,
         severity: GuardianSeverity = None,
-        limit: int = None
+        limit: int = None,
+        since: datetime = None,
+        until: datetime = None
     ) -> List[GuardianEvent]:
         """
         Get Guardian events with optional filtering.
@@ -763,28 +791,34 @@ class GuardianAgent:
             event_type: Filter by event type
             severity: Filter by severity
             limit: Maximum number of events to return
+            since: Only events at or after this time
+            until: Only events at or before this time
         
         Returns:
-            List of matching GuardianEvents
+            List of matching GuardianEvents, most recent first
         """
-        events = self._events
-        
-        if entity_id:
-            events = [e for e in events if e.entity_id == entity_id]
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        
-        if severity:
-            events = [e for e in events if e.severity == severity]
-        
-        # Sort by timestamp descending (most recent first)
-        events = sorted(events, key=lambda e: e.timestamp, reverse=True)
-        
-        if limit:
-            events = events[:limit]
-        
-        return events
+        return self._events.query(
+            entity_id=entity_id,
+            event_type=event_type,
+            severity=severity,
+            since=since,
+            until=until,
+            limit=limit,
+        )
+    
+    def count_events(
+        self,
+        entity_id: str = None,
+        event_type: GuardianEventType = None,
+        severity: GuardianSeverity = None
+    ) -> int:
+        """Number of stored events matching the filters, without listing them"""
+        return self._events.count(entity_id=entity_id, event_type=event_type, severity=severity)
+    
+    @property
+    def event_store(self) -> GuardianEventStore:
+        """Underlying event store"""
+        return self._events
     
     def clear_events(self, entity_id: str = None) -> int:
         """
@@ -797,13 +831,9 @@ class GuardianAgent:
             Number of events cleared
         """
         if entity_id:
-            original_count = len(self._events)
-            self._events = [e for e in self._events if e.entity_id != entity_id]
-            return original_count - len(self._events)
+            return self._events.remove_entity(entity_id)
         else:
-            count = len(self._events)
-            self._events.clear()
-            return count
+            return self._events.clear()
     
     @property
     def event_count(self) -> int:
@@ -814,6 +844,7 @@ class GuardianAgent:
     # ADVANCED MONITORING CAPABILITIES
     # ========================================
     
+    @traced("guardian.perform_multi_dimensional_staleness_check")
     def perform_multi_dimensional_staleness_check(
         self,
         entity_id: str,
@@ -886,6 +917,7 @@ class GuardianAgent:
             "severity": "CRITICAL" if overall_score < 0.3 else "WARNING" if overall_score < 0.5 else "OK",
         }
     
+    @traced("guardian.validate_cross_agent_signals")
     def validate_cross_agent_signals(
         self,
         signals: List[Dict[str, Any]]
@@ -1020,6 +1052,7 @@ class GuardianAgent:
             "components_verified": len(components),
         }
     
+    @traced("guardian.validate_dqi_consistency")
     def validate_dqi_consistency(
         self,
         dqi_score: float,
@@ -1116,11 +1149,14 @@ class GuardianAgent:
             "timestamp": datetime.now().isoformat(),
         }
         
-        # Event storage check
-        event_count = len(self._events)
+        # Event storage check (storage is bounded; report retention pressure)
+        store_stats = self._events.get_stats()
+        event_count = store_stats["events"]
         diagnostics["checks"]["event_storage"] = {
             "status": "OK" if event_count < 10000 else "WARNING",
             "count": event_count,
+            "capacity": store_stats["max_events"],
+            "evicted": store_stats["evicted"],
             "message": "Event storage healthy" if event_count < 10000 else "Consider clearing old events",
         }
         
@@ -11,13 +11,14 @@ Responsibilities:
 
 Key Features:
 - Real-time health monitoring
-- Agent performance timeline
+- Agent performance timeline from minute/hour/day rollups with
+  latency percentiles (performance_rollup.py)
 - Staleness visualization data
 - Alert history aggregation
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from enum import Enum
 
@@ -29,6 +30,7 @@ from src.guardian.guardian_agent import (
     GuardianSeverity,
     StalenessIndicator,
 )
+from src.guardian.performance_rollup import AgentPerformanceRollup
 
 logger = get_logger(__name__)
 
@@ -132,7 +134,7 @@ class GuardianDashboardData:
         
         # Agent performance tracking
         self._agent_metrics: Dict[str, AgentPerformanceMetrics] = {}
-        self._processing_history: List[Dict[str, Any]] = []
+        self._rollup = AgentPerformanceRollup()
         
         logger.info("GuardianDashboardData initialized")
     
@@ -143,10 +145,9 @@ class GuardianDashboardData:
         Returns:
             Dictionary with system health information
         """
-        # Count events by severity
-        all_events = self.guardian.get_events()
-        critical_events = len([e for e in all_events if e.severity == GuardianSeverity.CRITICAL])
-        warning_events = len([e for e in all_events if e.severity == GuardianSeverity.WARNING])
+        # Count events by severity (index sizes, no event scan)
+        critical_events = self.guardian.count_events(severity=GuardianSeverity.CRITICAL)
+        warning_events = self.guardian.count_events(severity=GuardianSeverity.WARNING)
         
         # Count stale entities
         stale_count = len([
@@ -226,24 +227,28 @@ class GuardianDashboardData:
     
     def get_agent_performance_timeline(
         self,
-        hours: int = 24
+        hours: int = 24,
+        resolution_seconds: Optional[int] = None,
+        agent_name: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Get agent performance timeline data.
         
         Args:
             hours: Number of hours of history to include
+            resolution_seconds: Bucket width (60, 3600 or 86400); chosen
+                from ``hours`` when omitted
+            agent_name: Only include this agent
         
         Returns:
-            List of performance data points over time
+            List of performance data points over time, one per bucket,
+            each with per-agent counts, averages and p50/p95/p99 latency
         """
-        # Filter processing history to requested timeframe
-        cutoff = datetime.now() - timedelta(hours=hours)
-        
-        timeline_data = [
-            entry for entry in self._processing_history
-            if entry.get("timestamp", datetime.min) >= cutoff
-        ]
+        timeline_data = self._rollup.timeline(
+            hours=hours,
+            resolution=resolution_seconds,
+            agent_name=agent_name,
+        )
         
         # If no history, generate sample current state
         if not timeline_data:
@@ -290,28 +295,17 @@ class GuardianDashboardData:
         Returns:
             Dictionary with alert counts and details
         """
-        events = self.guardian.get_events()
-        
-        # Group by severity
-        critical = [e for e in events if e.severity == GuardianSeverity.CRITICAL]
-        warnings = [e for e in events if e.severity == GuardianSeverity.WARNING]
-        info = [e for e in events if e.severity == GuardianSeverity.INFO]
-        
-        # Group by event type
-        by_type = {}
-        for event in events:
-            type_key = event.event_type.value
-            if type_key not in by_type:
-                by_type[type_key] = 0
-            by_type[type_key] += 1
+        store = self.guardian.event_store
+        by_severity = store.counts_by("severity")
+        latest_critical = self.guardian.get_events(severity=GuardianSeverity.CRITICAL, limit=1)
         
         return {
-            "total": len(events),
-            "critical": len(critical),
-            "warning": len(warnings),
-            "info": len(info),
-            "by_type": by_type,
-            "latest_critical": critical[0].to_dict() if critical else None,
+            "total": len(store),
+            "critical": by_severity.get(GuardianSeverity.CRITICAL.value, 0),
+            "warning": by_severity.get(GuardianSeverity.WARNING.value, 0),
+            "info": by_severity.get(GuardianSeverity.INFO.value, 0),
+            "by_type": store.counts_by("event_type"),
+            "latest_critical": latest_critical[0].to_dict() if latest_critical else None,
         }
     
     def record_agent_processing(
@@ -361,18 +355,25 @@ class GuardianDashboardData:
             metrics.abstention_rate = metrics.abstention_count / total_calls
             metrics.last_active = datetime.now()
         
-        # Record in history
-        self._processing_history.append({
-            "timestamp": datetime.now(),
-            "agent": agent_name,
-            "processing_time_ms": processing_time_ms,
-            "abstained": abstained,
-            "confidence": confidence,
-        })
-        
-        # Trim history if too long
-        if len(self._processing_history) > 10000:
-            self._processing_history = self._processing_history[-5000:]
+        # Record in the time-bucketed rollups
+        self._rollup.record(agent_name, processing_time_ms, abstained, confidence)
+    
+    def get_agent_latency_summary(
+        self,
+        agent_name: str,
+        hours: float = 1,
+    ) -> Dict[str, Any]:
+        """
+        Get an agent's call counts and p50/p95/p99 latency over a window.
+        
+        Args:
+            agent_name: Name of the agent
+            hours: Window length
+        
+        Returns:
+            Dictionary of counts, averages and latency percentiles
+        """
+        return self._rollup.summary(agent_name, hours=hours)
     
     def _calculate_data_freshness(self) -> float:
         """Calculate overall data freshness score (0-1)."""
@@ -392,9 +393,13 @@ class GuardianDashboardData:
         agent_status = []
         
         for name, metrics in self._agent_metrics.items():
+            latency = self._rollup.summary(name, hours=1)
             agent_status.append({
                 "name": name,
                 "processing_time_ms": metrics.avg_processing_time_ms,
+                "p50_ms": latency["p50_ms"],
+                "p95_ms": latency["p95_ms"],
+                "p99_ms": latency["p99_ms"],
                 "signals": metrics.signals_generated,
                 "abstentions": metrics.abstention_count,
                 "abstention_rate": metrics.abstention_rate,
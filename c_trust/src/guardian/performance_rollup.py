@@ -0,0 +1,347 @@
+"""
+C-TRUST Agent Performance Rollup
+================================
+Bounded time-series store for agent processing metrics.
+
+Each resolution (minute, hour, day by default) is a ring of fixed-size
+typed arrays indexed by ``bucket % slots``. A bucket holds, per agent:
+call count, abstentions, confidence sum (over non-abstained calls),
+latency sum/max and a log-scale latency histogram (HDR-style: bins grow
+by ``LATENCY_GROWTH`` so every percentile is within a few percent of the
+true value, and histograms merge by addition).
+
+Recording updates one bucket per resolution in O(1); timeline queries
+read pre-aggregated buckets instead of individual calls. Memory is fixed
+by (agents x sum of slots x bins), independent of throughput.
+
+Usage:
+    rollup = AgentPerformanceRollup()
+    rollup.record("safety", processing_time_ms=12.5, abstained=False, confidence=0.9)
+    rollup.timeline(hours=6)              # minute buckets
+    rollup.summary("safety", hours=24)    # p50/p95/p99 over the window
+"""
+
+import math
+import time
+from array import array
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core import get_logger
+
+logger = get_logger(__name__)
+
+
+# (bucket width in seconds, buckets kept): 6 hours of minutes, 30 days of hours, a year of days
+DEFAULT_RESOLUTIONS: Tuple[Tuple[int, int], ...] = ((60, 360), (3600, 720), (86400, 365))
+
+# Latency histogram: bin 0 holds values below LATENCY_MIN_MS, bin i covers
+# [LATENCY_MIN_MS * g^(i-1), LATENCY_MIN_MS * g^i); the last bin is open-ended
+LATENCY_MIN_MS = 0.1
+LATENCY_GROWTH = 1.1
+LATENCY_BINS = 160  # covers up to ~6 minutes
+_LOG_GROWTH = math.log(LATENCY_GROWTH)
+
+PERCENTILES = (50, 95, 99)
+
+
+def latency_bin(value_ms: float) -> int:
+    """Histogram bin of a latency value."""
+    if value_ms < LATENCY_MIN_MS:
+        return 0
+    return min(int(math.log(value_ms / LATENCY_MIN_MS) / _LOG_GROWTH) + 1, LATENCY_BINS - 1)
+
+
+def bin_value(index: int) -> float:
+    """Representative latency of a bin (geometric midpoint)."""
+    if index == 0:
+        return 0.0
+    return LATENCY_MIN_MS * LATENCY_GROWTH ** (index - 0.5)
+
+
+def histogram_percentiles(
+    histogram: Sequence[int],
+    count: int,
+    max_ms: float,
+    percentiles: Sequence[int] = PERCENTILES,
+) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 (by default) from a latency histogram, capped at the observed max."""
+    result: Dict[str, Optional[float]] = {f"p{p}_ms": None for p in percentiles}
+    if count <= 0:
+        return result
+    targets = sorted((max(1, math.ceil(count * p / 100)), p) for p in percentiles)
+    cumulative = 0
+    t = 0
+    for index, n in enumerate(histogram):
+        if not n:
+            continue
+        cumulative += n
+        while t < len(targets) and cumulative >= targets[t][0]:
+            result[f"p{targets[t][1]}_ms"] = round(min(bin_value(index), max_ms), 3)
+            t += 1
+        if t == len(targets):
+            break
+    return result
+
+
+class _Ring:
+    """
+    One resolution of one agent: ``slots`` buckets of ``width`` seconds.
+
+    A slot is reused when a newer bucket maps to it; its previous contents
+    (older than the ring's retention) are dropped.
+    """
+
+    __slots__ = (
+        "width", "slots", "epoch", "count", "abstentions",
+        "confidence_sum", "latency_sum", "latency_max", "histogram",
+    )
+
+    def __init__(self, width: int, slots: int):
+        self.width = width
+        self.slots = slots
+        self.epoch = array("q", [-1]) * slots
+        self.count = array("q", [0]) * slots
+        self.abstentions = array("q", [0]) * slots
+        self.confidence_sum = array("d", [0.0]) * slots
+        self.latency_sum = array("d", [0.0]) * slots
+        self.latency_max = array("d", [0.0]) * slots
+        self.histogram = array("I", [0]) * (slots * LATENCY_BINS)
+
+    def record(self, ts: float, latency_bin_index: int, processing_time_ms: float, abstained: bool, confidence: float) -> None:
+        bucket = int(ts // self.width)
+        slot = bucket % self.slots
+        if self.epoch[slot] != bucket:
+            if self.epoch[slot] > bucket:
+                return  # older than the retention of this resolution
+            self._reset(slot, bucket)
+        self.count[slot] += 1
+        if abstained:
+            self.abstentions[slot] += 1
+        else:
+            self.confidence_sum[slot] += confidence
+        self.latency_sum[slot] += processing_time_ms
+        if processing_time_ms > self.latency_max[slot]:
+            self.latency_max[slot] = processing_time_ms
+        self.histogram[slot * LATENCY_BINS + latency_bin_index] += 1
+
+    def _reset(self, slot: int, bucket: int) -> None:
+        self.epoch[slot] = bucket
+        self.count[slot] = 0
+        self.abstentions[slot] = 0
+        self.confidence_sum[slot] = 0.0
+        self.latency_sum[slot] = 0.0
+        self.latency_max[slot] = 0.0
+        start = slot * LATENCY_BINS
+        self.histogram[start:start + LATENCY_BINS] = _ZERO_ROW
+
+    def slots_between(self, first_bucket: int, last_bucket: int) -> List[int]:
+        """Occupied slots whose bucket is in [first_bucket, last_bucket], oldest first."""
+        first_bucket = max(first_bucket, last_bucket - self.slots + 1)
+        result = []
+        for bucket in range(first_bucket, last_bucket + 1):
+            slot = bucket % self.slots
+            if self.epoch[slot] == bucket and self.count[slot]:
+                result.append(slot)
+        return result
+
+    def histogram_row(self, slot: int) -> array:
+        start = slot * LATENCY_BINS
+        return self.histogram[start:start + LATENCY_BINS]
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.epoch, self.count, self.abstentions, self.confidence_sum,
+                  self.latency_sum, self.latency_max, self.histogram)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+_ZERO_ROW = array("I", [0]) * LATENCY_BINS
+
+
+class AgentPerformanceRollup:
+    """
+    Per-agent, multi-resolution performance buckets.
+
+    Thread-safe. Timestamps are naive local datetimes, like the rest of
+    the Guardian dashboard.
+    """
+
+    def __init__(
+        self,
+        resolutions: Sequence[Tuple[int, int]] = DEFAULT_RESOLUTIONS,
+        max_points: int = 360,
+    ):
+        """
+        Initialize rollup store.
+
+        Args:
+            resolutions: (bucket seconds, buckets kept) per resolution, finest first
+            max_points: Timeline queries pick the finest resolution that
+                covers the window in at most this many buckets
+        """
+        self.resolutions = tuple(sorted((int(w), int(n)) for w, n in resolutions))
+        self.max_points = max_points
+        self._agents: Dict[str, List[_Ring]] = {}
+        self._lock = Lock()
+
+    def record(
+        self,
+        agent_name: str,
+        processing_time_ms: float,
+        abstained: bool,
+        confidence: float,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Add one agent call to the bucket of every resolution (O(resolutions))."""
+        ts = timestamp.timestamp() if timestamp is not None else time.time()
+        index = latency_bin(processing_time_ms)
+        with self._lock:
+            rings = self._agents.get(agent_name)
+            if rings is None:
+                rings = self._agents[agent_name] = [_Ring(w, n) for w, n in self.resolutions]
+            for ring in rings:
+                ring.record(ts, index, processing_time_ms, abstained, confidence)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @property
+    def agents(self) -> List[str]:
+        return list(self._agents)
+
+    def choose_resolution(self, hours: float) -> int:
+        """Finest bucket width that covers ``hours`` in at most max_points buckets."""
+        window = hours * 3600
+        for width, slots in self.resolutions:
+            if window <= width * slots and window / width <= self.max_points:
+                return width
+        return self.resolutions[-1][0]
+
+    def _ring(self, rings: List[_Ring], width: int) -> _Ring:
+        for ring in rings:
+            if ring.width == width:
+                return ring
+        raise ValueError(f"No {width}s resolution; available: {[w for w, _ in self.resolutions]}")
+
+    def timeline(
+        self,
+        hours: float = 24,
+        resolution: Optional[int] = None,
+        agent_name: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Bucketed performance over the last ``hours``, oldest first.
+
+        Args:
+            hours: Window length
+            resolution: Bucket width in seconds (chosen from hours if None)
+            agent_name: Only this agent
+            now: End of the window (defaults to the current time)
+
+        Returns:
+            [{"timestamp", "resolution_seconds", "agents": [per-agent stats]}]
+            for every bucket in which at least one agent ran
+
+        Raises:
+            ValueError: If ``resolution`` is not one of the configured widths
+        """
+        width = resolution or self.choose_resolution(hours)
+        end = (now or datetime.now()).timestamp()
+        first, last = int((end - hours * 3600) // width), int(end // width)
+
+        points: Dict[int, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for name, rings in self._agents.items():
+                if agent_name is not None and name != agent_name:
+                    continue
+                ring = self._ring(rings, width)
+                for slot in ring.slots_between(first, last):
+                    stats = self._slot_stats(ring, [slot])
+                    stats["name"] = name
+                    points.setdefault(ring.epoch[slot], []).append(stats)
+
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(bucket * width).isoformat(),
+                "resolution_seconds": width,
+                "agents": points[bucket],
+            }
+            for bucket in sorted(points)
+        ]
+
+    def summary(
+        self,
+        agent_name: str,
+        hours: float = 24,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Totals and latency percentiles of one agent over the last ``hours``."""
+        width = self.choose_resolution(hours)
+        end = (now or datetime.now()).timestamp()
+        first, last = int((end - hours * 3600) // width), int(end // width)
+        with self._lock:
+            rings = self._agents.get(agent_name)
+            if rings is None:
+                return self._empty_stats()
+            ring = self._ring(rings, width)
+            return self._slot_stats(ring, ring.slots_between(first, last))
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            "count": 0,
+            "abstentions": 0,
+            "abstention_rate": 0.0,
+            "avg_confidence": 0.0,
+            "avg_processing_time_ms": 0.0,
+            "max_ms": 0.0,
+            **{f"p{p}_ms": None for p in PERCENTILES},
+        }
+
+    @staticmethod
+    def _slot_stats(ring: _Ring, slots: List[int]) -> Dict[str, Any]:
+        """Merge buckets (sums add, histograms add bin by bin)."""
+        if not slots:
+            return AgentPerformanceRollup._empty_stats()
+        count = sum(ring.count[s] for s in slots)
+        abstentions = sum(ring.abstentions[s] for s in slots)
+        latency_max = max(ring.latency_max[s] for s in slots)
+        if len(slots) == 1:
+            histogram = ring.histogram_row(slots[0])
+        else:
+            histogram = [0] * LATENCY_BINS
+            for s in slots:
+                for index, n in enumerate(ring.histogram_row(s)):
+                    if n:
+                        histogram[index] += n
+        signals = count - abstentions
+        return {
+            "count": count,
+            "abstentions": abstentions,
+            "abstention_rate": round(abstentions / count, 4) if count else 0.0,
+            "avg_confidence": round(sum(ring.confidence_sum[s] for s in slots) / signals, 4) if signals else 0.0,
+            "avg_processing_time_ms": round(sum(ring.latency_sum[s] for s in slots) / count, 3) if count else 0.0,
+            "max_ms": round(latency_max, 3),
+            **histogram_percentiles(histogram, count, latency_max),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "agents": len(self._agents),
+                "resolutions": [{"seconds": w, "buckets": n} for w, n in self.resolutions],
+                "latency_bins": LATENCY_BINS,
+                "memory_bytes": sum(r.nbytes for rings in self._agents.values() for r in rings),
+            }
+
+
+__all__ = [
+    "AgentPerformanceRollup",
+    "DEFAULT_RESOLUTIONS",
+    "histogram_percentiles",
+    "latency_bin",
+]
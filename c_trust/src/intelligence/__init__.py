@@ -19,6 +19,8 @@ from src.intelligence.base_agent import (
     RiskSignal,
     FeatureEvidence,
     AgentSignal,
+    BatchAssessment,
+    FeatureMatrix,
     AgentRegistry,
     AgentOrchestrator,
 )
@@ -27,6 +29,7 @@ from src.intelligence.consensus import (
     ConsensusEngine,
     RiskAssessmentEngine,
     ConsensusDecision,
+    BatchConsensus,
     AgentContribution,
     ConsensusRiskLevel,
     RecommendedAction,
@@ -39,12 +42,15 @@ __all__ = [
     "RiskSignal",
     "FeatureEvidence",
     "AgentSignal",
+    "BatchAssessment",
+    "FeatureMatrix",
     "AgentRegistry",
     "AgentOrchestrator",
     # Consensus engine
     "ConsensusEngine",
     "RiskAssessmentEngine",
     "ConsensusDecision",
+    "BatchConsensus",
     "AgentContribution",
     "ConsensusRiskLevel",
     "RecommendedAction",
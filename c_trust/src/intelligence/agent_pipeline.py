@@ -18,19 +18,49 @@ Architecture:
                     ↓
               AnalysisResult
 
+Agents run on a persistent worker pool owned by the pipeline. Each agent
+has its own deadline (counted from when it starts running); an agent that
+misses it is reported as failed and the study completes without it.
+
+An agent that misses its deadline still holds its worker until it returns.
+When such hung agents occupy every worker, the pool is replaced and the
+queued agents are resubmitted to the new one. As a backstop, an agent
+still queued queue_timeout seconds after it was submitted (or after the
+pool last made progress, in long batches) is cancelled and abstains.
+
+Every stage is traced (src/core/tracing.py): pipeline.agents with one
+pipeline.agent span per agent, pipeline.consensus, pipeline.dqi (legacy
+and agent_driven) and the guardian.* validation spans, all tagged with
+the study_id.
+
 Usage:
     pipeline = AgentPipeline()
     result = pipeline.run_full_analysis(study_id, features)
+    
+    # Many studies: every (study, agent) pair shares the pool,
+    # results stream back as each study completes
+    for result in pipeline.run_batch({"STUDY_01": features_1, "STUDY_02": features_2}):
+        ...
+    
+    # Agent signals only, vectorized over a studies × features matrix
+    frames = pipeline.evaluate_matrix(feature_frame)
+    consensus = pipeline.consensus_matrix(feature_frame)
 """
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
 import time
 
+import numpy as np
+import pandas as pd
+
 from src.core import get_logger
+from src.core.settings import settings
+from src.core.tracing import tracer
 
 # Import all 7 agents
 from src.agents.signal_agents import (
@@ -45,10 +75,10 @@ from src.agents.signal_agents import (
 )
 
 # Import consensus and DQI engines
-from src.intelligence.consensus import ConsensusEngine, ConsensusDecision
+from src.intelligence.consensus import BatchConsensus, ConsensusEngine, ConsensusDecision
 from src.intelligence.dqi import DQIEngine, DQIScore
 from src.intelligence.dqi_engine_agent_driven import calculate_dqi_from_agents, DQIResult
-from src.intelligence.base_agent import AgentSignal, AgentType
+from src.intelligence.base_agent import AgentSignal, AgentType, FeatureMatrix
 
 # Import Guardian
 from src.guardian.guardian_agent import GuardianAgent
@@ -112,6 +142,19 @@ class PipelineResult:
         }
 
 
+@dataclass
+class _AgentTask:
+    """One (study, agent) unit of work on the pool."""
+    study_id: str
+    agent_name: str
+    agent: Any
+    future: Optional[Future] = None
+    submitted_at: float = 0.0  # time.monotonic()
+    started_at: Optional[float] = None  # time.monotonic(), set by the worker
+    run: Optional[Callable[..., AgentResult]] = None
+    features: Optional[Dict[str, Any]] = None
+
+
 # ========================================
 # AGENT PIPELINE
 # ========================================
@@ -143,19 +186,31 @@ class AgentPipeline:
     
     def __init__(
         self,
-        max_workers: int = 4,
-        enable_guardian: bool = True
+        max_workers: Optional[int] = None,
+        enable_guardian: bool = True,
+        agent_timeout: Optional[float] = None,
+        queue_timeout: Optional[float] = None,
     ):
         """
         Initialize the agent pipeline.
         
         Args:
-            max_workers: Max parallel agent executions
+            max_workers: Agent pool size (defaults to settings.AGENT_POOL_WORKERS)
             enable_guardian: Whether to run Guardian validation
+            agent_timeout: Per-agent deadline in seconds (defaults to settings.AGENT_TIMEOUT_SECONDS)
+            queue_timeout: Longest an agent may wait for a worker before it is
+                cancelled and abstains (defaults to settings.AGENT_QUEUE_TIMEOUT_SECONDS)
         """
-        self.max_workers = max_workers
+        self.max_workers = max_workers or getattr(settings, 'AGENT_POOL_WORKERS', 4)
+        self.agent_timeout = agent_timeout or getattr(settings, 'AGENT_TIMEOUT_SECONDS', 30.0)
+        self.queue_timeout = queue_timeout or getattr(settings, 'AGENT_QUEUE_TIMEOUT_SECONDS', 30.0)
         self.enable_guardian = enable_guardian
         
+        # Persistent agent pool (created on first parallel run)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+        self._hung: Set[Future] = set()  # timed-out agents still holding a worker of the current pool
+        
         # Initialize all 7 agents
         self.agents = {
             "Data Completeness": DataCompletenessAgent(),
@@ -176,6 +231,10 @@ class AgentPipeline:
         # Tracking
         self._execution_count = 0
         self._total_time = 0.0
+        self._agent_timeouts = 0
+        self._agents_not_started = 0
+        self._pool_replacements = 0
+        self._matrix_evaluations = 0
         
         logger.info(f"AgentPipeline initialized with {len(self.agents)} agents")
     
@@ -203,15 +262,117 @@ class AgentPipeline:
         Returns:
             PipelineResult with full analysis
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         logger.info(f"Starting full analysis for {study_id}")
         
-        # Step 1: Run all agents
-        if parallel:
-            agent_results = self._run_agents_parallel(features, study_id)
-        else:
-            agent_results = self._run_agents_sequential(features, study_id)
+        with tracer.span("pipeline.analysis", study_id=study_id):
+            # Step 1: Run all agents
+            if parallel:
+                agent_results = self._run_agents_parallel(features, study_id)
+            else:
+                with tracer.span("pipeline.agents"):
+                    agent_results = self._run_agents_sequential(features, study_id)
+            
+            return self._build_result(study_id, features, agent_results, start_time)
+    
+    def run_batch(self, studies: Mapping[str, Dict[str, Any]]) -> Iterator[PipelineResult]:
+        """
+        Run the full analysis for many studies on the shared agent pool.
+        
+        All (study, agent) pairs are submitted up front, so throughput is
+        bounded by pool saturation rather than by the slowest agent of each
+        study. Results are yielded as soon as every agent of a study has
+        finished or missed its deadline (completion order, not input order).
+        
+        Args:
+            studies: Mapping of study_id -> engineered features
+        
+        Yields:
+            PipelineResult per study
+        """
+        logger.info(f"Starting batch analysis for {len(studies)} studies")
+        
+        for study_id, agent_results, start_time in self._execute_agents(studies):
+            # Agents of many studies interleave on the pool, so each study's
+            # pipeline.agents span is its own trace here
+            with tracer.span("pipeline.analysis", study_id=study_id):
+                result = self._build_result(study_id, studies[study_id], agent_results, start_time)
+            yield result
+    
+    def evaluate_matrix(self, features: Any) -> Dict[str, pd.DataFrame]:
+        """
+        Evaluate every agent over many studies in one vectorized pass.
+        
+        Produces the same risk levels, confidences, abstentions and
+        evidence severities as analyze() per study, without per-study
+        agent calls (no consensus, DQI or Guardian).
+        
+        Args:
+            features: FeatureMatrix, DataFrame (studies × features) or
+                      mapping of study_id -> engineered features
+        
+        Returns:
+            Mapping of agent name -> BaseAgent.analyze_batch frame
+        """
+        matrix = FeatureMatrix.coerce(features)
+        logger.info(f"Evaluating {len(self.agents)} agents over {len(matrix)} studies")
+        
+        frames = {}
+        for name, agent in self.agents.items():
+            try:
+                frames[name] = agent.analyze_batch(matrix)
+            except Exception as e:
+                logger.error(f"Vectorized evaluation failed for {name}, analyzing per study: {e}")
+                frames[name] = agent._analyze_rows(matrix)
+        
+        self._matrix_evaluations += 1
+        return frames
+    
+    def consensus_matrix(self, features: Any) -> BatchConsensus:
+        """
+        Vectorized agent evaluation followed by batch consensus.
+        
+        As in run_full_analysis, only signals from agents that neither
+        abstained nor failed take part in each study's consensus.
+        
+        Args:
+            features: FeatureMatrix, DataFrame (studies × features) or
+                      mapping of study_id -> engineered features
+        
+        Returns:
+            BatchConsensus keyed by study_id
+        """
+        matrix = FeatureMatrix.coerce(features)
+        frames = self.evaluate_matrix(matrix)
         
+        scores = np.column_stack([
+            np.where(
+                frame["abstained"] | frame["failed"],
+                np.nan,
+                frame["risk_level"].map(
+                    {signal.value: score for signal, score in ConsensusEngine.RISK_SCORES.items()}
+                ).to_numpy(dtype=float),
+            )
+            for frame in frames.values()
+        ])
+        confidences = np.column_stack([frame["confidence"].to_numpy(dtype=float) for frame in frames.values()])
+        
+        return self.consensus_engine.calculate_consensus_batch(
+            scores,
+            confidences,
+            np.zeros(scores.shape, dtype=bool),
+            [agent.agent_type for agent in self.agents.values()],
+            entity_ids=list(matrix.index),
+        )
+    
+    def _build_result(
+        self,
+        study_id: str,
+        features: Dict[str, Any],
+        agent_results: List[AgentResult],
+        start_time: float
+    ) -> PipelineResult:
+        """Consensus, DQI and Guardian steps over a study's agent results."""
         # Step 2: Collect valid signals for consensus
         signals = []
         succeeded = 0
@@ -233,10 +394,11 @@ class AgentPipeline:
         consensus = None
         if signals:
             try:
-                consensus = self.consensus_engine.calculate_consensus(
-                    signals=signals,
-                    study_id=study_id
-                )
+                with tracer.span("pipeline.consensus"):
+                    consensus = self.consensus_engine.calculate_consensus(
+                        signals=signals,
+                        study_id=study_id
+                    )
                 logger.info(f"Consensus: {consensus.risk_level.value} ({consensus.confidence:.2f})")
             except Exception as e:
                 logger.error(f"Consensus calculation failed: {e}")
@@ -247,10 +409,11 @@ class AgentPipeline:
         
         # Old DQI calculation (for backward compatibility)
         try:
-            dqi_score = self.dqi_engine.calculate_dqi(
-                features=features,
-                study_id=study_id
-            )
+            with tracer.span("pipeline.dqi", method="legacy"):
+                dqi_score = self.dqi_engine.calculate_dqi(
+                    features=features,
+                    study_id=study_id
+                )
             logger.info(f"DQI Score (legacy): {dqi_score.overall_score:.1f}")
         except Exception as e:
             logger.error(f"DQI calculation failed: {e}")
@@ -258,11 +421,12 @@ class AgentPipeline:
         # NEW: Agent-driven DQI calculation
         if signals and consensus:
             try:
-                dqi_agent_driven = calculate_dqi_from_agents(
-                    agent_signals=signals,
-                    consensus=consensus,
-                    study_id=study_id
-                )
+                with tracer.span("pipeline.dqi", method="agent_driven"):
+                    dqi_agent_driven = calculate_dqi_from_agents(
+                        agent_signals=signals,
+                        consensus=consensus,
+                        study_id=study_id
+                    )
                 logger.info(
                     f"DQI Score (agent-driven): {dqi_agent_driven.score:.1f} "
                     f"({dqi_agent_driven.band.value}, confidence={dqi_agent_driven.confidence:.2f})"
@@ -298,7 +462,7 @@ class AgentPipeline:
                 logger.error(f"Guardian validation failed: {e}")
         
         # Calculate total time
-        total_time = (time.time() - start_time) * 1000
+        total_time = (time.monotonic() - start_time) * 1000
         self._execution_count += 1
         self._total_time += total_time
         
@@ -327,31 +491,200 @@ class AgentPipeline:
         features: Dict[str, Any],
         study_id: str
     ) -> List[AgentResult]:
-        """Run all agents in parallel using ThreadPoolExecutor."""
-        results = []
+        """Run all agents in parallel on the shared agent pool."""
+        for _, agent_results, _ in self._execute_agents({study_id: features}):
+            return agent_results
+        return []
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get or create the persistent agent pool."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ctrust-agent",
+                )
+            return self._executor
+    
+    def _execute_agents(
+        self,
+        studies: Mapping[str, Dict[str, Any]]
+    ) -> Iterator[Tuple[str, List[AgentResult], float]]:
+        """
+        Run every agent for every study on the pool.
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {}
-            
+        Yields (study_id, agent_results, start_time) as each study completes.
+        Agents that run past agent_timeout are reported as failed; Python
+        threads cannot be interrupted, so such an agent keeps its worker
+        until it returns and its late result is discarded. If those agents
+        hold every worker, the pool is replaced so queued agents can start.
+        Agents that wait past queue_timeout without starting abstain.
+        """
+        executor = self._get_executor()
+        pending: Dict[Future, _AgentTask] = {}
+        collected: Dict[str, Dict[str, AgentResult]] = {study_id: {} for study_id in studies}
+        first_started: Dict[str, float] = {}  # earliest agent start per study
+        spans = {}
+        
+        for study_id, features in studies.items():
+            spans[study_id] = tracer.start_span("pipeline.agents", study_id=study_id)
+            run = tracer.bind(self._run_pooled_agent, parent=spans[study_id])
             for name, agent in self.agents.items():
-                future = executor.submit(self._run_single_agent, name, agent, features, study_id)
-                futures[future] = name
-            
-            for future in futures:
-                try:
-                    result = future.result(timeout=30)  # 30s timeout
-                    results.append(result)
-                except Exception as e:
-                    name = futures[future]
-                    results.append(AgentResult(
-                        agent_type=AgentType.SAFETY,  # Default
-                        agent_name=name,
-                        signal=None,
-                        processing_time_ms=0,
-                        error=str(e),
-                    ))
+                task = _AgentTask(study_id=study_id, agent_name=name, agent=agent, run=run, features=features)
+                task.submitted_at = time.monotonic()
+                task.future = executor.submit(run, task, features)
+                pending[task.future] = task
         
-        return results
+        # Queued agents count their wait from submit or from the pool's last progress,
+        # so a long batch is not abandoned while the pool is still working through it
+        last_progress = time.monotonic()
+        
+        try:
+            while pending:
+                done, _ = wait(
+                    pending,
+                    timeout=self._next_deadline(pending.values(), last_progress),
+                    return_when=FIRST_COMPLETED,
+                )
+                now = time.monotonic()
+                touched = []
+                if done:
+                    last_progress = now
+                
+                for future in done:
+                    task = pending.pop(future)
+                    collected[task.study_id][task.agent_name] = self._task_result(task)
+                    touched.append(task)
+                
+                for future, task in list(pending.items()):
+                    if task.started_at is not None:
+                        last_progress = max(last_progress, task.started_at)
+                        if now - task.started_at >= self.agent_timeout:
+                            del pending[future]
+                            self._mark_hung(future)
+                            collected[task.study_id][task.agent_name] = self._timeout_result(task, now)
+                            touched.append(task)
+                
+                for future, task in list(pending.items()):
+                    if task.started_at is None and now - max(task.submitted_at, last_progress) >= self.queue_timeout:
+                        if future.cancel():
+                            del pending[future]
+                            collected[task.study_id][task.agent_name] = self._not_started_result(task)
+                            touched.append(task)
+                
+                if len(self._hung) >= self.max_workers and any(t.started_at is None for t in pending.values()):
+                    pending = self._resubmit_on_new_pool(pending)
+                
+                for task in touched:
+                    started = task.started_at if task.started_at is not None else now
+                    first_started[task.study_id] = min(first_started.get(task.study_id, started), started)
+                
+                for study_id in dict.fromkeys(task.study_id for task in touched):
+                    results = collected[study_id]
+                    if len(results) == len(self.agents):
+                        del collected[study_id]
+                        tracer.finish(spans.pop(study_id))
+                        yield study_id, [results[name] for name in self.agents], first_started.pop(study_id)
+        finally:
+            # Consumer stopped early: drop work that has not started
+            for future in pending:
+                future.cancel()
+    
+    def _run_pooled_agent(self, task: _AgentTask, features: Dict[str, Any]) -> AgentResult:
+        """Pool entry point: stamp the start time, then run the agent."""
+        task.started_at = time.monotonic()
+        return self._run_traced_agent(task.agent_name, task.agent, features, task.study_id)
+    
+    def _next_deadline(self, tasks, last_progress: float) -> float:
+        """Seconds until the earliest running agent's deadline or queued agent's queue deadline."""
+        now = time.monotonic()
+        deadlines = [
+            t.started_at + self.agent_timeout if t.started_at is not None
+            else max(t.submitted_at, last_progress) + self.queue_timeout
+            for t in tasks
+        ]
+        # Agents that start later have later deadlines, so agent_timeout bounds the wait
+        return max(0.0, min(deadlines + [now + self.agent_timeout]) - now)
+    
+    def _mark_hung(self, future: Future) -> None:
+        """Count a timed-out agent's worker as busy until the agent returns."""
+        with self._executor_lock:
+            self._hung.add(future)
+        future.add_done_callback(self._release_hung)
+    
+    def _release_hung(self, future: Future) -> None:
+        with self._executor_lock:
+            self._hung.discard(future)
+    
+    def _resubmit_on_new_pool(self, pending: Dict[Future, _AgentTask]) -> Dict[Future, _AgentTask]:
+        """
+        Replace a pool whose workers are all held by hung agents and move the
+        queued agents onto the new one.
+        
+        The old pool is shut down without waiting; its hung workers exit when
+        their agents return.
+        """
+        with self._executor_lock:
+            old, self._executor = self._executor, ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="ctrust-agent",
+            )
+            self._hung = set()
+            executor = self._executor
+        self._pool_replacements += 1
+        logger.warning(
+            f"All {self.max_workers} agent workers are held by timed-out agents; replacing the agent pool"
+        )
+        
+        moved: Dict[Future, _AgentTask] = {}
+        for future, task in pending.items():
+            if task.started_at is None and future.cancel():
+                task.submitted_at = time.monotonic()
+                task.future = executor.submit(task.run, task, task.features)
+                moved[task.future] = task
+            else:
+                moved[future] = task
+        if old is not None:
+            old.shutdown(wait=False)
+        return moved
+    
+    def _task_result(self, task: _AgentTask) -> AgentResult:
+        try:
+            return task.future.result()
+        except Exception as e:
+            return AgentResult(
+                agent_type=getattr(task.agent, 'agent_type', AgentType.SAFETY),
+                agent_name=task.agent_name,
+                signal=None,
+                processing_time_ms=0,
+                error=str(e),
+            )
+    
+    def _not_started_result(self, task: _AgentTask) -> AgentResult:
+        self._agents_not_started += 1
+        logger.warning(
+            f"Agent {task.agent_name} did not start within {self.queue_timeout:.0f}s for {task.study_id}; abstaining"
+        )
+        return AgentResult(
+            agent_type=getattr(task.agent, 'agent_type', AgentType.SAFETY),
+            agent_name=task.agent_name,
+            signal=None,
+            processing_time_ms=0,
+            abstained=True,
+        )
+    
+    def _timeout_result(self, task: _AgentTask, now: float) -> AgentResult:
+        self._agent_timeouts += 1
+        logger.warning(
+            f"Agent {task.agent_name} exceeded {self.agent_timeout:.0f}s deadline for {task.study_id}"
+        )
+        return AgentResult(
+            agent_type=getattr(task.agent, 'agent_type', AgentType.SAFETY),
+            agent_name=task.agent_name,
+            signal=None,
+            processing_time_ms=(now - task.started_at) * 1000,
+            error=f"Timed out after {self.agent_timeout:.0f}s",
+        )
     
     def _run_agents_sequential(
         self,
@@ -362,11 +695,25 @@ class AgentPipeline:
         results = []
         
         for name, agent in self.agents.items():
-            result = self._run_single_agent(name, agent, features, study_id)
+            result = self._run_traced_agent(name, agent, features, study_id)
             results.append(result)
         
         return results
     
+    def _run_traced_agent(
+        self,
+        name: str,
+        agent: Any,
+        features: Dict[str, Any],
+        study_id: str
+    ) -> AgentResult:
+        """Run a single agent inside a pipeline.agent span."""
+        with tracer.span("pipeline.agent", agent=name) as span:
+            result = self._run_single_agent(name, agent, features, study_id)
+            if result.error:
+                span.error = result.error
+        return result
+    
     def _run_single_agent(
         self,
         name: str,
@@ -430,7 +777,22 @@ class AgentPipeline:
             "avg_time_ms": self._total_time / max(self._execution_count, 1),
             "agent_count": len(self.agents),
             "guardian_enabled": self.enable_guardian,
+            "pool_workers": self.max_workers,
+            "agent_timeout_s": self.agent_timeout,
+            "agent_timeouts": self._agent_timeouts,
+            "agents_not_started": self._agents_not_started,
+            "pool_replacements": self._pool_replacements,
+            "hung_workers": len(self._hung),
+            "matrix_evaluations": self._matrix_evaluations,
         }
+    
+    def close(self) -> None:
+        """Shut down the agent pool (a later run creates a new one)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            self._hung = set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 # ========================================
@@ -451,6 +813,8 @@ def get_pipeline() -> AgentPipeline:
 def reset_pipeline() -> None:
     """Reset pipeline instance (for testing)."""
     global _pipeline_instance
+    if _pipeline_instance is not None:
+        _pipeline_instance.close()
     _pipeline_instance = None
 
 
@@ -30,10 +30,13 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Mapping, Optional, Type
 import copy
 import threading
 
+import numpy as np
+import pandas as pd
+
 from src.core import get_logger
 
 logger = get_logger(__name__)
@@ -155,6 +158,127 @@ class AgentSignal:
         }
 
 
+@dataclass
+class BatchAssessment:
+    """
+    Vectorized agent output for many studies (one array entry per study).
+
+    Attributes:
+        risk_scores: Risk score per study (1=LOW .. 4=CRITICAL)
+        confidence: Confidence per study
+        abstained: Whether the agent abstains for each study
+        severities: Evidence severity per feature, NaN where analyze()
+                    would not emit evidence for that feature (in evidence order)
+    """
+    risk_scores: np.ndarray
+    confidence: np.ndarray
+    abstained: np.ndarray
+    severities: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+# Batch risk_level labels indexed by risk score (0 = abstained/failed)
+BATCH_RISK_LEVELS = np.array([
+    RiskSignal.UNKNOWN.value,
+    RiskSignal.LOW.value,
+    RiskSignal.MEDIUM.value,
+    RiskSignal.HIGH.value,
+    RiskSignal.CRITICAL.value,
+], dtype=object)
+
+# Leading analyze_batch columns (severity_<feature> columns follow)
+BATCH_COLUMNS = ["risk_level", "confidence", "abstained", "failed", "features_analyzed"]
+
+
+# ========================================
+# FEATURE MATRIX
+# ========================================
+
+class FeatureMatrix:
+    """
+    Columnar features for many studies (studies × features).
+
+    A NaN cell or missing column means the feature is absent for that
+    study - the same as the key missing from its feature dictionary, so
+    analyze(matrix.row(study_id), study_id) is the per-study equivalent of
+    one row of analyze_batch(matrix).
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Initialize feature matrix.
+
+        Args:
+            frame: DataFrame indexed by study_id with one column per feature
+                   (non-numeric values are treated as absent)
+        """
+        self.frame = frame.apply(pd.to_numeric, errors="coerce").astype(float)
+        self._present = self.frame.notna()
+
+    @classmethod
+    def from_records(cls, studies: Mapping[str, Mapping[str, Any]]) -> 'FeatureMatrix':
+        """Build from a mapping of study_id -> feature dictionary."""
+        frame = pd.DataFrame.from_records(
+            [dict(features) for features in studies.values()],
+            index=list(studies),
+        )
+        return cls(frame)
+
+    @classmethod
+    def from_array(
+        cls,
+        values: np.ndarray,
+        feature_names: List[str],
+        study_ids: List[str]
+    ) -> 'FeatureMatrix':
+        """Build from a 2-D NumPy array (rows = studies, NaN = absent)."""
+        return cls(pd.DataFrame(values, index=study_ids, columns=feature_names))
+
+    @classmethod
+    def coerce(cls, features: Any) -> 'FeatureMatrix':
+        """Accept a FeatureMatrix, a DataFrame or a mapping of feature dictionaries."""
+        if isinstance(features, FeatureMatrix):
+            return features
+        if isinstance(features, pd.DataFrame):
+            return cls(features)
+        return cls.from_records(features)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def index(self) -> pd.Index:
+        return self.frame.index
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.frame.columns)
+
+    def has(self, name: str) -> np.ndarray:
+        """Whether each study has a value for the feature."""
+        if name not in self.frame.columns:
+            return np.zeros(len(self.frame), dtype=bool)
+        return self._present[name].to_numpy()
+
+    def get(self, name: str, default: float = np.nan) -> np.ndarray:
+        """Feature values, with default where the feature is absent (features.get)."""
+        if name not in self.frame.columns:
+            return np.full(len(self.frame), default, dtype=float)
+        values = self.frame[name].to_numpy(dtype=float)
+        return np.where(self._present[name].to_numpy(), values, default)
+
+    def count(self, names: List[str]) -> np.ndarray:
+        """Number of the given features present for each study."""
+        counts = np.zeros(len(self.frame), dtype=int)
+        for name in names:
+            counts += self.has(name)
+        return counts
+
+    def row(self, study_id: str) -> Dict[str, float]:
+        """Feature dictionary for one study (absent features omitted)."""
+        row = self.frame.loc[study_id]
+        return {name: float(value) for name, value in row.items() if not pd.isna(value)}
+
+
 # ========================================
 # BASE AGENT INTERFACE
 # ========================================
@@ -456,6 +580,220 @@ class BaseAgent(ABC):
             excess_ratio = (feature_value - threshold) / threshold
             return min(excess_ratio, 1.0)
 
+    # ----------------------------------------
+    # Batch evaluation
+    # ----------------------------------------
+
+    def analyze_batch(self, features: Any) -> pd.DataFrame:
+        """
+        Analyze many studies in one vectorized pass.
+
+        Row i gives the same result as analyze() on study i's feature
+        dictionary (see FeatureMatrix.row). Agents without a vectorized
+        _assess_batch fall back to calling analyze() per study.
+
+        Args:
+            features: FeatureMatrix, DataFrame (studies × features) or
+                      mapping of study_id -> feature dictionary
+
+        Returns:
+            DataFrame indexed by study_id with columns risk_level,
+            confidence, abstained, failed, features_analyzed and one
+            severity_<feature> column per evidence feature (NaN when no
+            evidence is emitted). failed marks studies where analyze()
+            raises (e.g. a severity outside [0, 1]).
+        """
+        matrix = FeatureMatrix.coerce(features)
+        assessment = self._assess_batch(matrix)
+
+        if assessment is None:
+            return self._analyze_rows(matrix)
+
+        abstained = np.asarray(assessment.abstained, dtype=bool)
+        confidence = np.asarray(assessment.confidence, dtype=float)
+        severities = {
+            name: np.where(abstained, np.nan, np.broadcast_to(values, abstained.shape))
+            for name, values in assessment.severities.items()
+        }
+
+        # FeatureEvidence / AgentSignal validation, vectorized
+        with np.errstate(invalid="ignore"):
+            failed = ~abstained & ~((confidence >= 0) & (confidence <= 1))
+            for values in severities.values():
+                failed |= ~np.isnan(values) & ~((values >= 0) & (values <= 1))
+        skipped = abstained | failed
+
+        risk_scores = np.where(skipped, 0, assessment.risk_scores).astype(int)
+        features_analyzed = np.where(skipped, 0, matrix.count(
+            getattr(self, "REQUIRED_FEATURES", []) + getattr(self, "OPTIONAL_FEATURES", [])
+        ))
+
+        result = pd.DataFrame({
+            "risk_level": BATCH_RISK_LEVELS[risk_scores],
+            "confidence": np.where(skipped, 0.0, confidence),
+            "abstained": abstained,
+            "failed": failed,
+            "features_analyzed": features_analyzed,
+        }, index=matrix.index)
+        for name, values in severities.items():
+            result[f"severity_{name}"] = np.where(failed, np.nan, values)
+
+        return result
+
+    def _assess_batch(self, matrix: FeatureMatrix) -> Optional[BatchAssessment]:
+        """
+        Vectorized equivalent of analyze() (override in subclasses).
+
+        Returns:
+            BatchAssessment, or None to fall back to per-study analyze()
+        """
+        return None
+
+    def _analyze_rows(self, matrix: FeatureMatrix) -> pd.DataFrame:
+        """Fallback for analyze_batch: run analyze() study by study."""
+        rows = []
+        for study_id in matrix.index:
+            try:
+                signal = self.analyze(matrix.row(study_id), study_id)
+            except Exception as e:
+                logger.debug(f"{self.agent_type.value} batch row {study_id} failed: {e}")
+                rows.append({
+                    "risk_level": RiskSignal.UNKNOWN.value,
+                    "confidence": 0.0,
+                    "abstained": False,
+                    "failed": True,
+                    "features_analyzed": 0,
+                })
+                continue
+
+            row = {
+                "risk_level": signal.risk_level.value,
+                "confidence": signal.confidence,
+                "abstained": signal.abstained,
+                "failed": False,
+                "features_analyzed": signal.features_analyzed,
+            }
+            for evidence in signal.evidence:
+                row[f"severity_{evidence.feature_name}"] = evidence.severity
+            rows.append(row)
+
+        frame = pd.DataFrame(rows, index=matrix.index)
+        return frame.reindex(
+            columns=BATCH_COLUMNS + [c for c in frame.columns if c not in BATCH_COLUMNS]
+        )
+
+    def _should_abstain_batch(
+        self,
+        matrix: FeatureMatrix,
+        required_features: List[str]
+    ) -> np.ndarray:
+        """Vectorized _should_abstain (absent and null are the same in a matrix)."""
+        missing = matrix.count(required_features) < len(required_features)
+        confidence = self._batch_confidence_with_partial_data(matrix, required_features)
+        return missing | (confidence < self.abstention_threshold)
+
+    def _batch_confidence_with_partial_data(
+        self,
+        matrix: FeatureMatrix,
+        required_features: List[str]
+    ) -> np.ndarray:
+        """
+        Vectorized _calculate_confidence_with_partial_data.
+
+        Sums run column by column in feature order so results match the
+        scalar version bit for bit.
+        """
+        n_rows = len(matrix)
+        if not required_features:
+            return np.zeros(n_rows)
+
+        # Same iteration order as features.items() on a matrix row
+        names = [name for name in matrix.columns if name in required_features]
+        present = [matrix.has(name) for name in names]
+        values = [matrix.get(name, 0.0) for name in names]
+        count = matrix.count(names)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            first = np.full(n_rows, np.nan)
+            total = np.zeros(n_rows)
+            for has, value in zip(present, values):
+                first = np.where(has & np.isnan(first), value, first)
+                total = np.where(has, total + value, total)
+            identical = np.ones(n_rows, dtype=bool)
+            for has, value in zip(present, values):
+                identical &= ~has | (value == first)
+
+            mean = total / count
+            squares = np.zeros(n_rows)
+            overflow = np.zeros(n_rows, dtype=bool)
+            for has, value in zip(present, values):
+                diff = value - mean
+                square = np.power(diff, 2)
+                # float ** 2 raises OverflowError in Python (caught -> 0.5)
+                overflow |= has & np.isinf(square) & np.isfinite(diff)
+                squares = np.where(has, squares + square, squares)
+            std_dev = np.power(squares / count, 0.5)
+            cv_score = np.minimum((std_dev / np.abs(mean)) / 0.5, 1.0)
+
+            variance_score = np.select(
+                [count < 2, identical, mean == 0, overflow],
+                [0.5, 0.0, 0.5, 0.5],
+                cv_score,
+            )
+            completeness = count / len(required_features)
+            confidence = (completeness * 0.7) + (variance_score * 0.3)
+
+        return np.where(count == 0, 0.0, np.minimum(np.maximum(confidence, 0.0), 1.0))
+
+    @staticmethod
+    def _batch_risk_scores(
+        values: np.ndarray,
+        thresholds: Dict[str, float],
+        inverted: bool = False
+    ) -> np.ndarray:
+        """
+        Vectorized worst-case threshold scoring (4=CRITICAL .. 1=LOW).
+
+        Higher values are worse (>= thresholds) unless inverted, in which
+        case lower values are worse (<= thresholds).
+        """
+        compare = np.less_equal if inverted else np.greater_equal
+        return np.select(
+            [
+                compare(values, thresholds["critical"]),
+                compare(values, thresholds["high"]),
+                compare(values, thresholds["medium"]),
+            ],
+            [4, 3, 2],
+            1,
+        )
+
+    @staticmethod
+    def _batch_severity(
+        values: np.ndarray,
+        threshold: float,
+        max_value: Optional[float] = None
+    ) -> np.ndarray:
+        """Vectorized _calculate_severity."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if max_value:
+                severity = np.minimum((values - threshold) / (max_value - threshold), 1.0)
+            else:
+                severity = np.minimum((values - threshold) / threshold, 1.0)
+        return np.where(values <= threshold, 0.0, severity)
+
+    @staticmethod
+    def _batch_deficit_severity(values: np.ndarray, threshold: float) -> np.ndarray:
+        """Vectorized severity for higher-is-better metrics (completion rates)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            severity = np.minimum((threshold - values) / threshold, 1.0)
+        return np.where(values >= threshold, 0.0, severity)
+
+    @staticmethod
+    def _batch_evidence(condition: np.ndarray, severity: Any) -> np.ndarray:
+        """Severity where analyze() would emit evidence, NaN elsewhere."""
+        return np.where(condition, severity, np.nan)
+
 
 # ========================================
 # AGENT REGISTRY AND ORCHESTRATION
@@ -705,6 +1043,8 @@ __all__ = [
     "RiskSignal",
     "FeatureEvidence",
     "AgentSignal",
+    "BatchAssessment",
+    "FeatureMatrix",
     "AgentRegistry",
     "AgentOrchestrator",
 ]
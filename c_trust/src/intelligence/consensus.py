@@ -29,9 +29,12 @@ Decision Matrix:
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import statistics
 
+import numpy as np
+import pandas as pd
+
 from src.core import get_logger
 from src.intelligence.base_agent import (
     AgentSignal,
@@ -149,6 +152,144 @@ class ConsensusDecision:
         }
 
 
+@dataclass
+class BatchConsensus:
+    """
+    Consensus decisions for many entities (studies or sites) as arrays.
+    
+    Scores, confidences, risk levels and actions are computed up front;
+    contributions, explanations and ConsensusDecision objects are only
+    built for an entity when asked for.
+    
+    Attributes:
+        entity_ids: Entity identifiers (row order)
+        agent_types: Agent type per column of the input arrays
+        risk_score: Weighted risk score per entity (0-100)
+        confidence: Participation-adjusted confidence per entity
+        risk_level: ConsensusRiskLevel value per entity
+        recommended_action: RecommendedAction value per entity
+        active_agents: Agents contributing to each decision
+        total_agents: Agents that produced a signal (active + abstained)
+        failed: Entities whose score is outside [0, 100] (e.g. from
+                negative weights); calculate_consensus raises for these
+    """
+    entity_ids: List[str]
+    agent_types: List[AgentType]
+    risk_score: np.ndarray
+    confidence: np.ndarray
+    risk_level: np.ndarray
+    recommended_action: np.ndarray
+    active_agents: np.ndarray
+    total_agents: np.ndarray
+    failed: np.ndarray
+    timestamp: datetime = field(default_factory=datetime.now)
+    
+    # Inputs kept for lazy explanations
+    _engine: Optional['ConsensusEngine'] = field(default=None, repr=False)
+    _agent_scores: Optional[np.ndarray] = field(default=None, repr=False)
+    _agent_confidences: Optional[np.ndarray] = field(default=None, repr=False)
+    _active: Optional[np.ndarray] = field(default=None, repr=False)
+    _present: Optional[np.ndarray] = field(default=None, repr=False)
+    _abstention_reasons: Optional[np.ndarray] = field(default=None, repr=False)
+    _positions: Optional[Dict[str, int]] = field(default=None, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.entity_ids)
+    
+    def _position(self, entity_id: str) -> int:
+        if self._positions is None:
+            self._positions = {eid: i for i, eid in enumerate(self.entity_ids)}
+        return self._positions[entity_id]
+    
+    def contributions(self, entity_id: str) -> List[AgentContribution]:
+        """Agent contributions for one entity (active first, then abstained)."""
+        i = self._position(entity_id)
+        sufficient = self.active_agents[i] >= ConsensusEngine.MIN_ACTIVE_AGENTS
+        weights = [self._engine.weights.get(t, 1.0) for t in self.agent_types]
+        active, abstained = [], []
+        
+        for j, agent_type in enumerate(self.agent_types):
+            if not self._present[i, j]:
+                continue
+            raw_score = self._agent_scores[i, j]
+            if self._active[i, j]:
+                confidence = float(self._agent_confidences[i, j])
+                active.append(AgentContribution(
+                    agent_type=agent_type,
+                    raw_signal=ConsensusEngine.SCORE_SIGNALS.get(raw_score, RiskSignal.UNKNOWN),
+                    weight=weights[j],
+                    weighted_score=raw_score * (weights[j] * confidence) if sufficient else 0.0,
+                    confidence=confidence,
+                    abstained=False,
+                ))
+            else:
+                abstained.append(AgentContribution(
+                    agent_type=agent_type,
+                    raw_signal=RiskSignal.UNKNOWN,
+                    weight=weights[j],
+                    weighted_score=0.0,
+                    confidence=0.0,
+                    abstained=True,
+                ))
+        
+        return active + abstained
+    
+    def explanation(self, entity_id: str) -> str:
+        """Human-readable explanation for one entity (built on demand)."""
+        i = self._position(entity_id)
+        contributions = self.contributions(entity_id)
+        
+        if self.total_agents[i] == 0:
+            return ConsensusEngine.NO_SIGNALS_EXPLANATION
+        if self.active_agents[i] < ConsensusEngine.MIN_ACTIVE_AGENTS:
+            return self._engine._insufficient_data_explanation(contributions)
+        
+        reasons = []
+        if self._abstention_reasons is not None:
+            reasons = [
+                (agent_type, self._abstention_reasons[i, j])
+                for j, agent_type in enumerate(self.agent_types)
+                if self._present[i, j] and not self._active[i, j]
+            ]
+        
+        return self._engine._generate_explanation_with_abstentions(
+            ConsensusRiskLevel(self.risk_level[i]),
+            float(self.confidence[i]),
+            contributions,
+            float(self.risk_score[i]),
+            reasons,
+        )
+    
+    def decision(self, entity_id: str) -> ConsensusDecision:
+        """Full ConsensusDecision for one entity."""
+        i = self._position(entity_id)
+        contributions = self.contributions(entity_id)
+        return ConsensusDecision(
+            risk_level=ConsensusRiskLevel(self.risk_level[i]),
+            confidence=float(self.confidence[i]),
+            risk_score=float(self.risk_score[i]),
+            contributing_agents=contributions,
+            recommended_action=RecommendedAction(self.recommended_action[i]),
+            explanation=self.explanation(entity_id),
+            timestamp=self.timestamp,
+            total_agents=int(self.total_agents[i]),
+            abstained_agents=int(self.total_agents[i] - self.active_agents[i]),
+            study_id=entity_id,
+        )
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Per-entity results as a DataFrame (no explanations)."""
+        return pd.DataFrame({
+            "risk_level": self.risk_level,
+            "risk_score": self.risk_score,
+            "confidence": self.confidence,
+            "recommended_action": self.recommended_action,
+            "active_agents": self.active_agents,
+            "total_agents": self.total_agents,
+            "failed": self.failed,
+        }, index=pd.Index(self.entity_ids, name="entity_id"))
+
+
 # ========================================
 # CONSENSUS ENGINE
 # ========================================
@@ -191,6 +332,11 @@ class ConsensusEngine:
         RiskSignal.UNKNOWN: 0.0,  # Abstained agents don't contribute
     }
     
+    # Numeric score back to risk signal (batch contributions)
+    SCORE_SIGNALS: Dict[float, RiskSignal] = {
+        score: signal for signal, score in RISK_SCORES.items()
+    }
+    
     # Risk thresholds for classification
     RISK_THRESHOLDS: Dict[str, float] = {
         "critical": 85.0,
@@ -198,6 +344,14 @@ class ConsensusEngine:
         "medium": 40.0,
     }
     
+    # Minimum active (non-abstained) agents for a consensus
+    MIN_ACTIVE_AGENTS = 3
+    
+    # Confidence at or above which high-risk decisions escalate
+    HIGH_CONFIDENCE = 0.7
+    
+    NO_SIGNALS_EXPLANATION = "No agent signals available for consensus"
+    
     def __init__(
         self,
         custom_weights: Optional[Dict[AgentType, float]] = None,
@@ -258,7 +412,7 @@ class ConsensusEngine:
             )
         
         # Require minimum 3 active agents for reliable consensus
-        if len(active_signals) < 3:
+        if len(active_signals) < self.MIN_ACTIVE_AGENTS:
             logger.warning(
                 f"Study {study_id}: Only {len(active_signals)} active agents, "
                 f"minimum 3 required for consensus"
@@ -329,7 +483,7 @@ class ConsensusEngine:
         # Generate explanation with abstention information
         explanation = self._generate_explanation_with_abstentions(
             risk_level, adjusted_confidence, contributions, risk_score,
-            active_signals, abstained_signals
+            [(s.agent_type, s.abstention_reason) for s in abstained_signals],
         )
         
         decision = ConsensusDecision(
@@ -352,6 +506,170 @@ class ConsensusEngine:
         
         return decision
     
+    def calculate_consensus_batch(
+        self,
+        risk_scores: np.ndarray,
+        confidences: np.ndarray,
+        abstained: np.ndarray,
+        agent_types: Sequence[AgentType],
+        entity_ids: Optional[Sequence[str]] = None,
+        abstention_reasons: Optional[np.ndarray] = None,
+    ) -> BatchConsensus:
+        """
+        Calculate consensus for many entities at once with array operations.
+        
+        Applies the same rules as calculate_consensus (minimum active
+        agents, confidence-weighted scores, agreement/coverage confidence,
+        participation adjustment, risk/action matrix) to every row. Weighted
+        sums run agent by agent in column order, so risk scores are
+        identical to the per-entity result; explanations are built lazily
+        (BatchConsensus.explanation / decision).
+        
+        Args:
+            risk_scores: (entities × agents) scores on the RISK_SCORES scale;
+                         NaN where an agent produced no signal
+            confidences: (entities × agents) agent confidences
+            abstained: (entities × agents) abstention mask
+            agent_types: Agent type of each column
+            entity_ids: Row identifiers (defaults to "0", "1", ...)
+            abstention_reasons: (entities × agents) AgentSignal.abstention_reason
+                         values (None where there is none), quoted in explanations
+        
+        Returns:
+            BatchConsensus
+        """
+        scores = np.asarray(risk_scores, dtype=float)
+        confidences = np.asarray(confidences, dtype=float)
+        abstained = np.asarray(abstained, dtype=bool)
+        agent_types = list(agent_types)
+        n_entities = scores.shape[0]
+        
+        if scores.ndim != 2 or scores.shape != confidences.shape or scores.shape != abstained.shape:
+            raise ValueError("risk_scores, confidences and abstained must be (entities × agents) arrays")
+        if scores.shape[1] != len(agent_types):
+            raise ValueError(f"Expected {scores.shape[1]} agent types, got {len(agent_types)}")
+        if abstention_reasons is not None:
+            abstention_reasons = np.asarray(abstention_reasons, dtype=object)
+            if abstention_reasons.shape != scores.shape:
+                raise ValueError("abstention_reasons must be an (entities × agents) array")
+        
+        if entity_ids is None:
+            entity_ids = [str(i) for i in range(n_entities)]
+        entity_ids = list(entity_ids)
+        
+        present = ~np.isnan(scores)
+        active = present & ~abstained
+        total_agents = present.sum(axis=1)
+        active_agents = active.sum(axis=1)
+        
+        # Weighted risk score (sequential sums, same order as the per-entity loop)
+        total_weighted_score = np.zeros(n_entities)
+        total_weight = np.zeros(n_entities)
+        score_sum = np.zeros(n_entities)
+        score_sq_sum = np.zeros(n_entities)
+        confidence_sum = np.zeros(n_entities)
+        first_score = np.full(n_entities, np.nan)
+        agreement = np.ones(n_entities, dtype=bool)
+        
+        for j, agent_type in enumerate(agent_types):
+            is_active = active[:, j]
+            raw_score = np.where(is_active, scores[:, j], 0.0)
+            confidence = np.where(is_active, confidences[:, j], 0.0)
+            effective_weight = self.weights.get(agent_type, 1.0) * confidence
+            
+            total_weighted_score = np.where(
+                is_active, total_weighted_score + raw_score * effective_weight, total_weighted_score
+            )
+            total_weight = np.where(is_active, total_weight + effective_weight, total_weight)
+            
+            confidence_sum += confidence
+            score_sum += raw_score
+            score_sq_sum += raw_score * raw_score
+            first_score = np.where(is_active & np.isnan(first_score), raw_score, first_score)
+            agreement &= ~is_active | (raw_score == first_score)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            risk_score = np.where(total_weight > 0, total_weighted_score / total_weight, 0.0)
+            
+            # Agreement: 1 - normalized sample variance of active risk scores
+            n = active_agents.astype(float)
+            variance = (n * score_sq_sum - score_sum * score_sum) / (n * (n - 1))
+            agreement_factor = np.where(
+                agreement, 1.0, 1.0 - np.minimum(variance / 1875.0, 1.0)
+            )
+            avg_confidence = confidence_sum / n
+            coverage_factor = np.minimum(n / 3.0, 1.0)
+            base_confidence = np.clip(
+                avg_confidence * 0.4 + agreement_factor * 0.4 + coverage_factor * 0.2, 0.0, 1.0
+            )
+            participation_rate = active_agents / total_agents
+            adjusted_confidence = base_confidence * participation_rate
+        
+        risk_level = np.select(
+            [
+                risk_score >= self.thresholds["critical"],
+                risk_score >= self.thresholds["high"],
+                risk_score >= self.thresholds["medium"],
+            ],
+            [
+                ConsensusRiskLevel.CRITICAL.value,
+                ConsensusRiskLevel.HIGH.value,
+                ConsensusRiskLevel.MEDIUM.value,
+            ],
+            ConsensusRiskLevel.LOW.value,
+        ).astype(object)
+        
+        high_confidence = adjusted_confidence >= self.HIGH_CONFIDENCE
+        action = np.select(
+            [
+                risk_level == ConsensusRiskLevel.CRITICAL.value,
+                (risk_level == ConsensusRiskLevel.HIGH.value) & high_confidence,
+                risk_level == ConsensusRiskLevel.HIGH.value,
+                (risk_level == ConsensusRiskLevel.MEDIUM.value) & high_confidence,
+                risk_level == ConsensusRiskLevel.MEDIUM.value,
+            ],
+            [
+                RecommendedAction.IMMEDIATE_ESCALATION.value,
+                RecommendedAction.IMMEDIATE_ESCALATION.value,
+                RecommendedAction.HUMAN_REVIEW_REQUIRED.value,
+                RecommendedAction.PRIORITIZE_FOR_ACTION.value,
+                RecommendedAction.MONITOR_CLOSELY.value,
+            ],
+            RecommendedAction.ROUTINE_MONITORING.value,
+        ).astype(object)
+        
+        # Too few active agents (or no signals at all): UNKNOWN, human review
+        sufficient = active_agents >= self.MIN_ACTIVE_AGENTS
+        failed = sufficient & ~((risk_score >= 0) & (risk_score <= 100))
+        decided = sufficient & ~failed
+        
+        result = BatchConsensus(
+            entity_ids=entity_ids,
+            agent_types=agent_types,
+            risk_score=np.where(sufficient, risk_score, 0.0),
+            confidence=np.where(decided, adjusted_confidence, 0.0),
+            risk_level=np.where(decided, risk_level, ConsensusRiskLevel.UNKNOWN.value),
+            recommended_action=np.where(
+                decided, action, RecommendedAction.HUMAN_REVIEW_REQUIRED.value
+            ),
+            active_agents=active_agents,
+            total_agents=total_agents,
+            failed=failed,
+            _engine=self,
+            _agent_scores=scores,
+            _agent_confidences=confidences,
+            _active=active,
+            _present=present,
+            _abstention_reasons=abstention_reasons,
+        )
+        
+        logger.info(
+            f"Batch consensus for {n_entities} entities: "
+            f"{int(sufficient.sum())} decided, {int((~sufficient).sum())} insufficient data"
+        )
+        
+        return result
+    
     def _calculate_confidence(self, signals: List[AgentSignal]) -> float:
         """
         Calculate confidence based on agent agreement.
@@ -434,7 +752,7 @@ class ConsensusEngine:
         | Medium     | Low        | Monitor Closely           |
         | Low        | Any        | Routine Monitoring        |
         """
-        high_confidence = confidence >= 0.7
+        high_confidence = confidence >= self.HIGH_CONFIDENCE
         
         if risk_level == ConsensusRiskLevel.CRITICAL:
             return RecommendedAction.IMMEDIATE_ESCALATION
@@ -499,14 +817,14 @@ class ConsensusEngine:
         confidence: float,
         contributions: List[AgentContribution],
         risk_score: float,
-        active_signals: List[AgentSignal],
-        abstained_signals: List[AgentSignal],
+        abstention_reasons: List[Tuple[AgentType, Optional[str]]],
     ) -> str:
         """
         Generate enhanced explanation including abstention details.
         
         This provides more context about why agents abstained and how
-        that affected the consensus decision.
+        that affected the consensus decision. abstention_reasons holds
+        (agent_type, reason) for each abstained agent, in signal order.
         """
         active = [c for c in contributions if not c.abstained]
         abstained = [c for c in contributions if c.abstained]
@@ -514,7 +832,9 @@ class ConsensusEngine:
         # Build explanation
         parts = [
             f"Risk Level: {risk_level.value.upper()} (score: {risk_score:.1f}/100)",
-            f"Confidence: {confidence:.0%}",
+            # Rounded first so batch and per-entity confidences (equal to ~1e-16,
+            # summed in different orders) always print the same percentage
+            f"Confidence: {round(confidence, 9):.0%}",
             f"Active Agents: {len(active)}/{len(contributions)}",
         ]
         
@@ -530,12 +850,12 @@ class ConsensusEngine:
             parts.append(f"Abstained: {abstained_names}")
             
             # Add abstention reasons if available
-            if abstained_signals:
+            if abstention_reasons:
                 reasons = []
-                for signal in abstained_signals[:2]:  # Show first 2 reasons
-                    if signal.abstention_reason:
-                        short_reason = signal.abstention_reason.split('.')[0][:50]
-                        reasons.append(f"{signal.agent_type.value}: {short_reason}")
+                for agent_type, reason in abstention_reasons[:2]:  # Show first 2 reasons
+                    if reason:
+                        short_reason = reason.split('.')[0][:50]
+                        reasons.append(f"{agent_type.value}: {short_reason}")
                 if reasons:
                     parts.append(f"Reasons: {'; '.join(reasons)}")
         
@@ -587,28 +907,30 @@ class ConsensusEngine:
                 abstained=True,
             ))
         
-        active_names = [s.agent_type.value for s in active_signals]
-        abstained_names = [s.agent_type.value for s in abstained_signals]
-        
-        explanation = (
-            f"Insufficient data for consensus: Only {len(active_signals)} of {len(all_signals)} "
-            f"agents provided signals (minimum 3 required). "
-            f"Active: {', '.join(active_names)}. "
-            f"Abstained: {', '.join(abstained_names)}."
-        )
-        
         return ConsensusDecision(
             risk_level=ConsensusRiskLevel.UNKNOWN,
             confidence=0.0,
             risk_score=0.0,
             contributing_agents=contributions,
             recommended_action=RecommendedAction.HUMAN_REVIEW_REQUIRED,
-            explanation=explanation,
+            explanation=self._insufficient_data_explanation(contributions),
             total_agents=len(all_signals),
             abstained_agents=len(abstained_signals),
             study_id=study_id,
         )
     
+    def _insufficient_data_explanation(self, contributions: List[AgentContribution]) -> str:
+        """Explanation for a decision with fewer than MIN_ACTIVE_AGENTS active agents."""
+        active_names = [c.agent_type.value for c in contributions if not c.abstained]
+        abstained_names = [c.agent_type.value for c in contributions if c.abstained]
+        
+        return (
+            f"Insufficient data for consensus: Only {len(active_names)} of {len(contributions)} "
+            f"agents provided signals (minimum {self.MIN_ACTIVE_AGENTS} required). "
+            f"Active: {', '.join(active_names)}. "
+            f"Abstained: {', '.join(abstained_names)}."
+        )
+    
     def _create_unknown_decision(
         self,
         study_id: Optional[str],
@@ -620,7 +942,7 @@ class ConsensusEngine:
             risk_score=0.0,
             contributing_agents=[],
             recommended_action=RecommendedAction.HUMAN_REVIEW_REQUIRED,
-            explanation="No agent signals available for consensus",
+            explanation=self.NO_SIGNALS_EXPLANATION,
             total_agents=0,
             abstained_agents=0,
             study_id=study_id,
@@ -733,6 +1055,40 @@ class RiskAssessmentEngine:
         )
         return decision
     
+    def assess_sites_batch(
+        self,
+        risk_scores: np.ndarray,
+        confidences: np.ndarray,
+        abstained: np.ndarray,
+        agent_types: Sequence[AgentType],
+        study_id: str,
+        site_ids: Sequence[str],
+        abstention_reasons: Optional[np.ndarray] = None,
+    ) -> BatchConsensus:
+        """
+        Assess risk for all sites of a study in one batch.
+        
+        Args:
+            risk_scores: (sites × agents) scores, NaN where no signal
+            confidences: (sites × agents) agent confidences
+            abstained: (sites × agents) abstention mask
+            agent_types: Agent type of each column
+            study_id: Study identifier
+            site_ids: Site identifier per row
+            abstention_reasons: (sites × agents) abstention reasons, None where absent
+        
+        Returns:
+            BatchConsensus keyed by "<study_id>/<site_id>"
+        """
+        return self.consensus.calculate_consensus_batch(
+            risk_scores,
+            confidences,
+            abstained,
+            agent_types,
+            entity_ids=[f"{study_id}/{site_id}" for site_id in site_ids],
+            abstention_reasons=abstention_reasons,
+        )
+    
     def prioritize_risks(
         self,
         decisions: List[ConsensusDecision],
@@ -797,6 +1153,7 @@ __all__ = [
     "ConsensusEngine",
     "RiskAssessmentEngine",
     "ConsensusDecision",
+    "BatchConsensus",
     "AgentContribution",
     "ConsensusRiskLevel",
     "RecommendedAction",
@@ -15,7 +15,10 @@ from src.notifications.notification_engine import (
     NotificationType,
     NotificationPriority,
     NotificationStatus,
+    get_notification_engine,
 )
+from src.notifications.inbox import UserInbox, InboxItem, InboxPage
+from src.notifications.delivery_dispatcher import DeliveryDispatcher
 
 from src.notifications.user_action_capture import (
     UserActionCaptureSystem,
@@ -38,6 +41,11 @@ __all__ = [
     "NotificationType",
     "NotificationPriority",
     "NotificationStatus",
+    "get_notification_engine",
+    "UserInbox",
+    "InboxItem",
+    "InboxPage",
+    "DeliveryDispatcher",
     # User Action Capture
     "UserActionCaptureSystem",
     "UserAction",
@@ -0,0 +1,170 @@
+"""
+C-TRUST Notification Delivery Dispatcher
+========================================
+Runs notification delivery callbacks off the routing thread.
+
+NotificationRoutingEngine hands each routed batch of deliveries to the
+dispatcher in one call. A single background thread coalesces whatever
+batches are queued (up to ``batch_size`` deliveries) and runs:
+- batch callbacks once per coalesced batch, with the list of deliveries;
+- per-delivery callbacks once per delivery, in delivery order.
+
+Routing a burst of alerts therefore costs one queue put instead of
+(recipients x callbacks) synchronous calls, and a slow consumer (e.g. a
+WebSocket push hub) no longer holds up routing.
+
+Usage:
+    dispatcher = DeliveryDispatcher(batch_callbacks, delivery_callbacks)
+    dispatcher.submit(deliveries)
+    dispatcher.flush()   # wait until every submitted delivery has been dispatched
+    dispatcher.close()   # drain and stop
+"""
+
+import atexit
+import queue
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core import get_logger
+from src.core.settings import settings
+
+logger = get_logger(__name__)
+
+
+_STOP = object()
+
+
+class DeliveryDispatcher:
+    """
+    Background batch dispatcher for delivery callbacks.
+
+    The callback lists are read at dispatch time, so callbacks registered
+    after the dispatcher is created are picked up. The worker thread is
+    started on the first submit.
+    """
+
+    def __init__(
+        self,
+        batch_callbacks: List[Callable[[List[Any]], None]],
+        delivery_callbacks: List[Callable[[Any], None]],
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            batch_callbacks: Callbacks taking a list of deliveries
+            delivery_callbacks: Callbacks taking one delivery
+            batch_size: Maximum deliveries per dispatched batch
+                (defaults to settings.NOTIFICATION_CALLBACK_BATCH_SIZE)
+        """
+        self.batch_callbacks = batch_callbacks
+        self.delivery_callbacks = delivery_callbacks
+        self.batch_size = batch_size or getattr(settings, 'NOTIFICATION_CALLBACK_BATCH_SIZE', 1000)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._progress = Condition()
+        self._start_lock = Lock()
+        self._submitted = 0
+        self._dispatched = 0
+        self._thread: Optional[Thread] = None
+        self._closed = False
+
+        self.stats: Dict[str, int] = {"deliveries": 0, "batches": 0, "errors": 0}
+
+    def submit(self, deliveries: List[Any]) -> None:
+        """Queue deliveries for the callbacks (never blocks)."""
+        if not deliveries:
+            return
+        if self._closed:
+            raise RuntimeError("DeliveryDispatcher is closed")
+        self._ensure_started()
+        with self._progress:
+            self._submitted += len(deliveries)
+        self._queue.put(list(deliveries))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every delivery submitted before the call has been dispatched.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._progress:
+            target = self._submitted
+            return self._progress.wait_for(lambda: self._dispatched >= target, timeout=timeout)
+
+    @property
+    def pending(self) -> int:
+        """Deliveries submitted but not yet dispatched."""
+        with self._progress:
+            return self._submitted - self._dispatched
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Dispatch what is queued and stop the worker. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            try:
+                atexit.unregister(self.close)
+            except Exception:
+                pass
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="notification-callbacks", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            if batch is _STOP:
+                return
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is _STOP:
+                    stop = True
+                    break
+                batch.extend(more)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[Any]) -> None:
+        for callback in list(self.batch_callbacks):
+            try:
+                callback(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Batch delivery callback error: {e}")
+        for callback in list(self.delivery_callbacks):
+            for delivery in batch:
+                try:
+                    callback(delivery)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(f"Delivery callback error: {e}")
+
+        self.stats["deliveries"] += len(batch)
+        self.stats["batches"] += 1
+        with self._progress:
+            self._dispatched += len(batch)
+            self._progress.notify_all()
+
+
+__all__ = ["DeliveryDispatcher"]
@@ -0,0 +1,353 @@
+"""
+C-TRUST Notification Inbox
+==========================
+Per-user indexed inbox for notification deliveries.
+
+Each user's deliveries are kept in per-priority queues ordered by delivery
+sequence, split by state (unacknowledged/acknowledged x active/expired):
+- listing walks CRITICAL -> LOW and stops after ``limit`` items, so the
+  result is already in (priority, age) order without sorting;
+- unread and pending-acknowledgment counts are maintained counters;
+- expiry is lazy: a heap ordered by expires_at is popped on access and
+  moves only the deliveries that actually expired;
+- pages are addressed by keyset cursors on (priority, sequence), which
+  stay valid while new deliveries arrive.
+
+Usage:
+    inbox = UserInbox("CRA_01")
+    inbox.add(delivery, notification)
+    page = inbox.page(limit=50, unread_only=True)
+    page.items, page.next_cursor, inbox.unread_count
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from src.notifications.notification_engine import Notification, UserNotificationDelivery
+
+
+# Priority values in delivery order (most urgent first); unknown priorities sort last
+PRIORITY_ORDER = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+_PRIORITY_RANK = {p: i for i, p in enumerate(PRIORITY_ORDER)}
+
+# (acknowledged, expired)
+_STATES = ((False, False), (True, False), (False, True), (True, True))
+
+
+def _rank(priority: Any) -> int:
+    return _PRIORITY_RANK.get(getattr(priority, "value", priority), len(PRIORITY_ORDER))
+
+
+@dataclass
+class InboxItem:
+    """A delivery in a user's inbox with its notification."""
+    seq: int
+    delivery: "UserNotificationDelivery"
+    notification: "Notification"
+    acknowledged: bool = False
+    expired: bool = False
+
+    @property
+    def rank(self) -> int:
+        return _rank(self.notification.priority)
+
+    @property
+    def state(self) -> Tuple[bool, bool]:
+        return (self.acknowledged, self.expired)
+
+
+@dataclass
+class InboxPage:
+    """One page of an inbox listing."""
+    items: List[InboxItem]
+    next_cursor: Optional[str]
+    total: Optional[int] = None  # None when a filter makes the count non-O(1)
+
+
+def encode_inbox_cursor(item: InboxItem) -> str:
+    return f"{item.rank}.{item.seq}"
+
+
+def decode_inbox_cursor(cursor: str) -> Tuple[int, int]:
+    """(priority rank, sequence) of the last item on the previous page."""
+    try:
+        rank, seq = cursor.split(".")
+        rank, seq = int(rank), int(seq)
+    except ValueError:
+        raise ValueError(f"Malformed notification cursor: {cursor!r}")
+    if not 0 <= rank <= len(PRIORITY_ORDER) or seq < 0:
+        raise ValueError(f"Malformed notification cursor: {cursor!r}")
+    return rank, seq
+
+
+class _Bucket:
+    """Items kept sorted by sequence number."""
+
+    __slots__ = ("seqs", "items")
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.items: Dict[int, InboxItem] = {}
+
+    def add(self, item: InboxItem) -> None:
+        if not self.seqs or self.seqs[-1] < item.seq:
+            self.seqs.append(item.seq)
+        else:
+            insort(self.seqs, item.seq)
+        self.items[item.seq] = item
+
+    def remove(self, item: InboxItem) -> None:
+        del self.seqs[bisect_left(self.seqs, item.seq)]
+        del self.items[item.seq]
+
+    def iter_after(self, seq: int) -> Iterator[InboxItem]:
+        for position in range(bisect_right(self.seqs, seq), len(self.seqs)):
+            yield self.items[self.seqs[position]]
+
+    def __len__(self) -> int:
+        return len(self.seqs)
+
+
+class UserInbox:
+    """
+    Indexed deliveries of a single user.
+
+    Thread-safe. Deliveries must be changed through the inbox (mark_read,
+    acknowledge) for the counters to stay correct.
+    """
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._buckets: Dict[Tuple[bool, bool], List[_Bucket]] = {
+            state: [_Bucket() for _ in range(len(PRIORITY_ORDER) + 1)] for state in _STATES
+        }
+        self._by_delivery: Dict[str, InboxItem] = {}
+        self._by_notification: Dict[str, InboxItem] = {}
+        self._expiry: List[Tuple[datetime, int, str]] = []
+        self._unread = 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, delivery: "UserNotificationDelivery", notification: "Notification") -> InboxItem:
+        """Add a delivery (O(1) amortized; O(log n) with an expiry time)."""
+        return self.add_many([(delivery, notification)])[0]
+
+    def add_many(self, entries: List[Tuple["UserNotificationDelivery", "Notification"]]) -> List[InboxItem]:
+        """Add (delivery, notification) pairs in order under one lock acquisition."""
+        with self._lock:
+            items = [self._add_locked(delivery, notification) for delivery, notification in entries]
+            self._expire_locked(datetime.now())
+            return items
+
+    def _add_locked(self, delivery: "UserNotificationDelivery", notification: "Notification") -> InboxItem:
+        self._seq += 1
+        item = InboxItem(
+            seq=self._seq,
+            delivery=delivery,
+            notification=notification,
+            acknowledged=delivery.acknowledged_at is not None,
+        )
+        self._bucket(item).add(item)
+        self._by_delivery[delivery.delivery_id] = item
+        self._by_notification[notification.notification_id] = item
+        if not item.acknowledged and delivery.read_at is None:
+            self._unread += 1
+        if notification.expires_at is not None:
+            heapq.heappush(self._expiry, (notification.expires_at, item.seq, delivery.delivery_id))
+        return item
+
+    def mark_read(self, delivery_id: str, read_at: Optional[datetime] = None) -> bool:
+        """Set read_at on a delivery. Returns False if it is not in this inbox."""
+        with self._lock:
+            item = self._by_delivery.get(delivery_id)
+            if item is None:
+                return False
+            if item.delivery.read_at is None and item.state == (False, False):
+                self._unread -= 1
+            item.delivery.read_at = read_at or datetime.now()
+            return True
+
+    def acknowledge(
+        self,
+        delivery_id: str,
+        action_taken: Optional[str] = None,
+        comment: Optional[str] = None,
+        acknowledged_at: Optional[datetime] = None,
+    ) -> bool:
+        """Record an acknowledgment and move the delivery out of the pending queues."""
+        with self._lock:
+            item = self._by_delivery.get(delivery_id)
+            if item is None:
+                return False
+            delivery = item.delivery
+            delivery.acknowledged_at = acknowledged_at or datetime.now()
+            delivery.action_taken = action_taken
+            delivery.comment = comment
+            if not item.acknowledged:
+                if not item.expired and delivery.read_at is None:
+                    self._unread -= 1
+                self._move(item, acknowledged=True, expired=item.expired)
+            return True
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Move deliveries whose notification expired. Returns number moved."""
+        with self._lock:
+            return self._expire_locked(now or datetime.now())
+
+    def _expire_locked(self, now: datetime) -> int:
+        moved = 0
+        while self._expiry and self._expiry[0][0] < now:
+            _, _, delivery_id = heapq.heappop(self._expiry)
+            item = self._by_delivery.get(delivery_id)
+            if item is None or item.expired:
+                continue
+            if not item.acknowledged and item.delivery.read_at is None:
+                self._unread -= 1
+            self._move(item, acknowledged=item.acknowledged, expired=True)
+            moved += 1
+        return moved
+
+    def _bucket(self, item: InboxItem) -> _Bucket:
+        return self._buckets[item.state][item.rank]
+
+    def _move(self, item: InboxItem, acknowledged: bool, expired: bool) -> None:
+        self._bucket(item).remove(item)
+        item.acknowledged = acknowledged
+        item.expired = expired
+        self._bucket(item).add(item)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, delivery_id: str) -> Optional[InboxItem]:
+        return self._by_delivery.get(delivery_id)
+
+    def get_by_notification(self, notification_id: str) -> Optional[InboxItem]:
+        """Latest delivery of a notification to this user."""
+        return self._by_notification.get(notification_id)
+
+    @property
+    def unread_count(self) -> int:
+        """Active (unexpired), unacknowledged deliveries not yet read."""
+        with self._lock:
+            self._expire_locked(datetime.now())
+            return self._unread
+
+    @property
+    def pending_count(self) -> int:
+        """Active (unexpired) deliveries awaiting acknowledgment."""
+        with self._lock:
+            self._expire_locked(datetime.now())
+            return sum(len(b) for b in self._buckets[(False, False)])
+
+    def __len__(self) -> int:
+        return len(self._by_delivery)
+
+    def _states(self, include_acknowledged: bool, include_expired: bool) -> List[Tuple[bool, bool]]:
+        return [
+            (acked, expired) for acked, expired in _STATES
+            if (include_acknowledged or not acked) and (include_expired or not expired)
+        ]
+
+    def iter_items(
+        self,
+        include_acknowledged: bool = False,
+        include_expired: bool = False,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[InboxItem]:
+        """
+        Items in (priority, delivery order), starting after a cursor position.
+
+        Takes a snapshot of the matching items when called, so the inbox
+        may change while the result is consumed.
+        """
+        with self._lock:
+            self._expire_locked(datetime.now())
+            states = self._states(include_acknowledged, include_expired)
+            start_rank, start_seq = after if after is not None else (0, 0)
+            per_rank = []
+            for rank in range(start_rank, len(PRIORITY_ORDER) + 1):
+                after_seq = start_seq if rank == start_rank else 0
+                sources = [self._buckets[state][rank].iter_after(after_seq) for state in states]
+                per_rank.append(list(heapq.merge(*sources, key=lambda item: item.seq)))
+        for items in per_rank:
+            yield from items
+
+    def page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_acknowledged: bool = False,
+        include_expired: bool = False,
+        unread_only: bool = False,
+        predicate: Optional[Callable[[InboxItem], bool]] = None,
+    ) -> InboxPage:
+        """
+        One page of the inbox in (priority, delivery order).
+
+        Only the items on the page (plus one to detect the next page) are
+        visited unless filters skip items.
+        """
+        after = decode_inbox_cursor(cursor) if cursor else None
+        with self._lock:
+            self._expire_locked(datetime.now())
+            states = self._states(include_acknowledged, include_expired)
+            start_rank, start_seq = after if after is not None else (0, 0)
+            result: List[InboxItem] = []
+            more = False
+            for rank in range(start_rank, len(PRIORITY_ORDER) + 1):
+                after_seq = start_seq if rank == start_rank else 0
+                sources = [self._buckets[state][rank].iter_after(after_seq) for state in states]
+                for item in heapq.merge(*sources, key=lambda i: i.seq):
+                    if unread_only and item.delivery.read_at is not None:
+                        continue
+                    if predicate is not None and not predicate(item):
+                        continue
+                    if len(result) == limit:
+                        more = True
+                        break
+                    result.append(item)
+                if more:
+                    break
+
+            total = None
+            if predicate is None:
+                if not unread_only:
+                    total = sum(len(self._buckets[state][r]) for state in states for r in range(len(PRIORITY_ORDER) + 1))
+                elif states == [(False, False)]:
+                    total = self._unread
+
+        next_cursor = encode_inbox_cursor(result[-1]) if more and result else None
+        return InboxPage(items=result, next_cursor=next_cursor, total=total)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire_locked(datetime.now())
+            return {
+                "user_id": self.user_id,
+                "deliveries": len(self._by_delivery),
+                "unread": self._unread,
+                "pending_acknowledgment": sum(len(b) for b in self._buckets[(False, False)]),
+                "acknowledged": sum(len(b) for s in ((True, False), (True, True)) for b in self._buckets[s]),
+                "expired": sum(len(b) for s in ((False, True), (True, True)) for b in self._buckets[s]),
+            }
+
+
+__all__ = [
+    "UserInbox",
+    "InboxItem",
+    "InboxPage",
+    "PRIORITY_ORDER",
+    "decode_inbox_cursor",
+    "encode_inbox_cursor",
+]
@@ -9,6 +9,9 @@ Key Features:
 - Content filtering based on user role and decision type
 - Notification acknowledgment workflow
 - User action capture and logging
+- Per-user indexed inboxes with O(1) unread/pending counters (inbox.py)
+- Role -> users directory for O(recipients) routing and bulk route_batch
+- Delivery callbacks dispatched in batches off-thread (delivery_dispatcher.py)
 """
 
 import hashlib
@@ -16,10 +19,12 @@ import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import logging
 
 from src.core import get_logger
+from src.notifications.delivery_dispatcher import DeliveryDispatcher
+from src.notifications.inbox import InboxPage, UserInbox
 
 logger = get_logger(__name__)
 
@@ -257,9 +262,23 @@ class NotificationRoutingEngine:
         self._notifications: Dict[str, Notification] = {}
         self._deliveries: Dict[str, UserNotificationDelivery] = {}
         self._user_deliveries: Dict[str, List[str]] = {}  # user_id -> delivery_ids
+        self._notification_deliveries: Dict[str, List[str]] = {}  # notification_id -> delivery_ids
+        self._inboxes: Dict[str, UserInbox] = {}
         
-        # Callbacks for notification events
+        # User directory, maintained incrementally: role -> user_ids (insertion ordered)
+        self._user_roles: Dict[str, UserRole] = {}
+        self._role_users: Dict[UserRole, Dict[str, None]] = {role: {} for role in UserRole}
+        self._watchers: Dict[str, None] = {}  # users who receive every directory-routed notification
+        
+        # Statistics counters, maintained as notifications are created and change status
+        self._counts_by_type: Dict[str, int] = {}
+        self._counts_by_priority: Dict[str, int] = {}
+        self._counts_by_status: Dict[str, int] = {}
+        
+        # Callbacks for notification events, run by the dispatcher thread
         self._delivery_callbacks: List[Callable[[UserNotificationDelivery], None]] = []
+        self._batch_delivery_callbacks: List[Callable[[List[UserNotificationDelivery]], None]] = []
+        self._dispatcher = DeliveryDispatcher(self._batch_delivery_callbacks, self._delivery_callbacks)
         
         logger.info("NotificationRoutingEngine initialized")
     
@@ -272,10 +291,70 @@ class NotificationRoutingEngine:
     
     def _generate_delivery_id(self) -> str:
         """Generate unique delivery ID"""
+        return self._generate_delivery_ids(1)[0]
+    
+    def _generate_delivery_ids(self, count: int) -> List[str]:
+        """Generate a block of unique delivery IDs under one lock acquisition"""
         with self._lock:
-            self._delivery_counter += 1
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            return f"DELIV_{timestamp}_{self._delivery_counter:06d}"
+            start = self._delivery_counter + 1
+            self._delivery_counter += count
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        return [f"DELIV_{timestamp}_{n:06d}" for n in range(start, start + count)]
+    
+    # ========================================
+    # USER DIRECTORY
+    # ========================================
+    
+    def register_user(self, user_id: str, role: UserRole) -> None:
+        """Add a user to the routing directory, or move them to a new role"""
+        with self._lock:
+            previous = self._user_roles.get(user_id)
+            if previous == role:
+                return
+            if previous is not None:
+                del self._role_users[previous][user_id]
+            self._user_roles[user_id] = role
+            self._role_users[role][user_id] = None
+    
+    def register_users(self, users: Dict[str, UserRole]) -> None:
+        """Register a dictionary of user_id -> UserRole"""
+        for user_id, role in users.items():
+            self.register_user(user_id, role)
+    
+    def unregister_user(self, user_id: str) -> bool:
+        """Remove a user from the routing directory (their inbox is kept)"""
+        with self._lock:
+            role = self._user_roles.pop(user_id, None)
+            if role is None:
+                return False
+            del self._role_users[role][user_id]
+            return True
+    
+    def register_watcher(self, user_id: str) -> None:
+        """
+        Deliver every notification routed through the directory to a user,
+        whatever its target roles (e.g. the shared dashboard inbox).
+        
+        The delivery is recorded under the notification's first target role,
+        and a watcher who is also in the directory is not delivered twice.
+        """
+        with self._lock:
+            self._watchers[user_id] = None
+    
+    def unregister_watcher(self, user_id: str) -> bool:
+        """Stop delivering every notification to a user (their inbox is kept)"""
+        with self._lock:
+            if user_id not in self._watchers:
+                return False
+            del self._watchers[user_id]
+            return True
+    
+    def get_users(self, role: Optional[UserRole] = None) -> Dict[str, UserRole]:
+        """Registered users, optionally only those with one role"""
+        with self._lock:
+            if role is None:
+                return dict(self._user_roles)
+            return {user_id: role for user_id in self._role_users[role]}
     
     def determine_target_roles(
         self,
@@ -359,7 +438,7 @@ class NotificationRoutingEngine:
             metadata=metadata or {},
         )
         
-        self._notifications[notification_id] = notification
+        self.add_notification(notification)
         
         logger.info(
             f"Created notification {notification_id}: "
@@ -371,74 +450,120 @@ class NotificationRoutingEngine:
         return notification
 
     
+    def add_notification(self, notification: Notification) -> bool:
+        """
+        Store a notification built outside create_notification (e.g. from a
+        SystemAlert). Returns False if its ID is already stored.
+        """
+        with self._lock:
+            if notification.notification_id in self._notifications:
+                return False
+            self._notifications[notification.notification_id] = notification
+            self._increment(self._counts_by_type, notification.notification_type.value)
+            self._increment(self._counts_by_priority, notification.priority.value)
+            self._increment(self._counts_by_status, notification.status.value)
+            return True
+    
     def route_notification(
         self,
         notification: Notification,
-        users: Dict[str, UserRole],
+        users: Optional[Dict[str, UserRole]] = None,
     ) -> List[UserNotificationDelivery]:
         """
         Route a notification to appropriate users based on their roles.
         
         Args:
             notification: Notification to route
-            users: Dictionary of user_id -> UserRole
+            users: Dictionary of user_id -> UserRole; the registered user
+                directory is used when omitted
         
         Returns:
             List of delivery records
         """
-        deliveries = []
-        
-        for user_id, user_role in users.items():
-            # Check if user's role is in target roles
-            if user_role in notification.target_roles:
-                delivery = self._deliver_to_user(notification, user_id, user_role)
-                deliveries.append(delivery)
-        
-        # Update notification status
-        if deliveries:
-            notification.status = NotificationStatus.DELIVERED
-        
-        logger.info(
-            f"Routed notification {notification.notification_id} "
-            f"to {len(deliveries)} user(s)"
-        )
-        
-        return deliveries
+        return self.route_batch([notification], users)
     
-    def _deliver_to_user(
+    def route_batch(
         self,
-        notification: Notification,
-        user_id: str,
-        user_role: UserRole,
-    ) -> UserNotificationDelivery:
-        """Deliver notification to a specific user"""
-        delivery_id = self._generate_delivery_id()
-        
-        delivery = UserNotificationDelivery(
-            delivery_id=delivery_id,
-            notification_id=notification.notification_id,
-            user_id=user_id,
-            user_role=user_role,
-        )
+        notifications: List[Notification],
+        users: Optional[Dict[str, UserRole]] = None,
+    ) -> List[UserNotificationDelivery]:
+        """
+        Route several notifications in one pass.
         
-        # Store delivery
-        self._deliveries[delivery_id] = delivery
+        Recipients come from a role -> users index (the registered directory,
+        or one built once from ``users``), so each notification costs
+        O(recipients) rather than O(all users). Delivery IDs are allocated in
+        one block, inbox inserts are grouped per user, and the whole batch is
+        handed to the callback dispatcher at once.
         
-        # Track user's deliveries
-        if user_id not in self._user_deliveries:
-            self._user_deliveries[user_id] = []
-        self._user_deliveries[user_id].append(delivery_id)
+        Args:
+            notifications: Notifications to route; ones not created by this
+                engine are stored first
+            users: Dictionary of user_id -> UserRole; the registered user
+                directory (and its watchers) is used when omitted
         
-        # Notify callbacks
-        for callback in self._delivery_callbacks:
-            try:
-                callback(delivery)
-            except Exception as e:
-                logger.error(f"Delivery callback error: {e}")
+        Returns:
+            Delivery records, grouped by notification in input order
+        """
+        watchers: List[str] = []
+        if users is None:
+            with self._lock:
+                role_users = {role: list(ids) for role, ids in self._role_users.items() if ids}
+                watchers = list(self._watchers)
+        else:
+            role_users = {}
+            for user_id, role in users.items():
+                role_users.setdefault(role, []).append(user_id)
+        
+        targets = []
+        for notification in notifications:
+            self.add_notification(notification)
+            roles = list(dict.fromkeys(notification.target_roles))
+            recipients = set()
+            for role in roles:
+                for user_id in role_users.get(role, ()):
+                    targets.append((notification, user_id, role))
+                    recipients.add(user_id)
+            if roles:
+                for user_id in watchers:
+                    if user_id not in recipients:
+                        targets.append((notification, user_id, roles[0]))
         
-        logger.debug(f"Delivered {notification.notification_id} to {user_id} ({user_role.value})")
+        deliveries = []
+        by_user: Dict[str, List[Tuple[UserNotificationDelivery, Notification]]] = {}
+        for (notification, user_id, role), delivery_id in zip(targets, self._generate_delivery_ids(len(targets))):
+            delivery = UserNotificationDelivery(
+                delivery_id=delivery_id,
+                notification_id=notification.notification_id,
+                user_id=user_id,
+                user_role=role,
+            )
+            deliveries.append(delivery)
+            by_user.setdefault(user_id, []).append((delivery, notification))
+        
+        with self._lock:
+            for delivery in deliveries:
+                self._deliveries[delivery.delivery_id] = delivery
+                self._user_deliveries.setdefault(delivery.user_id, []).append(delivery.delivery_id)
+                self._notification_deliveries.setdefault(delivery.notification_id, []).append(delivery.delivery_id)
+        for user_id, items in by_user.items():
+            self._delivery_inbox(user_id).add_many(items)
+        
+        delivered = {delivery.notification_id for delivery in deliveries}
+        for notification in notifications:
+            if notification.notification_id in delivered:
+                self.set_notification_status(notification, NotificationStatus.DELIVERED)
+            logger.debug(
+                f"Routed notification {notification.notification_id} to "
+                f"{len(self._notification_deliveries.get(notification.notification_id, ()))} user(s)"
+            )
+        
+        if deliveries and (self._delivery_callbacks or self._batch_delivery_callbacks):
+            self._dispatcher.submit(deliveries)
+        
+        logger.info(f"Routed {len(notifications)} notification(s) as {len(deliveries)} delivery(ies)")
         
-        return delivery
+        return deliveries
     
     def filter_content_for_role(
         self,
@@ -562,6 +687,18 @@ class NotificationRoutingEngine:
         return any(kw in action.lower() for kw in dm_keywords)
 
     
+    def get_inbox(self, user_id: str) -> Optional[UserInbox]:
+        """A user's inbox, or None if nothing was ever delivered to them"""
+        return self._inboxes.get(user_id)
+    
+    def _delivery_inbox(self, user_id: str) -> UserInbox:
+        """Get or create a user's inbox; only delivery creates inboxes"""
+        inbox = self._inboxes.get(user_id)
+        if inbox is None:
+            with self._lock:
+                inbox = self._inboxes.setdefault(user_id, UserInbox(user_id))
+        return inbox
+    
     def get_user_notifications(
         self,
         user_id: str,
@@ -577,43 +714,56 @@ class NotificationRoutingEngine:
             include_expired: Include expired notifications
         
         Returns:
-            List of notifications for the user
-        """
-        delivery_ids = self._user_deliveries.get(user_id, [])
-        notifications = []
-        
-        for delivery_id in delivery_ids:
-            delivery = self._deliveries.get(delivery_id)
-            if not delivery:
-                continue
-            
-            notification = self._notifications.get(delivery.notification_id)
-            if not notification:
-                continue
-            
-            # Filter based on status
-            if not include_acknowledged and delivery.acknowledged_at is not None:
-                continue
-            
-            if not include_expired and notification.is_expired():
-                continue
-            
-            notifications.append(notification)
-        
-        # Sort by priority and creation time
-        priority_order = {
-            NotificationPriority.CRITICAL: 0,
-            NotificationPriority.HIGH: 1,
-            NotificationPriority.MEDIUM: 2,
-            NotificationPriority.LOW: 3,
-        }
+            List of notifications for the user, by priority then age
+        """
+        inbox = self._inboxes.get(user_id)
+        if inbox is None:
+            return []
+        return [
+            item.notification
+            for item in inbox.iter_items(include_acknowledged, include_expired)
+        ]
+    
+    def get_user_notifications_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        unread_only: bool = False,
+        include_acknowledged: bool = False,
+        include_expired: bool = False,
+        roles: Optional[List[UserRole]] = None,
+    ) -> InboxPage:
+        """
+        Get one page of a user's inbox.
         
-        notifications.sort(
-            key=lambda n: (priority_order.get(n.priority, 4), n.created_at),
-            reverse=False
-        )
+        Args:
+            user_id: User identifier
+            limit: Page size
+            cursor: next_cursor of the previous page
+            unread_only: Only deliveries not yet read
+            include_acknowledged: Include acknowledged notifications
+            include_expired: Include expired notifications
+            roles: Only deliveries made to the user in one of these roles
         
-        return notifications
+        Returns:
+            InboxPage of InboxItems (delivery + notification)
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        inbox = self._inboxes.get(user_id)
+        if inbox is None:
+            return InboxPage(items=[], next_cursor=None, total=0)
+        predicate = (lambda item: item.delivery.user_role in roles) if roles else None
+        return inbox.page(
+            limit=limit,
+            cursor=cursor,
+            include_acknowledged=include_acknowledged,
+            include_expired=include_expired,
+            unread_only=unread_only,
+            predicate=predicate,
+        )
     
     def get_notification(self, notification_id: str) -> Optional[Notification]:
         """Get a notification by ID"""
@@ -623,6 +773,52 @@ class NotificationRoutingEngine:
         """Get a delivery record by ID"""
         return self._deliveries.get(delivery_id)
     
+    def get_notification_deliveries(self, notification_id: str) -> List[UserNotificationDelivery]:
+        """Every delivery made for a notification, in delivery order"""
+        return [self._deliveries[d] for d in self._notification_deliveries.get(notification_id, ())]
+    
+    def mark_delivery_read(self, delivery_id: str) -> bool:
+        """Mark a delivery as read, keeping the user's unread counter in step"""
+        delivery = self._deliveries.get(delivery_id)
+        if delivery is None:
+            return False
+        return self._delivery_inbox(delivery.user_id).mark_read(delivery_id)
+    
+    def acknowledge_delivery(
+        self,
+        delivery_id: str,
+        action_taken: Optional[str] = None,
+        comment: Optional[str] = None,
+    ) -> bool:
+        """Record acknowledgment of a delivery and take it out of the pending queues"""
+        delivery = self._deliveries.get(delivery_id)
+        if delivery is None:
+            return False
+        return self._delivery_inbox(delivery.user_id).acknowledge(delivery_id, action_taken, comment)
+    
+    def set_notification_status(self, notification: Notification, status: NotificationStatus) -> None:
+        """Change a notification's status, keeping statistics counters in step"""
+        with self._lock:
+            if notification.status == status:
+                return
+            self._counts_by_status[notification.status.value] = self._counts_by_status.get(notification.status.value, 1) - 1
+            self._increment(self._counts_by_status, status.value)
+            notification.status = status
+    
+    @staticmethod
+    def _increment(counts: Dict[str, int], key: str) -> None:
+        counts[key] = counts.get(key, 0) + 1
+    
+    def get_unread_count(self, user_id: str) -> int:
+        """Unread, unacknowledged, unexpired deliveries for a user (O(1))"""
+        inbox = self._inboxes.get(user_id)
+        return inbox.unread_count if inbox else 0
+    
+    def get_pending_count(self, user_id: str) -> int:
+        """Deliveries awaiting acknowledgment for a user (O(1))"""
+        inbox = self._inboxes.get(user_id)
+        return inbox.pending_count if inbox else 0
+    
     def get_pending_acknowledgments(
         self,
         user_id: Optional[str] = None,
@@ -636,55 +832,55 @@ class NotificationRoutingEngine:
         Returns:
             List of deliveries pending acknowledgment
         """
-        pending = []
-        
-        for delivery in self._deliveries.values():
-            if delivery.acknowledged_at is not None:
-                continue
-            
-            if user_id and delivery.user_id != user_id:
-                continue
-            
-            notification = self._notifications.get(delivery.notification_id)
-            if notification and not notification.is_expired():
-                pending.append(delivery)
+        if user_id:
+            inboxes = [self._inboxes[user_id]] if user_id in self._inboxes else []
+        else:
+            inboxes = list(self._inboxes.values())
         
-        return pending
+        return [item.delivery for inbox in inboxes for item in inbox.iter_items()]
     
     def register_delivery_callback(
         self,
         callback: Callable[[UserNotificationDelivery], None]
     ) -> None:
-        """Register callback for notification deliveries"""
+        """Register callback for notification deliveries (run on the dispatcher thread)"""
         self._delivery_callbacks.append(callback)
     
+    def unregister_delivery_callback(
+        self,
+        callback: Callable[[UserNotificationDelivery], None]
+    ) -> None:
+        """Stop calling a callback registered with register_delivery_callback"""
+        if callback in self._delivery_callbacks:
+            self._delivery_callbacks.remove(callback)
+    
+    def register_batch_delivery_callback(
+        self,
+        callback: Callable[[List[UserNotificationDelivery]], None]
+    ) -> None:
+        """Register callback taking each dispatched batch of deliveries"""
+        self._batch_delivery_callbacks.append(callback)
+    
+    def flush_callbacks(self, timeout: Optional[float] = None) -> bool:
+        """Wait until callbacks have run for every delivery routed so far"""
+        return self._dispatcher.flush(timeout=timeout)
+    
+    def close(self) -> None:
+        """Run pending delivery callbacks and stop the dispatcher thread"""
+        self._dispatcher.close()
+    
     def get_statistics(self) -> Dict[str, Any]:
-        """Get notification statistics"""
-        total = len(self._notifications)
-        by_type = {}
-        by_priority = {}
-        by_status = {}
-        
-        for notification in self._notifications.values():
-            # By type
-            type_key = notification.notification_type.value
-            by_type[type_key] = by_type.get(type_key, 0) + 1
-            
-            # By priority
-            priority_key = notification.priority.value
-            by_priority[priority_key] = by_priority.get(priority_key, 0) + 1
-            
-            # By status
-            status_key = notification.status.value
-            by_status[status_key] = by_status.get(status_key, 0) + 1
-        
-        return {
-            "total_notifications": total,
-            "total_deliveries": len(self._deliveries),
-            "by_type": by_type,
-            "by_priority": by_priority,
-            "by_status": by_status,
-        }
+        """Get notification statistics (from maintained counters)"""
+        with self._lock:
+            return {
+                "total_notifications": len(self._notifications),
+                "total_deliveries": len(self._deliveries),
+                "registered_users": len(self._user_roles),
+                "pending_callbacks": self._dispatcher.pending,
+                "by_type": dict(self._counts_by_type),
+                "by_priority": dict(self._counts_by_priority),
+                "by_status": {k: v for k, v in self._counts_by_status.items() if v},
+            }
 
 
 class NotificationAcknowledgmentManager:
@@ -739,7 +935,7 @@ class NotificationAcknowledgmentManager:
             logger.warning(f"User {user_id} cannot mark delivery {delivery_id} as read")
             return False
         
-        delivery.read_at = datetime.now()
+        self.routing_engine.mark_delivery_read(delivery_id)
         
         self._log_action(delivery, "READ", user_id)
         
@@ -775,14 +971,12 @@ class NotificationAcknowledgmentManager:
             return False
         
         # Update delivery
-        delivery.acknowledged_at = datetime.now()
-        delivery.action_taken = action_taken
-        delivery.comment = comment
+        self.routing_engine.acknowledge_delivery(delivery_id, action_taken, comment)
         
         # Update notification status
         notification = self.routing_engine.get_notification(delivery.notification_id)
         if notification:
-            notification.status = NotificationStatus.ACKNOWLEDGED
+            self.routing_engine.set_notification_status(notification, NotificationStatus.ACKNOWLEDGED)
         
         self._log_action(delivery, "ACKNOWLEDGE", user_id, action_taken, comment)
         
@@ -819,14 +1013,12 @@ class NotificationAcknowledgmentManager:
             return False
         
         # Update delivery
-        delivery.acknowledged_at = datetime.now()
-        delivery.action_taken = "DISMISSED"
-        delivery.comment = reason
+        self.routing_engine.acknowledge_delivery(delivery_id, "DISMISSED", reason)
         
         # Update notification status
         notification = self.routing_engine.get_notification(delivery.notification_id)
         if notification:
-            notification.status = NotificationStatus.DISMISSED
+            self.routing_engine.set_notification_status(notification, NotificationStatus.DISMISSED)
         
         self._log_action(delivery, "DISMISS", user_id, "DISMISSED", reason)
         
@@ -881,12 +1073,10 @@ class NotificationAcknowledgmentManager:
         )
         
         # Update original notification status
-        original_notification.status = NotificationStatus.ESCALATED
+        self.routing_engine.set_notification_status(original_notification, NotificationStatus.ESCALATED)
         
         # Mark original delivery as acknowledged
-        delivery.acknowledged_at = datetime.now()
-        delivery.action_taken = "ESCALATED"
-        delivery.comment = escalation_reason
+        self.routing_engine.acknowledge_delivery(delivery_id, "ESCALATED", escalation_reason)
         
         self._log_action(delivery, "ESCALATE", user_id, "ESCALATED", escalation_reason)
         
@@ -952,8 +1142,7 @@ class NotificationAcknowledgmentManager:
     
     def get_pending_count(self, user_id: str) -> int:
         """Get count of pending acknowledgments for a user"""
-        pending = self.routing_engine.get_pending_acknowledgments(user_id)
-        return len(pending)
+        return self.routing_engine.get_pending_count(user_id)
     
     def requires_acknowledgment(self, notification: Notification) -> bool:
         """
@@ -971,8 +1160,24 @@ class NotificationAcknowledgmentManager:
         return True
 
 
+# Process-wide engine behind the notification API endpoints
+_shared_engine: Optional[NotificationRoutingEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_notification_engine() -> NotificationRoutingEngine:
+    """Get or create the shared notification routing engine"""
+    global _shared_engine
+    if _shared_engine is None:
+        with _shared_lock:
+            if _shared_engine is None:
+                _shared_engine = NotificationRoutingEngine()
+    return _shared_engine
+
+
 __all__ = [
     "NotificationRoutingEngine",
+    "get_notification_engine",
     "NotificationAcknowledgmentManager",
     "Notification",
     "UserNotificationDelivery",
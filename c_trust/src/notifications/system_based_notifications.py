@@ -18,6 +18,7 @@ Key Features:
 - Consensus confidence monitoring
 - Temporal drift alerts
 - Automated severity classification
+- Bulk routing of alert bursts through NotificationRoutingEngine.route_batch
 """
 
 import threading
@@ -30,10 +31,13 @@ import logging
 from src.core import get_logger
 from src.notifications.notification_engine import (
     Notification,
+    NotificationRoutingEngine,
     NotificationPriority,
     NotificationType,
     NotificationStatus,
+    UserNotificationDelivery,
     UserRole,
+    get_notification_engine,
 )
 
 logger = get_logger(__name__)
@@ -202,11 +206,18 @@ class SystemBasedNotificationEngine:
     CONSENSUS_CONFIDENCE_THRESHOLD = 0.6  # <60% confidence is low
     GUARDIAN_INTEGRITY_THRESHOLD = 0.7  # <70% integrity is concerning
     
-    def __init__(self):
-        """Initialize system-based notification engine"""
+    def __init__(self, routing_engine: Optional[NotificationRoutingEngine] = None):
+        """
+        Initialize system-based notification engine.
+        
+        Args:
+            routing_engine: Engine that route_alerts delivers through
+        """
         self._alert_counter = 0
         self._lock = threading.Lock()
         self._alerts: Dict[str, SystemAlert] = {}
+        self._routed: Set[str] = set()
+        self.routing_engine = routing_engine
         
         logger.info("SystemBasedNotificationEngine initialized")
     
@@ -555,6 +566,67 @@ class SystemBasedNotificationEngine:
         
         return alerts
     
+    def route_alerts(
+        self,
+        alerts: Optional[List[SystemAlert]] = None,
+        users: Optional[Dict[str, UserRole]] = None,
+    ) -> List[UserNotificationDelivery]:
+        """
+        Deliver alerts through the routing engine as one batch.
+        
+        Meant for the burst of alerts produced by a full refresh: the
+        alerts are converted once and routed with route_batch, which costs
+        O(recipients) per alert. Alerts already routed are skipped.
+        
+        Args:
+            alerts: Alerts to route (defaults to every alert not yet routed)
+            users: Dictionary of user_id -> UserRole; the routing engine's
+                registered user directory is used when omitted
+        
+        Returns:
+            Delivery records created
+        
+        Raises:
+            ValueError: If the engine has no routing engine
+        """
+        if self.routing_engine is None:
+            raise ValueError("SystemBasedNotificationEngine has no routing engine to route alerts through")
+        
+        with self._lock:
+            if alerts is None:
+                alerts = list(self._alerts.values())
+            pending = [a for a in alerts if a.alert_id not in self._routed]
+            self._routed.update(a.alert_id for a in pending)
+        
+        if not pending:
+            return []
+        return self.routing_engine.route_batch([a.to_notification() for a in pending], users)
+    
+    def route_snapshot_alerts(self, previous: Any, snapshot: Any) -> List[UserNotificationDelivery]:
+        """
+        Study store listener: check the DQI of every study whose score or
+        risk level changed in the published snapshot and route the alerts.
+        
+        Hooked to StudyResultStore.add_listener so each full refresh (and
+        single-study publish) ends with one route_batch of its alerts.
+        """
+        alerts = []
+        for study_id, result in snapshot.studies.items():
+            score = result.get("overall_score")
+            if score is None:
+                continue
+            before = previous.studies.get(study_id) or {}
+            if (before.get("overall_score"), before.get("risk_level")) == (score, result.get("risk_level")):
+                continue
+            dimensions = result.get("dimension_scores") or {}
+            if isinstance(dimensions, list):
+                dimensions = {d["dimension"]: d["raw_score"] for d in dimensions}
+            alerts.extend(self.check_dqi_score(study_id, score, dimensions, str(result.get("risk_level"))))
+        
+        if not alerts or self.routing_engine is None:
+            return []
+        return self.route_alerts(alerts)
+    
     def get_alert(self, alert_id: str) -> Optional[SystemAlert]:
         """Get alert by ID"""
         return self._alerts.get(alert_id)
@@ -625,8 +697,31 @@ class SystemBasedNotificationEngine:
         }
 
 
+# Process-wide engine, routing through the shared notification engine
+_shared_engine: Optional[SystemBasedNotificationEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_system_notification_engine() -> SystemBasedNotificationEngine:
+    """Get or create the shared system notification engine"""
+    global _shared_engine
+    if _shared_engine is None:
+        with _shared_lock:
+            if _shared_engine is None:
+                _shared_engine = SystemBasedNotificationEngine(get_notification_engine())
+    return _shared_engine
+
+
+def reset_system_notification_engine() -> None:
+    """Reset the shared engine (for testing)"""
+    global _shared_engine
+    _shared_engine = None
+
+
 __all__ = [
     "SystemBasedNotificationEngine",
+    "get_system_notification_engine",
+    "reset_system_notification_engine",
     "SystemAlert",
     "SystemAlertType",
     "SystemAlertSeverity",
@@ -448,10 +448,7 @@ class UserActionCaptureSystem:
             return True, None  # No requirement means satisfied
         
         # Get deliveries for this notification
-        deliveries = []
-        for delivery in self.routing_engine._deliveries.values():
-            if delivery.notification_id == notification_id:
-                deliveries.append(delivery)
+        deliveries = self.routing_engine.get_notification_deliveries(notification_id)
         
         is_satisfied = requirement.check_satisfaction(deliveries)
         
@@ -512,8 +509,8 @@ class UserActionCaptureSystem:
             notification = self.routing_engine.get_notification(notification_id)
             if notification:
                 # Find a delivery to escalate from
-                for delivery in self.routing_engine._deliveries.values():
-                    if delivery.notification_id == notification_id and delivery.acknowledged_at is None:
+                for delivery in self.routing_engine.get_notification_deliveries(notification_id):
+                    if delivery.acknowledged_at is None:
                         self.acknowledgment_manager.escalate(
                             delivery.delivery_id,
                             "SYSTEM",
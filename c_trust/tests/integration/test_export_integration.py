@@ -7,16 +7,15 @@ Phase 4, Task 20: Integration Tests for Export
 """
 
 import csv
-import json
 import pytest
 from datetime import datetime
-from pathlib import Path
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
 from src.api.main import app
 from src.api.export import get_export_data, generate_csv_export, EXPORT_DIR
+from src.api.study_store import DEFAULT_RESULTS_FILE, get_study_store, reset_study_store
 
 
 # ========================================
@@ -29,13 +28,24 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def study_store():
+    """Fresh study result store for each test"""
+    reset_study_store()
+    yield get_study_store()
+    reset_study_store()
+
+
+def publish_cache(cache_data):
+    """Publish cache data to the study result store (in memory only)"""
+    get_study_store().publish(cache_data, persist=False)
+
+
 @pytest.fixture
-def real_cache_data():
+def real_cache_data(study_store):
     """Load real data cache if available"""
-    cache_file = Path("c_trust/data_cache.json")
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            return json.load(f)
+    if study_store.load():
+        return dict(study_store.snapshot().studies)
     return None
 
 
@@ -139,10 +149,8 @@ def mock_cache_data():
 
 def test_export_single_study(mock_cache_data):
     """Test export for a single study"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data(study_ids=['STUDY_01'])
+    publish_cache(mock_cache_data)
+    data = get_export_data(study_ids=['STUDY_01'])
     
     assert len(data) == 1
     assert data[0]['study_id'] == 'STUDY_01'
@@ -157,10 +165,8 @@ def test_export_single_study(mock_cache_data):
 
 def test_export_all_studies(mock_cache_data):
     """Test export for all studies"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    publish_cache(mock_cache_data)
+    data = get_export_data()
     
     assert len(data) == 3
     study_ids = [d['study_id'] for d in data]
@@ -175,10 +181,8 @@ def test_export_all_studies(mock_cache_data):
 
 def test_export_with_agent_signals(mock_cache_data):
     """Test export includes agent signal data"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    publish_cache(mock_cache_data)
+    data = get_export_data()
     
     # Verify safety metrics are included
     assert data[0]['sae_backlog_days'] == 12.0
@@ -199,10 +203,8 @@ def test_export_with_agent_signals(mock_cache_data):
 
 def test_export_with_dimension_scores(mock_cache_data):
     """Test export includes dimension scores"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    publish_cache(mock_cache_data)
+    data = get_export_data()
     
     # Verify dimension scores are included
     assert 'dimension_safety_score' in data[0]
@@ -222,10 +224,8 @@ def test_export_with_dimension_scores(mock_cache_data):
 def test_exported_csv_is_valid(mock_cache_data, tmp_path):
     """Test that exported CSV is valid and parseable"""
     # Get export data
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    publish_cache(mock_cache_data)
+    data = get_export_data()
     
     # Generate CSV
     filename = "test_export.csv"
@@ -252,10 +252,8 @@ def test_exported_csv_is_valid(mock_cache_data, tmp_path):
 def test_exported_data_matches_api_response(mock_cache_data, tmp_path):
     """Test that exported data matches what API returns"""
     # Get export data
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            export_data = get_export_data()
+    publish_cache(mock_cache_data)
+    export_data = get_export_data()
     
     # Generate CSV
     filename = "api_match_export.csv"
@@ -280,18 +278,16 @@ def test_exported_data_matches_api_response(mock_cache_data, tmp_path):
 
 def test_export_csv_endpoint(client, mock_cache_data):
     """Test CSV export API endpoint"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            response = client.post(
-                "/api/v1/export/csv",
-                json={
-                    "format": "csv",
-                    "study_ids": None,
-                    "include_agent_signals": True,
-                    "include_temporal_metrics": True
-                }
-            )
+    publish_cache(mock_cache_data)
+    response = client.post(
+        "/api/v1/export/csv",
+        json={
+            "format": "csv",
+            "study_ids": None,
+            "include_agent_signals": True,
+            "include_temporal_metrics": True
+        }
+    )
     
     assert response.status_code == 200
     data = response.json()
@@ -311,19 +307,17 @@ def test_export_csv_endpoint(client, mock_cache_data):
 @pytest.mark.skip(reason="Excel export endpoint needs proper file system mocking")
 def test_export_excel_endpoint(client, mock_cache_data, tmp_path):
     """Test Excel export API endpoint"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('src.api.export.EXPORT_DIR', tmp_path):
-                response = client.post(
-                    "/api/v1/export/excel",
-                    json={
-                        "format": "excel",
-                        "study_ids": None,
-                        "include_agent_signals": True,
-                        "include_temporal_metrics": True
-                    }
-                )
+    publish_cache(mock_cache_data)
+    with patch('src.api.export.EXPORT_DIR', tmp_path):
+        response = client.post(
+            "/api/v1/export/excel",
+            json={
+                "format": "excel",
+                "study_ids": None,
+                "include_agent_signals": True,
+                "include_temporal_metrics": True
+            }
+        )
     
     assert response.status_code == 200
     data = response.json()
@@ -339,10 +333,8 @@ def test_export_excel_endpoint(client, mock_cache_data, tmp_path):
 
 def test_export_with_filters(mock_cache_data):
     """Test export with study ID filters"""
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data(study_ids=['STUDY_01', 'STUDY_03'])
+    publish_cache(mock_cache_data)
+    data = get_export_data(study_ids=['STUDY_01', 'STUDY_03'])
     
     assert len(data) == 2
     study_ids = [d['study_id'] for d in data]
@@ -360,10 +352,8 @@ def test_export_performance(mock_cache_data, tmp_path):
     import time
     
     # Get export data
-    with patch('builtins.open', create=True) as mock_file:
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(mock_cache_data)
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    publish_cache(mock_cache_data)
+    data = get_export_data()
     
     # Time CSV generation
     start_time = time.time()
@@ -383,7 +373,7 @@ def test_export_performance(mock_cache_data, tmp_path):
 # ========================================
 
 @pytest.mark.skipif(
-    not Path("c_trust/data_cache.json").exists(),
+    not DEFAULT_RESULTS_FILE.exists(),
     reason="Real data cache not available"
 )
 def test_export_with_real_data(real_cache_data, tmp_path):
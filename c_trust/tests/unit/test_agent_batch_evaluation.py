@@ -0,0 +1,203 @@
+"""
+Unit Tests for Vectorized Agent Evaluation
+==========================================
+Tests that analyze_batch over a studies × features matrix gives exactly
+the same risk levels, confidences, abstentions and severities as the
+per-study analyze().
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.agents.signal_agents import (
+    CodingReadinessAgent,
+    CrossEvidenceAgent,
+    DataCompletenessAgent,
+    EDCQualityAgent,
+    QueryQualityAgent,
+    SafetyComplianceAgent,
+    StabilityAgent,
+    TemporalDriftAgent,
+)
+from src.intelligence.agent_pipeline import AgentPipeline
+from src.intelligence.base_agent import FeatureMatrix
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+# Feature -> (low, high) sampling range; ranges overshoot the valid domain
+# so invalid severities (analyze() raising) are exercised too
+FEATURE_RANGES = {
+    "missing_pages_pct": (0, 60),
+    "form_completion_rate": (30, 100),
+    "visit_completion_rate": (30, 100),
+    "data_entry_lag_days": (0, 40),
+    "_visit_gap_count": (0, 5),
+    "fatal_sae_count": (0, 2),
+    "sae_backlog_days": (0, 20),
+    "sae_overdue_count": (0, 8),
+    "open_query_count": (0, 350),
+    "query_aging_days": (0, 70),
+    "coding_completion_rate": (50, 100),
+    "coding_backlog_days": (0, 70),
+    "uncoded_sae_count": (0, 2),
+    "coding_velocity": (-0.5, 2),
+    "pending_queries_coding": (-5, 80),
+    "avg_data_entry_lag_days": (0, 70),
+    "overdue_visits_count": (0, 60),
+    "lag_trend": (-8, 8),
+    "max_data_entry_lag_days": (0, 100),
+    "data_entry_errors": (0, 60),
+    "missing_required_fields": (0, 120),
+    "edc_system_uptime": (90, 100),
+    "data_validation_failures": (0, 70),
+    "enrollment_velocity": (20, 110),
+    "site_activation_rate": (20, 110),
+    "dropout_rate": (0, 30),
+    "enrollment_trend": (-15, 15),
+    "site_performance_variance": (0, 60),
+    "patient_retention_rate": (50, 100),
+    "edc_sae_consistency_score": (-10, 100),
+    "visit_projection_deviation": (0, 60),
+    "data_integrity_issues_count": (0, 20),
+    "cross_source_mismatch_rate": (0, 30),
+    "lab_clinical_correlation": (0, 1),
+    "duplicate_records_count": (0, 30),
+}
+
+AGENTS = [
+    DataCompletenessAgent,
+    SafetyComplianceAgent,
+    QueryQualityAgent,
+    CodingReadinessAgent,
+    TemporalDriftAgent,
+    EDCQualityAgent,
+    StabilityAgent,
+    CrossEvidenceAgent,
+]
+
+# Threshold boundaries and identical values hit the edge cases
+BOUNDARY_VALUES = [0.0, 3.0, 5.0, 7.0, 10.0, 14.0, 50.0, 80.0, 90.0, 95.0, 100.0]
+
+
+def random_matrix(seed, n_studies=400, missing_rate=0.25):
+    """Random features with absent cells, integers and exact threshold values"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (low, high) in FEATURE_RANGES.items():
+        values = rng.uniform(low, high, n_studies)
+        values = np.where(rng.random(n_studies) < 0.3, np.round(values), values)
+        values = np.where(rng.random(n_studies) < 0.1, rng.choice(BOUNDARY_VALUES, n_studies), values)
+        values[rng.random(n_studies) < missing_rate] = np.nan
+        columns[name] = values
+    frame = pd.DataFrame(columns, index=[f"STUDY_{i:03d}" for i in range(n_studies)])
+    # Shuffle column order: the variance score depends on feature order
+    return frame[list(rng.permutation(frame.columns))]
+
+
+def assert_matches_analyze(agent, matrix, batch):
+    for study_id in matrix.index:
+        row = batch.loc[study_id]
+        try:
+            signal = agent.analyze(matrix.row(study_id), study_id)
+        except ValueError:
+            assert row["failed"], study_id
+            continue
+
+        assert not row["failed"], study_id
+        assert row["risk_level"] == signal.risk_level.value, study_id
+        assert row["confidence"] == signal.confidence, study_id
+        assert row["abstained"] == signal.abstained, study_id
+        assert row["features_analyzed"] == signal.features_analyzed, study_id
+
+        expected = {e.feature_name: e.severity for e in signal.evidence}
+        for column in batch.columns:
+            if column.startswith("severity_"):
+                feature = column[len("severity_"):]
+                if feature in expected:
+                    assert row[column] == expected.pop(feature), (study_id, feature)
+                else:
+                    assert math.isnan(row[column]), (study_id, feature)
+        assert expected == {}, study_id
+
+
+# ========================================
+# EQUIVALENCE
+# ========================================
+
+@pytest.mark.parametrize("agent_class", AGENTS, ids=lambda c: c.__name__)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_batch_matches_analyze(agent_class, seed):
+    agent = agent_class()
+    matrix = FeatureMatrix(random_matrix(seed))
+
+    batch = agent.analyze_batch(matrix)
+
+    assert list(batch.index) == list(matrix.index)
+    assert_matches_analyze(agent, matrix, batch)
+
+
+@pytest.mark.parametrize("agent_class", [CodingReadinessAgent, EDCQualityAgent, StabilityAgent, CrossEvidenceAgent])
+def test_variance_abstention_matches_analyze(agent_class):
+    """A strict threshold makes the variance score decide abstention"""
+    agent = agent_class(abstention_threshold=0.85)
+    frame = random_matrix(seed=2, missing_rate=0.05)
+    required = agent_class.REQUIRED_FEATURES
+    frame.loc[frame.index[:50], required] = 42.0  # identical values
+    frame.loc[frame.index[50:80], required] = 0.0  # zero mean
+    matrix = FeatureMatrix(frame)
+
+    batch = agent.analyze_batch(matrix)
+
+    assert batch["abstained"].any() and not batch["abstained"].all()
+    assert_matches_analyze(agent, matrix, batch)
+
+
+# ========================================
+# INPUTS AND FALLBACK
+# ========================================
+
+def test_records_and_array_inputs_agree():
+    frame = random_matrix(seed=3, n_studies=20)
+    records = {
+        study_id: {k: v for k, v in row.items() if not pd.isna(v)}
+        for study_id, row in frame.iterrows()
+    }
+    agent = EDCQualityAgent()
+
+    from_frame = agent.analyze_batch(frame)
+    from_records = agent.analyze_batch(records)
+    from_array = agent.analyze_batch(
+        FeatureMatrix.from_array(frame.to_numpy(), list(frame.columns), list(frame.index))
+    )
+
+    pd.testing.assert_frame_equal(from_frame, from_records)
+    pd.testing.assert_frame_equal(from_frame, from_array)
+
+
+def test_agents_without_vectorized_path_fall_back_to_analyze():
+    agent = CodingReadinessAgent()
+    agent._assess_batch = lambda matrix: None
+    matrix = FeatureMatrix(random_matrix(seed=4, n_studies=50))
+
+    batch = agent.analyze_batch(matrix)
+
+    assert_matches_analyze(agent, matrix, batch)
+
+
+def test_pipeline_evaluates_every_agent():
+    pipeline = AgentPipeline(enable_guardian=False)
+    matrix = FeatureMatrix(random_matrix(seed=5, n_studies=30))
+
+    frames = pipeline.evaluate_matrix(matrix)
+
+    assert list(frames) == list(pipeline.agents)
+    for name, agent in pipeline.agents.items():
+        assert_matches_analyze(agent, matrix, frames[name])
+    assert pipeline.get_pipeline_stats()["matrix_evaluations"] == 1
+    pipeline.close()
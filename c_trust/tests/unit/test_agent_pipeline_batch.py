@@ -0,0 +1,162 @@
+"""
+Unit Tests for AgentPipeline Pool and Batch Mode
+================================================
+Tests the persistent agent pool, per-agent deadlines and streaming
+multi-study batches.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.intelligence.agent_pipeline import AgentPipeline
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+FEATURES = {
+    "missing_pages_pct": 12.0,
+    "form_completion_rate": 88.0,
+    "sae_backlog_days": 6.0,
+    "fatal_sae_count": 1,
+    "open_query_count": 45,
+    "query_aging_days": 12.0,
+    "coding_completion_rate": 82.0,
+    "avg_data_entry_lag_days": 8.0,
+    "edc_validation_pass_rate": 90.0,
+    "enrollment_velocity": 0.85,
+}
+
+
+@pytest.fixture
+def pipeline():
+    agent_pipeline = AgentPipeline(max_workers=4, enable_guardian=False, agent_timeout=0.5)
+    yield agent_pipeline
+    agent_pipeline.close()
+
+
+def slow_down(agent, gate, study_ids):
+    """Make an agent block on gate for the given studies"""
+    analyze = agent.analyze
+
+    def analyze_slowly(features, study_id):
+        if study_id in study_ids:
+            gate.wait(5)
+        return analyze(features, study_id)
+
+    agent.analyze = analyze_slowly
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_pool_is_reused_across_studies(pipeline):
+    pipeline.run_full_analysis("STUDY_01", FEATURES)
+    executor = pipeline._executor
+    pipeline.run_full_analysis("STUDY_02", FEATURES)
+
+    assert executor is not None
+    assert pipeline._executor is executor
+
+
+def test_parallel_matches_sequential(pipeline):
+    parallel = pipeline.run_full_analysis("STUDY_01", FEATURES)
+    sequential = pipeline.run_full_analysis("STUDY_01", FEATURES, parallel=False)
+
+    assert [r.agent_name for r in parallel.agent_results] == list(pipeline.agents)
+    assert parallel.agents_succeeded == sequential.agents_succeeded
+    assert parallel.consensus.risk_level == sequential.consensus.risk_level
+
+
+def test_slow_agent_times_out_with_partial_result(pipeline):
+    gate = threading.Event()
+    slow_down(pipeline.agents["Stability"], gate, {"STUDY_01"})
+
+    start = time.monotonic()
+    result = pipeline.run_full_analysis("STUDY_01", FEATURES)
+    elapsed = time.monotonic() - start
+    gate.set()
+
+    stability = next(r for r in result.agent_results if r.agent_name == "Stability")
+    assert stability.error.startswith("Timed out")
+    assert result.agents_failed == 1
+    assert result.consensus is not None
+    assert elapsed < 3
+    assert pipeline.get_pipeline_stats()["agent_timeouts"] == 1
+
+
+def test_batch_streams_fast_studies_first(pipeline):
+    """A study waiting on a slow agent does not hold up the others"""
+    gate = threading.Event()
+    slow_down(pipeline.agents["Safety & Compliance"], gate, {"STUDY_01"})
+    pipeline.agent_timeout = 10
+
+    batch = pipeline.run_batch({f"STUDY_0{i}": FEATURES for i in range(1, 5)})
+    first_three = [next(batch).study_id for _ in range(3)]
+    gate.set()
+    last = next(batch)
+
+    assert sorted(first_three) == ["STUDY_02", "STUDY_03", "STUDY_04"]
+    assert last.study_id == "STUDY_01"
+    assert last.agents_failed == 0
+    assert list(batch) == []
+
+
+def test_batch_results_match_single_runs(pipeline):
+    studies = {"STUDY_01": FEATURES, "STUDY_02": {**FEATURES, "fatal_sae_count": 5}}
+
+    batch = {r.study_id: r for r in pipeline.run_batch(studies)}
+
+    for study_id, features in studies.items():
+        single = pipeline.run_full_analysis(study_id, features)
+        assert batch[study_id].consensus.risk_level == single.consensus.risk_level
+        assert batch[study_id].dqi_score.overall_score == single.dqi_score.overall_score
+
+
+def test_hung_agents_filling_the_pool_do_not_block_the_study():
+    """Agents that never return hold every worker; the rest still run on a new pool"""
+    pipeline = AgentPipeline(max_workers=2, enable_guardian=False, agent_timeout=0.3, queue_timeout=5)
+    forever = threading.Event()
+    hung = list(pipeline.agents)[:2]  # submitted first, so they take both workers
+    for name in hung:
+        slow_down(pipeline.agents[name], forever, {"STUDY_01"})
+    try:
+        start = time.monotonic()
+        result = pipeline.run_full_analysis("STUDY_01", FEATURES)
+        elapsed = time.monotonic() - start
+
+        failed = {r.agent_name for r in result.agent_results if r.error}
+        assert failed == set(hung)
+        assert result.agents_failed == 2
+        assert result.agents_succeeded + result.agents_abstained == len(pipeline.agents) - 2
+        assert elapsed < 3
+        stats = pipeline.get_pipeline_stats()
+        assert stats["pool_replacements"] == 1
+        assert stats["hung_workers"] == 0
+    finally:
+        forever.set()
+        pipeline.close()
+
+
+def test_agents_that_never_start_abstain_after_queue_timeout():
+    pipeline = AgentPipeline(max_workers=1, enable_guardian=False, agent_timeout=1.0, queue_timeout=0.2)
+    forever = threading.Event()
+    first = next(iter(pipeline.agents))
+    slow_down(pipeline.agents[first], forever, {"STUDY_01"})
+    try:
+        start = time.monotonic()
+        result = pipeline.run_full_analysis("STUDY_01", FEATURES)
+        elapsed = time.monotonic() - start
+
+        assert result.agent_results[0].error.startswith("Timed out")
+        assert all(r.abstained and r.error is None for r in result.agent_results[1:])
+        assert result.agents_abstained == len(pipeline.agents) - 1
+        assert pipeline.get_pipeline_stats()["agents_not_started"] == len(pipeline.agents) - 1
+        assert elapsed < 3
+    finally:
+        forever.set()
+        pipeline.close()
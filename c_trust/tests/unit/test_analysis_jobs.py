@@ -0,0 +1,299 @@
+"""
+Unit Tests for Background Analysis Jobs
+=======================================
+Tests the bounded JobManager and the non-blocking analysis endpoints
+(202 + job ID, status/result polling, WebSocket push).
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import src.api.analysis as analysis_api
+import src.api.main as main_api
+from src.api.main import app
+from src.core.cache import CacheManager
+from src.core.jobs import JobManager, JobQueueFullError, JobStatus, get_job_manager, reset_job_manager
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+def payload(study_id):
+    """Minimal AnalysisResponse payload"""
+    return {
+        "study_id": study_id,
+        "timestamp": datetime.now().isoformat(),
+        "agent_signals": [],
+        "processing_time_ms": 12.0,
+        "agents_succeeded": 7,
+        "agents_failed": 0,
+        "agents_abstained": 0,
+    }
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+@pytest.fixture
+def manager():
+    jobs = JobManager(max_workers=2, max_pending=3, executor="thread", retention=5)
+    yield jobs
+    jobs.close()
+
+
+@pytest.fixture
+def blocked_analysis(tmp_path, monkeypatch):
+    """Analysis API wired to a temp cache and a compute step held until release"""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute(study_id):
+        calls.append(study_id)
+        started.set()
+        release.wait(5)
+        return payload(study_id)
+
+    reset_job_manager()
+    cache = CacheManager(cache_dir=str(tmp_path / "cache"), sweep_interval=0)
+    monkeypatch.setattr(analysis_api, "get_cache", lambda: cache)
+    monkeypatch.setattr(analysis_api, "_compute_analysis_payload", compute)
+    monkeypatch.setattr(
+        analysis_api,
+        "get_study_catalog",
+        lambda: SimpleNamespace(get_study=lambda study_id: object() if study_id == "STUDY_01" else None),
+    )
+
+    yield SimpleNamespace(started=started, release=release, calls=calls, cache=cache)
+
+    release.set()
+    reset_job_manager()
+    cache.close()
+
+
+# ========================================
+# JOB MANAGER
+# ========================================
+
+def test_job_lifecycle_and_on_success(manager):
+    release = threading.Event()
+    job = manager.submit("analysis", "STUDY_01", lambda: release.wait(5) and 41, on_success=lambda r: r + 1)
+
+    wait_for(lambda: manager.get(job.job_id).status == JobStatus.RUNNING)
+    release.set()
+
+    assert job.completion.result(timeout=5) == 42
+    assert job.status == JobStatus.COMPLETED
+    assert job.to_dict()["duration_ms"] is not None
+
+
+def test_same_key_is_coalesced(manager):
+    release = threading.Event()
+    first = manager.submit("analysis", "STUDY_01", release.wait, 5)
+    second = manager.submit("analysis", "STUDY_01", release.wait, 5)
+    release.set()
+
+    assert first is second
+    assert manager.get_stats()["coalesced"] == 1
+
+    first.completion.result(timeout=5)
+    wait_for(lambda: not manager.list_jobs(active_only=True))
+    assert manager.submit("analysis", "STUDY_01", lambda: None) is not first
+
+
+def test_queue_full_rejected(manager):
+    release = threading.Event()
+    for study_id in ("A", "B", "C"):
+        manager.submit("analysis", study_id, release.wait, 5)
+
+    with pytest.raises(JobQueueFullError):
+        manager.submit("analysis", "D", release.wait, 5)
+
+    release.set()
+    assert manager.get_stats()["rejected"] == 1
+
+
+def test_failure_reaches_waiters_and_listeners(manager):
+    finished = []
+    manager.add_listener(finished.append)
+
+    def boom():
+        raise RuntimeError("ingestion failed")
+
+    job = manager.submit("analysis", "STUDY_01", boom)
+
+    with pytest.raises(RuntimeError):
+        job.completion.result(timeout=5)
+    wait_for(lambda: finished == [job])
+    assert job.status == JobStatus.FAILED
+    assert job.error == "ingestion failed"
+
+
+def test_finished_jobs_pruned_beyond_retention(manager):
+    jobs = [manager.submit("analysis", f"S{i}", lambda: None) for i in range(3)]
+    for job in jobs:
+        job.completion.result(timeout=5)
+    wait_for(lambda: not manager.list_jobs(active_only=True))
+
+    for i in range(3, 6):
+        manager.submit("analysis", f"S{i}", lambda: None).completion.result(timeout=5)
+
+    assert len(manager.list_jobs()) <= 5
+    assert manager.get(jobs[0].job_id) is None
+
+
+def test_unknown_executor_rejected():
+    with pytest.raises(ValueError):
+        JobManager(executor="celery")
+
+
+# ========================================
+# API
+# ========================================
+
+def test_post_returns_202_and_result_when_done(blocked_analysis):
+    client = TestClient(app)
+
+    response = client.post("/api/v1/analysis/STUDY_01")
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] in ("queued", "running")
+    assert response.headers["Location"] == job["status_url"]
+
+    assert client.post("/api/v1/analysis/STUDY_01").json()["job_id"] == job["job_id"]
+    assert client.get(job["result_url"]).status_code == 202
+
+    blocked_analysis.release.set()
+    wait_for(lambda: client.get(job["status_url"]).json()["status"] == "completed")
+
+    result = client.get(job["result_url"])
+    assert result.status_code == 200
+    assert result.json()["agents_succeeded"] == 7
+    assert blocked_analysis.cache.get("analysis_STUDY_01")["study_id"] == "STUDY_01"
+    assert blocked_analysis.calls == ["STUDY_01"]
+
+
+def test_unknown_study_and_job(blocked_analysis):
+    client = TestClient(app)
+
+    assert client.post("/api/v1/analysis/STUDY_99").status_code == 404
+    assert client.get("/api/v1/analysis/jobs/analysis_missing").status_code == 404
+
+
+def test_cache_miss_does_not_block_event_loop(blocked_analysis, monkeypatch):
+    """Other requests are served while a cache-miss analysis runs"""
+    pushed = []
+
+    async def record(message):
+        pushed.append(message)
+
+    monkeypatch.setattr(main_api.ws_manager, "broadcast", record)
+
+    async def scenario():
+        get_job_manager().add_listener(partial(main_api._push_job_update, asyncio.get_running_loop()))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            analysis = asyncio.create_task(client.get("/api/v1/analysis/STUDY_01"))
+            while not blocked_analysis.started.is_set():
+                await asyncio.sleep(0.01)
+
+            health = await asyncio.wait_for(client.get("/api/v1/health"), timeout=5)
+            assert not analysis.done()
+
+            blocked_analysis.release.set()
+            response = await asyncio.wait_for(analysis, timeout=5)
+            for _ in range(100):
+                if pushed:
+                    break
+                await asyncio.sleep(0.01)
+            return health, response
+
+    health, response = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert response.status_code == 200
+    assert response.json()["study_id"] == "STUDY_01"
+    assert pushed[0]["type"] == "analysis_job"
+    assert pushed[0]["job"]["status"] == "completed"
+
+
+def test_study_features_ingestion_does_not_block_event_loop(monkeypatch):
+    """Ingestion and feature extraction for /features run off the event loop"""
+    started, release = threading.Event(), threading.Event()
+
+    def ingest_study(study):
+        started.set()
+        release.wait(timeout=5)
+        return {"raw": study.study_id}
+
+    monkeypatch.setattr(main_api, "get_study_catalog", lambda: SimpleNamespace(
+        get_study=lambda study_id: SimpleNamespace(study_id=study_id)))
+    monkeypatch.setattr(main_api, "data_ingestion", SimpleNamespace(ingest_study=ingest_study))
+    monkeypatch.setattr(main_api, "feature_extractor", SimpleNamespace(
+        extract_features=lambda raw_data, study_id: {"source": raw_data["raw"], "n_subjects": 3}))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            features = asyncio.create_task(client.get("/api/v1/studies/STUDY_01/features"))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+
+            health = await asyncio.wait_for(client.get("/api/v1/health"), timeout=5)
+            assert not features.done()
+
+            release.set()
+            return health, await asyncio.wait_for(features, timeout=5)
+
+    health, response = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert response.status_code == 200
+    assert response.json() == {"source": "STUDY_01", "n_subjects": 3}
+
+
+def test_refresh_discovery_does_not_block_event_loop(blocked_analysis, monkeypatch):
+    """Study discovery for POST /refresh runs off the event loop"""
+    started, release = threading.Event(), threading.Event()
+    submitted = []
+
+    def refresh():
+        started.set()
+        release.wait(timeout=5)
+        return {"STUDY_01": object(), "STUDY_02": object()}
+
+    monkeypatch.setattr(analysis_api, "get_study_catalog", lambda: SimpleNamespace(refresh=refresh))
+    monkeypatch.setattr(analysis_api, "get_job_manager", lambda: SimpleNamespace(
+        submit=lambda kind, key, fn, studies: submitted.append(studies)))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            refreshing = asyncio.create_task(client.post("/api/v1/analysis/refresh"))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+
+            health = await asyncio.wait_for(client.get("/api/v1/health"), timeout=5)
+            assert not refreshing.done()
+
+            release.set()
+            return health, await asyncio.wait_for(refreshing, timeout=5)
+
+    health, response = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert response.json()["studies_queued"] == 2
+    assert submitted == [["STUDY_01", "STUDY_02"]]
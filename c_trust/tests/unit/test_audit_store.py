@@ -0,0 +1,150 @@
+"""
+Unit Tests for the Indexed Audit Trail Store
+============================================
+Tests index-backed queries, summaries computed from the index and
+indexing of segments written before the index existed.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.audit import (
+    AuditEvent,
+    AuditEventType,
+    AuditIndexStore,
+    AuditQuery,
+    AuditTrailManager,
+)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def audit_dir(tmp_path):
+    return tmp_path / "audit"
+
+
+@pytest.fixture
+def manager(audit_dir):
+    AuditTrailManager._instance = None
+    manager = AuditTrailManager(storage_path=str(audit_dir))
+    yield manager
+    manager.close()
+    AuditTrailManager._instance = None
+
+
+def _event(index: int, timestamp: datetime, **kwargs) -> AuditEvent:
+    defaults = dict(
+        event_id=f"AUD_TEST_{index:06d}",
+        timestamp=timestamp,
+        event_type=AuditEventType.DATA_PROCESSING,
+        component_name="data_pipeline",
+        action_taken="Process",
+    )
+    defaults.update(kwargs)
+    return AuditEvent(**defaults)
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_queries_seek_by_entity_user_and_type(manager):
+    """Filters are answered from the index, newest first"""
+    for i in range(20):
+        manager.log_event(
+            event_type=AuditEventType.USER_VIEW if i % 2 else AuditEventType.DQI_CALCULATION,
+            component_name="ui" if i % 2 else "dqi",
+            action_taken=f"Action {i}",
+            entity_id=f"SITE_{i % 4:03d}",
+            user_id=f"USER_{i % 5:03d}",
+        )
+
+    history = manager.get_entity_history("SITE_001")
+    assert [e.action_taken for e in history] == [f"Action {i}" for i in (17, 13, 9, 5, 1)]
+
+    actions = manager.get_user_actions("USER_002")
+    assert {e.user_id for e in actions} == {"USER_002"}
+    assert len(actions) == 4
+
+    report = manager.query_events(AuditQuery(event_types=[AuditEventType.USER_VIEW], limit=3, offset=1))
+    assert report.total_count == 10
+    assert [e.action_taken for e in report.events] == ["Action 17", "Action 15", "Action 13"]
+    assert all(e.verify_integrity() for e in report.events)
+
+
+def test_time_range_and_summary_without_loading_events(audit_dir):
+    """Summaries cover every match and come from the index alone"""
+    store = AuditIndexStore(audit_dir)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    records = [
+        _event(
+            i,
+            start + timedelta(days=i),
+            user_id=f"USER_{i % 3:03d}" if i % 2 else None,
+            component_name="dqi" if i % 2 else "data_pipeline",
+        ).to_dict()
+        for i in range(30)
+    ]
+    store.append(records)
+    assert len(list(audit_dir.glob("audit_*.jsonl"))) == 30
+
+    filters = dict(start_time=start + timedelta(days=10), end_time=start + timedelta(days=19))
+    total, page = store.search(limit=5, **filters)
+    assert total == 10
+    assert [r["event_id"] for r in page] == [f"AUD_TEST_{i:06d}" for i in range(19, 14, -1)]
+
+    store._read = None  # summaries and counts must not touch the segments
+    summary = store.summarize(**filters)
+    assert summary["total"] == 10
+    assert summary["by_component"] == {"dqi": 5, "data_pipeline": 5}
+    assert sum(summary["by_user"].values()) == 5
+    assert summary["time_range"]["earliest"] == (start + timedelta(days=10)).isoformat()
+    assert store.count(component_names=["dqi"], **filters) == 5
+    store.close()
+
+
+def test_existing_segments_are_indexed_on_open(audit_dir):
+    """Plain JSONL logs written before the index existed become queryable"""
+    audit_dir.mkdir(parents=True)
+    timestamp = datetime(2025, 3, 4, 9, 30, 0)
+    segment = audit_dir / "audit_20250304.jsonl"
+    with open(segment, "w") as f:
+        for i in range(3):
+            f.write(json.dumps(_event(i, timestamp, entity_id="STUDY_01").to_dict()) + "\n")
+        f.write('{"event_id": "AUD_PARTIAL"')  # torn write at the end
+
+    store = AuditIndexStore(audit_dir)
+    assert store.count(entity_ids=["STUDY_01"]) == 3
+
+    # Completing the torn line makes it visible on the next reindex
+    with open(segment, "a") as f:
+        f.write("\n")
+    with open(segment, "a") as f:
+        f.write(json.dumps(_event(3, timestamp, entity_id="STUDY_01").to_dict()) + "\n")
+    assert store.reindex() == 1
+    assert store.count(entity_ids=["STUDY_01"]) == 4
+    store.close()
+
+    reopened = AuditIndexStore(audit_dir)
+    assert reopened.count() == 4
+    reopened.close()
+
+
+def test_manager_restart_keeps_history(audit_dir, manager):
+    """Events logged by a previous manager are found through the index"""
+    manager.log_user_action(user_id="CRA_01", action="EXPORT", entity_id="SITE_007")
+    manager.close()
+
+    AuditTrailManager._instance = None
+    restarted = AuditTrailManager(storage_path=str(audit_dir))
+    assert len(restarted._events) == 0
+    events = restarted.get_entity_history("SITE_007")
+    assert len(events) == 1
+    assert events[0].event_type == AuditEventType.USER_EXPORT
+    assert restarted.summarize_events(AuditQuery(user_ids=["CRA_01"]))["by_type"] == {"USER_EXPORT": 1}
+    restarted.close()
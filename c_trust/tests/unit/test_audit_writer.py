@@ -0,0 +1,140 @@
+"""
+Unit Tests for the Group-Commit Audit Writer
+============================================
+Tests batching, fsync policies, off-thread callbacks and flush/close
+draining of the background audit writer.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.audit import AuditEventType, AuditIndexStore, AuditQuery, AuditTrailManager
+from src.audit.audit_writer import AuditWriter
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def audit_dir(tmp_path):
+    return tmp_path / "audit"
+
+
+@pytest.fixture
+def store(audit_dir):
+    store = AuditIndexStore(audit_dir)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def manager(audit_dir):
+    AuditTrailManager._instance = None
+    manager = AuditTrailManager(storage_path=str(audit_dir))
+    yield manager
+    manager.close()
+    AuditTrailManager._instance = None
+
+
+def _record(i: int):
+    return {
+        "event_id": f"AUD_W_{i:06d}",
+        "timestamp": f"2025-05-01T10:00:{i % 60:02d}",
+        "event_type": "DATA_PROCESSING",
+        "component_name": "data_pipeline",
+        "action_taken": f"Process {i}",
+    }
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_events_are_group_committed(store):
+    """Events queued while the writer is busy share one commit"""
+    gate = threading.Event()
+    original_append = store.append
+
+    def slow_append(records, sync_each=False):
+        gate.wait(5)
+        original_append(records, sync_each=sync_each)
+
+    store.append = slow_append
+    writer = AuditWriter(store, fsync_mode="batch", batch_size=100)
+
+    for i in range(50):
+        writer.submit(_record(i))
+    gate.set()
+    assert writer.flush(timeout=5)
+
+    assert store.count() == 50
+    assert writer.stats["events"] == 50
+    assert writer.stats["batches"] <= 2
+    writer.close()
+
+
+def test_fsync_policies(store, monkeypatch):
+    """'event' fsyncs per line, 'batch' once per commit, 'interval' on a timer"""
+    syncs = []
+    monkeypatch.setattr("src.audit.audit_store.os.fsync", lambda fd: syncs.append(fd))
+
+    writer = AuditWriter(store, fsync_mode="event")
+    for i in range(3):
+        writer.submit(_record(i))
+    writer.close()
+    assert len(syncs) >= 3
+
+    syncs.clear()
+    writer = AuditWriter(store, fsync_mode="interval", fsync_interval=3600)
+    for i in range(3, 6):
+        writer.submit(_record(i))
+    assert writer.flush(timeout=5)
+    assert syncs == []
+    writer.close()  # close always syncs
+    assert syncs
+
+    with pytest.raises(ValueError):
+        AuditWriter(store, fsync_mode="never")
+
+
+def test_log_event_does_not_wait_for_callbacks(manager):
+    """Slow callbacks run on the writer's callback thread"""
+    release = threading.Event()
+    seen = []
+
+    def slow_callback(event):
+        release.wait(5)
+        seen.append((event.event_id, threading.current_thread().name))
+
+    manager.register_callback(slow_callback)
+
+    started = time.perf_counter()
+    events = [
+        manager.log_event(AuditEventType.AGENT_SIGNAL, "agent.safety", f"Signal {i}", entity_id="STUDY_01")
+        for i in range(20)
+    ]
+    assert time.perf_counter() - started < 1.0
+    assert seen == []
+
+    release.set()
+    assert manager.flush(timeout=5)
+    assert [event_id for event_id, _ in seen] == [e.event_id for e in events]
+    assert {name for _, name in seen} == {"audit-callbacks"}
+
+
+def test_queries_see_queued_events_and_close_drains(audit_dir, manager):
+    """Queries flush the writer first; close persists everything queued"""
+    for i in range(200):
+        manager.log_data_processing(f"Batch {i}", entity_id="STUDY_02")
+    assert manager.count_events(AuditQuery(entity_ids=["STUDY_02"])) == 200
+
+    for i in range(100):
+        manager.log_data_processing(f"Late {i}", entity_id="STUDY_03")
+    manager.close()
+
+    reopened = AuditIndexStore(audit_dir)
+    assert reopened.count(entity_ids=["STUDY_03"]) == 100
+    reopened.close()
@@ -0,0 +1,322 @@
+"""
+Unit Tests for CacheManager Persistence
+=======================================
+Tests per-key SQLite persistence, lazy loading and migration of the
+legacy whole-file JSON cache.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.cache import CacheEntry, CacheManager
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def make_cache(cache_dir):
+    """CacheManager factory: no background sweeper, every manager closed on teardown"""
+    managers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("cache_dir", cache_dir)
+        kwargs.setdefault("sweep_interval", 0)
+        manager = CacheManager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_entries_survive_restart_and_load_lazily(make_cache):
+    """A new manager reads persisted entries on first access only"""
+    make_cache().set("analysis_STUDY_01", {"score": 91.5})
+
+    reopened = make_cache()
+    assert reopened._cache == {}
+    assert reopened.get_stats()["entries_count"] == 1
+
+    assert reopened.get("analysis_STUDY_01") == {"score": 91.5}
+    assert list(reopened._cache) == ["analysis_STUDY_01"]
+
+
+def test_set_writes_only_its_own_key(make_cache, monkeypatch):
+    """Each set persists one row rather than the whole cache"""
+    cache = make_cache()
+    for i in range(20):
+        cache.set(f"key_{i}", {"value": i})
+
+    saved = []
+    real_save = cache._store.save
+    monkeypatch.setattr(cache._store, "save", lambda entry: saved.append(entry.key) or real_save(entry))
+
+    cache.set("key_5", {"value": "updated"})
+
+    assert saved == ["key_5"]
+    assert make_cache().get("key_5") == {"value": "updated"}
+
+
+def test_invalidate_removes_persisted_entry(make_cache):
+    cache = make_cache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.invalidate("a")
+    assert not cache.invalidate("missing")
+
+    reopened = make_cache()
+    assert reopened.get("a") is None
+    assert sorted(reopened.get_all_keys()) == ["b"]
+
+    assert reopened.invalidate_all() == 1
+    assert make_cache().get_all_keys() == []
+
+
+def test_expired_entries_are_purged_on_open(make_cache):
+    cache = make_cache()
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+    cache._store.save(CacheEntry(
+        key="short",
+        data=1,
+        created_at=datetime.now() - timedelta(hours=1),
+        expires_at=datetime.now() - timedelta(minutes=1),
+        data_hash="",
+    ))
+
+    assert make_cache(stale_grace=0).get_all_keys() == ["long"]
+
+
+def test_unserializable_data_stays_in_memory(make_cache):
+    """Values JSON can't encode are still cached for this process"""
+    cache = make_cache()
+    cache.set("when", {"at": datetime(2024, 1, 1)})
+
+    assert cache.get("when") == {"at": datetime(2024, 1, 1)}
+    assert make_cache().get("when") is None
+
+
+def test_legacy_json_file_is_migrated(make_cache, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    live = CacheEntry(
+        key="analysis_STUDY_02",
+        data={"score": 70},
+        created_at=datetime.now(),
+        expires_at=datetime.now() + timedelta(minutes=30),
+        data_hash="",
+    )
+    stale = CacheEntry(
+        key="analysis_STUDY_03",
+        data={"score": 10},
+        created_at=datetime.now() - timedelta(hours=2),
+        expires_at=datetime.now() - timedelta(hours=1),
+        data_hash="",
+    )
+    (cache_dir / CacheManager.CACHE_FILE).write_text(json.dumps({
+        live.key: live.to_dict(),
+        stale.key: stale.to_dict(),
+    }))
+
+    cache = make_cache(cache_dir=str(cache_dir), stale_grace=0)
+
+    assert cache.get("analysis_STUDY_02") == {"score": 70}
+    assert cache.get("analysis_STUDY_03") is None
+    assert not (cache_dir / CacheManager.CACHE_FILE).exists()
+
+
+def test_persistence_disabled_keeps_memory_only(make_cache):
+    cache = make_cache(enable_persistence=False)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get_stats()["entries_count"] == 1
+    assert make_cache().get("a") is None
+
+
+# ========================================
+# CAPACITY POLICY
+# ========================================
+
+def test_lru_eviction_by_entry_count(make_cache):
+    """Least recently used entry leaves memory but is read back from disk"""
+    cache = make_cache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now least recently used
+    cache.set("c", 3)
+
+    assert list(cache._cache) == ["a", "c"]
+    assert cache.get_stats()["evictions"] == 1
+
+    assert cache.get("b") == 2  # read through from the store
+    assert cache.get_stats()["memory_entries"] == 2
+
+
+def test_lfu_eviction_keeps_frequently_used(make_cache):
+    cache = make_cache(max_entries=2, eviction_policy="lfu")
+    cache.set("hot", 1)
+    cache.set("cold", 2)
+    for _ in range(3):
+        cache.get("hot")
+    cache.get("cold")
+    cache.set("new", 3)
+
+    assert sorted(cache._cache) == ["hot", "new"]
+
+
+def test_byte_bound_tracks_bytes_held(make_cache):
+    """Approximate bytes are accounted and bounded"""
+    cache = make_cache(enable_persistence=False, max_bytes=250)
+    for i in range(5):
+        cache.set(f"key_{i}", "x" * 100)
+
+    stats = cache.get_stats()
+    assert stats["bytes_held"] <= 250
+    assert stats["bytes_held"] == sum(e.size_bytes for e in cache._cache.values())
+    assert stats["evictions"] == 3
+    assert cache.get("key_0") is None  # no store to read back from
+
+
+def test_sweep_removes_expired_entries(make_cache):
+    cache = make_cache(stale_grace=0)
+    cache.set("live", 1)
+    cache.set("stale", 2)
+    cache._cache["stale"].expires_at = datetime.now() - timedelta(seconds=1)
+    cache._store.save(cache._cache["stale"])
+
+    assert cache.sweep_expired() == 1
+    assert list(cache._cache) == ["live"]
+    assert cache.get_all_keys() == ["live"]
+    assert cache.get_stats()["expired_removed"] == 1
+
+
+def test_stale_grace_survives_running_sweeper(make_cache):
+    """Expired entries inside the grace window are served stale, past it they are swept"""
+    cache = make_cache(sweep_interval=0.05, stale_grace=60)
+    cache.set("k", "old")
+    cache._cache["k"].expires_at = datetime.now() - timedelta(seconds=1)
+    cache._store.save(cache._cache["k"])
+    time.sleep(0.3)  # several sweeps
+
+    assert cache.get("k") is None  # expired: a miss, but kept
+    assert "k" in cache._cache and cache.get_all_keys() == ["k"]
+
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        return "new"
+
+    start = time.monotonic()
+    assert cache.get_or_compute_background("k", compute) == "old"
+    assert time.monotonic() - start < 1
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.get("k") != "new" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get("k") == "new"
+
+    cache.stale_grace = 0.1
+    cache._cache["k"].expires_at = datetime.now() - timedelta(seconds=1)
+    cache._store.save(cache._cache["k"])
+    deadline = time.monotonic() + 5
+    while cache.get_all_keys() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get_all_keys() == []
+
+
+def test_unknown_eviction_policy_rejected(make_cache):
+    with pytest.raises(ValueError):
+        make_cache(eviction_policy="fifo")
+
+
+# ========================================
+# SINGLE-FLIGHT
+# ========================================
+
+def test_concurrent_misses_compute_once(make_cache):
+    """Callers missing the same key share a single computation"""
+    cache = make_cache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"score": 88}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get_or_compute, "analysis_STUDY_01", compute) for _ in range(8)]
+        while cache.get_stats()["coalesced_requests"] < 7:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert calls == [1]
+    assert results == [{"score": 88}] * 8
+
+
+def test_waiters_receive_compute_error(make_cache):
+    """An exception in the shared computation reaches every waiter"""
+    cache = make_cache()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise RuntimeError("pipeline failed")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(cache.get_or_compute, "k", compute) for _ in range(3)]
+        while cache.get_stats()["coalesced_requests"] < 2:
+            time.sleep(0.01)
+        release.set()
+        for f in futures:
+            with pytest.raises(RuntimeError):
+                f.result(timeout=5)
+
+    assert cache._inflight == {}
+
+
+def test_stale_entry_refreshed_once_in_background(make_cache):
+    """Stale reads return immediately and queue a single refresh"""
+    cache = make_cache(refresh_workers=2)
+    cache.set("k", "old")
+    cache._cache["k"].expires_at = datetime.now() - timedelta(seconds=1)
+
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "new"
+
+    assert [cache.get_or_compute_background("k", compute) for _ in range(5)] == ["old"] * 5
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.get("k") != "new" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cache.get("k") == "new"
+    assert calls == [1]
+    assert cache.get_stats()["coalesced_requests"] == 4
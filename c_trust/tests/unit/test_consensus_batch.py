@@ -0,0 +1,221 @@
+"""
+Unit Tests for Batch Consensus
+==============================
+Tests that calculate_consensus_batch over (entity × agent) arrays agrees
+with the per-entity calculate_consensus, and that explanations are built
+on demand.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.intelligence.agent_pipeline import AgentPipeline
+from src.intelligence.base_agent import AgentSignal, AgentType, RiskSignal
+from src.intelligence.consensus import ConsensusEngine, RiskAssessmentEngine
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+AGENT_TYPES = [
+    AgentType.COMPLETENESS,
+    AgentType.SAFETY,
+    AgentType.QUERY_QUALITY,
+    AgentType.CODING,
+    AgentType.TIMELINE,
+    AgentType.OPERATIONS,
+    AgentType.STABILITY,
+    AgentType.COMPLIANCE,
+]
+
+LEVELS = [RiskSignal.LOW, RiskSignal.MEDIUM, RiskSignal.HIGH, RiskSignal.CRITICAL]
+
+
+@pytest.fixture
+def engine():
+    return ConsensusEngine()
+
+
+def abstention_reason(row, agent_type):
+    """Distinct per agent, and missing for some abstentions"""
+    if row % 5 == 0:
+        return None
+    return f"Missing {agent_type.value} features for row {row}. Needs source data"
+
+
+def random_inputs(seed, n_entities=300):
+    """Scores, confidences and abstention masks; some agents produce no signal"""
+    rng = np.random.default_rng(seed)
+    shape = (n_entities, len(AGENT_TYPES))
+    levels = rng.integers(0, len(LEVELS), shape)
+    scores = np.array([ConsensusEngine.RISK_SCORES[LEVELS[i]] for i in levels.ravel()]).reshape(shape)
+    scores[rng.random(shape) < 0.1] = np.nan
+    confidences = np.round(rng.uniform(0.3, 1.0, shape), rng.integers(1, 4))
+    abstained = rng.random(shape) < rng.uniform(0, 0.6, (n_entities, 1))
+    return scores, confidences, abstained
+
+
+def signals_for(scores, confidences, abstained, row, agent_types=AGENT_TYPES):
+    signals = []
+    for j, agent_type in enumerate(agent_types):
+        if np.isnan(scores[row, j]):
+            continue
+        if abstained[row, j]:
+            signals.append(AgentSignal(
+                agent_type=agent_type,
+                risk_level=RiskSignal.UNKNOWN,
+                confidence=0.0,
+                abstained=True,
+                abstention_reason=abstention_reason(row, agent_type) or "Missing required features",
+            ))
+        else:
+            signals.append(AgentSignal(
+                agent_type=agent_type,
+                risk_level=ConsensusEngine.SCORE_SIGNALS[scores[row, j]],
+                confidence=float(confidences[row, j]),
+            ))
+    return signals
+
+
+# ========================================
+# EQUIVALENCE
+# ========================================
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_matches_calculate_consensus(engine, seed):
+    scores, confidences, abstained = random_inputs(seed)
+    entity_ids = [f"SITE_{i:03d}" for i in range(len(scores))]
+
+    reasons = np.array(
+        [[abstention_reason(i, t) or "Missing required features" for t in AGENT_TYPES] for i in range(len(scores))],
+        dtype=object,
+    )
+
+    batch = engine.calculate_consensus_batch(
+        scores, confidences, abstained, AGENT_TYPES, entity_ids, abstention_reasons=reasons
+    )
+
+    for i, entity_id in enumerate(entity_ids):
+        signals = signals_for(scores, confidences, abstained, i)
+        try:
+            expected = engine.calculate_consensus(signals, entity_id)
+        except ValueError:
+            # Rounding can push an all-critical score just above 100
+            assert batch.failed[i]
+            continue
+        assert not batch.failed[i]
+        decision = batch.decision(entity_id)
+
+        assert decision.risk_level == expected.risk_level
+        assert decision.risk_score == expected.risk_score
+        assert decision.confidence == pytest.approx(expected.confidence, abs=1e-12)
+        assert decision.recommended_action == expected.recommended_action
+        assert decision.total_agents == expected.total_agents
+        assert decision.abstained_agents == expected.abstained_agents
+        assert [c.__dict__ for c in decision.contributing_agents] == \
+            [c.__dict__ for c in expected.contributing_agents]
+        assert decision.explanation == expected.explanation
+
+
+def test_negative_weights_flag_out_of_range_scores():
+    """A negative-weight agent can drive the score below 0 (calculate_consensus raises)"""
+    engine = ConsensusEngine(custom_weights={AgentType.STABILITY: -1.5})
+    types = [AgentType.SAFETY, AgentType.CODING, AgentType.TIMELINE, AgentType.STABILITY]
+    scores = np.array([[100.0, 25.0, 25.0, 25.0], [25.0, 25.0, 25.0, 100.0]])
+    confidences = np.ones(scores.shape)
+    abstained = np.zeros(scores.shape, bool)
+
+    batch = engine.calculate_consensus_batch(scores, confidences, abstained, types)
+
+    assert list(batch.failed) == [False, True]
+    assert batch.risk_level[1] == "unknown"
+    with pytest.raises(ValueError):
+        engine.calculate_consensus(signals_for(scores, confidences, abstained, 1, types), "1")
+    with pytest.raises(ValueError):
+        batch.decision("1")
+
+
+def test_shape_mismatch_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.calculate_consensus_batch(np.zeros((2, 3)), np.zeros((2, 3)), np.zeros((2, 3), bool), AGENT_TYPES)
+    with pytest.raises(ValueError):
+        engine.calculate_consensus_batch(
+            np.zeros((2, 3)), np.zeros((2, 3)), np.zeros((2, 3), bool), AGENT_TYPES[:3],
+            abstention_reasons=np.empty((2, 2), dtype=object),
+        )
+
+
+def test_explanation_quotes_abstention_reasons(engine):
+    types = AGENT_TYPES[:5]
+    scores = np.full((1, 5), 50.0)
+    abstained = np.array([[False, True, False, True, False]])
+    reasons = np.array([[None, "No SAE data. Export missing", None, None, None]], dtype=object)
+
+    batch = engine.calculate_consensus_batch(scores, np.ones((1, 5)), abstained, types, abstention_reasons=reasons)
+    explanation = batch.explanation("0")
+
+    assert "Abstained: safety, coding" in explanation
+    assert "Reasons: safety: No SAE data" in explanation
+    assert "coding:" not in explanation.split("Reasons:")[1]
+
+
+# ========================================
+# LAZY EXPLANATIONS AND SCALE
+# ========================================
+
+def test_explanations_built_only_on_request(engine, monkeypatch):
+    calls = []
+    explain = engine._generate_explanation_with_abstentions
+    monkeypatch.setattr(
+        engine, "_generate_explanation_with_abstentions", lambda *a, **k: calls.append(1) or explain(*a, **k)
+    )
+    scores, confidences, _ = random_inputs(seed=3, n_entities=50)
+    abstained = np.zeros(scores.shape, bool)
+
+    batch = engine.calculate_consensus_batch(scores, confidences, abstained, AGENT_TYPES)
+    assert calls == []
+    assert len(batch.to_frame()) == 50
+
+    assert batch.explanation("7").startswith("Risk Level:")
+    assert calls == [1]
+
+
+def test_thousands_of_sites_under_a_second():
+    assessor = RiskAssessmentEngine()
+    scores, confidences, abstained = random_inputs(seed=4, n_entities=20000)
+    site_ids = [f"SITE_{i}" for i in range(len(scores))]
+
+    start = time.perf_counter()
+    batch = assessor.assess_sites_batch(scores, confidences, abstained, AGENT_TYPES, "STUDY_01", site_ids)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert batch.entity_ids[0] == "STUDY_01/SITE_0"
+    assert batch.decision("STUDY_01/SITE_5").study_id == "STUDY_01/SITE_5"
+
+
+def test_pipeline_consensus_matrix_matches_full_analysis():
+    pipeline = AgentPipeline(enable_guardian=False)
+    studies = {
+        "STUDY_01": {"missing_pages_pct": 12.0, "form_completion_rate": 88.0, "fatal_sae_count": 1.0,
+                     "open_query_count": 45.0, "query_aging_days": 12.0, "coding_completion_rate": 82.0,
+                     "coding_backlog_days": 9.0, "avg_data_entry_lag_days": 8.0,
+                     "data_entry_errors": 3.0, "enrollment_velocity": 85.0,
+                     "site_activation_rate": 70.0, "dropout_rate": 12.0},
+        "STUDY_02": {"form_completion_rate": 99.0, "sae_backlog_days": 1.0, "open_query_count": 5.0,
+                     "avg_data_entry_lag_days": 2.0, "overdue_visits_count": 1.0},
+        "STUDY_03": {"open_query_count": 250.0},
+    }
+
+    batch = pipeline.consensus_matrix(studies)
+
+    for study_id, features in studies.items():
+        expected = pipeline.run_full_analysis(study_id, features, parallel=False).consensus
+        decision = batch.decision(study_id)
+        assert decision.risk_level == expected.risk_level
+        assert decision.risk_score == expected.risk_score
+        assert decision.confidence == pytest.approx(expected.confidence, abs=1e-12)
+    pipeline.close()
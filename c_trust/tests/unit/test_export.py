@@ -7,11 +7,9 @@ Phase 4, Task 17: Unit Tests for Export
 """
 
 import csv
-import json
 import pytest
 from datetime import datetime, timedelta
-from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import Mock, patch
 
 from src.api.export import (
     get_export_data,
@@ -23,6 +21,7 @@ from src.api.export import (
     EXPORT_DIR,
     EXPORT_EXPIRATION_HOURS
 )
+from src.api.study_store import get_study_store, reset_study_store
 
 
 # ========================================
@@ -119,11 +118,18 @@ def sample_export_data():
 # TEST: Data Retrieval
 # ========================================
 
-def test_get_export_data_all_studies(mock_cache_data):
+@pytest.fixture
+def study_store():
+    """Fresh study result store"""
+    reset_study_store()
+    yield get_study_store()
+    reset_study_store()
+
+
+def test_get_export_data_all_studies(study_store, mock_cache_data):
     """Test retrieving all studies for export"""
-    with patch('builtins.open', mock_open(read_data=json.dumps(mock_cache_data))):
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    study_store.publish(mock_cache_data, persist=False)
+    data = get_export_data()
     
     assert len(data) == 2
     assert data[0]['study_id'] == 'STUDY_01'
@@ -132,29 +138,29 @@ def test_get_export_data_all_studies(mock_cache_data):
     assert data[1]['dqi_score'] == 72.3
 
 
-def test_get_export_data_filtered_studies(mock_cache_data):
+def test_get_export_data_filtered_studies(study_store, mock_cache_data):
     """Test retrieving specific studies for export"""
-    with patch('builtins.open', mock_open(read_data=json.dumps(mock_cache_data))):
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data(study_ids=['STUDY_01'])
+    study_store.publish(mock_cache_data, persist=False)
+    data = get_export_data(study_ids=['STUDY_01'])
     
     assert len(data) == 1
     assert data[0]['study_id'] == 'STUDY_01'
 
 
-def test_get_export_data_no_cache():
+def test_get_export_data_no_cache(study_store):
     """Test handling missing data cache"""
-    with patch('pathlib.Path.exists', return_value=False):
-        data = get_export_data()
+    data = get_export_data()
     
     assert data == []
 
 
-def test_get_export_data_invalid_json():
+def test_get_export_data_invalid_json(study_store, tmp_path):
     """Test handling invalid JSON in cache"""
-    with patch('builtins.open', mock_open(read_data="invalid json")):
-        with patch('pathlib.Path.exists', return_value=True):
-            data = get_export_data()
+    study_store.results_file = tmp_path / "data_cache.json"
+    study_store.results_file.write_text("invalid json")
+    
+    assert not study_store.load()
+    data = get_export_data()
     
     assert data == []
 
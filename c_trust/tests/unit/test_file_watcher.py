@@ -0,0 +1,150 @@
+"""
+Unit Tests for FileWatcher
+==========================
+Tests stat-first change detection, touch filtering by content hash,
+deletion reporting and the polling and event-driven backends.
+"""
+
+import os
+import time
+
+import pytest
+
+from src.core.scheduler import WATCHDOG_AVAILABLE, FileWatcher, hash_file
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def watch_dir(tmp_path):
+    """Directory with one workbook in a nested study folder"""
+    study = tmp_path / "Study 1_CPID_Input Files"
+    study.mkdir()
+    (study / "Study 1_Missing_Pages_Report.xlsx").write_bytes(b"original contents")
+    (study / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+def bump_mtime(path):
+    """Advance mtime without touching contents"""
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def polling_watcher(watch_dir):
+    return FileWatcher([str(watch_dir)], backend="polling")
+
+
+# ========================================
+# POLLING BACKEND
+# ========================================
+
+def test_baseline_records_stat_only(watch_dir):
+    """Startup records stat signatures without reading any file"""
+    watcher = polling_watcher(watch_dir)
+
+    stats = watcher.get_stats()
+    assert stats["files_tracked"] == 1
+    assert watcher._files_hashed == 0
+    assert stats["backend"] == "polling"
+    assert watcher.check_now() == []
+
+
+def test_new_and_resized_files_reported(watch_dir):
+    """New files and size changes are reported without hashing"""
+    watcher = polling_watcher(watch_dir)
+    workbook = watch_dir / "Study 1_CPID_Input Files" / "Study 1_Missing_Pages_Report.xlsx"
+    new_file = watch_dir / "Study 1_CPID_Input Files" / "Study 1_eSAE_Dashboard.xlsx"
+
+    workbook.write_bytes(b"longer replacement contents")
+    new_file.write_bytes(b"new")
+
+    assert sorted(watcher.check_now()) == sorted([str(workbook), str(new_file)])
+    assert watcher.get_stats()["files_hashed"] == 0
+
+    # Unchanged stat signatures are not re-read
+    assert watcher.check_now() == []
+    assert watcher.get_stats()["files_hashed"] == 0
+
+
+def test_touch_only_change_is_filtered_by_hash(watch_dir):
+    """Once a digest is known, an mtime bump with identical contents is not a change"""
+    watcher = polling_watcher(watch_dir)
+    workbook = watch_dir / "Study 1_CPID_Input Files" / "Study 1_Missing_Pages_Report.xlsx"
+
+    # No earlier digest: the first same-size change counts, and is hashed
+    bump_mtime(workbook)
+    assert watcher.check_now() == [str(workbook)]
+    assert watcher.get_stats()["files_hashed"] == 1
+
+    bump_mtime(workbook)
+    assert watcher.check_now() == []
+
+    workbook.write_bytes(b"modified contents")  # same size
+    bump_mtime(workbook)
+    assert watcher.check_now() == [str(workbook)]
+    assert watcher.get_stats()["files_hashed"] == 3
+
+
+def test_deleted_files_are_reported_and_dropped(watch_dir):
+    """Removed files are reported once and stop being tracked"""
+    watcher = polling_watcher(watch_dir)
+    workbook = watch_dir / "Study 1_CPID_Input Files" / "Study 1_Missing_Pages_Report.xlsx"
+    workbook.unlink()
+
+    assert watcher.check_now() == [str(workbook)]
+    assert watcher.get_stats()["files_tracked"] == 0
+    assert watcher.check_now() == []
+
+    # Candidate paths (event backend) that no longer exist are reported the same way
+    workbook.write_bytes(b"restored")
+    assert watcher.check_now() == [str(workbook)]
+    workbook.unlink()
+    assert watcher._check_paths(watcher._stat_paths({str(workbook)}), full_scan=False) == [str(workbook)]
+
+
+def test_unknown_backend_rejected(watch_dir):
+    with pytest.raises(ValueError):
+        FileWatcher([str(watch_dir)], backend="fanotify")
+
+
+def test_hash_file_is_content_based(tmp_path):
+    first = tmp_path / "a.xlsx"
+    second = tmp_path / "b.xlsx"
+    first.write_bytes(b"x" * 3_000_000)
+    second.write_bytes(b"x" * 3_000_000)
+
+    assert hash_file(first) == hash_file(second)
+    second.write_bytes(b"x" * 2_999_999 + b"y")
+    assert hash_file(first) != hash_file(second)
+
+
+# ========================================
+# EVENT BACKEND
+# ========================================
+
+@pytest.mark.skipif(not WATCHDOG_AVAILABLE, reason="watchdog not installed")
+def test_event_backend_reports_debounced_change(watch_dir):
+    """A burst of writes is reported once after the debounce period"""
+    watcher = FileWatcher([str(watch_dir)], backend="events", debounce_seconds=0.3)
+    changes = []
+    watcher.add_change_callback(changes.append)
+    watcher.start()
+    try:
+        new_file = watch_dir / "Study 1_CPID_Input Files" / "Study 1_eSAE_Dashboard.xlsx"
+        with open(new_file, "wb") as f:
+            for _ in range(5):
+                f.write(b"chunk")
+                f.flush()
+                time.sleep(0.02)
+
+        deadline = time.monotonic() + 5
+        while not changes and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+
+    assert changes == [[str(new_file)]]
+    assert watcher.get_stats()["backend"] == "events"
@@ -0,0 +1,123 @@
+"""
+Unit Tests for the Guardian Event Store
+=======================================
+Tests retention, time-ordered secondary indexes, windowed queries and
+spilling of evicted events.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.guardian.event_store import GuardianEventStore
+from src.guardian.guardian_agent import (
+    GuardianAgent,
+    GuardianEvent,
+    GuardianEventType,
+    GuardianSeverity,
+)
+
+
+# ========================================
+# HELPERS
+# ========================================
+
+BASE_TIME = datetime(2025, 6, 1, 8, 0, 0)
+
+
+def _event(i: int, minutes: float = None, **kwargs) -> GuardianEvent:
+    defaults = dict(
+        event_id=f"EVT_{i:05d}",
+        event_type=GuardianEventType.STALENESS_DETECTED,
+        severity=GuardianSeverity.WARNING,
+        entity_id=f"STUDY_{i % 3:02d}",
+        snapshot_id=f"SNAP_{i}",
+        data_delta_summary="delta",
+        expected_behavior="expected",
+        actual_behavior="actual",
+        recommendation="review",
+        timestamp=BASE_TIME + timedelta(minutes=i if minutes is None else minutes),
+    )
+    defaults.update(kwargs)
+    return GuardianEvent(**defaults)
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_ring_buffer_retention_keeps_indexes_consistent():
+    """Oldest events are evicted from the primary order and every index"""
+    store = GuardianEventStore(max_events=10, max_age_hours=0)
+    for i in range(25):
+        store.add(_event(i))
+
+    assert len(store) == 10
+    assert store.evicted_count == 15
+    assert [e.event_id for e in store.query(limit=3)] == ["EVT_00024", "EVT_00023", "EVT_00022"]
+    assert sum(store.counts_by("entity_id").values()) == 10
+    assert store.count(entity_id="STUDY_00") == len([i for i in range(15, 25) if i % 3 == 0])
+    assert store.get("EVT_00000") is None
+
+
+def test_filtered_queries_are_newest_first_and_windowed():
+    store = GuardianEventStore(max_events=1000, max_age_hours=0)
+    for i in range(60):
+        severity = GuardianSeverity.CRITICAL if i % 10 == 0 else GuardianSeverity.INFO
+        store.add(_event(i, severity=severity))
+
+    critical = store.query(severity=GuardianSeverity.CRITICAL)
+    assert [e.event_id for e in critical] == [f"EVT_{i:05d}" for i in (50, 40, 30, 20, 10, 0)]
+
+    combined = store.query(entity_id="STUDY_01", severity=GuardianSeverity.CRITICAL, limit=2)
+    assert [e.event_id for e in combined] == ["EVT_00040", "EVT_00010"]
+
+    window = store.query(since=BASE_TIME + timedelta(minutes=20), until=BASE_TIME + timedelta(minutes=24))
+    assert [e.event_id for e in window] == [f"EVT_{i:05d}" for i in range(24, 19, -1)]
+
+    assert store.query(entity_id="UNKNOWN") == []
+    assert store.count(severity=GuardianSeverity.CRITICAL) == 6
+
+
+def test_out_of_order_and_duplicate_events():
+    store = GuardianEventStore(max_events=100, max_age_hours=0)
+    store.add(_event(1, minutes=10))
+    store.add(_event(2, minutes=30))
+    store.add(_event(3, minutes=20))
+
+    assert [e.event_id for e in store.query()] == ["EVT_00002", "EVT_00003", "EVT_00001"]
+    assert store.add(_event(2, minutes=30)) is False
+    assert len(store) == 3
+
+
+def test_age_retention_spills_to_disk(tmp_path):
+    store = GuardianEventStore(max_events=100, max_age_hours=1, spill_dir=str(tmp_path))
+    now = datetime.now()
+    store.add(_event(1, timestamp=now - timedelta(hours=3)))
+    store.add(_event(2, timestamp=now - timedelta(hours=2)))
+    store.add(_event(3, timestamp=now))
+
+    assert [e.event_id for e in store.query()] == ["EVT_00003"]
+    assert store.spilled_count == 2
+
+    spilled = list(store.spilled_events(since=now - timedelta(hours=2, minutes=30)))
+    assert [d["event_id"] for d in spilled] == ["EVT_00002"]
+    lines = [json.loads(l) for p in tmp_path.glob("*.jsonl") for l in p.read_text().splitlines()]
+    assert {d["event_id"] for d in lines} == {"EVT_00001", "EVT_00002"}
+
+
+def test_guardian_agent_uses_store():
+    """get_events, clear_events and event_count go through the store"""
+    guardian = GuardianAgent(event_store=GuardianEventStore(max_events=5, max_age_hours=0))
+    for i in range(8):
+        guardian.raise_integrity_warning(f"SITE_{i % 2}", f"SNAP_{i}", f"Issue {i}", "Check")
+
+    assert guardian.event_count == 5
+    recent = guardian.get_events(limit=2)
+    assert [e.actual_behavior for e in recent] == ["Issue 7", "Issue 6"]
+    assert guardian.count_events(entity_id="SITE_1") == 3
+
+    assert guardian.clear_events(entity_id="SITE_1") == 3
+    assert {e.entity_id for e in guardian.get_events()} == {"SITE_0"}
+    assert guardian.run_self_diagnostic()["checks"]["event_storage"]["evicted"] == 3
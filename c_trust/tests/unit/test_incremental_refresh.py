@@ -0,0 +1,134 @@
+"""
+Unit Tests for Incremental Refresh
+==================================
+Tests that watcher change sets are mapped back to studies and file types,
+and that only the affected studies are re-analyzed.
+"""
+
+import pandas as pd
+import pytest
+
+from src.core.scheduler import AnalysisScheduler, RefreshScheduler
+from src.data.ingestion import StudyDiscovery
+from src.data.study_catalog import StudyCatalog
+from src.data.models import FileType
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def data_root(tmp_path):
+    """Three studies with one workbook each"""
+    root = tmp_path / "studies"
+    for number in (1, 2, 3):
+        folder = root / f"Study {number}_CPID_Input Files"
+        folder.mkdir(parents=True)
+        pd.DataFrame({"Site ID": ["S1"], "Subject ID": ["P1"]}).to_excel(
+            folder / f"Study {number}_Missing_Pages_Report.xlsx", index=False
+        )
+    (root / "notes").mkdir()
+    return root
+
+
+# ========================================
+# CHANGE MAPPING
+# ========================================
+
+def test_known_file_maps_to_study_and_type(data_root):
+    """Files from discovery metadata map to their study and FileType"""
+    discovery = StudyDiscovery(str(data_root))
+    discovery.discover_all_studies()
+
+    changed = [str(data_root / "Study 2_CPID_Input Files" / "Study 2_Missing_Pages_Report.xlsx")]
+
+    assert discovery.map_changed_files(changed) == {"STUDY_02": {FileType.MISSING_PAGES}}
+
+
+def test_new_file_maps_by_folder(data_root):
+    """A file added after discovery is attributed to its study folder"""
+    discovery = StudyDiscovery(str(data_root))
+    discovery.discover_all_studies()
+
+    new_file = data_root / "Study 3_CPID_Input Files" / "Study 3_eSAE_Dashboard.xlsx"
+    pd.DataFrame({"Study": ["STUDY_03"]}).to_excel(new_file, index=False)
+
+    assert discovery.map_changed_files([str(new_file)]) == {"STUDY_03": {FileType.SAE_DM}}
+
+
+def test_unrelated_files_are_ignored(data_root, tmp_path):
+    """Files outside study folders or with unknown names map to nothing"""
+    discovery = StudyDiscovery(str(data_root))
+
+    changed = [
+        str(data_root / "notes" / "Study 1_Missing_Pages_Report.xlsx"),
+        str(data_root / "Study 1_CPID_Input Files" / "scratch.xlsx"),
+        str(tmp_path / "elsewhere.xlsx"),
+    ]
+
+    assert discovery.map_changed_files(changed) == {}
+
+
+def test_discover_study_returns_single_study(data_root):
+    """discover_study finds one study by ID"""
+    discovery = StudyDiscovery(str(data_root))
+
+    study = discovery.discover_study("STUDY_02")
+
+    assert study.study_id == "STUDY_02"
+    assert FileType.MISSING_PAGES.value in study.metadata["file_paths"]
+    assert discovery.discover_study("STUDY_99") is None
+
+
+# ========================================
+# SCHEDULER DISPATCH
+# ========================================
+
+def make_scheduler(data_root):
+    """Refresh scheduler recording which callback ran"""
+    scheduler = RefreshScheduler(data_path=str(data_root), enable_file_watcher=False)
+    calls = []
+    scheduler.set_refresh_callback(lambda: calls.append("full"))
+    scheduler.set_change_callback(lambda files: calls.append(files))
+    return scheduler, calls
+
+
+def test_file_changes_run_change_callback(data_root):
+    """Accumulated watcher changes are delivered once, deduplicated"""
+    scheduler, calls = make_scheduler(data_root)
+
+    scheduler._on_file_change(["b.xlsx", "a.xlsx"])
+    scheduler._on_file_change(["a.xlsx"])
+    assert scheduler._should_refresh()
+    scheduler._do_refresh()
+
+    assert calls == [["a.xlsx", "b.xlsx"]]
+    assert scheduler.get_status()["pending_changes"] == 0
+    assert scheduler.get_status()["incremental_refresh_count"] == 1
+
+
+def test_manual_trigger_runs_full_refresh(data_root):
+    """A manual trigger wins over pending file changes"""
+    scheduler, calls = make_scheduler(data_root)
+
+    scheduler._on_file_change(["a.xlsx"])
+    scheduler.trigger_refresh()
+    scheduler._do_refresh()
+
+    assert calls == ["full"]
+
+
+def test_analysis_scheduler_refreshes_only_affected_studies(data_root):
+    """Only studies owning a changed file are re-analyzed"""
+    refreshed = []
+
+    scheduler = AnalysisScheduler(on_changed_studies=refreshed.extend)
+    scheduler._catalog = StudyCatalog(StudyDiscovery(str(data_root)))
+
+    scheduler._refresh_changed_files([
+        str(data_root / "Study 3_CPID_Input Files" / "Study 3_Missing_Pages_Report.xlsx"),
+        str(data_root / "Study 1_CPID_Input Files" / "Study 1_Missing_Pages_Report.xlsx"),
+    ])
+
+    assert refreshed == ["STUDY_01", "STUDY_03"]
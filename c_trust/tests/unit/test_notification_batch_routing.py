@@ -0,0 +1,153 @@
+"""
+Unit Tests for Batched Notification Routing
+===========================================
+Tests the incremental role -> users directory, route_batch, off-thread
+batched delivery callbacks and routing of SystemAlert bursts.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.api.study_store import StudyResultStore
+from src.notifications.notification_engine import (
+    NotificationPriority,
+    NotificationRoutingEngine,
+    NotificationStatus,
+    NotificationType,
+    UserRole,
+)
+from src.notifications.system_based_notifications import SystemBasedNotificationEngine
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def engine():
+    engine = NotificationRoutingEngine()
+    yield engine
+    engine.close()
+
+
+def _notification(engine, i, notification_type=NotificationType.SITE_OPERATIONAL):
+    return engine.create_notification(
+        notification_type=notification_type,
+        priority=NotificationPriority.MEDIUM,
+        title=f"Issue {i}",
+        message="Site issue",
+        entity_id=f"SITE_{i:03d}",
+    )
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_directory_routes_only_to_target_roles(engine):
+    engine.register_users({f"CRA_{i}": UserRole.CRA for i in range(3)})
+    engine.register_users({f"DM_{i}": UserRole.DATA_MANAGER for i in range(2)})
+    engine.register_user("LEAD_0", UserRole.STUDY_LEAD)
+
+    deliveries = engine.route_notification(_notification(engine, 0))
+    assert [d.user_id for d in deliveries] == ["CRA_0", "CRA_1", "CRA_2"]
+
+    safety = engine.route_notification(_notification(engine, 1, NotificationType.SAFETY_ALERT))
+    assert {d.user_id for d in safety} == {"LEAD_0", "DM_0", "DM_1", "CRA_0", "CRA_1", "CRA_2"}
+
+    # Role changes and removals update the index incrementally
+    engine.register_user("CRA_0", UserRole.DATA_MANAGER)
+    assert engine.unregister_user("CRA_1") is True
+    assert engine.unregister_user("CRA_1") is False
+    assert engine.get_users(UserRole.CRA) == {"CRA_2": UserRole.CRA}
+    deliveries = engine.route_notification(_notification(engine, 2))
+    assert [d.user_id for d in deliveries] == ["CRA_2"]
+
+
+def test_route_batch_builds_deliveries_in_bulk(engine):
+    engine.register_users({"CRA_0": UserRole.CRA, "DM_0": UserRole.DATA_MANAGER})
+    notifications = [_notification(engine, i) for i in range(5)]
+    notifications.append(_notification(engine, 5, NotificationType.CODING_ISSUE))
+
+    deliveries = engine.route_batch(notifications)
+
+    assert [d.notification_id for d in deliveries] == [n.notification_id for n in notifications]
+    assert len({d.delivery_id for d in deliveries}) == 6
+    assert engine.get_unread_count("CRA_0") == 5
+    assert engine.get_unread_count("DM_0") == 1
+    assert all(n.status == NotificationStatus.DELIVERED for n in notifications)
+    assert engine.get_notification_deliveries(notifications[5].notification_id)[0].user_id == "DM_0"
+
+    # An explicit users dict still overrides the directory
+    extra = engine.route_batch(notifications[:2], {"CRA_9": UserRole.CRA})
+    assert [d.user_id for d in extra] == ["CRA_9", "CRA_9"]
+
+
+def test_callbacks_run_in_batches_off_thread(engine):
+    engine.register_users({f"CRA_{i}": UserRole.CRA for i in range(50)})
+    release = threading.Event()
+    batches, singles = [], []
+
+    def batch_callback(deliveries):
+        release.wait(5)
+        batches.append((len(deliveries), threading.current_thread().name))
+
+    engine.register_batch_delivery_callback(batch_callback)
+    engine.register_delivery_callback(lambda delivery: singles.append(delivery.delivery_id))
+
+    started = time.perf_counter()
+    deliveries = engine.route_batch([_notification(engine, i) for i in range(20)])
+    assert time.perf_counter() - started < 1.0
+    assert singles == []
+
+    release.set()
+    assert engine.flush_callbacks(timeout=5)
+    assert sum(size for size, _ in batches) == 1000
+    assert {name for _, name in batches} == {"notification-callbacks"}
+    assert singles == [d.delivery_id for d in deliveries]
+
+
+def test_system_alert_burst_routes_through_directory(engine):
+    engine.register_users({"LEAD_0": UserRole.STUDY_LEAD, "DM_0": UserRole.DATA_MANAGER, "CRA_0": UserRole.CRA})
+    system = SystemBasedNotificationEngine(routing_engine=engine)
+    for i in range(10):
+        system.check_dqi_score(f"STUDY_{i:02d}", dqi_score=30.0, dimension_scores={}, risk_level="HIGH")
+
+    deliveries = system.route_alerts()
+    assert deliveries
+    assert {d.notification_id for d in deliveries} == {a.alert_id for a in system.get_active_alerts()}
+    for delivery in deliveries:
+        assert delivery.user_role in engine.get_notification(delivery.notification_id).target_roles
+
+    # Alerts are routed once
+    assert system.route_alerts() == []
+    assert engine.get_statistics()["total_notifications"] == len(system.get_active_alerts())
+
+    with pytest.raises(ValueError):
+        SystemBasedNotificationEngine().route_alerts()
+
+
+def test_study_store_refresh_routes_dqi_alerts(engine, tmp_path):
+    engine.register_user("LEAD_0", UserRole.STUDY_LEAD)
+    engine.register_watcher("dashboard")
+    system = SystemBasedNotificationEngine(routing_engine=engine)
+    store = StudyResultStore(results_file=str(tmp_path / "data_cache.json"))
+    store.add_listener(system.route_snapshot_alerts)
+
+    def result(score, risk):
+        dimensions = [{"dimension": "completeness", "raw_score": 80.0, "weight": 1.0}]
+        return {"overall_score": score, "risk_level": risk, "dimension_scores": dimensions}
+
+    store.publish({"STUDY_01": result(30.0, "Critical"), "STUDY_02": result(90.0, "Low")}, persist=False)
+    titles = [i.notification.title for i in engine.get_user_notifications_page("dashboard").items]
+    assert titles == ["Critical DQI Score - Study STUDY_01"]
+    assert engine.get_unread_count("LEAD_0") == 1
+
+    # A refresh with unchanged scores raises nothing new; a changed score is checked again
+    store.publish({"STUDY_01": result(30.0, "Critical"), "STUDY_02": result(90.0, "Low")}, persist=False)
+    assert engine.get_unread_count("dashboard") == 1
+    store.publish_study("STUDY_02", result(50.0, "High"), persist=False)
+    assert engine.get_unread_count("dashboard") == 2
+    assert len(system.get_active_alerts()) == 2
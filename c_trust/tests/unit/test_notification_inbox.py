@@ -0,0 +1,184 @@
+"""
+Unit Tests for Per-User Notification Inboxes
+============================================
+Tests priority ordering, maintained unread/pending counters, lazy expiry
+and cursor pagination of NotificationRoutingEngine inboxes.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.notifications.notification_engine import (
+    NotificationAcknowledgmentManager,
+    NotificationPriority,
+    NotificationRoutingEngine,
+    NotificationStatus,
+    NotificationType,
+    UserRole,
+)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+USERS = {"CRA_01": UserRole.CRA, "LEAD_01": UserRole.STUDY_LEAD}
+
+PRIORITIES = [
+    NotificationPriority.LOW,
+    NotificationPriority.CRITICAL,
+    NotificationPriority.MEDIUM,
+    NotificationPriority.HIGH,
+]
+
+
+@pytest.fixture
+def engine():
+    return NotificationRoutingEngine()
+
+
+def _notify(engine, i, priority=NotificationPriority.MEDIUM, users=USERS):
+    notification = engine.create_notification(
+        notification_type=NotificationType.SITE_OPERATIONAL,
+        priority=priority,
+        title=f"Issue {i}",
+        message="Site issue",
+        entity_id=f"SITE_{i:03d}",
+        target_roles=[UserRole.CRA],
+    )
+    deliveries = engine.route_notification(notification, users)
+    return notification, deliveries
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_notifications_listed_by_priority_then_age(engine):
+    for i in range(8):
+        _notify(engine, i, PRIORITIES[i % 4])
+
+    titles = [n.title for n in engine.get_user_notifications("CRA_01")]
+    assert titles == [
+        "Issue 1", "Issue 5",   # CRITICAL
+        "Issue 3", "Issue 7",   # HIGH
+        "Issue 2", "Issue 6",   # MEDIUM
+        "Issue 0", "Issue 4",   # LOW
+    ]
+    assert engine.get_user_notifications("LEAD_01") == []
+
+
+def test_counters_follow_read_and_acknowledgment(engine):
+    manager = NotificationAcknowledgmentManager(engine)
+    deliveries = [_notify(engine, i)[1][0] for i in range(5)]
+
+    assert engine.get_unread_count("CRA_01") == 5
+    assert manager.get_pending_count("CRA_01") == 5
+
+    manager.mark_as_read(deliveries[0].delivery_id, "CRA_01")
+    manager.mark_as_read(deliveries[0].delivery_id, "CRA_01")
+    assert engine.get_unread_count("CRA_01") == 4
+
+    manager.acknowledge(deliveries[1].delivery_id, "CRA_01", "Contacted site")
+    manager.dismiss(deliveries[0].delivery_id, "CRA_01", "Duplicate")
+    assert engine.get_unread_count("CRA_01") == 3
+    assert engine.get_pending_count("CRA_01") == 3
+    assert {d.delivery_id for d in engine.get_pending_acknowledgments("CRA_01")} == {
+        d.delivery_id for d in deliveries[2:]
+    }
+
+    assert len(engine.get_user_notifications("CRA_01")) == 3
+    assert len(engine.get_user_notifications("CRA_01", include_acknowledged=True)) == 5
+
+    stats = engine.get_statistics()
+    assert stats["by_status"] == {"DELIVERED": 3, "ACKNOWLEDGED": 1, "DISMISSED": 1}
+    assert stats["by_priority"] == {"MEDIUM": 5}
+
+
+def test_expiry_is_lazy_and_updates_counters(engine):
+    _notify(engine, 0, NotificationPriority.CRITICAL)  # expires after 24 hours
+    _notify(engine, 1, NotificationPriority.LOW)       # expires after 2 weeks
+
+    inbox = engine.get_inbox("CRA_01")
+    assert inbox.expire(now=datetime.now() + timedelta(days=2)) == 1
+
+    assert engine.get_unread_count("CRA_01") == 1
+    assert [n.title for n in engine.get_user_notifications("CRA_01")] == ["Issue 1"]
+    assert [n.title for n in engine.get_user_notifications("CRA_01", include_expired=True)] == ["Issue 0", "Issue 1"]
+    assert inbox.get_stats()["expired"] == 1
+    assert inbox.expire(now=datetime.now() + timedelta(days=2)) == 0
+
+
+def test_cursor_pagination_is_stable_across_new_deliveries(engine):
+    for i in range(10):
+        _notify(engine, i, PRIORITIES[i % 2])  # LOW / CRITICAL alternating
+
+    first = engine.get_user_notifications_page("CRA_01", limit=4)
+    assert [item.notification.title for item in first.items] == ["Issue 1", "Issue 3", "Issue 5", "Issue 7"]
+    assert first.total == 10
+    assert first.next_cursor
+
+    # A new critical notification sorts ahead of the cursor and is not repeated or skipped into the page
+    _notify(engine, 10, NotificationPriority.CRITICAL)
+
+    second = engine.get_user_notifications_page("CRA_01", limit=4, cursor=first.next_cursor)
+    assert [item.notification.title for item in second.items] == ["Issue 9", "Issue 10", "Issue 0", "Issue 2"]
+
+    unread = engine.get_user_notifications_page("CRA_01", limit=100, unread_only=True)
+    assert unread.total == 11 and unread.next_cursor is None
+
+    other_role = engine.get_user_notifications_page("CRA_01", roles=[UserRole.STUDY_LEAD])
+    assert other_role.items == []
+
+    for cursor in ("not-a-cursor", "-1.3", "99999999.0", "0.-5"):
+        with pytest.raises(ValueError):
+            engine.get_user_notifications_page("CRA_01", cursor=cursor)
+
+
+def test_watchers_receive_directory_routes_and_reads_create_no_inbox(engine):
+    engine.register_users(USERS)
+    engine.register_watcher("dashboard")
+    engine.register_watcher("CRA_01")  # already a recipient: delivered once
+
+    notification = engine.create_notification(
+        notification_type=NotificationType.DATA_QUALITY_GAP,
+        priority=NotificationPriority.HIGH,
+        title="DQI dropped",
+        message="Study DQI below threshold",
+        entity_id="STUDY_01",
+        target_roles=[UserRole.STUDY_LEAD, UserRole.CRA],
+    )
+    deliveries = engine.route_notification(notification)
+    assert sorted((d.user_id, d.user_role) for d in deliveries) == [
+        ("CRA_01", UserRole.CRA),
+        ("LEAD_01", UserRole.STUDY_LEAD),
+        ("dashboard", UserRole.STUDY_LEAD),
+    ]
+    assert [i.notification.title for i in engine.get_user_notifications_page("dashboard").items] == ["DQI dropped"]
+
+    # An explicit recipient list bypasses the directory and its watchers
+    _notify(engine, 1, users={"CRA_02": UserRole.CRA})
+    assert engine.get_unread_count("dashboard") == 1
+
+    # Reading an unknown user's inbox returns nothing and allocates nothing
+    assert engine.get_user_notifications_page("nobody", cursor="0.1").items == []
+    assert engine.get_unread_count("nobody") == 0
+    assert engine.get_inbox("nobody") is None
+    assert engine.unregister_watcher("dashboard") and not engine.unregister_watcher("dashboard")
+
+
+def test_large_inbox_page_and_counts(engine):
+    users = {"CRA_01": UserRole.CRA}
+    for i in range(20000):
+        _notify(engine, i, PRIORITIES[i % 4], users=users)
+    manager = NotificationAcknowledgmentManager(engine)
+    for delivery in engine.get_pending_acknowledgments("CRA_01")[:15000]:
+        manager.acknowledge(delivery.delivery_id, "CRA_01", "Done")
+
+    page = engine.get_user_notifications_page("CRA_01", limit=50)
+    assert len(page.items) == 50
+    assert page.total == 5000
+    assert all(item.notification.priority == NotificationPriority.LOW for item in page.items)
+    assert engine.get_unread_count("CRA_01") == 5000
+    assert engine.get_statistics()["by_status"][NotificationStatus.ACKNOWLEDGED.value] == 15000
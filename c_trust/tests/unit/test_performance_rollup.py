@@ -0,0 +1,106 @@
+"""
+Unit Tests for Agent Performance Rollups
+========================================
+Tests multi-resolution buckets, latency percentiles, ring retention and
+the GuardianDashboardData timeline built on them.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.guardian.guardian_dashboard import GuardianDashboardData
+from src.guardian.performance_rollup import (
+    AgentPerformanceRollup,
+    histogram_percentiles,
+    latency_bin,
+    LATENCY_BINS,
+)
+
+
+# ========================================
+# HELPERS
+# ========================================
+
+NOW = datetime(2025, 6, 1, 12, 0, 30)
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_percentiles_are_within_bin_error():
+    histogram = [0] * LATENCY_BINS
+    values = [float(v) for v in range(1, 1001)]  # 1..1000 ms
+    for v in values:
+        histogram[latency_bin(v)] += 1
+
+    p = histogram_percentiles(histogram, len(values), max(values))
+    for key, exact in (("p50_ms", 500), ("p95_ms", 950), ("p99_ms", 990)):
+        assert abs(p[key] - exact) / exact < 0.06
+    assert histogram_percentiles([0] * LATENCY_BINS, 0, 0.0)["p50_ms"] is None
+
+
+def test_buckets_aggregate_per_resolution():
+    rollup = AgentPerformanceRollup()
+    for minute in range(120):
+        for i in range(10):
+            rollup.record(
+                "safety",
+                processing_time_ms=5.0 if i < 9 else 200.0,
+                abstained=(i == 0),
+                confidence=0.8,
+                timestamp=NOW - timedelta(minutes=minute),
+            )
+    rollup.record("coding", 1.0, False, 0.5, timestamp=NOW)
+
+    minutes = rollup.timeline(hours=1, now=NOW, agent_name="safety")
+    assert minutes[0]["resolution_seconds"] == 60
+    assert len(minutes) in (60, 61)
+    point = minutes[-1]["agents"][0]
+    assert point["count"] == 10 and point["abstentions"] == 1
+    assert point["avg_confidence"] == 0.8
+    assert point["p50_ms"] == pytest.approx(5.0, rel=0.06)
+    assert point["p99_ms"] == pytest.approx(200.0, rel=0.06)
+
+    hours = rollup.timeline(hours=24, now=NOW)
+    assert {p["resolution_seconds"] for p in hours} == {3600}
+    assert sum(a["count"] for p in hours for a in p["agents"] if a["name"] == "safety") == 1200
+
+    summary = rollup.summary("safety", hours=24, now=NOW)
+    assert summary["count"] == 1200 and summary["abstention_rate"] == 0.1
+    assert summary["p50_ms"] == pytest.approx(5.0, rel=0.06)
+    assert summary["p95_ms"] == pytest.approx(200.0, rel=0.06)
+    assert summary["max_ms"] == 200.0
+    assert rollup.summary("unknown")["count"] == 0
+
+    with pytest.raises(ValueError):
+        rollup.timeline(hours=1, resolution=300)
+
+
+def test_memory_is_bounded_by_ring_size():
+    rollup = AgentPerformanceRollup(resolutions=((60, 10),))
+    rollup.record("safety", 5.0, False, 0.9, timestamp=NOW - timedelta(hours=1))
+    size = rollup.get_stats()["memory_bytes"]
+    for minute in range(100):
+        rollup.record("safety", 5.0, False, 0.9, timestamp=NOW - timedelta(minutes=minute))
+
+    assert rollup.get_stats()["memory_bytes"] == size
+    # Only the last 10 minutes are retained; late records beyond retention are dropped
+    assert rollup.summary("safety", hours=1, now=NOW)["count"] == 10
+    rollup.record("safety", 5.0, False, 0.9, timestamp=NOW - timedelta(hours=2))
+    assert rollup.summary("safety", hours=1, now=NOW)["count"] == 10
+
+
+def test_dashboard_timeline_reads_rollups():
+    dashboard = GuardianDashboardData()
+    for i in range(20):
+        dashboard.record_agent_processing("completeness", 10.0 + i, abstained=False, confidence=0.9)
+
+    timeline = dashboard.get_agent_performance_timeline(hours=1)
+    assert timeline[-1]["agents"][0]["name"] == "completeness"
+    assert sum(p["agents"][0]["count"] for p in timeline) == 20
+
+    status = dashboard.get_full_dashboard_data()["agent_timeline"]
+    assert status
+    assert dashboard.get_agent_latency_summary("completeness")["p50_ms"] == pytest.approx(19.5, rel=0.06)
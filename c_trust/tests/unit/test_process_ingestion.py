@@ -0,0 +1,110 @@
+"""
+Unit Tests for Process-Pool Ingestion
+=====================================
+Tests that per-file process-pool ingestion returns the same data as the
+thread-pool path and cooperates with the parsed-workbook cache.
+"""
+
+import pandas as pd
+import pytest
+
+from src.data.ingestion import DataIngestionEngine, StudyDiscovery
+from src.data.models import FileType
+from src.data.workbook_cache import (
+    PYARROW_AVAILABLE,
+    WorkbookCache,
+    frame_from_bytes,
+    frame_to_bytes,
+)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def data_root(tmp_path):
+    """Two small studies with two workbooks each"""
+    root = tmp_path / "studies"
+    for number in (1, 2):
+        folder = root / f"Study {number}_CPID_Input Files"
+        folder.mkdir(parents=True)
+        pd.DataFrame({
+            "Site ID": [f"S{number}01", f"S{number}02"],
+            "Subject ID": ["P1", "P2"],
+            "Form": ["AE", "VS"],
+        }).to_excel(folder / f"Study {number}_Missing_Pages_Report.xlsx", index=False)
+        pd.DataFrame({
+            "Study": [f"STUDY_{number:02d}"] * 3,
+            "Site": ["S1", "S1", "S2"],
+            "Subject": ["P1", "P2", "P3"],
+            "SAE_ID": ["E1", "E2", "E3"],
+        }).to_excel(folder / f"Study {number}_eSAE_Dashboard.xlsx", index=False)
+    return root
+
+
+def make_engine(data_root, cache_dir=None):
+    """Ingestion engine pointed at the fixture data root"""
+    engine = DataIngestionEngine(use_workbook_cache=False)
+    engine.discovery = StudyDiscovery(str(data_root))
+    if cache_dir is not None:
+        engine.workbook_cache = WorkbookCache(cache_dir=str(cache_dir))
+        engine.reader.cache = engine.workbook_cache
+    return engine
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_frame_transport_round_trip():
+    """Arrow IPC and pickle payloads both restore the original frame"""
+    columnar = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    mixed = pd.DataFrame({"a": [1, "x"]})
+
+    fmt, payload = frame_to_bytes(columnar)
+    assert fmt == ("arrow" if PYARROW_AVAILABLE else "pickle")
+    pd.testing.assert_frame_equal(frame_from_bytes(fmt, payload), columnar)
+
+    fmt, payload = frame_to_bytes(mixed)
+    assert fmt == "pickle"
+    pd.testing.assert_frame_equal(frame_from_bytes(fmt, payload), mixed)
+
+
+def test_process_mode_matches_thread_mode(data_root):
+    """Process-pool ingestion returns the same frames as thread-pool ingestion"""
+    engine = make_engine(data_root)
+
+    threaded = engine.ingest_all_studies(execution_mode="thread", max_workers=2)
+    processed = engine.ingest_all_studies(execution_mode="process", max_workers=2)
+
+    assert set(processed) == {"STUDY_01", "STUDY_02"}
+    assert set(processed) == set(threaded)
+    for study_id, study_data in threaded.items():
+        assert set(processed[study_id]) == set(study_data)
+        for file_type, df in study_data.items():
+            pd.testing.assert_frame_equal(processed[study_id][file_type], df)
+
+
+def test_process_mode_serves_cache_hits_in_parent(data_root, tmp_path, monkeypatch):
+    """Files already in the workbook cache are not sent to the pool"""
+    engine = make_engine(data_root, cache_dir=tmp_path / "cache")
+    engine.ingest_all_studies(execution_mode="process", max_workers=2)
+    assert engine.workbook_cache.get_stats()["entries_count"] == 4
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool should not be started")
+
+    monkeypatch.setattr("src.data.ingestion.ProcessPoolExecutor", no_pool)
+    cached = engine.ingest_all_studies(execution_mode="process", max_workers=2)
+
+    assert FileType.SAE_DM in cached["STUDY_01"]
+    assert len(cached["STUDY_02"][FileType.MISSING_PAGES]) == 2
+
+
+def test_unknown_execution_mode_rejected(data_root):
+    """Unknown execution modes raise ValueError"""
+    engine = make_engine(data_root)
+
+    with pytest.raises(ValueError):
+        engine.ingest_all_studies(execution_mode="gpu")
@@ -0,0 +1,377 @@
+"""
+Unit Tests for WebSocket Push Hub
+=================================
+Tests topic subscriptions, concurrent fan-out with bounded queues,
+diff-only study/DQI updates, dead-socket removal and lag metrics.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.realtime import PushHub, diff_values, is_valid_topic
+from src.api.study_store import StudyResultStore
+from src.guardian.guardian_agent import GuardianAgent
+from src.notifications.notification_engine import (
+    NotificationPriority,
+    NotificationRoutingEngine,
+    NotificationType,
+    UserRole,
+)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+class FakeSocket:
+    """WebSocket stand-in; optionally blocks on a gate or fails on send"""
+
+    def __init__(self, gate=None, fail=False):
+        self.sent = []
+        self.gate = gate
+        self.fail = fail
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+    def of_type(self, message_type):
+        return [m for m in self.sent if m["type"] == message_type]
+
+
+STUDY = {
+    "overall_score": 82.5,
+    "risk_level": "Medium",
+    "dimension_scores": {"safety": 90.0, "completeness": 75.0},
+    "sites": [{"site_id": "S1"}],
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StudyResultStore(results_file=str(tmp_path / "results.json"))
+    store.publish({"STUDY_01": STUDY, "STUDY_02": {**STUDY, "overall_score": 60.0}}, persist=False)
+    return store
+
+
+@pytest.fixture
+def hub(store):
+    hub = PushHub(queue_size=4, send_timeout=0.5, store=store)
+    store.add_listener(hub.publish_snapshot)
+    return hub
+
+
+async def settle():
+    """Let sender tasks drain what they can"""
+    await asyncio.sleep(0.02)
+
+
+# ========================================
+# FAN-OUT AND BACKPRESSURE
+# ========================================
+
+def test_slow_client_does_not_stall_others(hub):
+    async def scenario():
+        gate = asyncio.Event()
+        slow, fast = FakeSocket(gate), FakeSocket()
+        await hub.connect(slow, ["guardian"])
+        await hub.connect(fast, ["guardian"])
+
+        for i in range(3):
+            hub.publish("guardian", {"type": "guardian_event", "n": i})
+        await settle()
+        fast_received = [m["n"] for m in fast.sent]
+
+        gate.set()
+        await settle()
+        await hub.close()
+        return fast_received, slow
+
+    fast_received, slow = asyncio.run(scenario())
+
+    assert fast_received == [0, 1, 2]
+    assert [m["n"] for m in slow.sent] == [0, 1, 2]
+
+
+def test_full_queue_drops_oldest_and_requests_resync(hub):
+    async def scenario():
+        gate = asyncio.Event()
+        socket = FakeSocket(gate)
+        connection = await hub.connect(socket, ["jobs"])
+        hub.publish("jobs", {"type": "analysis_job", "n": 0})
+        await settle()  # n=0 is now in flight
+        for i in range(1, 10):
+            hub.publish("jobs", {"type": "analysis_job", "n": i})
+        depth = connection.queue_depth
+
+        gate.set()
+        await settle()
+        stats = connection.to_dict()
+        await hub.close()
+        return socket, depth, stats
+
+    socket, depth, stats = asyncio.run(scenario())
+
+    assert depth == 4
+    assert stats["dropped"] == 5
+    assert [m["type"] for m in socket.sent] == ["analysis_job", "resync"] + ["analysis_job"] * 4
+    assert [m["n"] for m in socket.of_type("analysis_job")] == [0, 6, 7, 8, 9]
+    assert socket.of_type("resync")[0]["dropped"] == 5
+
+
+def test_failed_and_timed_out_sockets_are_removed(hub):
+    async def scenario():
+        dead, stuck, healthy = FakeSocket(fail=True), FakeSocket(asyncio.Event()), FakeSocket()
+        for socket in (dead, stuck, healthy):
+            await hub.connect(socket, ["guardian"])
+
+        hub.publish("guardian", {"type": "guardian_event"})
+        await asyncio.sleep(0.7)
+        hub.publish("guardian", {"type": "guardian_event"})
+        await settle()
+        remaining = [c.websocket for c in hub.active_connections]
+        stats = hub.get_stats()
+        await hub.close()
+        return dead, stuck, healthy, remaining, stats
+
+    dead, stuck, healthy, remaining, stats = asyncio.run(scenario())
+
+    assert remaining == [healthy]
+    assert dead.closed and stuck.closed
+    assert len(healthy.sent) == 2
+    assert stats["disconnected"] == 2
+
+
+# ========================================
+# TOPICS
+# ========================================
+
+def test_topic_validation():
+    assert is_valid_topic("study:STUDY_01")
+    assert is_valid_topic("notifications:user_1")
+    assert is_valid_topic("dqi")
+    assert not is_valid_topic("study")
+    assert not is_valid_topic("dqi:STUDY_01")
+    assert not is_valid_topic("alerts")
+
+
+def test_messages_only_reach_subscribers(hub):
+    async def scenario():
+        guardian, user_1, everyone = FakeSocket(), FakeSocket(), FakeSocket()
+        await hub.connect(guardian, ["guardian"])
+        await hub.connect(user_1, ["notifications:user_1"])
+        await hub.connect(everyone, ["notifications", "jobs"])
+
+        hub.publish("guardian", {"type": "guardian_event"})
+        hub.publish("notifications:user_1", {"type": "notification"})
+        hub.publish("notifications:user_2", {"type": "notification"})
+        await hub.broadcast({"type": "analysis_job", "topic": "jobs"})
+        await settle()
+        await hub.close()
+        return guardian, user_1, everyone
+
+    guardian, user_1, everyone = asyncio.run(scenario())
+
+    assert [m["topic"] for m in guardian.sent] == ["guardian"]
+    assert [m["topic"] for m in user_1.sent] == ["notifications:user_1"]
+    assert [m["topic"] for m in everyone.sent] == ["notifications:user_1", "notifications:user_2", "jobs"]
+
+
+def test_client_messages_are_answered_through_the_queue(hub):
+    async def scenario():
+        socket = FakeSocket()
+        connection = await hub.connect(socket, [])
+        await hub.handle_client_message(connection, {"action": "subscribe", "topics": ["guardian", "bogus"]})
+        await hub.handle_client_message(connection, {"action": "ping"})
+        await hub.handle_client_message(connection, {"action": "unsubscribe", "topics": ["guardian"]})
+        await hub.handle_client_message(connection, "not an object")
+        await settle()
+        await hub.close()
+        return socket, connection
+
+    socket, connection = asyncio.run(scenario())
+
+    assert [m["type"] for m in socket.sent] == ["subscribed", "pong", "unsubscribed", "error"]
+    assert socket.sent[0]["topics"] == ["guardian"]
+    assert socket.sent[0]["rejected"] == ["bogus"]
+    assert connection.topics == set()
+
+
+# ========================================
+# DIFF-ONLY STUDY AND DQI UPDATES
+# ========================================
+
+def test_diff_values_reports_nested_changes_and_removals():
+    previous = {"a": 1, "b": {"c": 2, "d": 3}, "e": [1], "gone": True}
+    current = {"a": 1, "b": {"c": 5, "d": 3, "f": None}, "e": [1, 2]}
+
+    changes, removed = diff_values(previous, current)
+
+    assert changes == [
+        {"path": ["b", "c"], "value": 5},
+        {"path": ["b", "f"], "value": None},
+        {"path": ["e"], "value": [1, 2]},
+    ]
+    assert removed == [["gone"]]
+
+
+def test_study_subscribers_get_snapshot_then_coalesced_diff(hub, store):
+    async def scenario():
+        gate = asyncio.Event()
+        gate.set()
+        socket = FakeSocket(gate)
+        connection = await hub.connect(socket, ["study:STUDY_01"])
+        await settle()
+
+        gate.clear()
+        hub.publish("study:STUDY_01", {"type": "marker"})  # holds the sender
+        await settle()
+        for score in (70.0, 71.0, 72.0):
+            store.publish_study("STUDY_01", {**STUDY, "overall_score": score}, persist=False)
+        store.publish_study("STUDY_02", {**STUDY, "overall_score": 10.0}, persist=False)
+        gate.set()
+        await settle()
+        await hub.close()
+        return socket, connection
+
+    socket, connection = asyncio.run(scenario())
+
+    snapshot, _, update = socket.sent
+    assert snapshot["type"] == "study_snapshot"
+    assert snapshot["data"] == STUDY
+    assert update["type"] == "study_update"
+    assert update["changes"] == [{"path": ["overall_score"], "value": 72.0}]
+    assert update["removed"] == []
+    assert update["version"] == store.snapshot().version
+    assert connection.stats.coalesced == 2
+
+
+def test_dqi_subscribers_get_changed_scores_only(hub, store):
+    async def scenario():
+        socket = FakeSocket()
+        await hub.connect(socket, ["dqi"])
+        await settle()
+        store.publish_study("STUDY_02", {**STUDY, "overall_score": 65.0, "risk_level": "High"}, persist=False)
+        await settle()
+        store.publish_study("STUDY_01", {**STUDY, "sites": []}, persist=False)  # no DQI change
+        await settle()
+        await hub.close()
+        return socket
+
+    socket = asyncio.run(scenario())
+
+    assert [m["type"] for m in socket.sent] == ["dqi_snapshot", "dqi_update"]
+    assert set(socket.sent[0]["scores"]) == {"STUDY_01", "STUDY_02"}
+    assert socket.sent[1]["scores"] == {"STUDY_02": {"overall_score": 65.0, "risk_level": "High"}}
+
+
+# ========================================
+# EVENT SOURCES
+# ========================================
+
+def test_guardian_and_notification_events_are_published(hub):
+    async def scenario():
+        socket = FakeSocket()
+        await hub.connect(socket, ["guardian", "notifications:user_1"])
+
+        GuardianAgent.add_event_listener(hub.publish_guardian_event)
+        try:
+            GuardianAgent().raise_integrity_warning(
+                entity_id="STUDY_01",
+                snapshot_id="snap_1",
+                issue_description="Risk unchanged after data improved",
+                recommendation="Review agent thresholds",
+            )
+        finally:
+            GuardianAgent.remove_event_listener(hub.publish_guardian_event)
+
+        engine = NotificationRoutingEngine()
+        engine.register_delivery_callback(hub.publish_notification_delivery)
+        notification = engine.create_notification(
+            notification_type=NotificationType.SAFETY_ALERT,
+            priority=NotificationPriority.HIGH,
+            title="SAE backlog",
+            message="STUDY_01 has overdue SAE reviews",
+            entity_id="STUDY_01",
+            entity_type="STUDY",
+        )
+        engine.route_notification(notification, {"user_1": UserRole.CRA, "user_2": UserRole.CRA})
+        engine.flush_callbacks(timeout=5)
+        await settle()
+        await hub.close()
+        return socket
+
+    socket = asyncio.run(scenario())
+
+    event = socket.of_type("guardian_event")[0]["event"]
+    assert event["entity_id"] == "STUDY_01"
+    notifications = socket.of_type("notification")
+    assert [n["delivery"]["user_id"] for n in notifications] == ["user_1"]
+
+
+def test_publish_from_worker_thread_over_websocket_endpoint(monkeypatch, store):
+    """Publishes from other threads are marshalled onto the serving loop"""
+    import src.api.main as main_api
+
+    hub = PushHub(store=store)
+    monkeypatch.setattr(main_api, "ws_manager", hub)
+    client = TestClient(main_api.app)
+
+    with client.websocket_connect("/api/v1/ws?topics=guardian") as websocket:
+        websocket.send_json({"action": "subscribe", "topics": ["study:STUDY_01"]})
+        assert websocket.receive_json()["type"] == "study_snapshot"
+        assert websocket.receive_json()["type"] == "subscribed"
+
+        hub.publish("guardian", {"type": "guardian_event", "event": {}})
+        assert websocket.receive_json()["type"] == "guardian_event"
+        websocket.send_json({"action": "ping"})
+        assert websocket.receive_json()["type"] == "pong"
+
+        stats = client.get("/api/v1/ws/stats").json()
+        assert stats["active_connections"] == 1
+        assert stats["connections"][0]["topics"] == ["guardian", "study:STUDY_01"]
+        assert stats["connections"][0]["sent"] >= 3
+
+
+def test_routed_notification_reaches_socket_through_app_lifespan(monkeypatch, store):
+    """The app registers the hub as a delivery callback while it is running"""
+    import src.api.main as main_api
+    from src.notifications import notification_engine
+
+    hub = PushHub(store=store)
+    engine = NotificationRoutingEngine()
+    store.publish({"STUDY_01": STUDY}, persist=True)  # cache present: startup skips the analysis run
+    monkeypatch.setattr(main_api, "ws_manager", hub)
+    monkeypatch.setattr(main_api, "get_study_store", lambda: store)
+    monkeypatch.setattr(notification_engine, "_shared_engine", engine)
+
+    with TestClient(main_api.app) as client:
+        with client.websocket_connect("/api/v1/ws?topics=notifications:dashboard") as websocket:
+            notification = engine.create_notification(
+                notification_type=NotificationType.SAFETY_ALERT,
+                priority=NotificationPriority.CRITICAL,
+                title="SAE backlog",
+                message="STUDY_01 has overdue SAE reviews",
+                entity_id="STUDY_01",
+                entity_type="STUDY",
+            )
+            engine.route_notification(notification)
+            message = websocket.receive_json()
+
+    assert message["type"] == "notification"
+    assert message["topic"] == "notifications:dashboard"
+    assert message["delivery"]["notification_id"] == notification.notification_id
+    assert engine._delivery_callbacks == []
+    engine.close()
@@ -0,0 +1,124 @@
+"""
+Unit Tests for Single-Pass Excel Reading
+========================================
+Tests that the single-pass reader opens each workbook once and produces
+the same frames as the pd.read_excel strategy chain.
+"""
+
+import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import src.data.ingestion as ingestion
+from src.data.ingestion import ExcelFileReader
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def described_workbook(tmp_path):
+    """Workbook whose header sits below two description rows, plus a second sheet"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Main"
+    ws.append(["Report generated for the quarterly data quality review meeting", None])
+    ws.append(["Columns below list open issues per subject and their current state", None])
+    ws.append(["Site ID", "Subject ID", "Status", "Value", "Value", None, 2024])
+    ws.append(["S1", "P1", "Open", 1.0, "x", None, 3])
+    ws.append(["S1", "P2", "NA", 2.5, "y", None, None])
+    ws.append([None] * 5)
+    ws.append(["S2", 103, "Closed", 3, datetime.datetime(2024, 1, 5), None, 1.5])
+
+    second = wb.create_sheet("Regions")
+    second.append(["Study", "Region", "Country"])
+    second.append(["STUDY_01", "EU", "DE"])
+
+    path = tmp_path / "Study_01_Missing_Pages.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def edc_workbook(tmp_path):
+    """EDC Metrics workbook with a three-row grouped header"""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["CPMD", None, "Input files", None])
+    ws.append(["Visit status", None, "Page status", None])
+    ws.append(["Site ID", "Subject ID", "# Pages Entered", "# Open Queries"])
+    ws.append(["S1", "P1", 3, 4])
+    ws.append(["S2", "P2", None, 1])
+
+    path = tmp_path / "Study_01_CPID_EDC_Metrics.xlsx"
+    wb.save(path)
+    return path
+
+
+# ========================================
+# PARITY WITH pd.read_excel
+# ========================================
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"header_row": 2},
+    {"sheet_name": "Regions"},
+    {"sheet_name": 1},
+    {"auto_detect_header": False},
+])
+def test_matches_strategy_chain(described_workbook, kwargs):
+    """Single-pass frames equal the legacy pd.read_excel frames"""
+    single = ExcelFileReader(single_pass=True).read_file(described_workbook, **kwargs)
+    legacy = ExcelFileReader(single_pass=False).read_file(described_workbook, **kwargs)
+
+    pd.testing.assert_frame_equal(single, legacy)
+
+
+def test_detects_header_below_description_rows(described_workbook):
+    """Header row is detected from the already-loaded rows"""
+    df = ExcelFileReader().read_file(described_workbook)
+
+    assert list(df.columns[:4]) == ["Site ID", "Subject ID", "Status", "Value"]
+    assert len(df) == 4
+
+
+def test_edc_metrics_multirow_header(edc_workbook):
+    """EDC Metrics grouped headers are forward-filled and flattened like before"""
+    single = ExcelFileReader(single_pass=True).read_file(edc_workbook)
+    legacy = ExcelFileReader(single_pass=False).read_file(edc_workbook)
+
+    pd.testing.assert_frame_equal(single, legacy)
+    assert "Input files - Page status - # Open Queries" in single.columns
+
+
+# ========================================
+# SINGLE OPEN
+# ========================================
+
+def test_workbook_opened_once(described_workbook, monkeypatch):
+    """A read opens the workbook exactly once"""
+    opened = []
+    real_load_workbook = ingestion.load_workbook
+
+    def counting_load_workbook(*args, **kwargs):
+        opened.append(kwargs.get("read_only"))
+        return real_load_workbook(*args, **kwargs)
+
+    monkeypatch.setattr(ingestion, "load_workbook", counting_load_workbook)
+    monkeypatch.setattr(ingestion.pd, "read_excel", None)  # any fallback would fail loudly
+
+    df = ExcelFileReader().read_file(described_workbook)
+
+    assert df is not None
+    assert opened == [True]
+
+
+def test_read_sheets_materialises_all_sheets(described_workbook):
+    """read_sheets returns every sheet from one handle"""
+    sheets = ExcelFileReader().read_sheets(described_workbook)
+
+    assert set(sheets) == {"Main", "Regions"}
+    assert list(sheets["Regions"].columns) == ["Study", "Region", "Country"]
@@ -0,0 +1,282 @@
+"""
+Unit Tests for Site Index
+=========================
+Tests site lookup, keyset pagination with sorting and filtering, per-version
+rebuilds and the paginated site/patient endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.site_index import (
+    InvalidCursorError,
+    SiteIndex,
+    encode_cursor,
+    get_site_index,
+    rebuild_site_index,
+    reset_site_index,
+)
+from src.api.study_store import StudyResultStore, get_study_store, reset_study_store
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+RISK_LEVELS = ["Low", "Medium", "High", "Critical"]
+
+
+def make_sites(n_sites, prefix="SITE"):
+    return [
+        {
+            "site_id": f"{prefix}_{s:03d}",
+            "site_name": f"Site {s}",
+            "enrollment": 3 + s % 4,
+            "target_enrollment": 10,
+            "open_queries": (s * 7) % 11,
+            "risk_level": RISK_LEVELS[s % 4],
+            "dqi_score": 60.0 + (s * 13) % 40,
+            "patients": [f"P{s:03d}-{p}" for p in range(3 + s % 4)],
+        }
+        for s in range(n_sites)
+    ]
+
+
+@pytest.fixture
+def studies():
+    return {
+        "STUDY_01": {"overall_score": 80.0, "sites": make_sites(25)},
+        "STUDY_02": {"overall_score": 70.0, "sites": make_sites(10)[::-1]},
+        "STUDY_03": {"overall_score": 60.0, "sites": [{"site_id": "SITE_900", "enrollment": 2}]},
+    }
+
+
+@pytest.fixture
+def index(tmp_path, studies):
+    store = StudyResultStore(results_file=str(tmp_path / "results.json"))
+    store.publish(studies, persist=False)
+    return SiteIndex(store.snapshot())
+
+
+def collect(query, **kwargs):
+    """Walk every page of a query"""
+    items, cursor, pages = [], None, 0
+    while True:
+        page = query(cursor=cursor, **kwargs)
+        items.extend(page.items)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            return items, page.total, pages
+
+
+# ========================================
+# LOOKUP
+# ========================================
+
+def test_lookup_by_site_and_study(index):
+    assert index.get_site("SITE_003").study_id == "STUDY_01"
+    assert index.get_site("SITE_003", "STUDY_02").study_id == "STUDY_02"
+    assert index.get_site("SITE_020", "STUDY_02") is None
+    assert index.get_site("NOPE") is None
+    assert index.studies_for_site("SITE_003") == ["STUDY_01", "STUDY_02"]
+    assert index.site_count == 36
+
+
+def test_study_sites_sorted_with_data_quality(index):
+    study = index.study_sites("STUDY_02")
+    assert [entry.site_id for entry in study.sites] == [f"SITE_{s:03d}" for s in range(10)]
+
+    quality = index.study_sites("STUDY_03").data_quality()
+    assert quality["status"] == "unavailable"
+    assert quality["warnings"] == ["Site SITE_900: Patient data unavailable (extraction failed)"]
+    assert index.study_sites("STUDY_01").data_quality()["status"] == "complete"
+
+
+# ========================================
+# PAGINATION
+# ========================================
+
+@pytest.mark.parametrize("sort", ["site_id", "dqi_score", "open_queries", "risk_level", "enrollment"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_pages_cover_the_sorted_list_exactly_once(index, sort, order):
+    items, total, pages = collect(index.query_sites, study_id="STUDY_01", sort=sort, order=order, limit=4)
+
+    entries = index.study_sites("STUDY_01").sites
+    expected = sorted(entries, key=lambda e: (e.value(sort) if sort != "risk_level"
+                                              else RISK_LEVELS.index(e.risk_level), e.site_id))
+    if order == "desc":
+        expected = expected[::-1]
+    assert [e.site_id for e in items] == [e.site_id for e in expected]
+    assert total == 25
+    assert pages == 7
+
+
+def test_filters_apply_before_paging(index):
+    items, total, _ = collect(
+        index.query_sites, sort="dqi_score", order="desc", limit=3,
+        risk_levels=["high", "critical"], min_dqi=70, max_open_queries=8,
+    )
+
+    assert total == len(items) > 3
+    assert all(e.risk_level in ("High", "Critical") for e in items)
+    assert all(e.dqi_score >= 70 and e.open_queries <= 8 for e in items)
+    assert [e.dqi_score for e in items] == sorted((e.dqi_score for e in items), reverse=True)
+    assert {e.study_id for e in items} == {"STUDY_01", "STUDY_02"}
+
+
+def test_cursor_from_another_query_is_rejected(index):
+    cursor = index.query_sites(study_id="STUDY_01", sort="dqi_score", limit=2).next_cursor
+
+    with pytest.raises(InvalidCursorError):
+        index.query_sites(study_id="STUDY_01", sort="site_id", limit=2, cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        index.query_sites(study_id="STUDY_01", sort="dqi_score", order="desc", cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        index.query_sites(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        index.query_sites(sort="patients")
+    with pytest.raises(KeyError):
+        index.query_sites(study_id="STUDY_99")
+
+
+def test_cursor_key_must_match_the_sort(index):
+    scope = "sites:STUDY_01:dqi_score:asc"
+    for key in ([0, 0, 70.0], [0, 0, "x", "STUDY_01", "SITE_001"], [0, 1, 5, "STUDY_01", "SITE_001"],
+                [0, 0, 70.0, 1, "SITE_001"], [True, 0, 70.0, "STUDY_01", "SITE_001"]):
+        with pytest.raises(InvalidCursorError):
+            index.query_sites(study_id="STUDY_01", sort="dqi_score", cursor=encode_cursor(scope, key))
+
+    entry = index.get_site("SITE_003", "STUDY_01")
+    with pytest.raises(InvalidCursorError):
+        index.query_patients(entry, cursor=encode_cursor("patients:STUDY_01:SITE_003:asc", ["P1", "0"]))
+
+
+def test_mixed_and_missing_values_sort_and_filter(tmp_path):
+    sites = [
+        {"site_id": "S1", "dqi_score": None, "saes": "n/a", "open_queries": "many"},
+        {"site_id": "S2", "dqi_score": 80.0, "saes": 2, "open_queries": 3},
+        {"site_id": "S3", "dqi_score": 65, "saes": {"serious": 1}},
+        {"site_id": "S4", "dqi_score": "high", "saes": 1.5},
+    ]
+    store = StudyResultStore(results_file=str(tmp_path / "results.json"))
+    store.publish({"STUDY_01": {"sites": sites}}, persist=False)
+    index = SiteIndex(store.snapshot())
+
+    items, _, _ = collect(index.query_sites, sort="saes", limit=1)
+    assert [e.site_id for e in items] == ["S4", "S2", "S1", "S3"]  # numbers, then strings / JSON text
+    items, _, _ = collect(index.query_sites, sort="dqi_score", order="desc", limit=1)
+    assert [e.site_id for e in items] == ["S1", "S4", "S2", "S3"]  # missing sorts last ascending
+
+    page = index.query_sites(min_dqi=60)
+    assert [e.site_id for e in page.items] == ["S2", "S3"] and page.total == 2
+    page = index.query_sites(max_open_queries=5)
+    assert [e.site_id for e in page.items] == ["S2", "S3", "S4"]
+
+
+def test_filtered_total_counted_once_per_filter(index, monkeypatch):
+    import src.api.site_index as site_index
+
+    calls = []
+    number = site_index._number
+    monkeypatch.setattr(site_index, "_number", lambda value: calls.append(value) or number(value))
+
+    first = index.query_sites(study_id="STUDY_01", min_dqi=70, limit=2)
+    counted = len(calls)
+    calls.clear()
+    second = index.query_sites(study_id="STUDY_01", min_dqi=70, limit=2, cursor=first.next_cursor)
+
+    assert first.total == second.total == sum(1 for e in index.study_sites("STUDY_01").sites if e.dqi_score >= 70)
+    assert counted > 25 and len(calls) < 25  # the second page only evaluates what it walks
+
+
+def test_patient_pages(index):
+    entry = index.get_site("SITE_003", "STUDY_01")
+    items, total, pages = collect(index.query_patients, entry=entry, order="desc", limit=2)
+
+    assert total == 6
+    assert pages == 3
+    assert [patient_id for patient_id, _ in items] == sorted(entry.roster, reverse=True)
+
+
+# ========================================
+# REBUILDS
+# ========================================
+
+def test_index_rebuilt_once_per_published_version(tmp_path, studies):
+    reset_site_index()
+    store = StudyResultStore(results_file=str(tmp_path / "results.json"))
+    store.add_listener(rebuild_site_index)
+    store.publish(studies, persist=False)
+    first = get_site_index(store.snapshot())
+
+    assert get_site_index(store.snapshot()) is first
+    store.publish_study("STUDY_04", {"sites": make_sites(2, prefix="NEW")}, persist=False)
+    second = get_site_index(store.snapshot())
+
+    assert second is not first
+    assert second.get_site("NEW_001").study_id == "STUDY_04"
+    assert first.get_site("NEW_001") is None
+    reset_site_index()
+
+
+# ========================================
+# ENDPOINTS
+# ========================================
+
+@pytest.fixture
+def client(studies):
+    reset_study_store()
+    reset_site_index()
+    get_study_store().publish(studies, persist=False)
+    from src.api.main import app
+    yield TestClient(app)
+    reset_study_store()
+    reset_site_index()
+
+
+def test_study_sites_endpoint_pages_and_projects(client):
+    params = {"limit": 10, "sort": "open_queries", "order": "desc", "fields": "site_id,open_queries"}
+    first = client.get("/api/v1/studies/STUDY_01/sites", params=params).json()
+    second = client.get("/api/v1/studies/STUDY_01/sites", params={**params, "cursor": first["next_cursor"]}).json()
+
+    assert first["total_sites"] == first["matched_sites"] == 25
+    assert first["total_patients"] == sum(3 + s % 4 for s in range(25))
+    assert first["data_quality"]["status"] == "complete"
+    assert set(first["sites"][0]) == {"site_id", "open_queries"}
+    open_queries = [s["open_queries"] for s in first["sites"] + second["sites"]]
+    assert open_queries == sorted(open_queries, reverse=True)
+    assert len({s["site_id"] for s in first["sites"] + second["sites"]}) == 20
+
+
+def test_study_sites_endpoint_rejects_bad_parameters(client):
+    assert client.get("/api/v1/studies/STUDY_01/sites", params={"fields": "site_id,nope"}).status_code == 400
+    assert client.get("/api/v1/studies/STUDY_01/sites", params={"sort": "nope"}).status_code == 400
+    assert client.get("/api/v1/studies/STUDY_01/sites", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/v1/studies/STUDY_99/sites").status_code == 404
+
+
+def test_portfolio_sites_filtered_by_risk(client):
+    body = client.get("/api/v1/sites", params={"risk_level": "Critical", "sort": "dqi_score"}).json()
+
+    assert body["matched_sites"] == len(body["sites"]) == 8
+    assert {s["risk_level"] for s in body["sites"]} == {"Critical"}
+    assert {s["study_id"] for s in body["sites"]} == {"STUDY_01", "STUDY_02"}
+    assert body["next_cursor"] is None
+
+
+def test_site_detail_and_patient_pages(client):
+    detail = client.get("/api/v1/sites/SITE_002", params={"study_id": "STUDY_02"})
+    first = client.get("/api/v1/sites/SITE_002/patients", params={"study_id": "STUDY_02", "limit": 3})
+    second = client.get(
+        "/api/v1/sites/SITE_002/patients",
+        params={"study_id": "STUDY_02", "limit": 3, "cursor": first.headers["x-next-cursor"]},
+    )
+
+    assert detail.status_code == 200
+    assert detail.json()["dqi_score"] == 86.0
+    assert first.headers["x-total-count"] == "5"
+    assert "x-next-cursor" not in second.headers
+    patient_ids = [p["patient_id"] for p in first.json() + second.json()]
+    assert patient_ids == detail.json()["patients"]
+    assert client.get("/api/v1/sites/NOPE/patients").status_code == 404
@@ -0,0 +1,224 @@
+"""
+Unit Tests for Streaming Export
+===============================
+Tests row generation with study filtering and column projection, CSV /
+Parquet / Arrow IPC streaming, bounded memory and the streaming endpoints.
+"""
+
+import csv
+import io
+import tracemalloc
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.export import (
+    PATIENT_EXPORT_COLUMNS,
+    SITE_EXPORT_COLUMNS,
+    get_stream_columns,
+    iter_export_rows,
+    stream_export,
+)
+from src.api.study_store import get_study_store, reset_study_store
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+def make_study(score, n_sites=3, patients_per_site=4, prefix="P"):
+    return {
+        "overall_score": score,
+        "risk_level": "Low" if score >= 85 else "High",
+        "dimension_scores": [
+            {"dimension": "safety", "raw_score": score - 5},
+            {"dimension": "completeness", "raw_score": score + 5},
+        ],
+        "features": {"total_subjects": n_sites * patients_per_site, "open_query_count": 12},
+        "sites": [
+            {
+                "site_id": f"SITE_{s:03d}",
+                "site_name": f"Site {s}",
+                "enrollment": patients_per_site,
+                "saes": s,
+                "queries": 10,
+                "open_queries": 3,
+                "resolved_queries": 7,
+                "risk_level": "Medium",
+                "patients": [f"{prefix}{s:03d}-{p:05d}" for p in range(patients_per_site)],
+            }
+            for s in range(n_sites)
+        ],
+    }
+
+
+@pytest.fixture
+def studies():
+    return {
+        "STUDY_01": make_study(90.0),
+        "STUDY_02": make_study(60.0, n_sites=2),
+        "STUDY_03": {**make_study(75.0), "dimension_scores": {"timeliness": {"score": 70.0}}},
+    }
+
+
+def read_csv(chunks):
+    return list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+
+
+# ========================================
+# ROW GENERATION
+# ========================================
+
+def test_study_rows_filter_and_project(studies):
+    rows = list(iter_export_rows(studies, "study", ["STUDY_02", "STUDY_03"], ["study_id", "dqi_score"]))
+
+    assert rows == [
+        {"study_id": "STUDY_02", "dqi_score": 60.0},
+        {"study_id": "STUDY_03", "dqi_score": 75.0},
+    ]
+
+
+def test_study_columns_include_dimensions_of_selected_studies(studies):
+    columns = get_stream_columns(studies, "study", ["STUDY_01", "STUDY_03"])
+
+    assert columns[0] == "study_id"
+    assert columns[-3:] == ["dimension_safety_score", "dimension_completeness_score", "dimension_timeliness_score"]
+    assert get_stream_columns(studies, "site") == SITE_EXPORT_COLUMNS
+    assert get_stream_columns(studies, "patient") == PATIENT_EXPORT_COLUMNS
+
+
+def test_site_and_patient_rows(studies):
+    sites = list(iter_export_rows(studies, "site", ["STUDY_02"]))
+    patients = list(iter_export_rows(studies, "patient", ["STUDY_02"]))
+
+    assert [(r["study_id"], r["site_id"], r["patient_count"]) for r in sites] == [
+        ("STUDY_02", "SITE_000", 4),
+        ("STUDY_02", "SITE_001", 4),
+    ]
+    assert len(patients) == 8
+    assert patients[0] == {
+        "study_id": "STUDY_02",
+        "site_id": "SITE_000",
+        "patient_id": "P000-00000",
+        "site_risk_level": "Medium",
+    }
+
+
+def test_filtered_out_studies_are_never_read(studies):
+    class Exploding(dict):
+        def get(self, *args):
+            raise AssertionError("excluded study was read")
+
+    studies["STUDY_02"] = Exploding(studies["STUDY_02"])
+
+    rows = list(iter_export_rows(studies, "patient", ["STUDY_01"]))
+
+    assert len(rows) == 12
+
+
+def test_invalid_requests_rejected(studies):
+    with pytest.raises(ValueError, match="format"):
+        stream_export(studies, "xml")
+    with pytest.raises(ValueError, match="granularity"):
+        stream_export(studies, "csv", "visit")
+    with pytest.raises(ValueError, match="columns"):
+        stream_export(studies, "csv", "site", columns=["site_id", "dqi_band"])
+
+
+# ========================================
+# FORMATS
+# ========================================
+
+def test_csv_streams_one_chunk_per_batch(studies):
+    chunks = list(stream_export(studies, "csv", "patient", batch_rows=10))
+
+    assert len(chunks) == 4  # header + 32 rows in batches of 10
+    rows = read_csv(chunks)
+    assert len(rows) == 32
+    assert list(rows[0]) == PATIENT_EXPORT_COLUMNS
+
+
+def test_parquet_round_trip_with_row_groups(studies):
+    chunks = list(stream_export(studies, "parquet", "site", columns=["study_id", "site_id", "saes", "dqi_score"], batch_rows=3))
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    table = parquet.read()
+
+    assert parquet.metadata.num_row_groups == 3  # 8 sites in groups of 3
+    assert table.column_names == ["study_id", "site_id", "saes", "dqi_score"]
+    assert table.schema.field("saes").type == pa.int64()
+    assert table.column("saes").to_pylist() == [0, 1, 2, 0, 1, 0, 1, 2]
+    assert table.column("dqi_score").null_count == 8
+
+
+def test_arrow_stream_round_trip(studies):
+    chunks = list(stream_export(studies, "arrow", "study", batch_rows=2))
+
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+    assert table.column("study_id").to_pylist() == ["STUDY_01", "STUDY_02", "STUDY_03"]
+    assert table.column("dqi_band").to_pylist() == ["GREEN", "RED", "AMBER"]
+    assert table.column("dimension_timeliness_score").to_pylist() == [None, None, 70.0]
+
+
+def test_patient_export_memory_is_bounded():
+    studies = {
+        f"STUDY_{i:02d}": make_study(80.0, n_sites=20, patients_per_site=2500, prefix=f"S{i}-")
+        for i in range(4)
+    }  # 200k patient rows
+
+    tracemalloc.start()
+    total = 0
+    for chunk in stream_export(studies, "parquet", "patient", batch_rows=2000):
+        total += len(chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert total > 0
+    assert peak < 8 * 1024 * 1024
+
+
+# ========================================
+# ENDPOINTS
+# ========================================
+
+@pytest.fixture
+def client(studies):
+    reset_study_store()
+    get_study_store().publish(studies, persist=False)
+    from src.api.main import app
+    yield TestClient(app)
+    reset_study_store()
+
+
+def test_stream_endpoint_serves_parquet(client):
+    response = client.get(
+        "/api/v1/export/stream",
+        params={"format": "parquet", "granularity": "patient", "study_ids": "STUDY_01", "columns": "patient_id,site_id"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert response.headers["x-data-version"] == str(get_study_store().snapshot().version)
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == ["patient_id", "site_id"]
+    assert table.num_rows == 12
+
+
+def test_stream_endpoint_rejects_unknown_column(client):
+    response = client.get("/api/v1/export/stream", params={"columns": "study_id,nope"})
+
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
+
+
+def test_studies_csv_export_streams_every_study(client):
+    response = client.get("/api/v1/export/studies")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert response.status_code == 200
+    assert rows[0][:3] == ["Study ID", "DQI Score", "Risk Level"]
+    assert [row[0] for row in rows[1:]] == ["STUDY_01", "STUDY_02", "STUDY_03"]
+    assert rows[1][3] == "85.0"
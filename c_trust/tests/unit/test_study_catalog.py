@@ -0,0 +1,205 @@
+"""
+Unit Tests for Study Catalog
+============================
+Tests that the catalog is built once, serves lookups from memory and is
+updated per study from file change sets.
+"""
+
+import shutil
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.study_store import reset_study_store
+from src.core.scheduler import FileWatcher, RefreshScheduler, get_file_watcher, reset_file_watcher
+from src.data.ingestion import StudyDiscovery
+from src.data.models import FileType
+from src.data.study_catalog import StudyCatalog, get_study_catalog, reset_study_catalog
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+def write_workbook(path):
+    pd.DataFrame({"Site ID": ["S1"], "Subject ID": ["P1"]}).to_excel(path, index=False)
+
+
+@pytest.fixture
+def data_root(tmp_path):
+    """Two studies with one workbook each"""
+    root = tmp_path / "studies"
+    for number in (1, 2):
+        folder = root / f"Study {number}_CPID_Input Files"
+        folder.mkdir(parents=True)
+        write_workbook(folder / f"Study {number}_Missing_Pages_Report.xlsx")
+    return root
+
+
+@pytest.fixture
+def catalog(data_root):
+    return StudyCatalog(StudyDiscovery(str(data_root)))
+
+
+@pytest.fixture
+def counted_scans(catalog, monkeypatch):
+    """Record full and single-study discovery calls"""
+    calls = []
+    discovery = catalog.discovery
+    full, single = discovery.discover_all_studies, discovery.discover_study
+    monkeypatch.setattr(discovery, "discover_all_studies", lambda: calls.append("all") or full())
+    monkeypatch.setattr(discovery, "discover_study", lambda sid: calls.append(sid) or single(sid))
+    return calls
+
+
+# ========================================
+# LOOKUPS
+# ========================================
+
+def test_built_once_on_first_lookup(catalog, counted_scans):
+    assert catalog.get_stats()["studies_count"] is None
+
+    assert [s.study_id for s in catalog.list_studies()] == ["STUDY_01", "STUDY_02"]
+    assert catalog.get_study("STUDY_02").study_id == "STUDY_02"
+    assert catalog.get_study("STUDY_99") is None
+    assert catalog.get_file_types("STUDY_01").keys() == {FileType.MISSING_PAGES}
+
+    assert counted_scans == ["all"]
+    assert catalog.version == 1
+
+
+def test_invalidate_rebuilds_on_next_lookup(catalog, counted_scans):
+    catalog.list_studies()
+    catalog.invalidate()
+    catalog.list_studies()
+
+    assert counted_scans == ["all", "all"]
+    assert catalog.version == 2
+
+
+# ========================================
+# CHANGE SETS
+# ========================================
+
+def test_changed_file_rescans_only_its_study(catalog, data_root, counted_scans):
+    catalog.list_studies()
+    new_file = data_root / "Study 2_CPID_Input Files" / "Study 2_eSAE_Dashboard.xlsx"
+    write_workbook(new_file)
+
+    affected = catalog.apply_changes([str(new_file)])
+
+    assert affected == {"STUDY_02": {FileType.SAE_DM}}
+    assert counted_scans == ["all", "STUDY_02"]
+    assert FileType.SAE_DM in catalog.get_file_types("STUDY_02")
+    assert catalog.version == 2
+
+
+def test_fingerprint_tracks_content_not_rebuilds(catalog, data_root):
+    """Rebuilding an unchanged tree (e.g. after a restart) keeps the fingerprint"""
+    fingerprint, _ = catalog.snapshot()
+    restarted = StudyCatalog(StudyDiscovery(str(data_root)))
+    assert restarted.snapshot()[0] == fingerprint
+
+    catalog.refresh()
+    assert catalog.version == 2
+    assert catalog.fingerprint == fingerprint
+
+    new_file = data_root / "Study 2_CPID_Input Files" / "Study 2_eSAE_Dashboard.xlsx"
+    write_workbook(new_file)
+    catalog.apply_changes([str(new_file)])
+    assert catalog.fingerprint != fingerprint
+
+
+def test_new_and_removed_studies(catalog, data_root):
+    catalog.list_studies()
+
+    folder = data_root / "Study 3_CPID_Input Files"
+    folder.mkdir()
+    write_workbook(folder / "Study 3_Missing_Pages_Report.xlsx")
+    catalog.apply_changes([str(folder / "Study 3_Missing_Pages_Report.xlsx")])
+
+    assert [s.study_id for s in catalog.list_studies()] == ["STUDY_01", "STUDY_02", "STUDY_03"]
+
+    shutil.rmtree(data_root / "Study 1_CPID_Input Files")
+    catalog.refresh_studies({"STUDY_01"})
+
+    assert catalog.get_study("STUDY_01") is None
+
+
+def test_unrelated_change_keeps_version(catalog, data_root):
+    catalog.list_studies()
+
+    assert catalog.apply_changes([str(data_root / "readme.xlsx")]) == {}
+    assert catalog.version == 1
+
+
+def test_watcher_deletions_leave_the_index(catalog, data_root):
+    """A deleted workbook reported by the watcher is dropped from its study"""
+    catalog.list_studies()
+    workbook = data_root / "Study 2_CPID_Input Files" / "Study 2_Missing_Pages_Report.xlsx"
+    extra = data_root / "Study 2_CPID_Input Files" / "Study 2_eSAE_Dashboard.xlsx"
+    write_workbook(extra)
+    catalog.apply_changes([str(extra)])
+    assert set(catalog.get_file_types("STUDY_02")) == {FileType.MISSING_PAGES, FileType.SAE_DM}
+
+    watcher = FileWatcher([str(data_root)], check_interval=0.05, backend="polling")
+    catalog.start_watching(watcher)
+    try:
+        workbook.unlink()
+        deadline = time.monotonic() + 5
+        while FileType.MISSING_PAGES in catalog.get_file_types("STUDY_02") and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        catalog.stop_watching()
+        watcher.stop()
+
+    assert set(catalog.get_file_types("STUDY_02")) == {FileType.SAE_DM}
+    assert watcher._on_change_callbacks == []
+
+
+def test_catalog_and_scheduler_share_one_watcher(catalog):
+    """Both subscribe to the data-root watcher instead of scanning it twice"""
+    reset_file_watcher()
+    try:
+        scheduler = RefreshScheduler()
+        catalog.start_watching()
+        shared = get_file_watcher()
+
+        assert scheduler._file_watcher is shared
+        assert shared._on_change_callbacks == [scheduler._on_file_change, catalog.apply_changes]
+
+        scheduler.stop()
+        catalog.stop_watching()
+        assert shared._on_change_callbacks == []
+    finally:
+        reset_file_watcher()
+
+
+# ========================================
+# API
+# ========================================
+
+def test_study_endpoints_use_catalog(catalog, data_root, monkeypatch):
+    """Endpoints read the catalog and its version is part of the ETag"""
+    reset_study_catalog()
+    reset_study_store()
+    monkeypatch.setattr("src.api.main.get_study_catalog", lambda: catalog)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/studies")
+    assert response.status_code == 200
+    assert [s["study_id"] for s in response.json()] == ["STUDY_01", "STUDY_02"]
+
+    etag = response.headers["ETag"]
+    assert client.get("/api/v1/studies", headers={"If-None-Match": etag}).status_code == 304
+
+    new_file = data_root / "Study 1_CPID_Input Files" / "Study 1_eSAE_Dashboard.xlsx"
+    write_workbook(new_file)
+    catalog.apply_changes([str(new_file)])
+
+    assert client.get("/api/v1/studies", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/v1/studies/STUDY_99").status_code == 404
+    assert get_study_catalog() is not catalog
@@ -0,0 +1,150 @@
+"""
+Unit Tests for Study Result Store
+=================================
+Tests versioned publishing, disk round-trips and conditional GETs on the
+dashboard endpoints.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.study_store import StudyResultStore, get_study_store, reset_study_store
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def results():
+    return {
+        "STUDY_01": {"overall_score": 91.0, "risk_level": "Low", "sites": []},
+        "STUDY_02": {
+            "overall_score": 55.0,
+            "risk_level": "Critical",
+            "sites": [{"site_id": "SITE_001", "risk_level": "High", "enrollment": 12}],
+        },
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StudyResultStore(results_file=str(tmp_path / "data_cache.json"))
+
+
+@pytest.fixture
+def client(results):
+    """API client with results published to a fresh shared store"""
+    reset_study_store()
+    get_study_store().publish(results, persist=False)
+    yield TestClient(app)
+    reset_study_store()
+
+
+# ========================================
+# STORE
+# ========================================
+
+def test_publish_bumps_version_and_etag(store, results):
+    empty = store.snapshot()
+    first = store.publish(results)
+    second = store.publish(results)
+
+    assert (empty.version, first.version, second.version) == (0, 1, 2)
+    assert len({empty.etag, first.etag, second.etag}) == 3
+    assert store.get_study("STUDY_02")["risk_level"] == "Critical"
+
+
+def test_old_snapshot_unchanged_after_publish(store, results):
+    """Readers holding a snapshot never see a later publish"""
+    before = store.publish(results)
+    store.publish_study("STUDY_01", {"overall_score": 10.0})
+
+    assert before.studies["STUDY_01"]["overall_score"] == 91.0
+    assert store.get_study("STUDY_01") == {"overall_score": 10.0}
+    assert set(store.snapshot().studies) == {"STUDY_01", "STUDY_02"}
+
+
+def test_snapshot_owns_a_copy_of_published_data(store, results):
+    """Publishers may keep mutating their input; the top level is read-only"""
+    snapshot = store.publish(results)
+    results["STUDY_02"]["sites"][0]["risk_level"] = "Low"
+    results["STUDY_02"]["overall_score"] = 99.0
+    results["STUDY_03"] = {}
+
+    study = snapshot.studies["STUDY_02"]
+    assert study["overall_score"] == 55.0
+    assert study["sites"][0]["risk_level"] == "High"
+    assert set(snapshot.studies) == {"STUDY_01", "STUDY_02"}
+    with pytest.raises(TypeError):
+        snapshot.studies["STUDY_03"] = {}
+
+    # Nested values are plain dicts/lists (the contract is: do not mutate them)
+    assert type(study) is dict and type(study["sites"]) is list
+
+
+def test_publish_study_with_new_dict_keeps_previous_nested_data(store, results):
+    """Derived results are built as new dicts, never edited in place"""
+    before = store.publish(results)
+    current = store.get_study("STUDY_02")
+    updated = {**current, "sites": [{**site, "risk_level": "Low"} for site in current["sites"]]}
+    after = store.publish_study("STUDY_02", updated)
+
+    assert before.studies["STUDY_02"]["sites"][0]["risk_level"] == "High"
+    assert after.studies["STUDY_02"]["sites"][0]["risk_level"] == "Low"
+    assert after.studies["STUDY_02"] is not updated
+    assert after.etag != before.etag
+
+
+def test_publish_normalizes_and_persists(store, tmp_path):
+    store.publish({"STUDY_01": {"score": np.float64(1.5), "at": datetime(2024, 1, 2)}})
+
+    assert store.get_study("STUDY_01") == {"score": 1.5, "at": "2024-01-02T00:00:00"}
+
+    reloaded = StudyResultStore(results_file=str(tmp_path / "data_cache.json"))
+    assert reloaded.load()
+    assert reloaded.get_study("STUDY_01") == store.get_study("STUDY_01")
+
+
+def test_load_missing_file(store):
+    assert not store.load()
+    assert store.snapshot().version == 0
+
+
+# ========================================
+# CONDITIONAL GET
+# ========================================
+
+def test_dashboard_summary_served_from_store(client):
+    response = client.get("/api/v1/dashboard/summary")
+
+    assert response.status_code == 200
+    assert response.json()["total_studies"] == 2
+    assert response.json()["critical_risks"] == 1
+    assert response.json()["sites_at_risk"] == 1
+    assert response.headers["X-Data-Version"] == "1"
+
+
+def test_matching_etag_returns_304(client, results):
+    etag = client.get("/api/v1/dashboard/summary").headers["ETag"]
+
+    response = client.get("/api/v1/dashboard/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    get_study_store().publish(results, persist=False)
+    response = client.get("/api/v1/dashboard/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_site_detail_conditional_get(client):
+    response = client.get("/api/v1/sites/SITE_001")
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/sites/SITE_001", headers={"If-None-Match": f'W/{response.headers["ETag"]}'})
+    assert response.status_code == 304
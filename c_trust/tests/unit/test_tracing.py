@@ -0,0 +1,105 @@
+"""
+Unit Tests for Pipeline Stage Tracing
+=====================================
+Tests span nesting, study_id inheritance, propagation into worker
+threads, Prometheus export and the disabled mode of the Tracer.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.tracing import Tracer
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def tracer():
+    return Tracer(enabled=True, max_traces=10)
+
+
+def _names(trace):
+    return [trace["name"]] + [name for child in trace["children"] for name in _names(child)]
+
+
+# ========================================
+# TESTS
+# ========================================
+
+def test_spans_nest_and_inherit_study_id(tracer):
+    with tracer.span("features.extract", study_id="STUDY_01") as root:
+        with tracer.span("features.file_type", file_type="edc_metrics") as child:
+            assert tracer.current() is child
+        with tracer.span("features.derived"):
+            pass
+    assert tracer.current() is None
+
+    traces = tracer.get_traces()
+    assert len(traces) == 1
+    assert _names(traces[0]) == ["features.extract", "features.file_type", "features.derived"]
+    assert traces[0]["children"][0]["tags"] == {"file_type": "edc_metrics", "study_id": "STUDY_01"}
+    assert traces[0]["children"][0]["parent_id"] == root.span_id
+    assert all(c["trace_id"] == root.span_id for c in traces[0]["children"])
+    assert traces[0]["duration_ms"] >= traces[0]["children"][0]["duration_ms"]
+
+
+def test_bind_carries_span_into_worker_threads(tracer):
+    def work(i):
+        with tracer.span("pipeline.agent", agent=f"agent_{i}"):
+            return tracer.current().tags["study_id"]
+
+    with tracer.span("pipeline.analysis", study_id="STUDY_02"):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            study_ids = list(executor.map(tracer.bind(work), range(7)))
+
+    assert study_ids == ["STUDY_02"] * 7
+    trace = tracer.get_traces(study_id="STUDY_02")[0]
+    assert sorted(c["tags"]["agent"] for c in trace["children"]) == [f"agent_{i}" for i in range(7)]
+
+    # Explicit parents (one span per study on a shared pool)
+    parent = tracer.start_span("pipeline.agents", study_id="STUDY_03")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(tracer.bind(work, parent=parent), 0).result()
+    tracer.finish(parent)
+    assert _names(tracer.get_traces(limit=1)[0]) == ["pipeline.agents", "pipeline.agent"]
+    assert tracer.get_traces(study_id="STUDY_04") == []
+
+
+def test_prometheus_histograms_and_errors(tracer):
+    for _ in range(3):
+        with tracer.span("ingestion.excel_read", study_id="STUDY_01", file_type="sae_dm", path="x.xlsx"):
+            pass
+    with pytest.raises(RuntimeError):
+        with tracer.span("pipeline.consensus", study_id="STUDY_01"):
+            raise RuntimeError("no signals")
+
+    text = tracer.render_prometheus()
+    assert "# TYPE ctrust_stage_duration_seconds histogram" in text
+    labels = 'stage="ingestion.excel_read",study_id="STUDY_01",file_type="sae_dm"'
+    assert f'ctrust_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"ctrust_stage_duration_seconds_count{{{labels}}} 3" in text
+    assert f"ctrust_stage_errors_total{{{labels}}} 0" in text
+    assert 'ctrust_stage_errors_total{stage="pipeline.consensus",study_id="STUDY_01"} 1' in text
+    assert "path=" not in text
+
+    failed = tracer.get_traces(limit=1)[0]
+    assert failed["error"] == "RuntimeError: no signals"
+    stats = {s["stage"]: s for s in tracer.get_stage_stats()}
+    assert stats["ingestion.excel_read"]["count"] == 3
+    assert stats["pipeline.consensus"]["errors"] == 1
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("features.extract", study_id="STUDY_01") as span:
+        span.set_tag("rows", 10)
+        with tracer.span("features.derived"):
+            pass
+
+    assert span.duration_ms is not None
+    assert tracer.get_traces() == []
+    assert tracer.get_stage_stats() == []
+    assert "ctrust_stage_duration_seconds_count" not in tracer.render_prometheus()
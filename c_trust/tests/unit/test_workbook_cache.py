@@ -0,0 +1,143 @@
+"""
+Unit Tests for Parsed Workbook Cache
+====================================
+Tests fingerprint invalidation, columnar round-trips, LRU eviction and
+ExcelFileReader integration.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.data.ingestion import ExcelFileReader
+from src.data.workbook_cache import PYARROW_AVAILABLE, WorkbookCache
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def cache(tmp_path):
+    """Workbook cache in a temporary directory"""
+    return WorkbookCache(cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Small workbook with a standard header row"""
+    path = tmp_path / "Study_01_Missing_Pages.xlsx"
+    pd.DataFrame({
+        "Site ID": ["S1", "S2", "S3"],
+        "Subject ID": ["P1", "P2", "P3"],
+        "Form": ["AE", "CM", "VS"],
+        "Days Missing": [3, 10, 0],
+    }).to_excel(path, index=False)
+    return path
+
+
+# ========================================
+# CACHE TESTS
+# ========================================
+
+def test_miss_then_hit(cache, workbook):
+    """Stored frame is returned unchanged on the next lookup"""
+    df = pd.read_excel(workbook)
+
+    assert cache.get(workbook) is None
+    assert cache.put(workbook, df)
+
+    cached = cache.get(workbook)
+    pd.testing.assert_frame_equal(cached, df)
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries_count"] == 1
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_arrow_compatible_frame_uses_feather(cache, workbook):
+    """Frames Arrow can represent are stored as Feather"""
+    cache.put(workbook, pd.read_excel(workbook))
+
+    files = [p.suffix for p in cache.cache_dir.iterdir() if p.name != cache.INDEX_FILE]
+    assert files == [".feather"]
+
+
+def test_mixed_type_columns_round_trip(cache, workbook):
+    """Mixed-type object columns fall back to pickle and round-trip exactly"""
+    df = pd.DataFrame({"Subject ID": [101, "P-102", None], 0: [1.5, 2.5, 3.5]})
+
+    assert cache.put(workbook, df)
+    pd.testing.assert_frame_equal(cache.get(workbook), df)
+
+
+def test_read_parameters_are_part_of_key(cache, workbook):
+    """A frame cached for one header row is not served for another"""
+    cache.put(workbook, pd.read_excel(workbook), header_row=0)
+
+    assert cache.get(workbook, header_row=0) is not None
+    assert cache.get(workbook, header_row=2) is None
+
+
+def test_modified_file_invalidates_entry(cache, workbook):
+    """Rewriting the workbook drops the stale entry"""
+    cache.put(workbook, pd.read_excel(workbook))
+
+    pd.DataFrame({"Site ID": ["S9"], "Subject ID": ["P9"]}).to_excel(workbook, index=False)
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(workbook) is None
+    assert cache.get_stats()["entries_count"] == 0
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    """Least recently used entry is evicted when over the entry limit"""
+    cache = WorkbookCache(cache_dir=str(tmp_path / "cache"), max_entries=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file_{i}.xlsx"
+        path.write_bytes(f"workbook {i}".encode())
+        paths.append(path)
+
+    df = pd.DataFrame({"a": [1, 2]})
+    cache.put(paths[0], df)
+    cache.put(paths[1], df)
+    cache.get(paths[0])  # paths[1] is now least recently used
+    cache.put(paths[2], df)
+
+    assert cache.get(paths[1]) is None
+    assert cache.get(paths[0]) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_index_survives_restart(tmp_path, workbook):
+    """A new cache instance sees entries written by a previous one"""
+    cache_dir = str(tmp_path / "cache")
+    WorkbookCache(cache_dir=cache_dir).put(workbook, pd.read_excel(workbook))
+
+    reopened = WorkbookCache(cache_dir=cache_dir)
+    assert reopened.get(workbook) is not None
+
+
+# ========================================
+# READER INTEGRATION
+# ========================================
+
+def test_reader_skips_parsing_on_cache_hit(cache, workbook, monkeypatch):
+    """Second read of an unchanged workbook is served from cache"""
+    reader = ExcelFileReader(cache=cache)
+    first = reader.read_file(workbook)
+    assert first is not None
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("workbook should not be parsed again")
+
+    monkeypatch.setattr(reader, "_parse_file", fail_parse)
+    second = reader.read_file(workbook)
+
+    pd.testing.assert_frame_equal(second, first)